@@ -49,6 +49,7 @@ class AppConfig:
     # Performance
     cache_calculations: bool = True
     cache_size: int = 128
+    journal_compact_size: int = 1024 * 1024  # Autosave journal bytes before a full save
 
     # Internationalization
     default_language: str = "system"
@@ -13,6 +13,7 @@ from config.tax_year_config import get_tax_year_config, TaxYearConfig
 from services.encryption_service import EncryptionService
 from services.tax_calculation_service import TaxCalculationService
 from services.ptin_ero_service import PTINEROService
+from services.return_index_service import ReturnIndexService
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +44,7 @@ class DependencyContainer:
         self._encryption_service: Optional[EncryptionService] = None
         self._tax_calculation_service: Optional[TaxCalculationService] = None
         self._ptin_ero_service: Optional[PTINEROService] = None
+        self._return_index_service: Optional[ReturnIndexService] = None
         
         logger.info(f"Initialized DependencyContainer for tax year {tax_year}")
     
@@ -112,15 +114,45 @@ class DependencyContainer:
             logger.debug("Created PTINEROService instance")
         return self._ptin_ero_service
     
+    def get_return_index_service(self) -> ReturnIndexService:
+        """
+        Get return index service instance.
+        
+        Returns:
+            ReturnIndexService storing its database under the safe directory,
+            holding every saved return (existing ones are indexed on first use)
+        """
+        if self._return_index_service is None:
+            from models.tax_data import index_saved_returns
+            self._return_index_service = ReturnIndexService(self.config)
+            index_saved_returns(self.config, self._return_index_service)
+            logger.debug("Created ReturnIndexService instance")
+        return self._return_index_service
+
+    def get_key_rotation_service(self, max_workers: Optional[int] = None):
+        """
+        Get a key rotation service for the application key.
+
+        Args:
+            max_workers: Worker processes (1 rotates in this process)
+
+        Returns:
+            KeyRotationService sharing the container's encryption service
+        """
+        from services.key_rotation_service import KeyRotationService
+        return KeyRotationService(self.config, encryption_service=self.get_encryption_service(),
+                                  max_workers=max_workers)
+
     def get_tax_data_repository(self):
         """
         Get tax data repository (TaxData instance).
         
         Returns:
-            TaxData instance configured with encryption
+            TaxData instance configured with encryption, recording its saves
+            in the return index
         """
         from models.tax_data import TaxData
-        return TaxData(self.config)
+        return TaxData(self.config, return_index=self.get_return_index_service())
     
     def get_pdf_form_filler(self):
         """
@@ -5,8 +5,153 @@ This module centralizes all tax year specific values to make it easy
 to update for new tax years without modifying calculation logic.
 """
 
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from math import isinf
+from typing import Any, Dict, List, Sequence, Tuple
+
+from utils.money import multiply_cents, to_cents
+
+
+@dataclass(frozen=True)
+class BracketTable:
+    """
+    Precompiled progressive bracket schedule.
+
+    Stores the tax owed on all income below each bracket, so the tax on any
+    amount is one bisect plus one multiply-add. Works with float or Decimal
+    amounts, matching the type of the brackets it was built from.
+    """
+
+    # Upper bound of each bracket (income at or below is taxed at its rate)
+    thresholds: Tuple[Any, ...]
+    rates: Tuple[Any, ...]
+    # Lower bound of each bracket
+    lower_bounds: Tuple[Any, ...]
+    # Tax on income up to each bracket's lower bound; the extra last entry is
+    # the tax on income up to the highest threshold
+    cumulative_tax: Tuple[Any, ...]
+
+    @classmethod
+    def from_brackets(cls, brackets: Sequence[Tuple[Any, Any]], zero: Any = 0.0) -> 'BracketTable':
+        """
+        Build a table from (threshold, rate) tuples in ascending order.
+
+        Args:
+            brackets: Bracket upper bounds and rates
+            zero: Zero of the amount type (0.0 or Decimal('0'))
+
+        Returns:
+            BracketTable for the schedule
+        """
+        lower_bounds = []
+        cumulative_tax = []
+        # Accumulate bracket by bracket so float results match a sequential loop
+        tax = zero
+        prev_threshold = zero
+        for threshold, rate in brackets:
+            lower_bounds.append(prev_threshold)
+            cumulative_tax.append(tax)
+            tax += (threshold - prev_threshold) * rate
+            prev_threshold = threshold
+        cumulative_tax.append(tax)
+
+        return cls(
+            thresholds=tuple(threshold for threshold, _ in brackets),
+            rates=tuple(rate for _, rate in brackets),
+            lower_bounds=tuple(lower_bounds),
+            cumulative_tax=tuple(cumulative_tax),
+        )
+
+    def bracket_index(self, income: Any) -> int:
+        """Index of the bracket an amount falls in (len(rates) if above every threshold)"""
+        return bisect_left(self.thresholds, income)
+
+    def tax(self, income: Any) -> Any:
+        """
+        Tax on an amount (not rounded).
+
+        Args:
+            income: Taxable amount
+
+        Returns:
+            Tax at the bracket rates
+        """
+        index = bisect_left(self.thresholds, income)
+        if index == len(self.rates):
+            return self.cumulative_tax[index]
+        return self.cumulative_tax[index] + (income - self.lower_bounds[index]) * self.rates[index]
+
+    def marginal_rate(self, income: Any) -> Any:
+        """Rate of the bracket an amount falls in (top rate above every threshold)"""
+        index = bisect_left(self.thresholds, income)
+        return self.rates[min(index, len(self.rates) - 1)]
+
+
+@dataclass(frozen=True)
+class CentsBracketTable:
+    """
+    Progressive bracket schedule in integer cents.
+
+    The tax on each full bracket is rounded to the cent when the table is
+    built; the tax on an amount adds its bracket's rate times the part of the
+    amount in that bracket, rounded half up. The top bracket is open-ended
+    (a schedule with a finite top gets a zero-rate bracket above it).
+    """
+
+    # Upper bound in cents of every bracket but the open-ended top one
+    thresholds: Tuple[int, ...]
+    rates: Tuple[Any, ...]
+    # Lower bound of each bracket in cents
+    lower_bounds: Tuple[int, ...]
+    # Tax in cents on income up to each bracket's lower bound
+    cumulative_tax: Tuple[int, ...]
+
+    @classmethod
+    def from_table(cls, table: BracketTable) -> 'CentsBracketTable':
+        """
+        Convert a float or Decimal bracket table to cents.
+
+        Args:
+            table: Precompiled bracket table
+
+        Returns:
+            CentsBracketTable for the same schedule
+        """
+        thresholds = list(table.thresholds)
+        rates = list(table.rates)
+        lower_bounds = list(table.lower_bounds)
+        if not isinf(thresholds[-1]):
+            lower_bounds.append(thresholds[-1])
+            thresholds.append(float('inf'))
+            rates.append(0)
+
+        lower_cents = [to_cents(bound) for bound in lower_bounds]
+        threshold_cents = [to_cents(threshold) for threshold in thresholds[:-1]]
+        cumulative_tax = [0]
+        for threshold, lower, rate in zip(threshold_cents, lower_cents, rates):
+            cumulative_tax.append(cumulative_tax[-1] + multiply_cents(threshold - lower, rate))
+
+        return cls(
+            thresholds=tuple(threshold_cents),
+            rates=tuple(rates),
+            lower_bounds=tuple(lower_cents),
+            cumulative_tax=tuple(cumulative_tax),
+        )
+
+    def tax(self, income_cents: int) -> int:
+        """
+        Tax on an amount.
+
+        Args:
+            income_cents: Taxable amount in cents
+
+        Returns:
+            Tax in cents
+        """
+        index = bisect_left(self.thresholds, income_cents)
+        in_bracket = income_cents - self.lower_bounds[index]
+        return self.cumulative_tax[index] + multiply_cents(in_bracket, self.rates[index])
 
 
 @dataclass
@@ -66,6 +211,52 @@ class TaxYearConfig:
     ss_tax_rate: float = 0.124
     medicare_tax_rate: float = 0.029
 
+    # Precompiled tax_brackets by filing status, built once per configuration
+    bracket_tables: Dict[str, BracketTable] = field(default_factory=dict, init=False, repr=False, compare=False)
+    cents_bracket_tables: Dict[str, CentsBracketTable] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self.bracket_tables = {
+            status: BracketTable.from_brackets(brackets)
+            for status, brackets in self.tax_brackets.items()
+        }
+        self.cents_bracket_tables = {
+            status: CentsBracketTable.from_table(table)
+            for status, table in self.bracket_tables.items()
+        }
+
+    def get_bracket_table(self, filing_status: str) -> BracketTable:
+        """
+        Get the precompiled bracket table for a filing status.
+
+        Args:
+            filing_status: Filing status (unknown statuses use Single)
+
+        Returns:
+            BracketTable for the filing status
+        """
+        table = self.bracket_tables.get(filing_status)
+        if table is None:
+            table = self.bracket_tables["Single"]
+        return table
+
+    def get_cents_bracket_table(self, filing_status: str) -> CentsBracketTable:
+        """
+        Get the bracket table in cents for a filing status.
+
+        Args:
+            filing_status: Filing status (unknown statuses use Single)
+
+        Returns:
+            CentsBracketTable for the filing status
+        """
+        table = self.cents_bracket_tables.get(filing_status)
+        if table is None:
+            table = self.cents_bracket_tables["Single"]
+        return table
+
 
 # Tax Year 2025 Configuration
 TAX_YEAR_2025 = TaxYearConfig(
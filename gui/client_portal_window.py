@@ -286,21 +286,18 @@ class ClientPortalWindow:
         for item in self.returns_tree.get_children():
             self.returns_tree.delete(item)
 
-        # For now, simulate some sample returns
-        # In a real implementation, this would load from the client's data directory
-        sample_returns = [
-            {"year": "2024", "status": "Filed", "filed_date": "2025-03-15", "modified": "2025-03-10", "notes": "Final return"},
-            {"year": "2023", "status": "Filed", "filed_date": "2024-03-20", "modified": "2024-03-15", "notes": "Amended return"},
-            {"year": "2022", "status": "Filed", "filed_date": "2023-04-01", "modified": "2023-03-25", "notes": "Original filing"}
-        ]
+        # Listed from the return index, so no return has to be decrypted
+        returns = self.container.get_return_index_service().list_returns(
+            client_id=self.client_id, order_by="tax_year"
+        )
 
-        for ret in sample_returns:
+        for ret in returns:
             self.returns_tree.insert("", tk.END, values=(
-                ret["year"],
-                ret["status"],
-                ret["filed_date"],
-                ret["modified"],
-                ret["notes"]
+                ret.tax_year,
+                ret.status.title(),
+                ret.filed_date[:10],
+                ret.last_modified[:10],
+                "Amended return" if ret.return_type == "amended" else ", ".join(ret.required_forms)
             ))
 
     def _load_documents(self) -> None:
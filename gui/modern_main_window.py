@@ -31,6 +31,7 @@ import datetime
 import queue
 
 from config.app_config import AppConfig
+from config.dependencies import get_container
 from models.tax_data import TaxData
 from services.tax_interview_service import TaxInterviewService
 from services.form_recommendation_service import FormRecommendationService
@@ -454,8 +455,7 @@ class ModernMainWindow(ctk.CTk):
 
             # Create initial tax data if not exists
             if not self.tax_data:
-                from models.tax_data import TaxData
-                self.tax_data = TaxData(self.config)
+                self.tax_data = get_container(self.config).get_tax_data_repository()
 
             # Show the tax forms selection page with recommendations
             self._show_tax_forms_page(recommendations)
@@ -491,8 +491,7 @@ class ModernMainWindow(ctk.CTk):
 
             # Create initial tax data if not exists
             if not self.tax_data:
-                from models.tax_data import TaxData
-                self.tax_data = TaxData(self.config)
+                self.tax_data = get_container(self.config).get_tax_data_repository()
 
             # Update sidebar
             self._update_sidebar_after_interview()
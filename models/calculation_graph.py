@@ -0,0 +1,248 @@
+"""
+Calculation dependency graph - incremental recalculation for tax totals
+
+Each node computes one intermediate value (a line-item subtotal, AGI,
+taxable income, tax, ...). Nodes declare the data paths they read and the
+nodes they depend on. When a data path changes only the nodes that read it,
+and everything downstream of them, are marked dirty; the next evaluation
+recomputes just those nodes.
+
+List nodes sum a per-row value over a list (W-2s, 1099s, capital gain
+lots). They cache each row's contribution so a single-row edit re-reads
+only that row.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+
+class _Node:
+    """Single node in the calculation graph"""
+
+    __slots__ = ('name', 'compute', 'depends_on', 'paths', 'value', 'dirty')
+
+    def __init__(self, name: str, compute: Callable[..., Any],
+                 depends_on: Iterable[str], paths: Iterable[str]):
+        self.name = name
+        self.compute = compute
+        self.depends_on = tuple(depends_on)
+        self.paths = tuple(paths)
+        self.value: Any = None
+        self.dirty = True
+
+
+class _ListNode(_Node):
+    """Node that sums a per-row value over the list stored at a data path"""
+
+    __slots__ = ('row_value', 'rows', 'stale_rows')
+
+    def __init__(self, name: str, path: str, row_value: Callable[[Any], Any]):
+        super().__init__(name, None, (), (path,))
+        self.row_value = row_value
+        self.rows: Optional[List[Any]] = None
+        self.stale_rows: Set[int] = set()
+
+
+def _paths_overlap(changed: str, watched: str) -> bool:
+    """True if a change at ``changed`` can affect data read at ``watched``"""
+    return (
+        changed == watched or
+        watched.startswith(changed + '.') or
+        changed.startswith(watched + '.')
+    )
+
+
+def _get_path(data: Dict[str, Any], path: str, default: Any = None) -> Any:
+    """Resolve a dot-notation path in nested dictionaries"""
+    value: Any = data
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return default
+        value = value.get(key, default)
+    return value
+
+
+class CalculationGraph:
+    """
+    Dependency graph of calculation nodes with dirty tracking.
+
+    Compute functions are called as ``compute(context, values)`` where
+    ``context`` is whatever the caller passes to ``evaluate`` (usually the
+    TaxData instance) and ``values`` maps dependency names to their values.
+    The graph keeps no reference to the context, so it can be deep-copied
+    along with its owner.
+    """
+
+    def __init__(self):
+        self._nodes: Dict[str, _Node] = {}
+        self._dependents: Dict[str, List[str]] = {}
+        # Names of nodes recomputed since the last reset_stats() call
+        self.recomputed: List[str] = []
+        # Number of list rows re-read since the last reset_stats() call
+        self.rows_recomputed = 0
+        self._cold = True
+
+    def add_node(self, name: str, compute: Callable[[Any, Dict[str, Any]], Any],
+                 depends_on: Iterable[str] = (), paths: Iterable[str] = ()) -> None:
+        """
+        Add a computed node.
+
+        Args:
+            name: Unique node name
+            compute: Function called with (context, dependency values)
+            depends_on: Names of nodes this node reads
+            paths: Data paths (dot notation) this node reads directly
+        """
+        self._register(_Node(name, compute, depends_on, paths))
+
+    def add_list_node(self, name: str, path: str, row_value: Callable[[Any], Any]) -> None:
+        """
+        Add a node that sums ``row_value(row)`` over the list at ``path``.
+
+        Args:
+            name: Unique node name
+            path: Data path of the list (dot notation)
+            row_value: Function giving one row's contribution
+        """
+        self._register(_ListNode(name, path, row_value))
+
+    def _register(self, node: _Node) -> None:
+        if node.name in self._nodes:
+            raise ValueError(f"Calculation node '{node.name}' already exists")
+        for dependency in node.depends_on:
+            if dependency not in self._nodes:
+                raise ValueError(f"Unknown dependency '{dependency}' for node '{node.name}'")
+            self._dependents.setdefault(dependency, []).append(node.name)
+        self._nodes[node.name] = node
+
+    def _mark_dirty(self, names: Iterable[str]) -> Set[str]:
+        """Mark nodes and everything downstream of them dirty"""
+        dirty: Set[str] = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name in dirty:
+                continue
+            dirty.add(name)
+            self._nodes[name].dirty = True
+            stack.extend(self._dependents.get(name, ()))
+        return dirty
+
+    def invalidate_path(self, path: str) -> Set[str]:
+        """
+        Mark nodes reading ``path`` (and their dependents) dirty.
+
+        List nodes on the path drop their per-row cache.
+
+        Args:
+            path: Changed data path (dot notation)
+
+        Returns:
+            Names of all nodes marked dirty
+        """
+        affected = [
+            node for node in self._nodes.values()
+            if any(_paths_overlap(path, watched) for watched in node.paths)
+        ]
+        for node in affected:
+            if isinstance(node, _ListNode):
+                node.rows = None
+        return self._mark_dirty(node.name for node in affected)
+
+    def invalidate_row(self, path: str, index: int, action: str = 'update') -> Set[str]:
+        """
+        Mark a single list row changed.
+
+        Args:
+            path: Data path of the list
+            index: Row index
+            action: 'update', 'append' or 'remove'
+
+        Returns:
+            Names of all nodes marked dirty
+        """
+        affected = []
+        for node in self._nodes.values():
+            if not any(_paths_overlap(path, watched) for watched in node.paths):
+                continue
+            affected.append(node.name)
+            if not isinstance(node, _ListNode) or node.paths[0] != path or node.rows is None:
+                if isinstance(node, _ListNode):
+                    node.rows = None
+                continue
+            if action == 'append':
+                node.rows.append(None)
+                node.stale_rows.add(len(node.rows) - 1)
+            elif action == 'remove' and 0 <= index < len(node.rows):
+                node.rows.pop(index)
+                node.stale_rows = {i - 1 if i > index else i for i in node.stale_rows if i != index}
+            elif action == 'update' and 0 <= index < len(node.rows):
+                node.stale_rows.add(index)
+            else:
+                node.rows = None
+        return self._mark_dirty(affected)
+
+    def invalidate_all(self) -> None:
+        """Mark every node dirty and drop all row caches"""
+        self._cold = True
+        for node in self._nodes.values():
+            node.dirty = True
+            if isinstance(node, _ListNode):
+                node.rows = None
+
+    def reset_stats(self) -> None:
+        """Clear recomputation statistics"""
+        self.recomputed = []
+        self.rows_recomputed = 0
+
+    @property
+    def is_cold(self) -> bool:
+        """True if nothing has been evaluated since creation or invalidate_all()"""
+        return self._cold
+
+    def is_dirty(self, name: str) -> bool:
+        """Check whether a node needs recomputation"""
+        return self._nodes[name].dirty
+
+    def evaluate(self, name: str, context: Any, data: Dict[str, Any]) -> Any:
+        """
+        Get a node's value, recomputing dirty nodes it depends on.
+
+        Args:
+            name: Node name
+            context: Object passed to compute functions
+            data: Data dictionary list nodes read their rows from
+
+        Returns:
+            The node's current value
+        """
+        node = self._nodes[name]
+        if not node.dirty:
+            return node.value
+
+        if isinstance(node, _ListNode):
+            node.value = self._evaluate_list(node, data)
+        else:
+            values = {dep: self.evaluate(dep, context, data) for dep in node.depends_on}
+            node.value = node.compute(context, values)
+
+        node.dirty = False
+        self._cold = False
+        self.recomputed.append(name)
+        return node.value
+
+    def _evaluate_list(self, node: _ListNode, data: Dict[str, Any]) -> Any:
+        """Refresh stale rows of a list node and sum them"""
+        items = _get_path(data, node.paths[0], [])
+        if not isinstance(items, list):
+            items = []
+
+        if node.rows is None or len(node.rows) != len(items):
+            node.rows = [node.row_value(item) for item in items]
+            self.rows_recomputed += len(items)
+        else:
+            for index in node.stale_rows:
+                node.rows[index] = node.row_value(items[index])
+            self.rows_recomputed += len(node.stale_rows)
+        node.stale_rows = set()
+
+        return sum(node.rows)
@@ -0,0 +1,161 @@
+"""
+Scenario overlay - copy-on-write view of tax data for what-if analysis
+
+A ScenarioOverlay reads through to a base return and holds only the paths a
+scenario changes. Unchanged sections are shared with the base and never
+copied, so evaluating a scenario costs only the size of its changes.
+
+Change semantics match TaxPlanningService's scenario format:
+
+- dictionaries are merged into existing sections key by key
+- a ``w2_forms`` list adds numeric values to the first W-2 (other values replace)
+- other values replace whatever is stored at the path
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+_MISSING = object()
+
+
+class _Replace:
+    """Leaf that replaces the base value at a path"""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class _FirstRowDelta:
+    """Leaf that adjusts fields of the first row of a base list"""
+
+    __slots__ = ('changes',)
+
+    def __init__(self, changes: Dict[str, Any]):
+        self.changes = changes
+
+    def apply(self, rows: Any) -> Any:
+        if not isinstance(rows, list) or not rows or not isinstance(rows[0], dict):
+            return rows
+        first = dict(rows[0])
+        for key, value in self.changes.items():
+            if key in first:
+                if isinstance(value, (int, float)):
+                    first[key] += value
+                else:
+                    first[key] = value
+        return [first] + rows[1:]
+
+
+def _resolve(value: Any, keys, default: Any) -> Any:
+    """Walk remaining keys inside a plain value like TaxData.get does"""
+    for key in keys:
+        if isinstance(value, dict):
+            value = value.get(key, default)
+        else:
+            return default
+    return value
+
+
+class ScenarioOverlay:
+    """
+    Read-through view of a return with scenario changes applied.
+
+    Exposes the same ``get(path, default)`` accessor as TaxData, so it can be
+    passed to TaxCalculationService.calculate_complete_return and to other
+    overlays as a base.
+    """
+
+    def __init__(self, base_get: Callable[..., Any], changes: Optional[Dict[str, Any]] = None):
+        """
+        Create an overlay.
+
+        Args:
+            base_get: ``get(path, default)`` accessor of the base return
+            changes: Nested dictionary of scenario changes
+        """
+        self._base_get = base_get
+        self._changes = changes or {}
+        self._patches: Dict[str, Any] = self._compile(self._changes, '')
+
+    @classmethod
+    def from_tax_data(cls, tax_data: Any, changes: Dict[str, Any]) -> 'ScenarioOverlay':
+        """
+        Overlay the current tax year of a TaxData object (or another overlay).
+
+        Args:
+            tax_data: Object with a ``get(path, default)`` accessor
+            changes: Nested dictionary of scenario changes
+
+        Returns:
+            ScenarioOverlay over the given data
+        """
+        return cls(tax_data.get, changes)
+
+    @classmethod
+    def from_year_data(cls, year_data: Dict[str, Any],
+                       changes: Optional[Dict[str, Any]] = None) -> 'ScenarioOverlay':
+        """
+        Overlay a plain dictionary of one tax year's data.
+
+        Args:
+            year_data: Year data as stored under TaxData.data["years"][year]
+            changes: Nested dictionary of scenario changes
+
+        Returns:
+            ScenarioOverlay reading paths the same way TaxData.get does
+        """
+        return cls(lambda path, default=None: _resolve(year_data, path.split('.'), default), changes)
+
+    @property
+    def changes(self) -> Dict[str, Any]:
+        """Scenario changes this overlay applies"""
+        return self._changes
+
+    def _compile(self, changes: Dict[str, Any], prefix: str) -> Dict[str, Any]:
+        """Turn scenario changes into a patch tree, consulting the base where merge rules need it"""
+        patches: Dict[str, Any] = {}
+        for key, value in changes.items():
+            path = f"{prefix}{key}"
+            current = self._base_get(path, _MISSING)
+            if isinstance(value, dict) and isinstance(current, dict):
+                patches[key] = self._compile(value, path + '.')
+            elif isinstance(value, list) and isinstance(current, list):
+                # Only W-2 lists support adjustments; other list changes are ignored
+                if key == 'w2_forms' and current and isinstance(current[0], dict) and value:
+                    patches[key] = _FirstRowDelta(value[0])
+            else:
+                patches[key] = _Replace(value)
+        return patches
+
+    def get(self, path: str, default: Any = None) -> Any:
+        """
+        Get a value using dot notation, with scenario changes applied.
+
+        Args:
+            path: Dot-notation path to the value
+            default: Default value if path not found
+
+        Returns:
+            The scenario value, or the base value for unchanged paths
+        """
+        keys = path.split('.')
+        node: Any = self._patches
+        for depth, key in enumerate(keys):
+            node = node.get(key)
+            if node is None:
+                return self._base_get(path, default)
+            if isinstance(node, _Replace):
+                return _resolve(node.value, keys[depth + 1:], default)
+            if isinstance(node, _FirstRowDelta):
+                if depth + 1 < len(keys):
+                    return default
+                return node.apply(self._base_get(path, default))
+        return self._merged(path, node)
+
+    def _merged(self, path: str, patches: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a section whose changed children are patched and the rest shared"""
+        merged = dict(self._base_get(path, {}))
+        for key in patches:
+            merged[key] = self.get(f"{path}.{key}")
+        return merged
@@ -9,19 +9,25 @@ import hmac
 import hashlib
 import logging
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Union
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from functools import lru_cache, wraps
 from cryptography.fernet import Fernet
 from config.app_config import AppConfig
 from services.encryption_service import EncryptionService
+from services.return_index_service import ReturnIndexService, ReturnSummary, agi_band, client_id_for_path
 from utils.event_bus import EventBus, Event, EventType
 from utils.resilience import retry
 from utils.error_tracker import get_error_tracker
+from utils.result_cache import content_hash, get_result_cache
+from utils.secure_container import MAGIC as CONTAINER_MAGIC, ContainerError, is_container, read_container
+from utils.save_journal import SaveJournal, apply_change, encode_record, file_state, fsync_directory
+from utils.segmented_container import LazySegments, index_digest, is_segmented, read_segmented, write_segmented
+from utils.money import sum_cents, to_cents, to_dollars
 from utils.tax_calculations import (
     calculate_standard_deduction,
-    calculate_income_tax,
-    calculate_self_employment_tax,
+    income_tax_cents,
+    self_employment_tax_cents,
     calculate_child_tax_credit,
     calculate_earned_income_credit,
     calculate_retirement_savings_credit,
@@ -30,33 +36,43 @@ from utils.tax_calculations import (
     calculate_premium_tax_credit
 )
 from utils.w2_calculator import W2Calculator
+from models.calculation_graph import CalculationGraph
+from utils.wash_sales import iter_wash_sales, parse_date, security_key
 
 # Performance: Cache decorator for expensive calculations
-def invalidate_cache_on_change(func):
-    """Decorator to invalidate cache when data changes"""
-    @wraps(func)
-    def wrapper(self, *args, **kwargs):
-        # Clear cache if data has been modified
-        if hasattr(self, '_calculation_cache'):
-            cache_time = getattr(self, '_cache_timestamp', None)
-            last_modified = self.data.get('metadata', {}).get('last_modified', '')
-            if cache_time != last_modified:
-                self._calculation_cache = {}
-                self._cache_timestamp = last_modified
-        else:
-            self._calculation_cache = {}
-            self._cache_timestamp = self.data.get('metadata', {}).get('last_modified', '')
-        
-        # Check cache
-        cache_key = f"{func.__name__}_{args}_{kwargs}"
-        if cache_key in self._calculation_cache:
-            return self._calculation_cache[cache_key]
-        
-        # Calculate and cache
-        result = func(self, *args, **kwargs)
-        self._calculation_cache[cache_key] = result
-        return result
-    return wrapper
+def invalidate_cache_on_change(inputs: Callable[["TaxData"], Any]):
+    """
+    Cache a method's result by the values it reads from the current tax year.
+
+    Results live in the shared result cache keyed by the method, its
+    arguments and a hash of ``inputs(self)`` - the values the method
+    actually reads - so a change to them selects a different entry while
+    undoing the change (or reloading identical data) finds the earlier
+    result again. Edits elsewhere in the year don't cost a rehash.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = (
+                f"TaxData.{func.__name__}",
+                self.get_current_year(),
+                content_hash(inputs(self), args, kwargs),
+            )
+            return get_result_cache().get_or_compute(key, lambda: func(self, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def _credit_inputs(tax_data: "TaxData") -> Tuple[Any, ...]:
+    """Values calculate_credits() reads besides AGI"""
+    return (
+        tax_data.get("filing_status.status", "Single"),
+        tax_data.get("dependents", []),
+        tax_data.get("credits", {}),
+        W2Calculator.calculate_total_wages(tax_data.get("income.w2_forms", [])),
+    )
+
+
 from utils.validation import (
     validate_ssn,
     validate_email,
@@ -82,18 +98,87 @@ def setup_logging():
 setup_logging()
 logger = logging.getLogger(__name__)
 
+
+def _positive_gain(item: Dict[str, Any]) -> float:
+    """Capital gains/losses contribute only gains to total income"""
+    gain = item.get("gain_loss", 0)
+    return gain if gain > 0 else 0
+
+
+# Income line items summed into total income: (graph node, list path, row value)
+INCOME_LINE_ITEMS = (
+    ("wages", "income.w2_forms", lambda w2: w2.get("wages", 0)),
+    ("interest_income", "income.interest_income", lambda item: item.get("amount", 0)),
+    ("dividend_income", "income.dividend_income", lambda item: item.get("amount", 0)),
+    ("self_employment_income", "income.self_employment", lambda item: item.get("net_profit", 0)),
+    ("retirement_distributions", "income.retirement_distributions", lambda item: item.get("amount", 0)),
+    ("social_security", "income.social_security", lambda item: item.get("amount", 0)),
+    ("capital_gains", "income.capital_gains", _positive_gain),
+    ("rental_income", "income.rental_income", lambda item: item.get("amount", 0)),
+    ("business_income", "income.business_income", lambda business: business.get("net_profit", 0)),
+)
+
+
+# Year data sections the totals and credits are calculated from
+CALCULATION_SECTIONS = (
+    "filing_status", "income", "adjustments", "deductions", "dependents", "credits", "payments"
+)
+
+# Year data sections the return index summary is built from
+INDEXED_SECTIONS = CALCULATION_SECTIONS + ("metadata",)
+
+
+def legacy_integrity_key(key_material: bytes) -> bytes:
+    """HMAC key of Fernet-era save packages, derived from the key file's contents"""
+    return hashlib.sha256(key_material + b'_integrity').digest()
+
+
+def verify_legacy_package(data_package: Dict[str, Any], integrity_keys: List[bytes]) -> None:
+    """
+    Check the HMAC of a Fernet-era save package.
+
+    Args:
+        data_package: Decrypted package with 'data' and 'mac'
+        integrity_keys: Keys from legacy_integrity_key() the MAC may be made with
+
+    Raises:
+        ValueError: If no key produces the package's MAC
+    """
+    json_data = json.dumps(data_package['data'], indent=2, sort_keys=True).encode()
+    for integrity_key in integrity_keys:
+        expected_mac = hmac.new(integrity_key, json_data, hashlib.sha256).hexdigest()
+        if hmac.compare_digest(expected_mac, data_package['mac']):
+            return
+    logger.error("Data integrity check failed")
+    raise ValueError("Data integrity verification failed - file may be corrupted or tampered")
+
+
+def calculation_inputs(year_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Select the parts of a year's data that calculations read.
+
+    Personal details and metadata (which carries modification timestamps)
+    are left out, so identical returns produce identical cache keys.
+    """
+    year_data = year_data or {}
+    return {section: year_data.get(section) for section in CALCULATION_SECTIONS}
+
+
 class TaxData:
     """Central data model for tax return information"""
     
-    def __init__(self, config: Optional[AppConfig] = None):
+    def __init__(self, config: Optional[AppConfig] = None,
+                 return_index: Optional[ReturnIndexService] = None):
         """
         Initialize tax data model with optional configuration.
         
         Args:
             config: Application configuration (uses default if None)
+            return_index: Index to record saved returns' metadata in (optional)
         """
         # Use provided config or create default
         self.config = config or AppConfig.from_env()
+        self.return_index = return_index
         
         # Field validators
         self.VALIDATORS = {
@@ -123,6 +208,17 @@ class TaxData:
         # Get event bus for publishing data changes
         self.event_bus = EventBus.get_instance()
 
+        # Saved file that autosave() journals changes against, and the
+        # changes made since the last autosave
+        self._base_path: Optional[Path] = None
+        self._base_digest: Optional[bytes] = None
+        self._base_state: Optional[Tuple[int, int, int]] = None
+        self._journal: Optional[SaveJournal] = None
+        self._journal_pending: List[bytes] = []
+        # Whether a change since the return index was last updated may
+        # change the current year's summary
+        self._index_stale = False
+
         # Multi-year support: data is now organized by tax year
         self.data = {
             "years": {},  # Dictionary of tax year data
@@ -138,6 +234,10 @@ class TaxData:
         # Initialize current year data
         self._initialize_year_data(2026)
 
+        # Dependency graph for incremental recalculation of totals
+        self._calc_graph = self._build_calculation_graph()
+        self._calc_graph_source = None
+
     def _initialize_year_data(self, tax_year: int):
         """
         Initialize data structure for a specific tax year.
@@ -146,7 +246,7 @@ class TaxData:
             tax_year: The tax year to initialize
         """
         if tax_year not in self.data["years"]:
-            self.data["years"][tax_year] = {
+            self.data["years"][tax_year] = year_data = {
                 # Personal Information
                 "personal_info": {
                     "first_name": "",
@@ -294,6 +394,7 @@ class TaxData:
                     "version": "2.0",
                 }
             }
+            self._record_change({"op": "year", "year": tax_year, "value": year_data})
     
     def get(self, path: str, default=None, tax_year: Optional[int] = None) -> Any:
         """
@@ -332,6 +433,19 @@ class TaxData:
             value: Value to set
             tax_year: Specific tax year to set data for (uses current year if None)
         """
+        self._set_value(path, value, tax_year)
+
+    def _set_value(self, path: str, value: Any, tax_year: Optional[int] = None,
+                   row_change: Optional[tuple] = None):
+        """
+        Validate and store a value, then invalidate dependent calculations.
+
+        Args:
+            path: Dot-notation path to set
+            value: Value to set
+            tax_year: Specific tax year to set data for (uses current year if None)
+            row_change: Optional (index, action) when only one row of a list changed
+        """
         if tax_year is None:
             tax_year = self.get_current_year()
 
@@ -376,6 +490,23 @@ class TaxData:
         self.data["years"][tax_year]["metadata"]["last_modified"] = datetime.now().isoformat()
         self.data["metadata"]["last_modified"] = datetime.now().isoformat()
 
+        if row_change is not None and row_change[1] != 'remove':
+            index, action = row_change
+            self._record_change({"op": "list", "year": tax_year, "path": path, "action": action,
+                                 "index": index, "item": value[index]})
+        elif row_change is not None:
+            self._record_change({"op": "list", "year": tax_year, "path": path, "action": "remove",
+                                 "index": row_change[0]})
+        else:
+            self._record_change({"op": "set", "year": tax_year, "path": path, "value": value})
+
+        # Mark only the calculations that read this path as dirty
+        if tax_year == self.get_current_year():
+            if row_change is not None:
+                self._calc_graph.invalidate_row(path, *row_change)
+            else:
+                self._calc_graph.invalidate_path(path)
+
         logger.info(f"Data modified - Field: {path}, Year: {tax_year}")
 
         # Publish event for data change
@@ -396,6 +527,7 @@ class TaxData:
 
         old_year = self.get_current_year()
         self.data["metadata"]["current_year"] = tax_year
+        self._record_change({"op": "metadata", "key": "current_year", "value": tax_year})
 
         # Initialize data for the new year if it doesn't exist
         self._initialize_year_data(tax_year)
@@ -450,6 +582,7 @@ class TaxData:
 
         # Clear year-specific calculated fields
         self._clear_calculated_fields(tax_year)
+        self._record_change({"op": "year", "year": tax_year, "value": self.data["years"][tax_year]})
 
         logger.info(f"Created new tax year {tax_year} based on {base_year}")
         return True
@@ -487,6 +620,7 @@ class TaxData:
             return False
 
         del self.data["years"][tax_year]
+        self._record_change({"op": "year", "year": tax_year, "value": None})
         logger.info(f"Deleted tax year {tax_year}")
         return True
 
@@ -505,6 +639,9 @@ class TaxData:
         self.data["years"][to_year]["dependents"] = copy.deepcopy(
             self.data["years"][from_year]["dependents"]
         )
+        for section in ("personal_info", "spouse_info", "dependents"):
+            self._record_change({"op": "section", "year": to_year, "section": section,
+                                 "value": self.data["years"][to_year][section]})
 
         logger.info(f"Copied personal info from {from_year} to {to_year}")
 
@@ -525,28 +662,33 @@ class TaxData:
         self.data["years"][tax_year][section] = data
         self.data["years"][tax_year]["metadata"]["last_modified"] = datetime.now().isoformat()
         self.data["metadata"]["last_modified"] = datetime.now().isoformat()
+        self._record_change({"op": "section", "year": tax_year, "section": section, "value": data})
+        if tax_year == self.get_current_year():
+            self._calc_graph.invalidate_path(section)
     
     def add_to_list(self, path: str, item: Any):
         """Add item to a list in the data structure"""
         current_list = self.get(path, [])
         if not isinstance(current_list, list):
             current_list = []
+            self._set_value(path, current_list + [item])
+            return
         current_list.append(item)
-        self.set(path, current_list)
+        self._set_value(path, current_list, row_change=(len(current_list) - 1, 'append'))
     
     def remove_from_list(self, path: str, index: int):
         """Remove item from list by index"""
         current_list = self.get(path, [])
         if isinstance(current_list, list) and 0 <= index < len(current_list):
             current_list.pop(index)
-            self.set(path, current_list)
+            self._set_value(path, current_list, row_change=(index, 'remove'))
     
     def update_in_list(self, path: str, index: int, new_item: Any):
         """Update item in list by index"""
         current_list = self.get(path, [])
         if isinstance(current_list, list) and 0 <= index < len(current_list):
             current_list[index] = new_item
-            self.set(path, current_list)
+            self._set_value(path, current_list, row_change=(index, 'update'))
     
     def get_required_forms(self) -> List[str]:
         """Determine which forms are required based on entered data"""
@@ -621,186 +763,243 @@ class TaxData:
         return sorted(forms)
     
     def calculate_totals(self) -> Dict[str, float]:
-        """Calculate key totals for the tax return using focused helper methods"""
-        income = self.get_section("income")
-        
+        """
+        Calculate key totals for the tax return.
+
+        Totals are evaluated through a dependency graph, so after a set() only
+        the calculations downstream of the changed path are recomputed. Graph
+        values are integer cents, returned here as dollars. When
+        nothing has been evaluated yet (a freshly loaded return, a year switch)
+        totals are looked up in the shared result cache by content first.
+        """
+        graph = self._calc_graph
+        year_data = self.data["years"].get(self.get_current_year())
+        source = (year_data, self.data.get("metadata", {}).get("tax_year"))
+        if self._calc_graph_source is None or self._calc_graph_source[0] is not year_data \
+                or self._calc_graph_source[1] != source[1]:
+            graph.invalidate_all()
+            self._calc_graph_source = source
+
+        if graph.is_cold:
+            key = ("TaxData.calculate_totals", self.get_current_year(), source[1],
+                   content_hash(calculation_inputs(year_data)))
+            return get_result_cache().get_or_compute(key, lambda: self._evaluate_totals(year_data))
+        return self._evaluate_totals(year_data)
+
+    def _evaluate_totals(self, year_data: Optional[Dict[str, Any]]) -> Dict[str, float]:
+        """Evaluate totals through the calculation graph"""
+        graph = self._calc_graph
+        totals = dict(graph.evaluate("result", self, year_data or {}))
+        totals.update(graph.evaluate("credits", self, year_data or {}))
+        return totals
+
+    def invalidate_calculations(self):
+        """
+        Discard all cached calculations.
+
+        Call after modifying ``self.data`` directly instead of through set().
+        """
+        self._calc_graph.invalidate_all()
+
+    def _build_calculation_graph(self) -> CalculationGraph:
+        """
+        Build the dependency graph behind calculate_totals().
+
+        Line items feed total_income -> AGI -> taxable income -> tax -> refund;
+        credits depend on AGI and payments on W-2 withholding. Every node
+        holds integer cents, so incremental updates add and subtract exactly.
+        """
+        graph = CalculationGraph()
+
+        for name, path, row_value in INCOME_LINE_ITEMS:
+            graph.add_list_node(name, path, lambda row, row_value=row_value: to_cents(row_value(row)))
+        graph.add_node(
+            "unemployment",
+            lambda td, v: to_cents(td._calculate_unemployment_income(td.get("income.unemployment", 0))),
+            paths=("income.unemployment",)
+        )
+        graph.add_node(
+            "other_income",
+            lambda td, v: sum_cents(other.get("amount", 0) for other in td.get("income.other_income", [])),
+            paths=("income.other_income",)
+        )
+
+        income_nodes = [name for name, _, _ in INCOME_LINE_ITEMS] + ["unemployment", "other_income"]
+        graph.add_node("total_income", lambda td, v: td._sum_income_lines(v), depends_on=income_nodes)
+        graph.add_node(
+            "adjusted_gross_income",
+            lambda td, v: td._agi_cents(v["total_income"]),
+            depends_on=("total_income",), paths=("adjustments",)
+        )
+        graph.add_node(
+            "taxable_income",
+            lambda td, v: td._taxable_income_cents(v["adjusted_gross_income"]),
+            depends_on=("adjusted_gross_income",), paths=("deductions", "filing_status.status")
+        )
+        graph.add_node(
+            "income_tax",
+            lambda td, v: income_tax_cents(
+                v["taxable_income"], td.get("filing_status.status"),
+                td.data.get("metadata", {}).get("tax_year", 2025)
+            ),
+            depends_on=("taxable_income",), paths=("filing_status.status",)
+        )
+        graph.add_node(
+            "self_employment_tax",
+            lambda td, v: self_employment_tax_cents(v["business_income"]),
+            depends_on=("business_income",)
+        )
+        graph.add_node(
+            "credits",
+            lambda td, v: td.calculate_credits(to_dollars(v["adjusted_gross_income"])),
+            depends_on=("adjusted_gross_income", "wages"),
+            paths=("dependents", "filing_status.status", "credits")
+        )
+
+        graph.add_list_node(
+            "w2_withholding", "income.w2_forms", lambda w2: to_cents(w2.get("federal_withholding", 0))
+        )
+        graph.add_node(
+            "total_payments",
+            lambda td, v: td._payments_cents(v["w2_withholding"], td.get_section("payments")),
+            depends_on=("w2_withholding",), paths=("payments",)
+        )
+
+        graph.add_node(
+            "result",
+            lambda td, v: td._summarize_totals(v),
+            depends_on=("total_income", "adjusted_gross_income", "taxable_income",
+                        "income_tax", "self_employment_tax", "credits", "total_payments")
+        )
+        return graph
+
+    @staticmethod
+    def _summarize_totals(values: Dict[str, Any]) -> Dict[str, float]:
+        """Combine graph node values (cents) into the calculate_totals() result (dollars)"""
         totals = {
-            "total_income": self._calculate_total_income(income),
-            "adjusted_gross_income": 0,
-            "taxable_income": 0,
-            "total_tax": 0,
-            "total_payments": 0,
+            "total_income": values["total_income"],
+            "adjusted_gross_income": values["adjusted_gross_income"],
+            "taxable_income": values["taxable_income"],
+            "total_tax": values["income_tax"] + values["self_employment_tax"],
+            "total_payments": values["total_payments"],
             "refund_or_owe": 0,
         }
-        
-        # Calculate AGI
-        totals["adjusted_gross_income"] = self._calculate_agi(totals["total_income"])
-        
-        # Calculate taxable income
-        totals["taxable_income"] = self._calculate_taxable_income(totals["adjusted_gross_income"])
-        
-        # Calculate total tax
-        tax_year = self.data.get("metadata", {}).get("tax_year", 2025)
-        filing_status = self.get("filing_status.status")
-        totals["total_tax"] = self._calculate_total_tax(
-            totals["taxable_income"],
-            filing_status,
-            tax_year,
-            income
-        )
-        
+
         # Subtract credits
-        credits = self.calculate_credits(totals["adjusted_gross_income"])
-        totals["total_tax"] = max(0, totals["total_tax"] - credits["total_credits"])
-        
-        # Add individual credits to result
-        totals.update(credits)
-        
-        # Calculate payments and final result
-        payments = self.get_section("payments")
-        totals["total_payments"] = self._calculate_total_payments(payments)
+        totals["total_tax"] = max(0, totals["total_tax"] - to_cents(values["credits"]["total_credits"]))
+
         totals["amount_owed"] = max(0, totals["total_tax"] - totals["total_payments"])
         totals["refund"] = max(0, totals["total_payments"] - totals["total_tax"])
         totals["refund_or_owe"] = totals["refund"] - totals["amount_owed"]
-        
-        return totals
+        return {name: to_dollars(amount) for name, amount in totals.items()}
+
+    @staticmethod
+    def _sum_income_lines(values: Dict[str, Any]) -> float:
+        """Add line item subtotals (cents) in a fixed order"""
+        total = 0
+        for name, _, _ in INCOME_LINE_ITEMS:
+            total += values[name]
+        total += values["unemployment"]
+        total += values["other_income"]
+        return total
     
     def _calculate_total_income(self, income: Dict[str, Any]) -> float:
         """Calculate total income from all sources"""
-        total = 0
-        
-        # W-2 wages
-        w2_forms = income.get("w2_forms", [])
-        total += W2Calculator.calculate_total_wages(w2_forms)
-        
-        # Interest and dividend income
-        total += sum(item.get("amount", 0) for item in income.get("interest_income", []))
-        total += sum(item.get("amount", 0) for item in income.get("dividend_income", []))
-        
-        # Self-employment income
-        total += sum(item.get("net_profit", 0) for item in income.get("self_employment", []))
-        
-        # Retirement distributions
-        total += sum(item.get("amount", 0) for item in income.get("retirement_distributions", []))
-        
-        # Social Security benefits
-        total += sum(item.get("amount", 0) for item in income.get("social_security", []))
-        
-        # Capital gains/losses (only gains are taxable)
-        for item in income.get("capital_gains", []):
-            gain = item.get("gain_loss", 0)
-            if gain > 0:  # Only add positive gains
-                total += gain
-        
-        # Rental income
-        total += sum(item.get("amount", 0) for item in income.get("rental_income", []))
-        
-        # Business income (legacy - may be deprecated in favor of self-employment)
-        total += sum(business.get("net_profit", 0) for business in income.get("business_income", []))
+        values = {}
+        for name, path, row_value in INCOME_LINE_ITEMS:
+            items = income.get(path.split(".", 1)[1], [])
+            values[name] = sum_cents(row_value(item) for item in items)
         
         # Unemployment income
-        total += self._calculate_unemployment_income(income.get("unemployment", 0))
+        values["unemployment"] = to_cents(self._calculate_unemployment_income(income.get("unemployment", 0)))
         
         # Other income
-        total += sum(other.get("amount", 0) for other in income.get("other_income", []))
+        values["other_income"] = sum_cents(other.get("amount", 0) for other in income.get("other_income", []))
         
-        return total
+        return to_dollars(self._sum_income_lines(values))
     
     def _calculate_unemployment_income(self, unemployment: Union[int, float, List]) -> float:
         """Calculate unemployment income (handles both old and new formats)"""
         if isinstance(unemployment, (int, float)):
             return unemployment
         elif isinstance(unemployment, list):
-            return sum(
+            return to_dollars(sum_cents(
                 unemp.get("amount", 0) if isinstance(unemp, dict) else unemp
                 for unemp in unemployment
-            )
+            ))
         return 0
     
     def _calculate_agi(self, total_income: float) -> float:
         """Calculate Adjusted Gross Income"""
+        return to_dollars(self._agi_cents(to_cents(total_income)))
+    
+    def _agi_cents(self, total_income: int) -> int:
+        """Adjusted Gross Income in cents from total income in cents"""
         adjustments = self.get_section("adjustments")
         adjustment_keys = (
             "educator_expenses", "hsa_deduction", "self_employment_tax",
             "self_employed_sep", "self_employed_health", "student_loan_interest", "ira_deduction"
         )
-        total_adjustments = sum(adjustments.get(key, 0) for key in adjustment_keys)
+        total_adjustments = sum_cents([adjustments.get(key, 0) for key in adjustment_keys])
         return total_income - total_adjustments
     
     def _calculate_taxable_income(self, agi: float) -> float:
         """Calculate taxable income after deductions"""
+        return to_dollars(self._taxable_income_cents(to_cents(agi)))
+    
+    def _taxable_income_cents(self, agi: int) -> int:
+        """Taxable income in cents from AGI in cents"""
         deductions = self.get_section("deductions")
         filing_status = self.get("filing_status.status")
         tax_year = self.data.get("metadata", {}).get("tax_year", 2025)
         
         if deductions.get("method") == "standard":
-            deduction_amount = calculate_standard_deduction(filing_status, tax_year)
+            deduction_amount = to_cents(calculate_standard_deduction(filing_status, tax_year))
         else:
             # Itemized deductions
             itemized_keys = ("medical_expenses", "state_local_taxes", "mortgage_interest", "charitable_contributions")
-            deduction_amount = sum(deductions.get(key, 0) for key in itemized_keys)
+            deduction_amount = sum_cents([deductions.get(key, 0) for key in itemized_keys])
         
         return max(0, agi - deduction_amount)
     
-    def _calculate_total_tax(self, taxable_income: float, filing_status: str, tax_year: int, income: Dict[str, Any]) -> float:
-        """Calculate total tax including income tax and self-employment tax"""
-        # Regular income tax
-        income_tax = calculate_income_tax(taxable_income, filing_status, tax_year)
-        
-        # Self-employment tax (if applicable)
-        business_income = income.get("business_income", [])
-        se_tax = 0
-        if business_income:
-            # Sum all business income
-            total_se_income = sum(biz.get("net_profit", 0) for biz in business_income) if isinstance(business_income, list) else business_income
-            if total_se_income > 0:
-                se_tax = calculate_self_employment_tax(total_se_income)
-        
-        return income_tax + se_tax
-    
     def _calculate_total_payments(self, payments: Dict[str, Any]) -> float:
         """Calculate total payments from all sources"""
-        total = 0
-        
         # Federal withholding from W-2s
         w2_forms = self.get("income.w2_forms", [])
-        total += sum(w2.get("federal_withholding", 0) for w2 in w2_forms)
+        withholding = sum_cents(w2.get("federal_withholding", 0) for w2 in w2_forms)
+        return to_dollars(self._payments_cents(withholding, payments))
+    
+    @staticmethod
+    def _payments_cents(withholding: int, payments: Dict[str, Any]) -> int:
+        """Add W-2 withholding (cents) to the payments section, in cents"""
+        total = 0
+        total += withholding
         
         # Estimated payments
         estimated = payments.get("estimated_payments", [])
         if isinstance(estimated, list):
-            total += sum(payment.get("amount", 0) for payment in estimated)
+            total += sum_cents(payment.get("amount", 0) for payment in estimated)
         else:
-            total += estimated
+            total += to_cents(estimated)
         
         # Other payments
-        total += payments.get("prior_year_overpayment", 0)
-        total += payments.get("eic_payments", 0)
+        total += to_cents(payments.get("prior_year_overpayment", 0))
+        total += to_cents(payments.get("eic_payments", 0))
         
         return total
     
-    @invalidate_cache_on_change
-    def calculate_credits(self, agi: float) -> Dict[str, float]:
-        """
-        Calculate all tax credits (cached for performance)
+    @staticmethod
+    def classify_dependents(dependents: List[Dict], current_year: int) -> tuple:
         """
-        credits = {
-            "child_tax_credit": 0,
-            "earned_income_credit": 0,
-            "education_credits": 0,
-            "retirement_savings_credit": 0,
-            "child_dependent_care_credit": 0,
-            "residential_energy_credit": 0,
-            "premium_tax_credit": 0,
-            "other_credits": 0,
-            "total_credits": 0
-        }
+        Split dependents into Child Tax Credit qualifying children and other dependents.
         
-        # Performance: Direct access to nested data
-        filing_status = self.get("filing_status.status", "Single")
-        
-        # Child Tax Credit - automatically determine from dependents
-        dependents = self.get("dependents", [])
+        Args:
+            dependents: List of dependent dictionaries
+            current_year: Tax year used to compute each dependent's age
+            
+        Returns:
+            Tuple of (qualifying_children, other_dependents) lists
+        """
         qualifying_children = []
         other_dependents = []
         
@@ -814,7 +1013,6 @@ class TaxData:
                 try:
                     # Parse birth date and check age (simplified)
                     birth_year = int(birth_date.split("/")[-1]) if "/" in birth_date else 2000
-                    current_year = self.get_current_year()
                     age = current_year - birth_year
                     if age < 17:
                         qualifying_children.append(dependent)
@@ -825,6 +1023,33 @@ class TaxData:
             else:
                 other_dependents.append(dependent)
         
+        return qualifying_children, other_dependents
+    
+    @invalidate_cache_on_change(_credit_inputs)
+    def calculate_credits(self, agi: float) -> Dict[str, float]:
+        """
+        Calculate all tax credits (cached for performance)
+        """
+        credits = {
+            "child_tax_credit": 0,
+            "earned_income_credit": 0,
+            "education_credits": 0,
+            "retirement_savings_credit": 0,
+            "child_dependent_care_credit": 0,
+            "residential_energy_credit": 0,
+            "premium_tax_credit": 0,
+            "other_credits": 0,
+            "total_credits": 0
+        }
+        
+        # Performance: Direct access to nested data
+        filing_status = self.get("filing_status.status", "Single")
+        
+        # Child Tax Credit - automatically determine from dependents
+        qualifying_children, other_dependents = self.classify_dependents(
+            self.get("dependents", []), self.get_current_year()
+        )
+        
         if qualifying_children or other_dependents:
             credits["child_tax_credit"] = calculate_child_tax_credit(
                 len(qualifying_children),
@@ -872,7 +1097,7 @@ class TaxData:
             credits["premium_tax_credit"] = calculate_premium_tax_credit(premium_amount)
         
         # Sum all credits
-        credits["total_credits"] = sum([
+        credits["total_credits"] = to_dollars(sum_cents([
             credits["child_tax_credit"],
             credits["earned_income_credit"],
             credits["education_credits"],
@@ -881,7 +1106,7 @@ class TaxData:
             credits["residential_energy_credit"],
             credits["premium_tax_credit"],
             credits["other_credits"]
-        ])
+        ]))
         
         return credits
     
@@ -893,10 +1118,7 @@ class TaxData:
     
     def update_w2_form(self, index: int, w2_data: Dict):
         """Update an existing W-2 form"""
-        w2_forms = self.get("income.w2_forms", [])
-        if 0 <= index < len(w2_forms):
-            w2_forms[index] = w2_data
-            self.set("income.w2_forms", w2_forms)
+        self.update_in_list("income.w2_forms", index, w2_data)
     
     def delete_w2_form(self, index: int):
         """Delete a W-2 form"""
@@ -929,7 +1151,7 @@ class TaxData:
         """Get key for HMAC integrity verification"""
         # Derive separate key from encryption key for HMAC
         key_material = self.config.key_file.read_bytes() if self.config.key_file.exists() else b'default_key'
-        return hashlib.sha256(key_material + b'_integrity').digest()
+        return legacy_integrity_key(key_material)
     
     def _validate_path(self, filename: str) -> Path:
         """Validate file path to prevent directory traversal"""
@@ -955,31 +1177,17 @@ class TaxData:
             
             # Validate and resolve path
             file_path = self._validate_path(filename)
+            if self._base_rewritten():
+                self._reopen_base()
             
-            # Serialize data to JSON
-            json_data = json.dumps(self.data, indent=2, sort_keys=True)
-            
-            # Calculate HMAC for integrity verification
-            integrity_key = self._get_integrity_key()
-            mac = hmac.new(integrity_key, json_data.encode(), hashlib.sha256).hexdigest()
-            
-            # Create data package with MAC
-            data_package = {
-                'data': self.data,
-                'mac': mac,
-                'version': '2.0'  # Encrypted version
-            }
-            
-            # Encrypt entire package
-            package_json = json.dumps(data_package)
-            encrypted_data = self.encryption.encrypt(package_json)
-            
-            # Write encrypted data
-            with open(file_path, 'wb') as f:
-                f.write(encrypted_data)
+            # Each year is its own encrypted segment; years that weren't
+            # loaded or changed are copied from the previous file as they are
+            self._write_segmented(file_path)
             
-            # Set restrictive file permissions (owner read/write only)
-            os.chmod(file_path, stat.S_IRUSR | stat.S_IWUSR)  # 0o600
+            # The new base holds every journaled change, so start a new journal
+            self._attach_journal(file_path, self.encryption.get_container_key())
+            self._journal.discard()
+            self._update_return_index(file_path)
             
             logger.info(f"Saved encrypted tax return: {file_path.name}")
             return str(file_path)
@@ -1002,10 +1210,21 @@ class TaxData:
             file_path = self._resolve_file_path(filename)
             
             with open(file_path, 'rb') as f:
-                file_data = f.read()
+                prefix = f.peek(len(CONTAINER_MAGIC))
+                segmented = is_segmented(prefix)
+                if segmented:
+                    self.data, file_key = self._load_segmented(f, file_path)
+                elif is_container(prefix):
+                    self.data = self._load_container(f, file_path.name)
+                else:
+                    # Try loading in order: encrypted with MAC, encrypted without MAC, plaintext
+                    self.data = self._load_file_data(f.read(), file_path.name)
             
-            # Try loading in order: encrypted with MAC, encrypted without MAC, plaintext
-            self.data = self._load_file_data(file_data, file_path.name)
+            # Older formats can't be journaled against; the first autosave rewrites them
+            self._detach_journal()
+            if segmented:
+                self._attach_journal(file_path, file_key)
+                self._replay_journal()
             self.data["metadata"]["last_modified"] = datetime.now().isoformat()
             
         except Exception as e:
@@ -1018,6 +1237,215 @@ class TaxData:
             )
             raise
     
+    def _write_segmented(self, file_path: Path) -> None:
+        """Write the return as a segmented container, replacing the file atomically"""
+        master_key = self.encryption.get_container_key()
+        years = self.data["years"]
+        shared = {key: value for key, value in self.data.items() if key != "years"}
+        temp_path = file_path.with_name(f".{file_path.name}.tmp")
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        fd = os.open(temp_path, flags, stat.S_IRUSR | stat.S_IWUSR)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                base, refs = write_segmented(f, master_key, shared, years)
+                f.flush()
+                os.fsync(f.fileno())
+            # Owner read/write only, even if a stale temp file had other permissions
+            os.chmod(temp_path, stat.S_IRUSR | stat.S_IWUSR)
+            os.replace(temp_path, file_path)
+            fsync_directory(file_path.parent)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        # Later saves copy unchanged years from the file just written
+        if not isinstance(years, LazySegments):
+            years = self.data["years"] = LazySegments(years)
+        years.attach(file_path, master_key, base, refs)
+    
+    def autosave(self, filename: Optional[str] = None) -> str:
+        """
+        Save the changes made since the last save or autosave.
+
+        Changes are appended to the save journal next to the file, so the
+        cost follows the size of the changes, not of the return. A full
+        save_to_file() is written instead, folding the journal into a new
+        base file, when there is no base file yet, when saving to another
+        file, or once the journal reaches config.journal_compact_size.
+
+        Changes made directly to ``self.data`` rather than through set(),
+        the list helpers or the year methods are only saved by a full save.
+
+        The return index is updated only when a journaled change touched a
+        section its summary is built from (INDEXED_SECTIONS); edits such as
+        personal details leave it until the next full save.
+
+        Args:
+            filename: File to save to (defaults to the file last saved or loaded)
+
+        Returns:
+            Path of the saved file
+        """
+        file_path = self._validate_path(filename) if filename is not None else self._base_path
+        if file_path is not None and file_path == self._base_path and self._base_rewritten():
+            self._reopen_base()
+        if (file_path is None or file_path != self._base_path or not file_path.exists()
+                or self._journal.size >= self.config.journal_compact_size):
+            return self.save_to_file(filename if file_path is None else str(file_path))
+
+        self._journal.append(self._base_digest, self._journal_pending)
+        self._journal_pending.clear()
+        if self._index_stale:
+            self._update_return_index(file_path)
+        return str(file_path)
+    
+    def return_summary(self, file_path: Path) -> ReturnSummary:
+        """
+        Summarize the current year for the return index.
+
+        Args:
+            file_path: File the return is saved in
+
+        Returns:
+            Indexed metadata of the current year
+        """
+        year_metadata = self.get("metadata", {})
+        return ReturnSummary(
+            path=str(file_path),
+            tax_year=self.get_current_year(),
+            client_id=self.data["metadata"].get("client_id") or client_id_for_path(file_path),
+            return_type=year_metadata.get("return_type", "original"),
+            filing_status=self.get("filing_status.status", ""),
+            agi_band=agi_band(self.calculate_totals()["adjusted_gross_income"]),
+            status=year_metadata.get("status", "draft"),
+            last_modified=self.data["metadata"]["last_modified"],
+            required_forms=self.get_required_forms(),
+            filed_date=year_metadata.get("filed_date", ""),
+        )
+    
+    def _update_return_index(self, file_path: Path) -> None:
+        """Record the saved return in the index; the save stands even if this fails"""
+        if self.return_index is None:
+            return
+        try:
+            self.return_index.record(self.return_summary(file_path), years=self.data["years"].keys())
+            self._index_stale = False
+        except Exception as e:
+            logger.warning(f"Could not update return index for {file_path.name}: {e}")
+    
+    def _record_change(self, change: Dict[str, Any]) -> None:
+        """Queue a change for the next autosave() to journal"""
+        # Without a base file the next autosave is a full save anyway
+        if self._base_path is not None:
+            self._journal_pending.append(encode_record(change))
+            if not self._index_stale:
+                self._index_stale = self._changes_index(change)
+
+    def _changes_index(self, change: Dict[str, Any]) -> bool:
+        """Whether a change can alter the current year's return index summary"""
+        op = change["op"]
+        if op in ("year", "metadata"):
+            return True
+        if change["year"] != self.get_current_year():
+            return False
+        section = change["section"] if op == "section" else change["path"].split('.', 1)[0]
+        return section in INDEXED_SECTIONS
+    
+    def _attach_journal(self, file_path: Path, master_key: bytes) -> None:
+        """Journal later changes against a segmented file just saved or loaded, under its key"""
+        self._base_path = file_path
+        self._base_state = file_state(file_path)
+        self._base_digest = index_digest(file_path)
+        self._journal = SaveJournal(file_path, master_key)
+        self._journal_pending = []
+        years = self.data["years"]
+        if isinstance(years, LazySegments):
+            years.reopen = self._reopen_base
+    
+    def _base_rewritten(self) -> bool:
+        """Whether another session or a key rotation replaced the base file"""
+        if self._base_path is None:
+            return False
+        state = file_state(self._base_path)
+        return state is not None and state != self._base_state
+    
+    def _reopen_base(self) -> None:
+        """
+        Follow a base file rewritten since it was saved or loaded.
+
+        A key rotation re-encrypts the file (folding in the journal) under
+        a new key. Years not loaded yet are read from the new file, and
+        changes not autosaved yet stay queued for the new journal.
+        """
+        file_path = self._base_path
+        with open(file_path, 'rb') as f:
+            (_, stored), master_key = self._read_with_any_key(
+                f, lambda f, key: read_segmented(f, key, file_path)
+            )
+        years = self.data["years"]
+        if isinstance(years, LazySegments):
+            years.follow(stored)
+        pending = self._journal_pending
+        self._attach_journal(file_path, master_key)
+        self._journal_pending = pending
+        logger.info(f"Reopened tax return rewritten since it was loaded: {file_path.name}")
+    
+    def _detach_journal(self) -> None:
+        """Stop journaling, until the next full save"""
+        self._base_path = None
+        self._base_digest = None
+        self._base_state = None
+        self._journal = None
+        self._journal_pending = []
+    
+    def _replay_journal(self) -> None:
+        """Apply the changes an earlier session journaled against the loaded file"""
+        changes = self._journal.open(self._base_digest)
+        if not changes:
+            return
+        for change in changes:
+            apply_change(self.data, change)
+        self.invalidate_calculations()
+        logger.info(f"Recovered {len(changes)} journaled changes: {self._journal.path.name}")
+    
+    def _load_segmented(self, fileobj, file_path: Path) -> Tuple[Dict[str, Any], bytes]:
+        """
+        Load the index of a segmented container; years are decrypted on first access.
+
+        Returns:
+            The data and the master key the file was written with
+        """
+        (shared, years), master_key = self._read_with_any_key(
+            fileobj, lambda f, key: read_segmented(f, key, file_path)
+        )
+        # The year the UI opens on is read now, so a damaged segment fails the load
+        years.get(shared["metadata"]["current_year"])
+        logger.info(f"Loaded encrypted tax return index ({len(years)} years): {file_path.name}")
+        return {"years": years, **shared}, master_key
+    
+    def _load_container(self, fileobj, filename: str) -> Dict[str, Any]:
+        """Load tax data from an encrypted container"""
+        payload, _ = self._read_with_any_key(fileobj, read_container)
+        data = json.loads(payload)
+        logger.info(f"Loaded encrypted tax return: {filename}")
+        return data
+    
+    def _read_with_any_key(self, fileobj, read: Callable[[Any, bytes], Any]) -> Tuple[Any, bytes]:
+        """
+        Read a container with the current key, or a retired one during a key rotation.
+
+        Returns:
+            What read() returned and the master key that authenticated
+        """
+        start = fileobj.tell()
+        keys = self.encryption.get_container_keys()
+        for master_key in keys[:-1]:
+            try:
+                return read(fileobj, master_key), master_key
+            except ContainerError:
+                fileobj.seek(start)
+        return read(fileobj, keys[-1]), keys[-1]
+    
     def _resolve_file_path(self, filename: str) -> Path:
         """Resolve and validate file path"""
         file_path = Path(filename)
@@ -1060,13 +1488,11 @@ class TaxData:
     
     def _verify_data_integrity(self, data_package: Dict[str, Any]):
         """Verify data integrity using HMAC"""
-        json_data = json.dumps(data_package['data'], indent=2, sort_keys=True)
-        integrity_key = self._get_integrity_key()
-        expected_mac = hmac.new(integrity_key, json_data.encode(), hashlib.sha256).hexdigest()
-        
-        if not hmac.compare_digest(expected_mac, data_package['mac']):
-            logger.error("Data integrity check failed")
-            raise ValueError("Data integrity verification failed - file may be corrupted or tampered")
+        # Files saved before a key rotation carry a MAC made with a retired key
+        integrity_keys = [self._get_integrity_key()] + [
+            legacy_integrity_key(old) for old in self.encryption.get_retired_keys()
+        ]
+        verify_legacy_package(data_package, integrity_keys)
     
     def _load_plaintext_fallback(self, file_data: bytes, filename: str, decrypt_error: Exception) -> Dict[str, Any]:
         """Try loading as plaintext JSON (legacy format)"""
@@ -1151,153 +1577,35 @@ class TaxData:
         Returns:
             List of dictionaries containing wash sale information
         """
-        wash_sales = []
-        capital_gains = self.get("income.capital_gains", [])
-        
-        for i, sale in enumerate(capital_gains):
-            if sale.get('gain_loss', 0) >= 0:  # Only check losses
-                continue
-                
-            sale_date = self._parse_date(sale.get('date_sold', ''))
-            if not sale_date:
-                continue
-                
-            description = sale.get('description', '').lower()
-            
-            # Check 30 days before and after sale
-            start_date = sale_date - timedelta(days=30)
-            end_date = sale_date + timedelta(days=30)
-            
-            for j, purchase in enumerate(capital_gains):
-                if i == j:  # Don't compare with itself
-                    continue
-                    
-                purchase_date = self._parse_date(purchase.get('date_acquired', ''))
-                if not purchase_date:
-                    continue
-                    
-                # Check if purchase is within 30-day window
-                if start_date <= purchase_date <= end_date:
-                    # Check if descriptions are similar (basic check)
-                    purchase_desc = purchase.get('description', '').lower()
-                    if self._are_similar_securities(description, purchase_desc):
-                        wash_sales.append({
-                            'sale_index': i,
-                            'purchase_index': j,
-                            'sale_description': sale.get('description'),
-                            'purchase_description': purchase.get('description'),
-                            'sale_date': sale.get('date_sold'),
-                            'purchase_date': purchase.get('date_acquired'),
-                            'loss_amount': abs(sale.get('gain_loss', 0)),
-                            'days_between': abs((purchase_date - sale_date).days)
-                        })
-        
-        return wash_sales
+        return list(self.iter_wash_sales())
+    
+    def iter_wash_sales(self) -> Iterator[Dict]:
+        """
+        Stream potential wash sales in capital gains transactions.
+        
+        Lots are indexed by security key and acquisition date, so large
+        brokerage imports are checked in O(n log n) rather than pairwise.
+        
+        Yields:
+            Dictionaries containing wash sale information
+        """
+        return iter_wash_sales(self.get("income.capital_gains", []))
     
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """Parse date string into datetime object"""
-        if not date_str:
-            return None
-        try:
-            # Try MM/DD/YYYY format
-            return datetime.strptime(date_str, '%m/%d/%Y')
-        except ValueError:
-            try:
-                # Try YYYY-MM-DD format
-                return datetime.strptime(date_str, '%Y-%m-%d')
-            except ValueError:
-                return None
+        return parse_date(date_str)
     
     def _are_similar_securities(self, desc1: str, desc2: str) -> bool:
         """
         Check if two security descriptions represent substantially identical securities.
         For wash sale purposes, securities are considered identical if they represent
         the same company and same type of security (common stock, preferred, etc.).
+
+        Uses the same security key as the indexed wash sale detector, so both
+        always agree.
         """
-        if not desc1 or not desc2:
-            return False
-            
-        # Normalize descriptions
-        desc1_norm = desc1.lower().strip()
-        desc2_norm = desc2.lower().strip()
-        
-        # Exact match
-        if desc1_norm == desc2_norm:
-            return True
-            
-        # Extract company name and security type
-        def extract_company_and_type(desc: str) -> tuple:
-            """Extract (company_name, security_type) from description"""
-            # Common security type indicators
-            security_types = ['common stock', 'preferred stock', 'bond', 'note', 'debenture']
-            
-            desc_lower = desc.lower()
-            
-            # Find security type
-            security_type = None
-            for st in security_types:
-                if st in desc_lower:
-                    security_type = st
-                    # Remove security type from description to get company name
-                    company_part = desc_lower.replace(st, '').strip()
-                    break
-            
-            if not security_type:
-                # If no security type found, assume it's common stock and use whole description as company
-                company_part = desc_lower
-                security_type = 'common stock'
-            
-            # Clean up company name - remove extra spaces, punctuation, and class designations
-            company_part = ' '.join(company_part.split())  # normalize spaces
-            company_part = company_part.replace(',', '').replace('.', '').strip()
-            
-            # Remove class designations (Class A, Class B, Series A, etc.) as they don't affect wash sale similarity
-            import re
-            company_part = re.sub(r'\bclass\s+[a-zA-Z0-9]+\b', '', company_part, flags=re.IGNORECASE)
-            company_part = re.sub(r'\bseries\s+[a-zA-Z0-9]+\b', '', company_part, flags=re.IGNORECASE)
-            company_part = ' '.join(company_part.split())  # normalize spaces again
-            
-            return company_part, security_type
-        
-        company1, type1 = extract_company_and_type(desc1_norm)
-        company2, type2 = extract_company_and_type(desc2_norm)
-        
-        # Must be same security type
-        if type1 != type2:
-            return False
-            
-        # Company names must be very similar (allowing for minor differences)
-        # For simplicity, check if one contains the other or they differ by only common variations
-        if company1 == company2:
-            return True
-            
-        # Check if one is substring of the other (handles abbreviations, etc.)
-        if company1 in company2 or company2 in company1:
-            return True
-            
-        # Handle common variations (Inc vs Inc., Corp vs Corporation, etc.)
-        variations = {
-            'inc': ['inc.', 'incorporated'],
-            'corp': ['corp.', 'corporation'],
-            'ltd': ['ltd.', 'limited'],
-            'co': ['co.', 'company']
-        }
-        
-        for base, variants in variations.items():
-            for variant in variants:
-                if base in company1 and variant in company2:
-                    # Replace variant with base and compare
-                    c1_normalized = company1.replace(base, '').replace(variant, '').strip()
-                    c2_normalized = company2.replace(base, '').replace(variant, '').strip()
-                    if c1_normalized == c2_normalized:
-                        return True
-                if variant in company1 and base in company2:
-                    c1_normalized = company1.replace(variant, '').replace(base, '').strip()
-                    c2_normalized = company2.replace(variant, '').replace(base, '').strip()
-                    if c1_normalized == c2_normalized:
-                        return True
-        
-        return False
+        key1 = security_key(desc1)
+        return key1 is not None and key1 == security_key(desc2)
     
     def is_amended_return(self, tax_year: Optional[int] = None) -> bool:
         """Check if the return for the given tax year is an amended return"""
@@ -1362,6 +1670,8 @@ class TaxData:
         
         # Set current year to the amended return
         self.data["metadata"]["current_year"] = original_tax_year  # Keep same year but mark as amended
+        self._record_change({"op": "year", "year": amended_key, "value": amended_data})
+        self._record_change({"op": "metadata", "key": "current_year", "value": original_tax_year})
         
         logger.info(f"Created amended return for tax year {original_tax_year}")
         
@@ -1403,3 +1713,47 @@ class TaxData:
         instance = cls()
         instance.load_from_file(filename)
         return instance
+
+
+def index_saved_returns(config: AppConfig, return_index: ReturnIndexService) -> int:
+    """
+    Add the returns saved before the return index existed to it, once.
+
+    Every tax year of each *.enc file under the safe directory that the
+    index doesn't list yet is recorded, with the file's modification time;
+    files that can't be loaded are skipped. Does nothing once the index is
+    marked backfilled.
+
+    Args:
+        config: Application configuration
+        return_index: Index to add the returns to
+
+    Returns:
+        Number of return files added
+    """
+    if return_index.backfilled:
+        return 0
+    safe_dir = Path(config.safe_dir).resolve()
+    backup_dir = safe_dir / "backups"
+    indexed = return_index.indexed_paths()
+    added = 0
+    for path in sorted(safe_dir.rglob("*.enc")):
+        # Skip temporary files of interrupted saves and backed-up copies
+        if path.name.startswith(".") or backup_dir in path.parents or str(path) in indexed:
+            continue
+        tax_data = TaxData(config)
+        try:
+            tax_data.load_from_file(str(path))
+        except Exception as e:
+            logger.warning(f"Not indexing {path.name}: {e}")
+            continue
+        tax_data.data["metadata"]["last_modified"] = datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+        years = list(tax_data.data["years"].keys())
+        for year in years:
+            if isinstance(year, int):
+                tax_data.data["metadata"]["current_year"] = year
+                return_index.record(tax_data.return_summary(path), years=years)
+        added += 1
+    return_index.mark_backfilled()
+    logger.info(f"Indexed {added} previously saved returns")
+    return added
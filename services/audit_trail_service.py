@@ -24,11 +24,12 @@ from services.exceptions import (
     ServiceExecutionException
 )
 from services.error_logger import get_error_logger
+from utils.record_store import RecordStore
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class AuditEntry:
     """Single audit log entry"""
 
@@ -81,6 +82,25 @@ class AuditEntry:
         return cls(**data)
 
 
+# Column layout for AuditTrailService.audit_log
+AUDIT_ENTRY_COLUMNS = {
+    'timestamp': 'datetime',
+    'user_id': 'category',
+    'action': 'category',
+    'entity_type': 'category',
+    'entity_id': 'category',
+    'field_name': 'category',
+    'session_id': 'category',
+    'ip_address': 'category',
+    'user_agent': 'category',
+}
+
+
+def new_audit_log(entries=()) -> RecordStore:
+    """Create an empty (or pre-filled) columnar audit log"""
+    return RecordStore(AuditEntry, AUDIT_ENTRY_COLUMNS, entries)
+
+
 @dataclass
 class AuditSession:
     """Audit session information"""
@@ -116,7 +136,7 @@ class AuditTrailService:
         """
         self.config = config or AppConfig()
         self.current_session: Optional[AuditSession] = None
-        self.audit_log: List[AuditEntry] = []
+        self.audit_log: RecordStore = new_audit_log()
         self.event_bus = EventBus.get_instance()
 
         # Ensure audit directory exists
@@ -310,7 +330,7 @@ class AuditTrailService:
         Returns:
             List of matching audit entries
         """
-        filtered_entries = self.audit_log
+        filtered_entries = list(self.audit_log)
 
         if entity_type:
             filtered_entries = [e for e in filtered_entries if e.entity_type == entity_type]
@@ -509,12 +529,12 @@ class AuditTrailService:
                     logger.warning(f"Failed to load audit log from {filepath}: {e}")
                     continue
 
-            self.audit_log = loaded_entries
+            self.audit_log = new_audit_log(loaded_entries)
             logger.info(f"Loaded {len(self.audit_log)} audit entries from disk")
 
         except Exception as e:
             logger.error(f"Failed to load audit log: {e}")
-            self.audit_log = []
+            self.audit_log = new_audit_log()
 
     def cleanup_old_logs(self, days_to_keep: int = 90) -> int:
         """
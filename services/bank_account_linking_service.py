@@ -45,6 +45,7 @@ from services.exceptions import (
     ServiceExecutionException
 )
 from services.error_logger import get_error_logger
+from utils.record_store import RecordStore
 from enum import Enum
 import hashlib
 import secrets
@@ -111,7 +112,7 @@ class BankAccount:
             self.created_at = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class BankTransaction:
     """Represents a bank transaction"""
     transaction_id: str
@@ -128,6 +129,20 @@ class BankTransaction:
     confidence_score: float = 0.0
 
 
+# Column layout for stored account transactions
+BANK_TRANSACTION_COLUMNS = {
+    'account_id': 'category',
+    'date': 'datetime',
+    'amount': 'float',
+    'category': 'category',
+    'merchant_name': 'category',
+    'is_pending': 'bool',
+    'tax_relevant': 'bool',
+    'tax_category': 'category',
+    'confidence_score': 'float',
+}
+
+
 @dataclass
 class TaxCategorizationResult:
     """Result of tax categorization analysis"""
@@ -153,7 +168,7 @@ class BankAccountLinkingService:
             encryption_key: Optional encryption key for credential storage
         """
         self.accounts: Dict[str, BankAccount] = {}
-        self.transactions: Dict[str, List[BankTransaction]] = {}
+        self.transactions: Dict[str, RecordStore] = {}
         self.credentials: Dict[str, Dict[str, Any]] = {}
 
         # Initialize encryption
@@ -431,7 +446,7 @@ class BankAccountLinkingService:
             mock_transactions = self._generate_mock_transactions(account_id)
 
             # Store transactions
-            self.transactions[account_id] = mock_transactions
+            self.transactions[account_id] = RecordStore(BankTransaction, BANK_TRANSACTION_COLUMNS, mock_transactions)
 
             # Update account balance and last sync
             account.balance = sum(t.amount for t in mock_transactions if not t.is_pending)
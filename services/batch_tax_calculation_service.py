@@ -0,0 +1,543 @@
+"""
+Batch Tax Calculation Service - Vectorized calculations over many returns
+
+This service computes the same figures as TaxCalculationService and the
+credit helpers in utils.tax_calculations, but for a whole columnar batch of
+returns at once. Each stage (income, AGI, deductions, bracket tax, SE tax,
+credits, payments) is a single NumPy pass over the batch, and bracket lookup
+uses np.searchsorted on the precompiled TaxYearConfig bracket tables in cents.
+
+Amount columns are converted to int64 cents once (utils.money.cents_array)
+and every stage works on them. Results are identical to the scalar path:
+both read the same cumulative bracket tax from the configuration and apply
+rates with multiply_cents / multiply_cents_array, rounding half up to the
+cent. Result columns are float64 dollars, like TaxResult's floats.
+"""
+
+import logging
+from dataclasses import dataclass, fields
+from typing import Dict, Any, List, Sequence, Tuple
+
+import numpy as np
+
+from config.tax_year_config import get_tax_year_config, CentsBracketTable, TaxYearConfig
+from services.exceptions import InvalidInputException, ServiceExecutionException
+from services.error_logger import get_error_logger
+from services.tax_calculation_service import TaxCalculationService, TaxResult
+from utils.money import cents_array, divide_cents_array, multiply_cents_array, to_cents, to_dollars
+
+logger = logging.getLogger(__name__)
+
+
+# Canonical filing status codes used in columnar batches
+FILING_STATUS_CODES: Tuple[str, ...] = ('Single', 'MFJ', 'MFS', 'HOH', 'QW')
+
+_FILING_STATUS_ALIASES = {
+    'Married Filing Jointly': 'MFJ',
+    'Married Filing Separately': 'MFS',
+    'Head of Household': 'HOH',
+    'Qualifying Widow(er)': 'QW',
+}
+
+
+def encode_filing_status(statuses: Sequence[str]) -> np.ndarray:
+    """
+    Encode filing status names as integer codes into FILING_STATUS_CODES.
+
+    Long-form names are mapped to their short codes; unknown statuses fall
+    back to Single, matching the scalar bracket lookup.
+
+    Args:
+        statuses: Filing status names
+
+    Returns:
+        int8 array of filing status codes
+    """
+    index = {status: code for code, status in enumerate(FILING_STATUS_CODES)}
+    return np.fromiter(
+        (index.get(_FILING_STATUS_ALIASES.get(status, status), 0) for status in statuses),
+        dtype=np.int8,
+        count=len(statuses)
+    )
+
+
+@dataclass
+class ReturnBatch:
+    """
+    Columnar batch of tax returns.
+
+    Every field is a 1-D array with one entry per return. Amount columns are
+    float64 dollars (converted to int64 cents when calculated); filing_status
+    holds codes into FILING_STATUS_CODES.
+    """
+
+    filing_status: np.ndarray
+    wages: np.ndarray
+    taxable_interest: np.ndarray
+    ordinary_dividends: np.ndarray
+    business_income: np.ndarray
+    itemized_deductions: np.ndarray
+    use_itemized: np.ndarray
+    federal_withholding: np.ndarray
+    estimated_tax_payments: np.ndarray
+
+    # Credit inputs
+    qualifying_children: np.ndarray
+    other_dependents: np.ndarray
+    retirement_contributions: np.ndarray
+    child_care_expenses: np.ndarray
+    residential_energy: np.ndarray
+    premium_tax_credit: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.filing_status)
+
+    @classmethod
+    def from_columns(cls, filing_status: Any, wages: Any, **columns: Any) -> 'ReturnBatch':
+        """
+        Build a batch from array-like columns.
+
+        Args:
+            filing_status: Integer codes or filing status names
+            wages: W-2 wages per return
+            **columns: Any other ReturnBatch column; missing columns default to zero
+
+        Returns:
+            ReturnBatch with normalized dtypes
+
+        Raises:
+            InvalidInputException: If a column name is unknown or lengths differ
+        """
+        status = np.asarray(filing_status)
+        if status.dtype.kind in ('U', 'S', 'O'):
+            status = encode_filing_status(status.tolist())
+        size = len(status)
+
+        names = {f.name for f in fields(cls)}
+        unknown = set(columns) - names
+        if unknown:
+            raise InvalidInputException(
+                field_name="columns",
+                details={"unknown_columns": sorted(unknown)}
+            )
+
+        values: Dict[str, np.ndarray] = {
+            'filing_status': status.astype(np.int8),
+            'wages': np.asarray(wages, dtype=np.float64),
+        }
+        for name in names - set(values):
+            column = columns.get(name)
+            if column is None:
+                column = np.zeros(size)
+            values[name] = np.asarray(
+                column, dtype=np.bool_ if name == 'use_itemized' else np.float64
+            )
+
+        for name, column in values.items():
+            if column.shape != (size,):
+                raise InvalidInputException(
+                    field_name=name,
+                    details={"expected_length": size, "actual_shape": column.shape}
+                )
+
+        return cls(**values)
+
+    @classmethod
+    def from_returns(cls, returns: Sequence[Any], tax_year: int = 2025) -> 'ReturnBatch':
+        """
+        Build a batch from TaxData objects or return dictionaries.
+
+        Column values are extracted with the same helpers that
+        TaxCalculationService uses, so the batch sees exactly what the scalar
+        path would see.
+
+        Args:
+            returns: TaxData objects or dictionaries (flat or multi-year)
+            tax_year: Tax year used to classify dependents
+
+        Returns:
+            ReturnBatch with one row per return
+        """
+        from models.tax_data import TaxData
+
+        scalar = TaxCalculationService(tax_year)
+        rows: Dict[str, List[Any]] = {f.name: [] for f in fields(cls)}
+
+        for tax_data in returns:
+            get_value = scalar._get_value_accessor(tax_data)
+            qualifying, other = TaxData.classify_dependents(get_value('dependents', []) or [], tax_year)
+
+            rows['filing_status'].append(get_value('filing_status.status', 'Single'))
+            rows['wages'].append(scalar._calculate_total_wages(get_value))
+            rows['taxable_interest'].append(scalar._calculate_taxable_interest(get_value))
+            rows['ordinary_dividends'].append(scalar._calculate_ordinary_dividends(get_value))
+            rows['business_income'].append(scalar._calculate_business_income(get_value))
+            rows['itemized_deductions'].append(scalar._calculate_itemized_deductions(get_value))
+            rows['use_itemized'].append(get_value('deductions.method', 'standard') == 'itemized')
+            rows['federal_withholding'].append(scalar._calculate_total_withholding(get_value))
+            rows['estimated_tax_payments'].append(get_value('payments.estimated_tax', 0))
+            rows['qualifying_children'].append(len(qualifying))
+            rows['other_dependents'].append(len(other))
+            rows['retirement_contributions'].append(get_value('credits.retirement_savings_credit', 0))
+            rows['child_care_expenses'].append(get_value('credits.child_dependent_care.expenses', 0))
+            rows['residential_energy'].append(get_value('credits.residential_energy.amount', 0))
+            rows['premium_tax_credit'].append(get_value('credits.premium_tax_credit.amount', 0))
+
+        filing_status = rows.pop('filing_status')
+        wages = rows.pop('wages')
+        return cls.from_columns(encode_filing_status(filing_status), wages, **rows)
+
+
+@dataclass
+class BatchTaxResult:
+    """
+    Columnar result table for a batch calculation.
+
+    Holds one array per TaxResult field plus the individual credits. As in
+    TaxResult, refund_amount and amount_owed are computed from total_tax;
+    tax_after_credits applies total_credits the way TaxData.calculate_totals does.
+    """
+
+    total_wages: np.ndarray
+    taxable_interest: np.ndarray
+    ordinary_dividends: np.ndarray
+    business_income: np.ndarray
+    total_income: np.ndarray
+    standard_deduction: np.ndarray
+    itemized_deduction: np.ndarray
+    deduction_used: np.ndarray
+    adjusted_gross_income: np.ndarray
+    taxable_income: np.ndarray
+    income_tax: np.ndarray
+    self_employment_tax: np.ndarray
+    total_tax: np.ndarray
+    federal_withholding: np.ndarray
+    estimated_tax_payments: np.ndarray
+    total_payments: np.ndarray
+    refund_amount: np.ndarray
+    amount_owed: np.ndarray
+
+    # Credits
+    child_tax_credit: np.ndarray
+    earned_income_credit: np.ndarray
+    retirement_savings_credit: np.ndarray
+    child_dependent_care_credit: np.ndarray
+    residential_energy_credit: np.ndarray
+    premium_tax_credit: np.ndarray
+    total_credits: np.ndarray
+    tax_after_credits: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.total_tax)
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """Convert result table to a dictionary of columns"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def row(self, index: int) -> TaxResult:
+        """
+        Get a single return's figures as a TaxResult.
+
+        Args:
+            index: Row index in the batch
+
+        Returns:
+            TaxResult populated from the batch columns
+        """
+        result = TaxResult()
+        for f in fields(TaxResult):
+            column = getattr(self, f.name, None)
+            if column is not None:
+                setattr(result, f.name, float(column[index]))
+        return result
+
+    def to_records(self) -> List[Dict[str, float]]:
+        """Convert result table to a list of per-return dictionaries"""
+        columns = {name: column.tolist() for name, column in self.to_dict().items()}
+        return [
+            {name: values[i] for name, values in columns.items()}
+            for i in range(len(self))
+        ]
+
+
+class BatchTaxCalculationService:
+    """
+    Service for vectorized tax calculations over a batch of returns.
+
+    Mirrors TaxCalculationService.calculate_complete_return and the credit
+    calculations used by TaxData.calculate_credits.
+    """
+
+    def __init__(self, tax_year: int = 2025):
+        """
+        Initialize batch tax calculation service.
+
+        Args:
+            tax_year: Tax year for calculations (default: 2025)
+        """
+        self.tax_year = tax_year
+        self.config: TaxYearConfig = get_tax_year_config(tax_year)
+        # SE tax and child tax credit amounts always come from the default
+        # configuration, exactly as in the scalar helpers
+        self.default_config: TaxYearConfig = get_tax_year_config()
+        self._bracket_tables = {
+            code: self._bracket_arrays(self.config.get_cents_bracket_table(status))
+            for code, status in enumerate(FILING_STATUS_CODES)
+        }
+        logger.info(f"Initialized BatchTaxCalculationService for tax year {tax_year}")
+
+    @staticmethod
+    def _bracket_arrays(table: CentsBracketTable) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert a bracket table in cents to lookup arrays.
+
+        Returns:
+            Tuple of (thresholds, rates, lower bounds, cumulative tax at lower bound);
+            all but the rates are int64 cents
+        """
+        return (
+            np.array(table.thresholds, dtype=np.int64),
+            np.array(table.rates, dtype=np.float64),
+            np.array(table.lower_bounds, dtype=np.int64),
+            np.array(table.cumulative_tax, dtype=np.int64),
+        )
+
+    def calculate_batch(self, batch: ReturnBatch) -> BatchTaxResult:
+        """
+        Calculate every return in the batch.
+
+        Args:
+            batch: Columnar batch of returns
+
+        Returns:
+            BatchTaxResult with one row per return
+
+        Raises:
+            InvalidInputException: If batch is None or not a ReturnBatch
+            ServiceExecutionException: If calculation fails unexpectedly
+        """
+        error_logger = get_error_logger()
+
+        try:
+            if not isinstance(batch, ReturnBatch):
+                raise InvalidInputException(
+                    field_name="batch",
+                    details={"unsupported_type": type(batch).__name__}
+                )
+
+            status = batch.filing_status
+            cents = {
+                name: cents_array(getattr(batch, name))
+                for name in ('wages', 'taxable_interest', 'ordinary_dividends', 'business_income',
+                             'itemized_deductions', 'federal_withholding', 'estimated_tax_payments')
+            }
+
+            # Income and AGI (no adjustments, as in the scalar service)
+            total_income = (
+                cents['wages'] +
+                cents['taxable_interest'] +
+                cents['ordinary_dividends'] +
+                cents['business_income']
+            )
+            agi = total_income
+
+            # Deductions
+            standard_deduction = np.array([
+                to_cents(self.config.standard_deductions.get(s, self.config.standard_deductions['Single']))
+                for s in FILING_STATUS_CODES
+            ], dtype=np.int64)[status]
+            deduction_used = np.where(batch.use_itemized, cents['itemized_deductions'], standard_deduction)
+            taxable_income = np.maximum(0, agi - deduction_used)
+
+            # Taxes
+            income_tax = self._calculate_income_tax(taxable_income, status)
+            self_employment_tax = self._calculate_self_employment_tax(cents['business_income'])
+            total_tax = income_tax + self_employment_tax
+
+            # Credits
+            credits = self._calculate_credits(batch, cents['wages'], agi)
+
+            # Payments and result
+            total_payments = cents['federal_withholding'] + cents['estimated_tax_payments']
+            balance = total_payments - total_tax
+
+            columns = dict(
+                total_wages=cents['wages'],
+                taxable_interest=cents['taxable_interest'],
+                ordinary_dividends=cents['ordinary_dividends'],
+                business_income=cents['business_income'],
+                total_income=total_income,
+                standard_deduction=standard_deduction,
+                itemized_deduction=cents['itemized_deductions'],
+                deduction_used=deduction_used,
+                adjusted_gross_income=agi,
+                taxable_income=taxable_income,
+                income_tax=income_tax,
+                self_employment_tax=self_employment_tax,
+                total_tax=total_tax,
+                federal_withholding=cents['federal_withholding'],
+                estimated_tax_payments=cents['estimated_tax_payments'],
+                total_payments=total_payments,
+                refund_amount=np.maximum(0, balance),
+                amount_owed=np.maximum(0, -balance),
+                tax_after_credits=np.maximum(0, total_tax - credits['total_credits']),
+                **credits
+            )
+            result = BatchTaxResult(**{name: to_dollars(column) for name, column in columns.items()})
+
+            logger.info(f"Completed batch tax calculation for {len(batch)} returns")
+            return result
+        except InvalidInputException as e:
+            error_logger.log_exception(
+                e,
+                context="batch_tax_calculation_service.calculate_batch",
+                extra_details={"tax_year": self.tax_year}
+            )
+            raise
+        except Exception as e:
+            error_logger.log_exception(
+                e,
+                context="batch_tax_calculation_service.calculate_batch",
+                extra_details={"tax_year": self.tax_year}
+            )
+            raise ServiceExecutionException(
+                service_name="BatchTaxCalculationService",
+                operation="calculate_batch",
+                details={"error": str(e)}
+            ) from e
+
+    def calculate_returns(self, returns: Sequence[Any]) -> BatchTaxResult:
+        """
+        Convenience wrapper: build a batch from returns and calculate it.
+
+        Args:
+            returns: TaxData objects or return dictionaries
+
+        Returns:
+            BatchTaxResult with one row per return
+        """
+        return self.calculate_batch(ReturnBatch.from_returns(returns, self.tax_year))
+
+    def _calculate_income_tax(self, taxable_income: np.ndarray, status: np.ndarray) -> np.ndarray:
+        """Bracket tax in cents via searchsorted on each filing status' thresholds"""
+        tax = np.zeros(len(taxable_income), dtype=np.int64)
+        for code in np.unique(status):
+            thresholds, rates, lower, cumulative = self._bracket_tables[int(code)]
+            mask = status == code
+            income = taxable_income[mask]
+            # First bracket whose threshold is >= income, as in CentsBracketTable.tax
+            idx = np.searchsorted(thresholds, income, side='left')
+            tax[mask] = cumulative[idx] + multiply_cents_array(income - lower[idx], rates[idx])
+        return tax
+
+    def _calculate_self_employment_tax(self, net_earnings: np.ndarray) -> np.ndarray:
+        """Vectorized self_employment_tax_cents for positive business income"""
+        config = self.default_config
+        se_income = multiply_cents_array(net_earnings, config.se_tax_rate)
+        ss_tax = multiply_cents_array(np.minimum(se_income, to_cents(config.ss_wage_base)), config.ss_tax_rate)
+        medicare_tax = multiply_cents_array(se_income, config.medicare_tax_rate)
+        medicare_threshold = to_cents(config.medicare_threshold)
+        additional_medicare = np.where(
+            se_income > medicare_threshold,
+            multiply_cents_array(se_income - medicare_threshold, config.additional_medicare_rate),
+            0
+        )
+        se_tax = ss_tax + medicare_tax + additional_medicare
+        return np.where(net_earnings > 0, se_tax, 0)
+
+    def _calculate_credits(self, batch: ReturnBatch, wages: np.ndarray, agi: np.ndarray) -> Dict[str, np.ndarray]:
+        """Vectorized credit calculations in cents"""
+        status = batch.filing_status
+        is_joint = np.isin(status, [FILING_STATUS_CODES.index('MFJ'), FILING_STATUS_CODES.index('QW')])
+        residential_energy = cents_array(batch.residential_energy)
+        premium_tax_credit = cents_array(batch.premium_tax_credit)
+
+        credits = {
+            'child_tax_credit': self._child_tax_credit(batch, agi, is_joint),
+            'earned_income_credit': self._earned_income_credit(batch, wages, agi),
+            'retirement_savings_credit': self._retirement_savings_credit(batch, agi),
+            'child_dependent_care_credit': self._child_dependent_care_credit(batch, agi),
+            'residential_energy_credit': np.where(batch.residential_energy > 0, residential_energy, 0),
+            'premium_tax_credit': np.where(batch.premium_tax_credit > 0, premium_tax_credit, 0),
+        }
+
+        credits['total_credits'] = sum(credits.values())
+        return credits
+
+    def _child_tax_credit(self, batch: ReturnBatch, agi: np.ndarray, is_joint: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_child_tax_credit"""
+        config = self.default_config
+        credit = (batch.qualifying_children.astype(np.int64) * to_cents(config.child_tax_credit_amount) +
+                  batch.other_dependents.astype(np.int64) * to_cents(config.other_dependent_credit))
+        threshold = np.where(is_joint, to_cents(400000), to_cents(200000))
+        reduction = np.floor_divide(agi - threshold, to_cents(1000)) * to_cents(50)
+        return np.where(agi > threshold, np.maximum(0, credit - reduction), credit)
+
+    def _earned_income_credit(self, batch: ReturnBatch, earned: np.ndarray, agi: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_earned_income_credit (simplified 2025 table)"""
+        status = batch.filing_status
+        children = np.minimum(batch.qualifying_children, 3).astype(np.intp)
+        is_mfj = status == FILING_STATUS_CODES.index('MFJ')
+
+        single_limits = cents_array([17640, 46560, 52918, 56838])
+        joint_limits = cents_array([24210, 53120, 59478, 63398])
+        max_credits = cents_array([600, 3995, 6604, 7430])
+
+        limit = np.where(is_mfj, joint_limits[children], single_limits[children])
+        max_credit = max_credits[children]
+        phase_in_end = to_cents(10000)
+
+        credit = np.where(
+            earned < phase_in_end,
+            divide_cents_array(np.clip(earned, 0, phase_in_end) * max_credit, phase_in_end),
+            max_credit
+        )
+        # credit * 10 * (limit - agi) / (3 * limit), as in the scalar helper
+        phase_out = agi * 10 > limit * 7
+        remaining = np.maximum(0, limit - agi)
+        credit = np.where(phase_out, divide_cents_array(credit * 10 * remaining, 3 * limit), credit)
+        credit = np.maximum(0, credit)
+
+        eligible = (
+            (batch.qualifying_children > 0) &
+            (earned > 0) &
+            (status != FILING_STATUS_CODES.index('MFS')) &
+            (agi <= limit)
+        )
+        return np.where(eligible, credit, 0)
+
+    def _retirement_savings_credit(self, batch: ReturnBatch, agi: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_retirement_savings_credit"""
+        limits = self.config.retirement_savings_credit_limits
+        per_status = [limits.get(s, limits['Single']) for s in FILING_STATUS_CODES]
+        status = batch.filing_status
+        limit_50 = cents_array([l['50_percent'] for l in per_status])[status]
+        limit_20 = cents_array([l['20_percent'] for l in per_status])[status]
+        limit_10 = cents_array([l['10_percent'] for l in per_status])[status]
+
+        rate = np.select(
+            [agi <= limit_50, agi <= limit_20, agi <= limit_10],
+            [0.50, 0.20, 0.10],
+            default=0.0
+        )
+        contributions = cents_array(batch.retirement_contributions)
+        credit = multiply_cents_array(np.minimum(contributions, to_cents(2000)), rate)
+        return np.where(batch.retirement_contributions > 0, credit, 0)
+
+    def _child_dependent_care_credit(self, batch: ReturnBatch, agi: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_child_dependent_care_credit"""
+        limits = self.config.child_dependent_care_limits
+        threshold = cents_array([
+            limits.get(s, limits['Single'])['threshold'] for s in FILING_STATUS_CODES
+        ])[batch.filing_status]
+
+        has_expenses = batch.child_care_expenses > 0
+        qualifying = np.minimum(cents_array(batch.child_care_expenses), to_cents(6000))
+        # 35% of expenses, less half the AGI over the threshold, rounded once
+        phased_out = divide_cents_array(7 * qualifying - 10 * np.maximum(0, agi - threshold), 20)
+        credit = np.where(
+            agi > threshold,
+            np.maximum(0, phased_out),
+            multiply_cents_array(qualifying, 0.35)
+        )
+        return np.where(has_expenses, credit, 0)
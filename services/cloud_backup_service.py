@@ -7,10 +7,11 @@ Supports multiple cloud providers with a unified interface.
 
 import json
 import logging
+import os
 import hashlib
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from abc import ABC, abstractmethod
 
@@ -23,9 +24,42 @@ from services.exceptions import (
     ServiceExecutionException
 )
 from services.error_logger import get_error_logger
+from utils.save_journal import file_state
 
 logger = logging.getLogger(__name__)
 
+# Backups are encrypted with their own key, kept in the safe directory
+BACKUP_KEY_FILENAME = "encryption.key"
+
+
+def write_archive_entry(archive: BinaryIO, filename: str, data: bytes) -> None:
+    """
+    Append one file to a backup archive.
+
+    An archive is a 4-byte big-endian file count followed, per file, by the
+    4-byte length of its name, the UTF-8 name, its 8-byte size and its bytes.
+    """
+    filename_bytes = filename.encode('utf-8')
+    archive.write(len(filename_bytes).to_bytes(4, byteorder='big'))
+    archive.write(filename_bytes)
+    archive.write(len(data).to_bytes(8, byteorder='big'))
+    archive.write(data)
+
+
+def iter_archive_entries(archive: BinaryIO) -> Iterator[Tuple[str, bytes]]:
+    """
+    Read the files of a backup archive (see write_archive_entry).
+
+    Yields:
+        Filename and encrypted content of each file, in archive order
+    """
+    file_count = int.from_bytes(archive.read(4), byteorder='big')
+    for _ in range(file_count):
+        filename_len = int.from_bytes(archive.read(4), byteorder='big')
+        filename = archive.read(filename_len).decode('utf-8')
+        file_size = int.from_bytes(archive.read(8), byteorder='big')
+        yield filename, archive.read(file_size)
+
 
 @dataclass
 class BackupMetadata:
@@ -161,7 +195,7 @@ class CloudBackupService:
             config: Application configuration
         """
         self.config = config
-        self.encryption_service = EncryptionService(config.safe_dir / "encryption.key")
+        self.encryption_service = EncryptionService(config.safe_dir / BACKUP_KEY_FILENAME)
         self.backup_dir = config.safe_dir / "backups"
         self.backup_dir.mkdir(parents=True, exist_ok=True)
 
@@ -171,6 +205,7 @@ class CloudBackupService:
 
         # Backup metadata storage
         self.metadata_file = self.backup_dir / "backup_metadata.json"
+        self._metadata_state: Optional[tuple] = None
         self.backups: Dict[str, BackupMetadata] = self._load_backup_metadata()
 
     def _load_cloud_config(self) -> CloudConfig:
@@ -208,6 +243,7 @@ class CloudBackupService:
 
     def _load_backup_metadata(self) -> Dict[str, BackupMetadata]:
         """Load backup metadata from file"""
+        self._metadata_state = file_state(self.metadata_file)
         if not self.metadata_file.exists():
             return {}
 
@@ -224,6 +260,18 @@ class CloudBackupService:
             logger.error(f"Failed to load backup metadata: {e}")
             return {}
 
+    def _refresh_backup_metadata(self) -> None:
+        """
+        Reload backup metadata another instance saved since it was read.
+
+        Key rotation records new checksums through its own service, so an
+        instance left open would otherwise reject rotated archives and
+        write the old checksums back.
+        """
+        if file_state(self.metadata_file) != self._metadata_state:
+            logger.info("Backup metadata changed on disk; reloading")
+            self.backups = self._load_backup_metadata()
+
     def _save_backup_metadata(self):
         """Save backup metadata to file"""
         try:
@@ -234,8 +282,12 @@ class CloudBackupService:
                 backup_dict['timestamp'] = metadata.timestamp.isoformat()
                 data[backup_id] = backup_dict
 
-            with open(self.metadata_file, 'w') as f:
+            # Replaced rather than rewritten, so open instances see a new file
+            temp_file = self.metadata_file.with_name(f".{self.metadata_file.name}.tmp")
+            with open(temp_file, 'w') as f:
                 json.dump(data, f, indent=2)
+            os.replace(temp_file, self.metadata_file)
+            self._metadata_state = file_state(self.metadata_file)
         except Exception as e:
             logger.error(f"Failed to save backup metadata: {e}")
 
@@ -329,16 +381,8 @@ class CloudBackupService:
                 archive.write(len(encrypted_files).to_bytes(4, byteorder='big'))
 
                 for encrypted_file in encrypted_files:
-                    # Write filename length and filename
-                    filename_bytes = encrypted_file.name.encode('utf-8')
-                    archive.write(len(filename_bytes).to_bytes(4, byteorder='big'))
-                    archive.write(filename_bytes)
-
-                    # Write file size and content
                     with open(encrypted_file, 'rb') as f:
-                        file_data = f.read()
-                        archive.write(len(file_data).to_bytes(8, byteorder='big'))
-                        archive.write(file_data)
+                        write_archive_entry(archive, encrypted_file.name, f.read())
 
             # Calculate checksum
             with open(archive_path, 'rb') as f:
@@ -356,6 +400,7 @@ class CloudBackupService:
             )
 
             # Store metadata
+            self._refresh_backup_metadata()
             self.backups[backup_id] = metadata
             self._save_backup_metadata()
 
@@ -384,6 +429,7 @@ class CloudBackupService:
             True if restore successful
         """
         try:
+            self._refresh_backup_metadata()
             if backup_id not in self.backups:
                 logger.error(f"Backup {backup_id} not found")
                 return False
@@ -410,20 +456,9 @@ class CloudBackupService:
             restore_path.mkdir(parents=True, exist_ok=True)
 
             with open(local_archive, 'rb') as archive:
-                # Read file count
-                file_count = int.from_bytes(archive.read(4), byteorder='big')
-
                 cipher = self.encryption_service.get_or_create_cipher()
 
-                for _ in range(file_count):
-                    # Read filename
-                    filename_len = int.from_bytes(archive.read(4), byteorder='big')
-                    filename = archive.read(filename_len).decode('utf-8')
-
-                    # Read file size and content
-                    file_size = int.from_bytes(archive.read(8), byteorder='big')
-                    encrypted_data = archive.read(file_size)
-
+                for filename, encrypted_data in iter_archive_entries(archive):
                     # Decrypt data
                     try:
                         decrypted_data = cipher.decrypt(encrypted_data)
@@ -459,8 +494,45 @@ class CloudBackupService:
         Returns:
             List of backup metadata, sorted by timestamp (most recent first)
         """
+        self._refresh_backup_metadata()
         return sorted(self.backups.values(), key=lambda x: x.timestamp, reverse=True)
 
+    def replace_backup_archive(self, backup_id: str) -> bool:
+        """
+        Upload a backup's local archive after it was rewritten in place.
+
+        Used by key rotation: the cloud copy is replaced before the new
+        checksum is recorded, so a failed upload leaves the old copy
+        restorable.
+
+        Args:
+            backup_id: ID of the backup whose archive changed
+
+        Returns:
+            True if the archive was uploaded and its checksum recorded
+        """
+        try:
+            self._refresh_backup_metadata()
+            if backup_id not in self.backups:
+                logger.error(f"Backup {backup_id} not found")
+                return False
+
+            archive_path = self.backup_dir / backup_id / f"{backup_id}.backup"
+            remote_path = f"{self.cloud_config.backup_folder}/{backup_id}.backup"
+            if not self.cloud_provider.upload_file(archive_path, remote_path):
+                logger.error(f"Failed to upload backup {backup_id} to cloud")
+                return False
+
+            with open(archive_path, 'rb') as f:
+                self.backups[backup_id].checksum = hashlib.sha256(f.read()).hexdigest()
+            self._save_backup_metadata()
+            logger.info(f"Replaced backup archive {backup_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to replace backup archive {backup_id}: {e}")
+            return False
+
     def delete_backup(self, backup_id: str) -> bool:
         """
         Delete a backup from both local and cloud storage.
@@ -472,6 +544,7 @@ class CloudBackupService:
             True if deletion successful
         """
         try:
+            self._refresh_backup_metadata()
             if backup_id not in self.backups:
                 logger.error(f"Backup {backup_id} not found")
                 return False
@@ -504,6 +577,7 @@ class CloudBackupService:
         Returns:
             Dictionary with backup status information
         """
+        self._refresh_backup_metadata()
         total_backups = len(self.backups)
         total_size = sum(metadata.total_size for metadata in self.backups.values())
 
@@ -5,7 +5,7 @@ Handles cryptocurrency transaction tracking and tax reporting for Form 8949 and
 """
 
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, date
 from decimal import Decimal
@@ -14,6 +14,8 @@ from enum import Enum
 from config.app_config import AppConfig
 from models.tax_data import TaxData
 from utils.error_tracker import get_error_tracker
+from utils.money import from_cents, to_cents
+from utils.record_store import RecordStore
 from services.exceptions import (
     InvalidInputException,
     DataValidationException,
@@ -43,7 +45,7 @@ class HoldingMethod(Enum):
     SPECIFIC_ID = "specific_id"  # Specific lot identification
 
 
-@dataclass
+@dataclass(slots=True)
 class CryptoTransaction:
     """A cryptocurrency transaction"""
 
@@ -93,7 +95,7 @@ class CryptoTransaction:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CapitalGainLoss:
     """Capital gain/loss from cryptocurrency transaction"""
 
@@ -120,6 +122,29 @@ class CapitalGainLoss:
         }
 
 
+# Column layouts for RecordStore collections of the records above
+CRYPTO_TRANSACTION_COLUMNS = {
+    'date': 'date',
+    'type': 'category',
+    'cryptocurrency': 'category',
+    'amount': 'decimal',
+    'price_per_unit': 'decimal',
+    'total_value': 'decimal',
+    'fees': 'decimal',
+    'exchange': 'category',
+}
+
+CAPITAL_GAIN_LOSS_COLUMNS = {
+    'date_acquired': 'date',
+    'date_sold': 'date',
+    'sales_price': 'decimal',
+    'cost_basis': 'decimal',
+    'gain_loss': 'decimal',
+    'holding_period': 'category',
+    'cryptocurrency': 'category',
+}
+
+
 class CryptocurrencyTaxService:
     """
     Service for handling cryptocurrency tax reporting.
@@ -194,98 +219,146 @@ class CryptocurrencyTaxService:
             logger.error(f"Failed to load crypto transactions: {e}")
             return []
 
-    def calculate_capital_gains_losses(self, tax_data: TaxData, tax_year: int) -> List[CapitalGainLoss]:
+    def get_transaction_store(self, tax_data: TaxData, tax_year: Optional[int] = None) -> RecordStore:
         """
-        Calculate capital gains and losses for the tax year using FIFO method.
+        Load cryptocurrency transactions into a columnar store.
+
+        Uses a fraction of the memory of get_transactions for large trade
+        histories; rows are built as CryptoTransaction objects on access.
 
         Args:
             tax_data: Tax data model
-            tax_year: Tax year to calculate for
+            tax_year: Only load transactions dated in this year (default: all)
 
         Returns:
-            List[CapitalGainLoss]: List of capital gains/losses
+            RecordStore of CryptoTransaction
         """
         try:
-            transactions = self.get_transactions(tax_data)
+            transaction_dicts = tax_data.get("cryptocurrency.transactions", [])
+            if tax_year is not None:
+                # Stored dates are ISO strings, so the year is their prefix
+                prefix = f"{tax_year:04d}-"
+                transaction_dicts = (t for t in transaction_dicts if t['date'].startswith(prefix))
+            return RecordStore.from_dicts(CryptoTransaction, CRYPTO_TRANSACTION_COLUMNS, transaction_dicts)
+        except Exception as e:
+            logger.error(f"Failed to load crypto transactions: {e}")
+            return RecordStore(CryptoTransaction, CRYPTO_TRANSACTION_COLUMNS)
+
+    def get_capital_gains_store(self, tax_data: TaxData, tax_year: int) -> RecordStore:
+        """
+        Calculate capital gains/losses into a columnar store.
 
-            # Filter transactions for the tax year
-            year_transactions = [t for t in transactions if t.date.year == tax_year]
-
-            # Group by cryptocurrency
-            crypto_holdings = {}  # crypto -> list of (date, amount, cost_basis) tuples
-
-            gains_losses = []
-
-            for transaction in sorted(year_transactions, key=lambda t: t.date):
-                crypto = transaction.cryptocurrency
-
-                if crypto not in crypto_holdings:
-                    crypto_holdings[crypto] = []
-
-                if transaction.type in [CryptoTransactionType.BUY, CryptoTransactionType.MINING,
-                                      CryptoTransactionType.AIRDROP, CryptoTransactionType.FORK,
-                                      CryptoTransactionType.STAKING]:
-                    # Add to holdings
-                    cost_basis_per_unit = transaction.total_value / transaction.amount
-                    crypto_holdings[crypto].append({
-                        'date': transaction.date,
-                        'amount': transaction.amount,
-                        'cost_basis_per_unit': cost_basis_per_unit,
-                        'remaining': transaction.amount
-                    })
-
-                elif transaction.type in [CryptoTransactionType.SELL, CryptoTransactionType.TRADE]:
-                    # Remove from holdings using FIFO
-                    amount_to_sell = transaction.amount
-                    total_cost_basis = Decimal('0')
-
-                    while amount_to_sell > 0 and crypto_holdings[crypto]:
-                        holding = crypto_holdings[crypto][0]
-
-                        if holding['remaining'] <= amount_to_sell:
-                            # Use entire holding
-                            amount_used = holding['remaining']
-                            cost_basis_used = amount_used * holding['cost_basis_per_unit']
-                            crypto_holdings[crypto].pop(0)
-                        else:
-                            # Use partial holding
-                            amount_used = amount_to_sell
-                            cost_basis_used = amount_used * holding['cost_basis_per_unit']
-                            holding['remaining'] -= amount_used
-
-                        total_cost_basis += cost_basis_used
-                        amount_to_sell -= amount_used
-
-                    # Calculate gain/loss
-                    if amount_to_sell == 0:  # All amount was covered by holdings
-                        sales_price = transaction.total_value
-                        gain_loss = sales_price - total_cost_basis
-
-                        # Determine holding period
-                        if crypto_holdings[crypto]:
-                            earliest_holding_date = crypto_holdings[crypto][0]['date']
-                            holding_period_days = (transaction.date - earliest_holding_date).days
-                            holding_period = "long" if holding_period_days > 365 else "short"
-                        else:
-                            holding_period = "short"  # Default if no holdings remain
-
-                        gains_losses.append(CapitalGainLoss(
-                            description=f"{crypto} - {transaction.description or transaction.transaction_id}",
-                            date_acquired=crypto_holdings[crypto][0]['date'] if crypto_holdings[crypto] else transaction.date,
-                            date_sold=transaction.date,
-                            sales_price=sales_price,
-                            cost_basis=total_cost_basis,
-                            gain_loss=gain_loss,
-                            holding_period=holding_period,
-                            cryptocurrency=crypto
-                        ))
-
-            return gains_losses
+        Lots are appended as they are matched, straight from the year's
+        transaction store, so no list of CapitalGainLoss objects is built.
+
+        Args:
+            tax_data: Tax data model
+            tax_year: Tax year to calculate for
 
+        Returns:
+            RecordStore of CapitalGainLoss (empty if the calculation fails)
+        """
+        store = RecordStore(CapitalGainLoss, CAPITAL_GAIN_LOSS_COLUMNS)
+        try:
+            store.extend(self._iter_capital_gains(self.get_transaction_store(tax_data, tax_year)))
         except Exception as e:
             logger.error(f"Failed to calculate crypto gains/losses: {e}")
             self.error_tracker.log_error("crypto_calculate_gains", str(e))
-            return []
+            store.clear()
+        return store
+
+    def calculate_capital_gains_losses(self, tax_data: TaxData, tax_year: int) -> List[CapitalGainLoss]:
+        """
+        Calculate capital gains and losses for the tax year using FIFO method.
+
+        Args:
+            tax_data: Tax data model
+            tax_year: Tax year to calculate for
+
+        Returns:
+            List[CapitalGainLoss]: List of capital gains/losses
+        """
+        return list(self.get_capital_gains_store(tax_data, tax_year))
+
+    def _iter_capital_gains(self, transactions: RecordStore) -> Iterator[CapitalGainLoss]:
+        """
+        Match sales against earlier acquisitions (FIFO), yielding each lot.
+
+        Args:
+            transactions: One tax year's transactions
+
+        Yields:
+            CapitalGainLoss per sale fully covered by holdings
+        """
+        # Group by cryptocurrency
+        crypto_holdings = {}  # crypto -> list of (date, amount, cost_basis) tuples
+
+        # Stable sort by date, building one transaction at a time
+        dates = transactions.column('date')
+        for index in sorted(range(len(transactions)), key=dates.__getitem__):
+            transaction = transactions[index]
+            crypto = transaction.cryptocurrency
+
+            if crypto not in crypto_holdings:
+                crypto_holdings[crypto] = []
+
+            if transaction.type in [CryptoTransactionType.BUY, CryptoTransactionType.MINING,
+                                  CryptoTransactionType.AIRDROP, CryptoTransactionType.FORK,
+                                  CryptoTransactionType.STAKING]:
+                # Add to holdings
+                cost_basis_per_unit = transaction.total_value / transaction.amount
+                crypto_holdings[crypto].append({
+                    'date': transaction.date,
+                    'amount': transaction.amount,
+                    'cost_basis_per_unit': cost_basis_per_unit,
+                    'remaining': transaction.amount
+                })
+
+            elif transaction.type in [CryptoTransactionType.SELL, CryptoTransactionType.TRADE]:
+                # Remove from holdings using FIFO
+                amount_to_sell = transaction.amount
+                total_cost_basis = Decimal('0')
+
+                while amount_to_sell > 0 and crypto_holdings[crypto]:
+                    holding = crypto_holdings[crypto][0]
+
+                    if holding['remaining'] <= amount_to_sell:
+                        # Use entire holding
+                        amount_used = holding['remaining']
+                        cost_basis_used = amount_used * holding['cost_basis_per_unit']
+                        crypto_holdings[crypto].pop(0)
+                    else:
+                        # Use partial holding
+                        amount_used = amount_to_sell
+                        cost_basis_used = amount_used * holding['cost_basis_per_unit']
+                        holding['remaining'] -= amount_used
+
+                    total_cost_basis += cost_basis_used
+                    amount_to_sell -= amount_used
+
+                # Calculate gain/loss
+                if amount_to_sell == 0:  # All amount was covered by holdings
+                    sales_price = transaction.total_value
+                    gain_loss = sales_price - total_cost_basis
+
+                    # Determine holding period
+                    if crypto_holdings[crypto]:
+                        earliest_holding_date = crypto_holdings[crypto][0]['date']
+                        holding_period_days = (transaction.date - earliest_holding_date).days
+                        holding_period = "long" if holding_period_days > 365 else "short"
+                    else:
+                        holding_period = "short"  # Default if no holdings remain
+
+                    yield CapitalGainLoss(
+                        description=f"{crypto} - {transaction.description or transaction.transaction_id}",
+                        date_acquired=crypto_holdings[crypto][0]['date'] if crypto_holdings[crypto] else transaction.date,
+                        date_sold=transaction.date,
+                        sales_price=sales_price,
+                        cost_basis=total_cost_basis,
+                        gain_loss=gain_loss,
+                        holding_period=holding_period,
+                        cryptocurrency=crypto
+                    )
 
     def get_tax_liability_estimate(self, tax_data: TaxData, tax_year: int) -> Dict[str, Any]:
         """
@@ -299,12 +372,23 @@ class CryptocurrencyTaxService:
             Dict containing tax estimates
         """
         try:
-            gains_losses = self.calculate_capital_gains_losses(tax_data, tax_year)
-
-            short_term_gains = sum(gl.gain_loss for gl in gains_losses if gl.gain_loss > 0 and gl.holding_period == "short")
-            short_term_losses = sum(abs(gl.gain_loss) for gl in gains_losses if gl.gain_loss < 0 and gl.holding_period == "short")
-            long_term_gains = sum(gl.gain_loss for gl in gains_losses if gl.gain_loss > 0 and gl.holding_period == "long")
-            long_term_losses = sum(abs(gl.gain_loss) for gl in gains_losses if gl.gain_loss < 0 and gl.holding_period == "long")
+            gains_losses = self.get_capital_gains_store(tax_data, tax_year)
+
+            # Totals are kept in integer cents; each lot is rounded to cents as on Form 8949,
+            # so they can differ by a few cents from the exact sum of unrounded lots
+            totals = {('short', True): 0, ('short', False): 0, ('long', True): 0, ('long', False): 0}
+            for gain_loss, holding_period in zip(gains_losses.column('gain_loss'),
+                                                 gains_losses.column('holding_period')):
+                cents = to_cents(gain_loss)
+                if cents:
+                    key = (holding_period, cents > 0)
+                    if key in totals:
+                        totals[key] += abs(cents)
+
+            short_term_gains = from_cents(totals[('short', True)])
+            short_term_losses = from_cents(totals[('short', False)])
+            long_term_gains = from_cents(totals[('long', True)])
+            long_term_losses = from_cents(totals[('long', False)])
 
             # Net capital gains (short-term + long-term)
             net_short_term = short_term_gains - short_term_losses
@@ -380,7 +464,7 @@ class CryptocurrencyTaxService:
             CSV formatted string
         """
         try:
-            gains_losses = self.calculate_capital_gains_losses(tax_data, tax_year)
+            gains_losses = self.get_capital_gains_store(tax_data, tax_year)
 
             # Create CSV header
             csv_lines = ["Description,Date Acquired,Date Sold,Sales Price,Cost Basis,Gain/Loss,Holding Period,Cryptocurrency"]
@@ -5,10 +5,12 @@ Extracted from TaxData to follow Single Responsibility Principle.
 This service encapsulates all cryptography operations.
 """
 
+import base64
 import logging
+import os
 from pathlib import Path
-from typing import Optional
-from cryptography.fernet import Fernet, InvalidToken
+from typing import List, Optional, Union
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 
 from services.exceptions import (
     EncryptionKeyNotFoundException,
@@ -17,6 +19,7 @@ from services.exceptions import (
     EncryptionException
 )
 from services.error_logger import get_error_logger
+from utils.save_journal import file_state, fsync_directory
 
 logger = logging.getLogger(__name__)
 error_logger = get_error_logger()
@@ -28,6 +31,13 @@ class EncryptionService:
     
     Uses Fernet (symmetric encryption) for secure data storage.
     Keys are stored in a configurable location.
+    
+    While a key rotation is in progress (see services.key_rotation_service),
+    the previous keys are kept in "<key_file>.retired": data is encrypted
+    with the current key and decrypted with whichever key it was written with.
+    The key files are checked on each use and reloaded when another instance
+    or process rotated them, so a long-lived instance never encrypts with a
+    deleted key.
     """
     
     def __init__(self, key_file: Path):
@@ -38,21 +48,33 @@ class EncryptionService:
             key_file: Path to the encryption key file
         """
         self.key_file = Path(key_file)
-        self._cipher: Optional[Fernet] = None
+        self._cipher: Optional[Union[Fernet, MultiFernet]] = None
+        self._key: Optional[bytes] = None
+        self._key_state: Optional[tuple] = None
+    
+    @property
+    def retired_key_file(self) -> Path:
+        """File holding the keys a rotation in progress is replacing"""
+        return self.key_file.with_name(self.key_file.name + ".retired")
     
-    def get_or_create_cipher(self) -> Fernet:
+    def get_or_create_cipher(self) -> Union[Fernet, MultiFernet]:
         """
         Get cipher instance, creating new key if needed.
         
         Returns:
-            Fernet cipher instance for encryption/decryption
+            Fernet cipher instance for encryption/decryption, or a MultiFernet
+            that also decrypts with the retired keys during a rotation
             
         Raises:
             EncryptionKeyNotFoundException: If key file doesn't exist and can't be created
             InvalidEncryptionKeyException: If key file is corrupted or invalid
         """
         if self._cipher is not None:
-            return self._cipher
+            if self._key_state == self._read_key_state():
+                return self._cipher
+            logger.info("Encryption key changed on disk; reloading")
+            self._cipher = None
+            self._key = None
         
         # Ensure directory exists
         self.key_file.parent.mkdir(parents=True, exist_ok=True)
@@ -62,8 +84,14 @@ class EncryptionService:
             try:
                 with open(self.key_file, 'rb') as f:
                     key = f.read()
+                self._key_state = self._read_key_state()
                 self._cipher = Fernet(key)
+                self._key = key
                 logger.info("Loaded existing encryption key")
+                retired = self.get_retired_keys()
+                if retired:
+                    self._cipher = MultiFernet([self._cipher, *(Fernet(old) for old in retired)])
+                    logger.info(f"Decrypting with {len(retired)} retired key(s) until rotation completes")
             except InvalidToken as e:
                 error_logger.log_exception(
                     e,
@@ -92,7 +120,9 @@ class EncryptionService:
                     f.write(key)
                 # Set restrictive permissions (owner read/write only)
                 self.key_file.chmod(0o600)
+                self._key_state = self._read_key_state()
                 self._cipher = Fernet(key)
+                self._key = key
                 logger.info("Generated new encryption key")
             except Exception as e:
                 logger.error(f"Failed to create encryption key: {e}")
@@ -100,6 +130,105 @@ class EncryptionService:
         
         return self._cipher
     
+    def _read_key_state(self) -> tuple:
+        """Identity of the key files on disk; rotation replaces them, changing it"""
+        return file_state(self.key_file), file_state(self.retired_key_file)
+    
+    def get_container_key(self) -> bytes:
+        """
+        Get the master key for secure containers (see utils.secure_container).
+
+        Containers derive a separate key per file from it, so the raw key is
+        never used directly for both Fernet tokens and containers.
+
+        Returns:
+            The 32 bytes of the Fernet key
+        """
+        self.get_or_create_cipher()
+        if self._key is None:
+            self._key = self.key_file.read_bytes()
+        return base64.urlsafe_b64decode(self._key.strip())
+    
+    def get_container_keys(self) -> List[bytes]:
+        """
+        Get every master key a container may have been written with.
+        
+        Returns:
+            The current container key first, then those of retired keys
+        """
+        return [self.get_container_key()] + [base64.urlsafe_b64decode(old) for old in self.get_retired_keys()]
+    
+    def get_fernet_keys(self) -> List[bytes]:
+        """
+        Get the current Fernet key followed by any retired keys.
+        
+        Returns:
+            Base64-encoded Fernet keys, current key first
+        """
+        self.get_or_create_cipher()
+        return [self._key.strip()] + self.get_retired_keys()
+    
+    def get_retired_keys(self) -> List[bytes]:
+        """
+        Get the keys a rotation in progress is replacing.
+        
+        Returns:
+            Base64-encoded Fernet keys, newest first (empty if not rotating)
+        """
+        try:
+            lines = self.retired_key_file.read_bytes().split()
+        except FileNotFoundError:
+            return []
+        return [line for line in lines if line]
+    
+    def stage_new_key(self) -> bytes:
+        """
+        Make a new key current, keeping the old one for decryption.
+        
+        The old key is written to the retired key file before the key file
+        is replaced, so a crash at any point leaves a usable pair. Does
+        nothing if a staged rotation is already in progress.
+        
+        Returns:
+            The current (new) base64-encoded Fernet key
+        """
+        old_key = self.get_fernet_keys()[0]
+        retired = self.get_retired_keys()
+        if retired and old_key not in retired:
+            return old_key
+        
+        if old_key not in retired:
+            self._write_key_file(self.retired_key_file, b"\n".join([old_key, *retired]) + b"\n")
+        new_key = Fernet.generate_key()
+        self._write_key_file(self.key_file, new_key)
+        self._cipher = None
+        self._key = None
+        logger.info("Staged new encryption key; retired keys remain valid for decryption")
+        return new_key
+    
+    def retire_old_keys(self) -> None:
+        """Delete the retired keys once nothing is encrypted with them"""
+        self.retired_key_file.unlink(missing_ok=True)
+        self._cipher = None
+        self._key = None
+        logger.info("Removed retired encryption keys")
+    
+    @staticmethod
+    def _write_key_file(path: Path, content: bytes) -> None:
+        """Durably replace a key file, readable by the owner only"""
+        temp_path = path.with_name(f".{path.name}.tmp")
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o600)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+            fsync_directory(path.parent)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
     def encrypt(self, data: str) -> bytes:
         """
         Encrypt string data.
@@ -222,7 +351,8 @@ class EncryptionService:
             new_key_file: Path for the new key file
             
         Note:
-            This requires re-encrypting all encrypted data with the new key.
+            This requires re-encrypting all encrypted data with the new key;
+            KeyRotationService rotates the key in place and does that.
         """
         # Generate new key
         new_key = Fernet.generate_key()
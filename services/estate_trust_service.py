@@ -13,8 +13,10 @@ from decimal import Decimal
 from enum import Enum
 
 from config.app_config import AppConfig
+from config.tax_year_config import BracketTable
 from models.tax_data import TaxData
 from utils.error_tracker import get_error_tracker
+from utils.money import sum_money
 from services.exceptions import (
     InvalidInputException,
     DataValidationException,
@@ -25,6 +27,27 @@ from services.error_logger import get_error_logger
 logger = logging.getLogger(__name__)
 
 
+def _trust_bracket_table(brackets: List[Tuple[str, str]]) -> BracketTable:
+    """Precompile a trust bracket schedule; income above the last threshold is taxed at 37%"""
+    schedule = [(Decimal(threshold), Decimal(rate)) for threshold, rate in brackets]
+    schedule.append((Decimal('Infinity'), Decimal('0.37')))
+    return BracketTable.from_brackets(schedule, zero=Decimal('0'))
+
+
+# Simplified trust tax brackets (estates and trusts use same rates as individuals).
+# In practice, this would use the actual IRS tax tables for the specific year.
+# 2024 tax brackets for trusts (simplified), used for 2024 and later
+TRUST_BRACKETS_2024 = _trust_bracket_table([
+    ('100', '0.10'), ('1100', '0.12'), ('4475', '0.22'), ('9575', '0.24'),
+    ('18200', '0.32'), ('23175', '0.35'), ('57875', '0.37'),
+])
+
+# Default brackets for earlier years
+TRUST_BRACKETS_DEFAULT = _trust_bracket_table([
+    ('100', '0.10'), ('1100', '0.12'), ('10000', '0.22'), ('100000', '0.24'),
+])
+
+
 class TrustType(Enum):
     """Types of trusts for tax purposes"""
     SIMPLE_TRUST = "simple_trust"
@@ -102,10 +125,10 @@ class TrustIncome:
 
     def calculate_total(self) -> Decimal:
         """Calculate total income"""
-        self.total_income = (
-            self.interest_income + self.dividend_income + self.business_income +
-            self.capital_gains + self.rental_income + self.royalty_income + self.other_income
-        )
+        self.total_income = sum_money((
+            self.interest_income, self.dividend_income, self.business_income,
+            self.capital_gains, self.rental_income, self.royalty_income, self.other_income
+        ))
         return self.total_income
 
     def to_dict(self) -> Dict[str, Any]:
@@ -149,10 +172,10 @@ class TrustDeductions:
 
     def calculate_total(self) -> Decimal:
         """Calculate total deductions"""
-        self.total_deductions = (
-            self.fiduciary_fees + self.attorney_fees + self.accounting_fees +
-            self.other_administrative_expenses + self.charitable_contributions + self.net_operating_loss
-        )
+        self.total_deductions = sum_money((
+            self.fiduciary_fees, self.attorney_fees, self.accounting_fees,
+            self.other_administrative_expenses, self.charitable_contributions, self.net_operating_loss
+        ))
         return self.total_deductions
 
     def to_dict(self) -> Dict[str, Any]:
@@ -404,45 +427,11 @@ class EstateTrustService:
         Returns:
             Decimal: Tax amount
         """
-        # Simplified trust tax calculation (estates and trusts use same rates as individuals)
-        # In practice, this would use the actual IRS tax tables for the specific year
-
-        if tax_year >= 2024:
-            # 2024 tax brackets for trusts (simplified)
-            brackets = [
-                (Decimal('0'), Decimal('100'), Decimal('0.10')),
-                (Decimal('100'), Decimal('1100'), Decimal('0.12')),
-                (Decimal('1100'), Decimal('4475'), Decimal('0.22')),
-                (Decimal('4475'), Decimal('9575'), Decimal('0.24')),
-                (Decimal('9575'), Decimal('18200'), Decimal('0.32')),
-                (Decimal('18200'), Decimal('23175'), Decimal('0.35')),
-                (Decimal('23175'), Decimal('57875'), Decimal('0.37')),
-            ]
-        else:
-            # Default brackets
-            brackets = [
-                (Decimal('0'), Decimal('100'), Decimal('0.10')),
-                (Decimal('100'), Decimal('1100'), Decimal('0.12')),
-                (Decimal('1100'), Decimal('10000'), Decimal('0.22')),
-                (Decimal('10000'), Decimal('100000'), Decimal('0.24')),
-            ]
-
-        tax = Decimal('0')
-        remaining_income = taxable_income
-
-        for min_amount, max_amount, rate in brackets:
-            if remaining_income <= 0:
-                break
-
-            bracket_amount = min(remaining_income, max_amount - min_amount)
-            tax += bracket_amount * rate
-            remaining_income -= bracket_amount
-
-        # Apply 37% rate to remaining income
-        if remaining_income > 0:
-            tax += remaining_income * Decimal('0.37')
-
-        return tax
+        if taxable_income <= 0:
+            return Decimal('0')
+
+        table = TRUST_BRACKETS_2024 if tax_year >= 2024 else TRUST_BRACKETS_DEFAULT
+        return table.tax(taxable_income)
 
     def add_beneficiary(self, tax_data: TaxData, beneficiary: TrustBeneficiary) -> bool:
         """
@@ -0,0 +1,584 @@
+"""
+Key Rotation Service
+
+EncryptionService.rotate_key() only writes a new key file; everything
+encrypted with the old key still needs it. This service stages a new key,
+re-encrypts every artifact that depends on the old one in parallel, and
+deletes the old key once nothing does.
+
+Two keys are rotated separately:
+
+    app      config.key_file: saved returns (*.enc, folding in their
+             autosave journals), PTIN/ERO records, encrypted fields of
+             the accessibility profile, and the returns inside backups
+    backups  safe_dir/encryption.key: backup files and archives; rewritten
+             archives are uploaded over their cloud copies
+
+While a rotation runs, EncryptionService encrypts with the new key and
+decrypts with either (MultiFernet semantics; containers try each key), so
+files both before and after their turn stay readable. Each file is written
+to a temporary file and swapped in with os.replace(), then its path is
+appended to a checkpoint, so an interrupted rotation resumes where it
+stopped. Re-encrypting a file twice is harmless, so a checkpoint line lost
+in a crash only costs time.
+
+The app may keep saving while a rotation runs. A file (or its journal)
+that changes while it's being re-encrypted is read again rather than
+replaced. EncryptionService reloads rotated key files, and TaxData follows
+a return rewritten under it, so sessions left open never encrypt with a
+deleted key.
+
+Backups keep returns as they were saved, encrypted with the app key
+under the backup key. The app rotation re-encrypts those returns inside
+each archive (keeping its backup key) and uploads it again, so a backup
+taken before the rotation still restores to a loadable return.
+
+Session data (sessions.json) is stored unencrypted and has nothing to
+rotate.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import math
+import os
+import stat
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Set, Tuple
+
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+
+from config.app_config import AppConfig
+from models.tax_data import legacy_integrity_key, verify_legacy_package
+from services.cloud_backup_service import CloudBackupService, iter_archive_entries, write_archive_entry
+from services.encryption_service import EncryptionService
+from services.exceptions import InvalidInputException, ServiceExecutionException
+from utils.save_journal import JOURNAL_SUFFIX, SaveJournal, apply_change, file_state, fsync_directory, journal_path
+from utils.secure_container import ContainerError, is_container, read_container, write_container
+from utils.segmented_container import index_digest, is_segmented, read_segmented, write_segmented
+
+logger = logging.getLogger(__name__)
+
+ROTATION_SCOPES = ("app", "backups")
+
+# How each kind of artifact is re-encrypted (see _RotationWorker)
+KIND_RETURN = "return"
+KIND_TOKEN_FILE = "token_file"
+KIND_TOKEN_FIELDS = "token_fields"
+KIND_ARCHIVE = "archive"
+KIND_BACKUP_RETURNS = "backup_returns"
+
+# Suffix of the per-file copies in a backup and of their archive entries
+_BACKUP_ENTRY_SUFFIX = ".encrypted"
+
+# Attempts at a file that is saved again while it's being rotated
+_CHANGE_ATTEMPTS = 5
+
+
+@dataclass
+class KeyRotationReport:
+    """Outcome and throughput of a key rotation run"""
+    scope: str
+    total_files: int = 0
+    rotated: int = 0
+    already_rotated: int = 0  # Done by an interrupted run, per the checkpoint
+    skipped: int = 0  # Nothing in the file was encrypted with the key
+    failures: Dict[str, str] = field(default_factory=dict)
+    bytes_processed: int = 0
+    elapsed_seconds: float = 0.0
+    completed: bool = False  # Old keys were deleted
+
+    @property
+    def files_per_second(self) -> float:
+        """Files rotated or skipped per second of this run"""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return (self.rotated + self.skipped) / self.elapsed_seconds
+
+    @property
+    def mb_per_second(self) -> float:
+        """Megabytes read per second of this run"""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.bytes_processed / (1024 * 1024) / self.elapsed_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        data = asdict(self)
+        data['files_per_second'] = self.files_per_second
+        data['mb_per_second'] = self.mb_per_second
+        return data
+
+
+@dataclass
+class _FileResult:
+    """What a worker did with one file"""
+    path: str
+    kind: str
+    status: str  # rotated, skipped or failed
+    size: int = 0
+    error: str = ""
+
+
+class KeyRotationService:
+    """
+    Re-encrypts everything protected by one key with a new key.
+
+    rotate() starts a rotation, or resumes one that was interrupted, and
+    returns a KeyRotationReport. The old keys are deleted only when every
+    file was rotated; otherwise they stay valid and the next rotate()
+    retries the files that failed.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        scope: str = "app",
+        encryption_service: Optional[EncryptionService] = None,
+        backup_service: Optional[CloudBackupService] = None,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize key rotation service.
+
+        Args:
+            config: Application configuration
+            scope: Key to rotate, one of ROTATION_SCOPES
+            encryption_service: Service of the app key (app scope)
+            backup_service: Service owning the backups and their key
+            max_workers: Worker processes (1 rotates in this process)
+
+        Raises:
+            InvalidInputException: If scope is unknown
+        """
+        if scope not in ROTATION_SCOPES:
+            raise InvalidInputException(
+                field_name="scope",
+                message=f"Scope must be one of {ROTATION_SCOPES}",
+                details={"scope": scope}
+            )
+        self.config = config
+        self.scope = scope
+        self.max_workers = max_workers
+        self.safe_dir = Path(config.safe_dir)
+        self.backup_service = backup_service or CloudBackupService(config)
+        if scope == "backups":
+            self.encryption = self.backup_service.encryption_service
+        else:
+            self.encryption = encryption_service or EncryptionService(config.key_file)
+        self.checkpoint_file = self.safe_dir / f".key_rotation_{scope}.jsonl"
+
+    @property
+    def in_progress(self) -> bool:
+        """Whether a rotation was started and not finished"""
+        return bool(self.encryption.get_retired_keys())
+
+    def discover(self) -> List[Tuple[Path, str]]:
+        """
+        Find the files encrypted with this scope's key.
+
+        Returns:
+            Paths and how to re-encrypt each, in a stable order
+        """
+        backup_dir = self.safe_dir / "backups"
+        if self.scope == "backups":
+            return (
+                [(path, KIND_TOKEN_FILE) for path in sorted(backup_dir.glob("*/*.encrypted"))]
+                + [(path, KIND_ARCHIVE) for path in sorted(backup_dir.glob("*/*.backup"))]
+            )
+
+        files = [
+            (path, KIND_RETURN) for path in sorted(self.safe_dir.rglob("*.enc"))
+            # Skip temporary files of interrupted saves
+            if not path.name.startswith(".") and backup_dir not in path.parents
+        ]
+        for name in ("ptin_records.json", "ero_records.json"):
+            path = self.safe_dir / "ptin_ero" / name
+            if path.exists():
+                files.append((path, KIND_TOKEN_FILE))
+        profile = self.safe_dir / "accessibility_profile.json"
+        if profile.exists():
+            files.append((profile, KIND_TOKEN_FIELDS))
+        files.extend((path, KIND_BACKUP_RETURNS) for path in sorted(backup_dir.glob("*/*.backup")))
+        return files
+
+    def rotate(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> KeyRotationReport:
+        """
+        Rotate the key, or resume an interrupted rotation.
+
+        Args:
+            progress_callback: Optional callback function(completed, total)
+                over the files still to rotate
+
+        Returns:
+            KeyRotationReport of this run
+
+        Raises:
+            ServiceExecutionException: If the worker pool fails; the
+                rotation can be resumed
+        """
+        if not self.in_progress:
+            # Left behind by a run that finished before removing it
+            self.checkpoint_file.unlink(missing_ok=True)
+        self.encryption.stage_new_key()
+        keys = self.encryption.get_fernet_keys()
+        fingerprint = hashlib.sha256(keys[0]).hexdigest()[:16]
+        done = self._read_checkpoint(fingerprint)
+
+        files = self.discover()
+        pending = [(str(path), kind) for path, kind in files if self._relative(path) not in done]
+        backup_keys = None
+        if any(kind == KIND_BACKUP_RETURNS for _, kind in pending):
+            backup_keys = self.backup_service.encryption_service.get_fernet_keys()
+        report = KeyRotationReport(
+            scope=self.scope,
+            total_files=len(files),
+            already_rotated=len(files) - len(pending)
+        )
+        logger.info(f"Rotating {self.scope} key: {len(pending)} of {len(files)} files to re-encrypt")
+
+        started = time.perf_counter()
+        total = len(pending)
+        if not done:
+            self._write_checkpoint_header(fingerprint)
+        with open(self.checkpoint_file, 'a', encoding='utf-8') as checkpoint:
+            def record(result: _FileResult) -> None:
+                self._record_result(result, report, checkpoint)
+                if progress_callback:
+                    progress_callback(report.rotated + report.skipped + len(report.failures), total)
+
+            try:
+                if self.max_workers == 1 or total <= 1:
+                    worker = _RotationWorker(keys, backup_keys)
+                    for task in pending:
+                        record(worker.rotate(*task))
+                else:
+                    with ProcessPoolExecutor(max_workers=self.max_workers,
+                                             initializer=_init_rotation_worker,
+                                             initargs=(keys, backup_keys)) as executor:
+                        # Several chunks per worker keeps progress updates flowing
+                        workers = self.max_workers or os.cpu_count() or 1
+                        chunk_size = max(1, math.ceil(total / (workers * 4)))
+                        futures = [
+                            executor.submit(_run_rotation_chunk, pending[start:start + chunk_size])
+                            for start in range(0, total, chunk_size)
+                        ]
+                        for future in as_completed(futures):
+                            for result in future.result():
+                                record(result)
+            except Exception as e:
+                raise ServiceExecutionException(
+                    service_name="KeyRotationService",
+                    operation="rotate",
+                    details={"error": str(e), "scope": self.scope}
+                ) from e
+            finally:
+                report.elapsed_seconds = time.perf_counter() - started
+
+        if report.failures:
+            logger.warning(f"Key rotation left {len(report.failures)} files on the old key; "
+                           f"old keys are kept until they are rotated")
+        else:
+            self.encryption.retire_old_keys()
+            self.checkpoint_file.unlink(missing_ok=True)
+            report.completed = True
+        logger.info(f"Rotated {report.rotated} files in {report.elapsed_seconds:.2f}s "
+                    f"({report.files_per_second:.1f} files/s, {report.mb_per_second:.2f} MB/s)")
+        return report
+
+    def _relative(self, path: Path) -> str:
+        return Path(path).relative_to(self.safe_dir).as_posix()
+
+    def _record_result(self, result: _FileResult, report: KeyRotationReport, checkpoint) -> None:
+        """Count a file and mark it done in the checkpoint"""
+        path = Path(result.path)
+        if result.status == "rotated" and result.kind in (KIND_ARCHIVE, KIND_BACKUP_RETURNS):
+            # The cloud copy must be replaced before the old key goes
+            if not self.backup_service.replace_backup_archive(path.parent.name):
+                result = _FileResult(result.path, result.kind, "failed", error="Upload of the rotated archive failed")
+
+        if result.status == "failed":
+            report.failures[self._relative(path)] = result.error
+            logger.error(f"Failed to rotate key of {path.name}: {result.error}")
+            return
+        if result.status == "rotated":
+            report.rotated += 1
+        else:
+            report.skipped += 1
+        report.bytes_processed += result.size
+        checkpoint.write(json.dumps({"path": self._relative(path)}) + "\n")
+        checkpoint.flush()
+
+    def _read_checkpoint(self, fingerprint: str) -> Set[str]:
+        """Paths already rotated to the current key"""
+        try:
+            with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return set()
+        done = set()
+        try:
+            header = json.loads(lines[0])
+            if header.get("scope") != self.scope or header.get("key") != fingerprint:
+                return set()
+            for line in lines[1:]:
+                done.add(json.loads(line)["path"])
+        except (IndexError, ValueError, KeyError, TypeError):
+            # A torn last line; what was read before it still counts
+            pass
+        return done
+
+    def _write_checkpoint_header(self, fingerprint: str) -> None:
+        header = {"scope": self.scope, "key": fingerprint, "started": datetime.now().isoformat()}
+        _replace_file(self.checkpoint_file, lambda f: f.write((json.dumps(header) + "\n").encode('utf-8')))
+
+
+class _FileChanged(Exception):
+    """A file was saved by someone else while it was being rotated"""
+
+
+def _rotation_state(path: Path) -> Tuple[Any, Any]:
+    """Versions of a file and of the journal that may sit next to it"""
+    return file_state(path), file_state(journal_path(path))
+
+
+def _replace_file(path: Path, write: Callable[[BinaryIO], Any], expected: Optional[Tuple[Any, Any]] = None) -> None:
+    """
+    Write a file owner-only through a temporary file and swap it in durably.
+
+    Raises:
+        _FileChanged: If the file no longer has the expected _rotation_state()
+    """
+    temp_path = path.with_name(f".{path.name}.tmp")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(temp_path, flags, stat.S_IRUSR | stat.S_IWUSR)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, stat.S_IRUSR | stat.S_IWUSR)
+        if expected is not None and _rotation_state(path) != expected:
+            raise _FileChanged(path.name)
+        os.replace(temp_path, path)
+        fsync_directory(path.parent)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+class _RotationWorker:
+    """Re-encrypts files under the first of a list of keys"""
+
+    def __init__(self, fernet_keys: List[bytes], backup_keys: Optional[List[bytes]] = None):
+        self.fernet = MultiFernet([Fernet(key) for key in fernet_keys])
+        self.backup_fernet = MultiFernet([Fernet(key) for key in backup_keys]) if backup_keys else None
+        self.container_keys = [base64.urlsafe_b64decode(key) for key in fernet_keys]
+        self.integrity_keys = [legacy_integrity_key(key) for key in fernet_keys]
+        self._expected: Optional[Tuple[Any, Any]] = None
+
+    def rotate(self, path: str, kind: str) -> _FileResult:
+        file_path = Path(path)
+        handler = {
+            KIND_RETURN: self._rotate_return,
+            KIND_TOKEN_FILE: self._rotate_token_file,
+            KIND_TOKEN_FIELDS: self._rotate_token_fields,
+            KIND_ARCHIVE: self._rotate_archive,
+            KIND_BACKUP_RETURNS: self._rotate_backup_returns,
+        }[kind]
+        for _ in range(_CHANGE_ATTEMPTS):
+            self._expected = _rotation_state(file_path)
+            try:
+                size = file_path.stat().st_size
+                rotated = handler(file_path)
+            except _FileChanged:
+                continue
+            except Exception as e:
+                return _FileResult(path, kind, "failed", error=f"{type(e).__name__}: {e}")
+            return _FileResult(path, kind, "rotated" if rotated else "skipped", size)
+        return _FileResult(path, kind, "failed", error="File kept changing while it was rotated")
+
+    def _replace(self, path: Path, write: Callable[[BinaryIO], Any]) -> None:
+        """Swap in the re-encrypted file, unless it was saved since it was read"""
+        _replace_file(path, write, self._expected)
+
+    def _read_with_any_key(self, fileobj: BinaryIO, read: Callable[[BinaryIO, bytes], Any]) -> Tuple[Any, bytes]:
+        start = fileobj.tell()
+        for master_key in self.container_keys[:-1]:
+            try:
+                return read(fileobj, master_key), master_key
+            except ContainerError:
+                fileobj.seek(start)
+        return read(fileobj, self.container_keys[-1]), self.container_keys[-1]
+
+    def _rotate_return(self, path: Path) -> bool:
+        return self._reencrypt_return(path, self._replace)
+
+    def _reencrypt_return(self, path: Path, replace: Callable[[Path, Callable[[BinaryIO], Any]], None]) -> bool:
+        new_key = self.container_keys[0]
+        with open(path, 'rb') as f:
+            prefix = f.read(4)
+            f.seek(0)
+            if is_segmented(prefix):
+                (shared, years), master_key = self._read_with_any_key(
+                    f, lambda f, key: read_segmented(f, key, path)
+                )
+                # A plain dict, so every year is encrypted again rather than copied
+                data = {"years": dict(years.items()), **shared}
+            elif is_container(prefix):
+                payload, _ = self._read_with_any_key(f, read_container)
+                replace(path, lambda out: write_container(out, new_key, [bytes(payload)]))
+                return True
+            else:
+                return self._rotate_legacy_return(path, f.read(), replace)
+
+        # The journal's key derives from the old key, so fold it into the new file
+        journal = SaveJournal(path, master_key)
+        for change in journal.open(index_digest(path)):
+            apply_change(data, change)
+        years = data.pop("years")
+        replace(path, lambda out: write_segmented(out, new_key, data, years))
+        journal.discard()
+        return True
+
+    def _rotate_legacy_return(self, path: Path, raw: bytes,
+                              replace: Callable[[Path, Callable[[BinaryIO], Any]], None]) -> bool:
+        """Re-encrypt a Fernet-era return, renewing its MAC"""
+        try:
+            plaintext = self.fernet.decrypt(raw)
+        except InvalidToken:
+            try:
+                json.loads(raw.decode('utf-8'))
+            except (ValueError, UnicodeDecodeError):
+                raise ValueError("Not encrypted with the current or a retired key") from None
+            return False  # Legacy plaintext, nothing to re-encrypt
+
+        package = json.loads(plaintext)
+        if isinstance(package, dict) and 'mac' in package and 'data' in package:
+            verify_legacy_package(package, self.integrity_keys)
+            json_data = json.dumps(package['data'], indent=2, sort_keys=True).encode()
+            package['mac'] = hmac.new(self.integrity_keys[0], json_data, hashlib.sha256).hexdigest()
+            plaintext = json.dumps(package).encode('utf-8')
+        replace(path, lambda out: out.write(self.fernet.encrypt(plaintext)))
+        return True
+
+    def _rotate_token_file(self, path: Path) -> bool:
+        raw = path.read_bytes()
+        if not raw:
+            return False
+        self._replace(path, lambda out: out.write(self.fernet.rotate(raw)))
+        return True
+
+    def _rotate_token_fields(self, path: Path) -> bool:
+        """Re-encrypt the Fernet token string values of a JSON file"""
+        rotated = 0
+
+        def rotate_value(value: Any) -> Any:
+            nonlocal rotated
+            if isinstance(value, dict):
+                return {key: rotate_value(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [rotate_value(item) for item in value]
+            if isinstance(value, str) and value:
+                try:
+                    token = self.fernet.rotate(value.encode('utf-8')).decode('utf-8')
+                except InvalidToken:
+                    return value
+                rotated += 1
+                return token
+            return value
+
+        data = rotate_value(json.loads(path.read_text(encoding='utf-8')))
+        if not rotated:
+            return False
+        self._replace(path, lambda out: out.write(json.dumps(data, indent=2).encode('utf-8')))
+        return True
+
+    def _rotate_archive(self, path: Path) -> bool:
+        with open(path, 'rb') as f:
+            entries = [(name, self.fernet.rotate(data)) for name, data in iter_archive_entries(f)]
+
+        def write(out: BinaryIO) -> None:
+            out.write(len(entries).to_bytes(4, byteorder='big'))
+            for name, data in entries:
+                write_archive_entry(out, name, data)
+
+        self._replace(path, write)
+        return True
+
+    def _rotate_backup_returns(self, path: Path) -> bool:
+        """
+        Re-encrypt the returns inside a backup archive with the new app key.
+
+        Returns are unpacked into a private staging directory next to their
+        journals, rotated there like saved returns (folding the journals in)
+        and packed again under the unchanged backup key. The backup's
+        per-file copies are rewritten to match the archive.
+        """
+        with open(path, 'rb') as f:
+            entries = list(iter_archive_entries(f))
+        names = {name for name, _ in entries}
+        rotated: Dict[str, Optional[bytes]] = {}
+        with tempfile.TemporaryDirectory(dir=path.parent) as staging_dir:
+            staging = Path(staging_dir)
+            for name, token in entries:
+                plain_name = name[:-len(_BACKUP_ENTRY_SUFFIX)] if name.endswith(_BACKUP_ENTRY_SUFFIX) else name
+                if plain_name.endswith((".enc", ".enc" + JOURNAL_SUFFIX)):
+                    (staging / plain_name).write_bytes(self.backup_fernet.decrypt(token))
+            for name, _ in entries:
+                staged = staging / name[:-len(_BACKUP_ENTRY_SUFFIX)]
+                if not name.endswith(".enc" + _BACKUP_ENTRY_SUFFIX) or not staged.exists():
+                    continue
+                try:
+                    changed = self._reencrypt_return(staged, _replace_file)
+                except (ContainerError, ValueError) as e:
+                    # Not written with any app key, so retiring the old one can't hurt it
+                    logger.warning(f"Leaving backed-up {staged.name} of {path.parent.name} as is: {e}")
+                    continue
+                if changed:
+                    rotated[name] = self.backup_fernet.encrypt(staged.read_bytes())
+                    journal = journal_path(staged)
+                    if not journal.exists() and journal.name + _BACKUP_ENTRY_SUFFIX in names:
+                        rotated[journal.name + _BACKUP_ENTRY_SUFFIX] = None  # Folded into its return
+        if not rotated:
+            return False
+
+        kept = []
+        for name, data in entries:
+            data = rotated.get(name, data)
+            if data is not None:
+                kept.append((name, data))
+
+        def write(out: BinaryIO) -> None:
+            out.write(len(kept).to_bytes(4, byteorder='big'))
+            for name, data in kept:
+                write_archive_entry(out, name, data)
+
+        self._replace(path, write)
+        for name, data in rotated.items():
+            copy = path.parent / name
+            if data is None:
+                copy.unlink(missing_ok=True)
+            elif copy.exists():
+                _replace_file(copy, lambda out: out.write(data))
+        return True
+
+
+# Per-process rotation worker, created once by the pool initializer
+_rotation_worker: Optional[_RotationWorker] = None
+
+
+def _init_rotation_worker(fernet_keys: List[bytes], backup_keys: Optional[List[bytes]]) -> None:
+    global _rotation_worker
+    _rotation_worker = _RotationWorker(fernet_keys, backup_keys)
+
+
+def _run_rotation_chunk(tasks: List[Tuple[str, str]]) -> List[_FileResult]:
+    return [_rotation_worker.rotate(path, kind) for path, kind in tasks]
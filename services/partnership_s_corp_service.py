@@ -14,6 +14,7 @@ from enum import Enum
 
 from config.app_config import AppConfig
 from utils.error_tracker import get_error_tracker
+from utils.money import from_cents, sum_money, to_cents
 from services.exceptions import (
     InvalidInputException,
     DataValidationException,
@@ -109,12 +110,15 @@ class BusinessIncome:
 
     def calculate_gross_profit(self) -> Decimal:
         """Calculate gross profit"""
-        self.gross_profit = self.gross_receipts - self.returns_allowances - self.cost_of_goods_sold
+        self.gross_profit = from_cents(
+            to_cents(self.gross_receipts) - to_cents(self.returns_allowances) - to_cents(self.cost_of_goods_sold)
+        )
         return self.gross_profit
 
     def total_ordinary_income(self) -> Decimal:
         """Calculate total ordinary income"""
-        return self.gross_profit + self.dividends + self.interest_income + self.rents + self.royalties + self.other_income
+        return sum_money((self.gross_profit, self.dividends, self.interest_income,
+                          self.rents, self.royalties, self.other_income))
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for storage"""
@@ -165,12 +169,12 @@ class BusinessDeductions:
 
     def total_deductions(self) -> Decimal:
         """Calculate total deductions"""
-        return (
-            self.compensation_officers + self.salaries_wages + self.repairs_maintenance +
-            self.bad_debts + self.rents + self.taxes_licenses + self.charitable_contributions +
-            self.advertising + self.pension_plans + self.employee_benefits + self.utilities +
-            self.supplies + self.other_expenses
-        )
+        return sum_money((
+            self.compensation_officers, self.salaries_wages, self.repairs_maintenance,
+            self.bad_debts, self.rents, self.taxes_licenses, self.charitable_contributions,
+            self.advertising, self.pension_plans, self.employee_benefits, self.utilities,
+            self.supplies, self.other_expenses
+        ))
 
     def calculate_total_deductions(self) -> Decimal:
         """Calculate total deductions (alias for total_deductions)"""
@@ -45,6 +45,7 @@ from services.exceptions import (
     ServiceExecutionException
 )
 from services.error_logger import get_error_logger
+from utils.record_store import RecordStore
 from enum import Enum
 import hashlib
 import secrets
@@ -137,7 +138,7 @@ class QuickBooksAccount:
     tax_code_ref: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class QuickBooksTransaction:
     """Represents a QuickBooks transaction"""
     transaction_id: str
@@ -159,6 +160,20 @@ class QuickBooksTransaction:
             self.line_items = []
 
 
+# Column layout for stored company transactions
+QUICKBOOKS_TRANSACTION_COLUMNS = {
+    'transaction_type': 'category',
+    'date': 'datetime',
+    'amount': 'float',
+    'account_id': 'category',
+    'tax_amount': 'float',
+    'is_taxable': 'bool',
+    'category': 'category',
+    'tax_relevant': 'bool',
+    'confidence_score': 'float',
+}
+
+
 @dataclass
 class TaxMappingResult:
     """Result of tax category mapping"""
@@ -191,7 +206,7 @@ class QuickBooksIntegrationService:
 
         self.companies: Dict[str, QuickBooksCompany] = {}
         self.accounts: Dict[str, List[QuickBooksAccount]] = {}
-        self.transactions: Dict[str, List[QuickBooksTransaction]] = {}
+        self.transactions: Dict[str, RecordStore] = {}
         self.auth_tokens: Dict[str, Dict[str, Any]] = {}
 
         # Initialize encryption
@@ -481,7 +496,9 @@ class QuickBooksIntegrationService:
             mock_transactions = self._generate_mock_transactions(company_id)
 
             self.accounts[company_id] = mock_accounts
-            self.transactions[company_id] = mock_transactions
+            self.transactions[company_id] = RecordStore(
+                QuickBooksTransaction, QUICKBOOKS_TRANSACTION_COLUMNS, mock_transactions
+            )
 
             company.last_sync = datetime.now()
 
@@ -0,0 +1,274 @@
+"""
+Return Index Service
+
+Keeps a local SQLite index of per-return metadata (client, tax year, filing
+status, AGI band, status, last modified and required forms), so client
+returns can be listed, filtered and sorted without decrypting each file.
+
+Rows are written by TaxData whenever a return is saved or autosaved;
+returns saved before the index existed are added once by
+models.tax_data.index_saved_returns(). The index holds no names, SSNs or
+amounts: AGI is stored only as the lower bound of a coarse band.
+"""
+
+import bisect
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from config.app_config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "return_index.db"
+SCHEMA_VERSION = 2
+
+# Lower bounds of the AGI bands returns are indexed under
+AGI_BANDS = (0, 25_000, 50_000, 100_000, 200_000, 500_000, 1_000_000)
+
+# Prefix of the per-client directories created by AuthenticationService
+CLIENT_DIRECTORY_PREFIX = "client_data_"
+
+SORT_COLUMNS = ("last_modified", "tax_year", "client_id", "filing_status", "agi_band", "status", "path")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS returns (
+    path TEXT NOT NULL,
+    tax_year INTEGER NOT NULL,
+    client_id TEXT NOT NULL,
+    return_type TEXT NOT NULL,
+    filing_status TEXT NOT NULL,
+    agi_band INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    last_modified TEXT NOT NULL,
+    required_forms TEXT NOT NULL,
+    filed_date TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (path, tax_year)
+);
+CREATE INDEX IF NOT EXISTS returns_client ON returns (client_id, tax_year);
+CREATE INDEX IF NOT EXISTS returns_year ON returns (tax_year, filing_status);
+CREATE INDEX IF NOT EXISTS returns_modified ON returns (last_modified);
+CREATE TABLE IF NOT EXISTS return_forms (
+    path TEXT NOT NULL,
+    tax_year INTEGER NOT NULL,
+    form TEXT NOT NULL,
+    PRIMARY KEY (path, tax_year, form),
+    FOREIGN KEY (path, tax_year) REFERENCES returns (path, tax_year) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS return_forms_form ON return_forms (form);
+CREATE TABLE IF NOT EXISTS index_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Columns added after version 1, by the version that added them
+_MIGRATIONS = {
+    2: "ALTER TABLE returns ADD COLUMN filed_date TEXT NOT NULL DEFAULT ''",
+}
+
+
+def agi_band(agi: float) -> int:
+    """Lower bound of the AGI band an amount falls in"""
+    return AGI_BANDS[max(0, bisect.bisect_right(AGI_BANDS, agi) - 1)]
+
+
+def client_id_for_path(path: Path) -> str:
+    """Client a return belongs to, from its client data directory ("" if none)"""
+    name = Path(path).parent.name
+    return name[len(CLIENT_DIRECTORY_PREFIX):] if name.startswith(CLIENT_DIRECTORY_PREFIX) else ""
+
+
+@dataclass
+class ReturnSummary:
+    """Indexed metadata of one tax year of a saved return"""
+    path: str
+    tax_year: int
+    client_id: str = ""
+    return_type: str = "original"  # original, amended
+    filing_status: str = ""
+    agi_band: int = 0
+    status: str = "draft"
+    last_modified: str = ""
+    required_forms: List[str] = field(default_factory=list)
+    filed_date: str = ""
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> 'ReturnSummary':
+        """Create from an index row"""
+        data = dict(row)
+        data['required_forms'] = json.loads(data['required_forms'])
+        return cls(**data)
+
+
+class ReturnIndexService:
+    """
+    SQLite index of saved return metadata.
+
+    The database runs in WAL mode, so the portal can read while a save
+    writes. One connection is shared by all threads, guarded by a lock.
+    """
+
+    def __init__(self, config: AppConfig, db_path: Optional[Path] = None):
+        """
+        Open the index, creating it if needed.
+
+        Args:
+            config: Application configuration
+            db_path: Database file (default: safe_dir/return_index.db)
+        """
+        self.config = config
+        self.db_path = Path(db_path) if db_path is not None else config.safe_dir / INDEX_FILENAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            self._conn.executescript(_SCHEMA)
+            if version:
+                for added_in, statement in sorted(_MIGRATIONS.items()):
+                    if version < added_in:
+                        self._conn.execute(statement)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        logger.info(f"Opened return index: {self.db_path}")
+
+    def record(self, summary: ReturnSummary, years: Optional[Iterable[Union[int, str]]] = None) -> None:
+        """
+        Add or replace a return's row for one tax year.
+
+        Args:
+            summary: Metadata of the year
+            years: All tax years in the file; rows for other years of the
+                same file are removed (default: keep them)
+        """
+        with self._lock, self._conn:
+            if years is not None:
+                kept = [year for year in years if isinstance(year, int)]
+                self._conn.execute(
+                    f"DELETE FROM returns WHERE path = ? AND tax_year NOT IN ({','.join('?' * len(kept))})",
+                    (summary.path, *kept)
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO returns (path, tax_year, client_id, return_type, filing_status, "
+                "agi_band, status, last_modified, required_forms, filed_date) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (summary.path, summary.tax_year, summary.client_id, summary.return_type,
+                 summary.filing_status, summary.agi_band, summary.status, summary.last_modified,
+                 json.dumps(summary.required_forms), summary.filed_date)
+            )
+            self._conn.execute("DELETE FROM return_forms WHERE path = ? AND tax_year = ?",
+                               (summary.path, summary.tax_year))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO return_forms VALUES (?, ?, ?)",
+                [(summary.path, summary.tax_year, form) for form in summary.required_forms]
+            )
+
+    def remove(self, path: Union[str, Path]) -> None:
+        """Remove every row of a return file"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM returns WHERE path = ?", (str(path),))
+
+    def list_returns(
+        self,
+        client_id: Optional[str] = None,
+        tax_year: Optional[int] = None,
+        filing_status: Optional[str] = None,
+        status: Optional[str] = None,
+        min_agi: Optional[float] = None,
+        max_agi: Optional[float] = None,
+        form: Optional[str] = None,
+        order_by: str = "last_modified",
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[ReturnSummary]:
+        """
+        List indexed returns matching all given filters.
+
+        Args:
+            client_id: Only this client's returns ("" for the user's own)
+            tax_year: Only this tax year
+            filing_status: Only this filing status
+            status: Only this status
+            min_agi: Only bands that can hold an AGI of at least this
+            max_agi: Only bands starting at or below this AGI
+            form: Only returns requiring this form
+            order_by: One of SORT_COLUMNS
+            descending: Sort descending
+            limit: Maximum rows to return
+            offset: Rows to skip, for paging
+
+        Returns:
+            Matching returns, sorted
+
+        Raises:
+            ValueError: If order_by is not a sortable column
+        """
+        if order_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {order_by!r}; use one of {SORT_COLUMNS}")
+        where, params = [], []
+        for column, value in (("client_id", client_id), ("tax_year", tax_year),
+                              ("filing_status", filing_status), ("status", status)):
+            if value is not None:
+                where.append(f"r.{column} = ?")
+                params.append(value)
+        if min_agi is not None:
+            where.append("r.agi_band >= ?")
+            params.append(agi_band(min_agi))
+        if max_agi is not None:
+            where.append("r.agi_band <= ?")
+            params.append(max_agi)
+        if form is not None:
+            where.append("EXISTS (SELECT 1 FROM return_forms f "
+                         "WHERE f.path = r.path AND f.tax_year = r.tax_year AND f.form = ?)")
+            params.append(form)
+
+        sql = "SELECT r.* FROM returns r"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY r.{order_by} {'DESC' if descending else 'ASC'}, r.path, r.tax_year"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [ReturnSummary.from_row(row) for row in rows]
+
+    def indexed_paths(self) -> Set[str]:
+        """Paths of every indexed return file"""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT path FROM returns").fetchall()
+        return {path for (path,) in rows}
+
+    @property
+    def backfilled(self) -> bool:
+        """Whether returns saved before the index existed were added"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM index_state WHERE key = 'backfilled'").fetchone()
+        return row is not None
+
+    def mark_backfilled(self) -> None:
+        """Record that existing returns were added, so it's done only once"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO index_state VALUES ('backfilled', ?)",
+                               (datetime.now().isoformat(),))
+
+    def count_by_client(self) -> Dict[str, int]:
+        """Number of indexed returns per client id"""
+        with self._lock:
+            rows = self._conn.execute("SELECT client_id, COUNT(*) FROM returns GROUP BY client_id").fetchall()
+        return {client_id: count for client_id, count in rows}
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
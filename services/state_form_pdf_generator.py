@@ -6,17 +6,28 @@ This module provides functionality for:
 - PDF creation for state tax returns
 - Form field population for major states
 - State form validation and completion
+
+A state with a fillable template in templates/state_forms is filled from its
+prepared field data through the shared template cache. Other states get a
+summary form: the static part (title, section tables, labels, disclaimer) is
+rendered once per state and tax year and cached, and each return only draws
+its values on an overlay that is stamped onto a copy of that background.
 """
 
+import io
 import logging
 import os
-from typing import Dict, Any, Optional, List
+import threading
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 from dataclasses import dataclass
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import Paragraph
 from reportlab.lib import colors
 
 from services.state_tax_service import StateTaxService, StateCode, StateTaxCalculation
@@ -24,10 +35,55 @@ from constants.pdf_fields import (
     California540Fields, NewYorkIT201Fields, NewJersey1040Fields,
     IllinoisIL1040Fields, PennsylvaniaPA40Fields, Massachusetts1Fields
 )
+from utils.pdf.form_filler import PDFFormFiller
 from utils.pdf.pdf_generator import TaxReturnPDFGenerator
 
 logger = logging.getLogger(__name__)
 
+# Summary form layout (points on a letter page)
+PAGE_WIDTH, PAGE_HEIGHT = letter
+MARGIN = 72
+VALUE_COLUMN_X = 312
+HEADER_ROW_HEIGHT = 24
+ROW_HEIGHT = 18
+SECTION_GAP = 42
+
+# Resource name of the font the per-return values are drawn in
+OVERLAY_FONT = "FValue"
+
+# (heading, column titles, row labels, whether values are right-aligned)
+SUMMARY_SECTIONS: List[Tuple[str, Tuple[str, str], Tuple[str, ...], bool]] = [
+    ("Taxpayer Information", ("Field", "Value"),
+     ("Name", "SSN", "Address", "City, State, ZIP", "Filing Status", "Dependents"), False),
+    ("Income Information", ("Income Type", "Amount"),
+     ("Federal Adjusted Gross Income", "Wages", "Interest", "Dividends", "Business Income"), True),
+    ("Tax Calculation", ("Calculation Item", "Amount"),
+     ("Taxable Income", "Tax Rate", "Tax Owed", "Credits", "Net Tax Due"), True),
+]
+
+DISCLAIMER = """
+<b>Important Notice:</b> This is a computer-generated representation of your state tax return for informational purposes only.
+It is not an official tax form and should not be filed with your state tax authority.
+Please consult with a tax professional and use official state tax forms for actual filing.
+"""
+
+
+def _pdf_string(text: str) -> str:
+    """Escape text for a PDF literal string"""
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _summary_row_positions() -> List[List[float]]:
+    """Baseline of each summary row's text, per section"""
+    positions = []
+    top = PAGE_HEIGHT - MARGIN - 40
+    for _, _, labels, _ in SUMMARY_SECTIONS:
+        table_top = top - 14
+        first_row = table_top - HEADER_ROW_HEIGHT
+        positions.append([first_row - ROW_HEIGHT * (row + 1) + 5 for row in range(len(labels))])
+        top = first_row - ROW_HEIGHT * len(labels) - SECTION_GAP + 14
+    return positions
+
 
 @dataclass
 class StateFormData:
@@ -55,6 +111,13 @@ class StateFormPDFGenerator:
         # Ensure templates directory exists
         self.templates_dir.mkdir(parents=True, exist_ok=True)
 
+        # Parsed templates are cached process-wide, so fills reuse them
+        self.form_filler = PDFFormFiller(str(self.templates_dir))
+
+    # Rendered summary backgrounds by (state, tax year), shared by all instances
+    _backgrounds: Dict[Tuple[StateCode, int], PdfReader] = {}
+    _backgrounds_lock = threading.Lock()
+
     def generate_state_form_pdf(self, form_data: StateFormData,
                               output_path: Optional[str] = None) -> str:
         """
@@ -77,18 +140,28 @@ class StateFormPDFGenerator:
         if output_path is None:
             output_path = self._generate_output_path(form_data)
 
-        # Prepare form field data
-        field_data = self._prepare_form_fields(form_data)
-
-        # Generate PDF using reportlab
         try:
-            self._generate_pdf_with_reportlab(form_data, output_path)
+            template_path = self._find_template(form_data.state_code)
+            if template_path is not None:
+                # Fill the state's own form from its prepared field data
+                field_data = self._prepare_form_fields(form_data)
+                self.form_filler.fill_form(template_path.stem, field_data, output_path)
+            else:
+                self._generate_summary_pdf(form_data, output_path)
             logger.info(f"Generated state form PDF: {output_path}")
             return output_path
         except Exception as e:
             logger.error(f"Failed to generate state form PDF: {e}")
             raise
 
+    def _find_template(self, state_code: StateCode) -> Optional[Path]:
+        """Fillable template for a state, if one is installed"""
+        try:
+            template_path = self._get_template_path(state_code)
+        except ValueError:
+            return None
+        return template_path if template_path.exists() else None
+
     def get_supported_states(self) -> List[StateCode]:
         """Get list of states supported for PDF generation"""
         return [
@@ -694,100 +767,144 @@ class StateFormPDFGenerator:
 
         return fields
 
-    def _generate_pdf_with_reportlab(self, form_data: StateFormData, output_path: str):
-        """Generate PDF using reportlab with form data"""
-        doc = SimpleDocTemplate(output_path, pagesize=letter)
-        styles = getSampleStyleSheet()
-        story = []
-
-        # Title
-        state_info = self.state_service.get_state_info(form_data.state_code)
-        state_name = state_info.name if state_info else form_data.state_code.value
-        title = f"{state_name} State Income Tax Return - {form_data.tax_year}"
-        story.append(Paragraph(title, styles['Title']))
-        story.append(Spacer(1, 12))
-
-        # Taxpayer Information
-        story.append(Paragraph("Taxpayer Information", styles['Heading2']))
-        taxpayer_data = [
-            ["Field", "Value"],
-            ["Name", f"{form_data.taxpayer_info.get('first_name', '')} {form_data.taxpayer_info.get('last_name', '')}"],
-            ["SSN", form_data.taxpayer_info.get('ssn', '')],
-            ["Address", form_data.taxpayer_info.get('address', '')],
-            ["City, State, ZIP", f"{form_data.taxpayer_info.get('city', '')}, {form_data.taxpayer_info.get('state', '')} {form_data.taxpayer_info.get('zip_code', '')}"],
-            ["Filing Status", form_data.filing_status.title()],
-            ["Dependents", str(form_data.dependents)]
-        ]
-        taxpayer_table = Table(taxpayer_data)
-        taxpayer_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(taxpayer_table)
-        story.append(Spacer(1, 12))
-
-        # Income Information
-        story.append(Paragraph("Income Information", styles['Heading2']))
-        income_data = [
-            ["Income Type", "Amount"],
-            ["Federal Adjusted Gross Income", f"${form_data.income_data.get('federal_agi', 0):,.2f}"],
-            ["Wages", f"${form_data.income_data.get('wages', 0):,.2f}"],
-            ["Interest", f"${form_data.income_data.get('interest', 0):,.2f}"],
-            ["Dividends", f"${form_data.income_data.get('dividends', 0):,.2f}"],
-            ["Business Income", f"${form_data.income_data.get('business_income', 0):,.2f}"]
-        ]
-        income_table = Table(income_data)
-        income_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(income_table)
-        story.append(Spacer(1, 12))
-
-        # Tax Calculation
-        story.append(Paragraph("Tax Calculation", styles['Heading2']))
+    def _summary_values(self, form_data: StateFormData) -> List[List[str]]:
+        """Values of the summary form's rows, per section"""
+        info = form_data.taxpayer_info
+        income = form_data.income_data
         calc = form_data.tax_calculation
-        tax_data = [
-            ["Calculation Item", "Amount"],
-            ["Taxable Income", f"${calc.taxable_income:,.2f}"],
-            ["Tax Rate", f"{calc.effective_rate:.2%}"],
-            ["Tax Owed", f"${calc.tax_owed:,.2f}"],
-            ["Credits", f"${calc.credits:,.2f}"],
-            ["Net Tax Due", f"${calc.tax_owed - calc.credits:,.2f}"]
+        return [
+            [
+                f"{info.get('first_name', '')} {info.get('last_name', '')}",
+                info.get('ssn', ''),
+                info.get('address', ''),
+                f"{info.get('city', '')}, {info.get('state', '')} {info.get('zip_code', '')}",
+                form_data.filing_status.title(),
+                str(form_data.dependents),
+            ],
+            [
+                f"${income.get(key, 0):,.2f}"
+                for key in ('federal_agi', 'wages', 'interest', 'dividends', 'business_income')
+            ],
+            [
+                f"${calc.taxable_income:,.2f}",
+                f"{calc.effective_rate:.2%}",
+                f"${calc.tax_owed:,.2f}",
+                f"${calc.credits:,.2f}",
+                f"${calc.tax_owed - calc.credits:,.2f}",
+            ],
         ]
-        tax_table = Table(tax_data)
-        tax_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(tax_table)
-        story.append(Spacer(1, 12))
-
-        # Disclaimer
-        disclaimer = """
-        <b>Important Notice:</b> This is a computer-generated representation of your state tax return for informational purposes only.
-        It is not an official tax form and should not be filed with your state tax authority.
-        Please consult with a tax professional and use official state tax forms for actual filing.
+
+    def _get_summary_background(self, state_code: StateCode, tax_year: int) -> PdfReader:
         """
-        story.append(Paragraph(disclaimer, styles['Normal']))
+        Get the static part of a state's summary form, rendering it on first use.
 
-        # Build the PDF
-        doc.build(story)
\ No newline at end of file
+        Args:
+            state_code: State of the form
+            tax_year: Tax year in the title
+
+        Returns:
+            Parsed one-page background
+        """
+        key = (state_code, tax_year)
+        with self._backgrounds_lock:
+            background = self._backgrounds.get(key)
+            if background is None:
+                background = PdfReader(io.BytesIO(self._render_summary_background(state_code, tax_year)))
+                self._backgrounds[key] = background
+            return background
+
+    def _render_summary_background(self, state_code: StateCode, tax_year: int) -> bytes:
+        """Draw the title, section tables, row labels and disclaimer of a summary form"""
+        buffer = io.BytesIO()
+        pdf = canvas.Canvas(buffer, pagesize=letter, pageCompression=1)
+        width = PAGE_WIDTH - 2 * MARGIN
+
+        state_info = self.state_service.get_state_info(state_code)
+        state_name = state_info.name if state_info else state_code.value
+        pdf.setFont('Helvetica-Bold', 18)
+        pdf.drawCentredString(PAGE_WIDTH / 2, PAGE_HEIGHT - MARGIN, f"{state_name} State Income Tax Return - {tax_year}")
+
+        for (heading, columns, labels, _), rows in zip(SUMMARY_SECTIONS, _summary_row_positions()):
+            header_bottom = rows[0] - 5 + ROW_HEIGHT
+            table_bottom = rows[-1] - 5
+            pdf.setFont('Helvetica-Bold', 14)
+            pdf.drawString(MARGIN, header_bottom + HEADER_ROW_HEIGHT + 10, heading)
+
+            pdf.setFillColor(colors.grey)
+            pdf.rect(MARGIN, header_bottom, width, HEADER_ROW_HEIGHT, stroke=0, fill=1)
+            pdf.setFillColor(colors.beige)
+            pdf.rect(MARGIN, table_bottom, width, header_bottom - table_bottom, stroke=0, fill=1)
+
+            pdf.setFillColor(colors.whitesmoke)
+            pdf.setFont('Helvetica-Bold', 12)
+            pdf.drawString(MARGIN + 6, header_bottom + 8, columns[0])
+            pdf.drawString(VALUE_COLUMN_X + 6, header_bottom + 8, columns[1])
+
+            pdf.setFillColor(colors.black)
+            pdf.setFont('Helvetica', 10)
+            for label, baseline in zip(labels, rows):
+                pdf.drawString(MARGIN + 6, baseline, label)
+
+            pdf.setStrokeColor(colors.black)
+            pdf.grid([MARGIN, VALUE_COLUMN_X, MARGIN + width],
+                     [header_bottom + HEADER_ROW_HEIGHT, header_bottom] +
+                     [baseline - 5 for baseline in rows])
+
+        disclaimer = Paragraph(DISCLAIMER, getSampleStyleSheet()['Normal'])
+        _, height = disclaimer.wrap(width, PAGE_HEIGHT)
+        disclaimer.drawOn(pdf, MARGIN, MARGIN - 18 + max(0, 60 - height))
+
+        pdf.showPage()
+        pdf.save()
+        return buffer.getvalue()
+
+    def _generate_summary_pdf(self, form_data: StateFormData, output_path: str) -> None:
+        """
+        Write a summary form: the cached background with this return's values on top.
+
+        The values are drawn with a content stream appended to a copy of the
+        background page, so the background is never re-rendered or re-parsed.
+
+        Args:
+            form_data: State form data
+            output_path: Destination PDF
+        """
+        operators = [f"BT /{OVERLAY_FONT} 10 Tf"]
+        for (_, _, _, right_aligned), rows, values in zip(
+                SUMMARY_SECTIONS, _summary_row_positions(), self._summary_values(form_data)):
+            for baseline, value in zip(rows, values):
+                x = VALUE_COLUMN_X + 6
+                if right_aligned:
+                    x = PAGE_WIDTH - MARGIN - 6 - stringWidth(value, 'Helvetica', 10)
+                operators.append(f"1 0 0 1 {x:.2f} {baseline:.2f} Tm ({_pdf_string(value)}) Tj")
+        operators.append("ET")
+
+        background = self._get_summary_background(form_data.state_code, form_data.tax_year)
+        writer = PdfWriter()
+        with self._backgrounds_lock:
+            # Cloning resolves objects from the shared reader's stream
+            page = writer.add_page(background.pages[0])
+
+        def stream(data: bytes):
+            content = DecodedStreamObject()
+            content.set_data(data)
+            return writer._add_object(content)
+
+        resources = page[NameObject('/Resources')].get_object()
+        fonts = resources.setdefault(NameObject('/Font'), DictionaryObject()).get_object()
+        fonts[NameObject(f"/{OVERLAY_FONT}")] = writer._add_object(DictionaryObject({
+            NameObject('/Type'): NameObject('/Font'),
+            NameObject('/Subtype'): NameObject('/Type1'),
+            NameObject('/BaseFont'): NameObject('/Helvetica'),
+            NameObject('/Encoding'): NameObject('/WinAnsiEncoding'),
+        }))
+        # Isolate the background's graphics state from the overlay
+        page[NameObject('/Contents')] = ArrayObject([
+            stream(b"q\n"), page.raw_get('/Contents'), stream(b"\nQ\n"),
+            stream("\n".join(operators).encode('cp1252', errors='replace')),
+        ])
+
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, 'wb') as f:
+            writer.write(f)
@@ -13,7 +13,7 @@ from pathlib import Path
 from decimal import Decimal
 
 from config.app_config import AppConfig
-from models.tax_data import TaxData
+from models.tax_data import TaxData, calculation_inputs
 from services.exceptions import (
     InvalidInputException,
     DataValidationException,
@@ -22,6 +22,8 @@ from services.exceptions import (
 from services.error_logger import get_error_logger
 from services.tax_calculation_service import TaxCalculationService
 from utils.error_tracker import get_error_tracker
+from utils.money import sum_money, to_money
+from utils.result_cache import content_hash, get_result_cache
 
 
 @dataclass
@@ -214,7 +216,7 @@ class TaxAnalyticsService:
             
             # Get total income from the year's data
             income_data = tax_data.get_section('income', tax_year)
-            total_income = sum(Decimal(str(v)) for v in income_data.values() if v)
+            total_income = sum_money(v for v in income_data.values() if v)
 
             # Get tax calculation result
             tax_result = self.tax_calculation.calculate_tax(tax_data)
@@ -268,7 +270,7 @@ class TaxAnalyticsService:
         try:
             tax_year = tax_data.get_current_year()
             income_data = tax_data.get_section('income', tax_year)
-            total_income = sum(Decimal(str(v)) for v in income_data.values() if v)
+            total_income = sum_money(v for v in income_data.values() if v)
             
             tax_result = self.tax_calculation.calculate_tax(tax_data)
 
@@ -323,7 +325,7 @@ class TaxAnalyticsService:
             tax_year = tax_data.get_current_year()
             # Get income breakdown
             income_data = tax_data.get_section('income', tax_year)
-            total_income = sum(Decimal(str(v)) for v in income_data.values() if v)
+            total_income = sum_money(v for v in income_data.values() if v)
 
             if total_income <= 0:
                 return {}
@@ -332,7 +334,7 @@ class TaxAnalyticsService:
             distribution = {}
             for source, amount in income_data.items():
                 if amount and amount > 0:
-                    percentage = (Decimal(str(amount)) / total_income) * 100
+                    percentage = (to_money(amount) / total_income) * 100
                     distribution[source] = float(percentage)
 
             return distribution
@@ -359,8 +361,8 @@ class TaxAnalyticsService:
             income_data = tax_data.get_section('income', tax_year)
             deduction_data = tax_data.get_section('deductions', tax_year)
             
-            total_income = sum(Decimal(str(v)) for v in income_data.values() if v)
-            total_deductions = sum(Decimal(str(v)) for v in deduction_data.values() if v)
+            total_income = sum_money(v for v in income_data.values() if v)
+            total_deductions = sum_money(v for v in deduction_data.values() if v)
             
             filing_status = tax_data.get('filing_status', tax_year)
 
@@ -415,7 +417,7 @@ class TaxAnalyticsService:
             
             # Get credits from tax data
             credit_data = tax_data.get_section('credits', tax_year)
-            total_credits = sum(Decimal(str(v)) for v in credit_data.values() if v)
+            total_credits = sum_money(v for v in credit_data.values() if v)
 
             # Estimate potential tax liability without credits
             tax_without_credits = sum(tax_result.tax_liability_breakdown.values())
@@ -462,6 +464,13 @@ class TaxAnalyticsService:
         Returns:
             Comprehensive analytics result
         """
+        cache_key = self._analysis_cache_key(tax_data)
+        if cache_key is not None:
+            cached = get_result_cache().get(cache_key)
+            if cached is not None:
+                cached.calculated_at = datetime.now()
+                return cached
+
         try:
             tax_year = tax_data.get_current_year()
             effective_rate = self.calculate_effective_tax_rate(tax_data)
@@ -472,7 +481,7 @@ class TaxAnalyticsService:
             deduction_analysis = self.analyze_deduction_utilization(tax_data)
             credit_analysis = self.analyze_credit_utilization(tax_data)
 
-            return TaxAnalyticsResult(
+            result = TaxAnalyticsResult(
                 tax_year=tax_year,
                 effective_tax_rate=effective_rate,
                 marginal_tax_rate=marginal_rate,
@@ -483,6 +492,9 @@ class TaxAnalyticsService:
                 tax_liability_breakdown=burden_analysis['breakdown'],
                 calculated_at=datetime.now()
             )
+            if cache_key is not None:
+                get_result_cache().put(cache_key, result)
+            return result
 
         except Exception as e:
             tax_year = tax_data.get_current_year()
@@ -503,6 +515,33 @@ class TaxAnalyticsService:
                 calculated_at=datetime.now()
             )
 
+    def _analysis_cache_key(self, tax_data: TaxData) -> Optional[Tuple]:
+        """
+        Build the shared result cache key for an analysis.
+
+        Only analyses backed by a TaxCalculationService are cached; any other
+        calculation backend may not be deterministic for the same inputs.
+
+        Args:
+            tax_data: Tax data being analyzed
+
+        Returns:
+            Cache key, or None if the analysis should not be cached
+        """
+        if type(self.tax_calculation) is not TaxCalculationService:
+            return None
+        try:
+            tax_year = tax_data.get_current_year()
+            year_data = tax_data.data["years"].get(tax_year)
+        except (AttributeError, KeyError, TypeError):
+            return None
+        return (
+            "TaxAnalyticsService.generate_comprehensive_analysis",
+            tax_year,
+            self.tax_calculation.tax_year,
+            content_hash(calculation_inputs(year_data)),
+        )
+
     def analyze_tax_trends(self, tax_returns: List[TaxData]) -> TaxTrendAnalysis:
         """
         Analyze tax trends across multiple years.
@@ -548,7 +587,7 @@ class TaxAnalyticsService:
                 # Get total income
                 tax_year = tax_data.get_current_year()
                 income_data = tax_data.get_section('income', tax_year)
-                total_income = sum(Decimal(str(v)) for v in income_data.values() if v)
+                total_income = sum_money(v for v in income_data.values() if v)
                 incomes.append(float(total_income))
 
                 tax_result = self.tax_calculation.calculate_tax(tax_data)
@@ -664,7 +703,7 @@ class TaxAnalyticsService:
 
             # Get current income data
             current_income_data = tax_data.get_section('income', base_year)
-            current_total_income = sum(Decimal(str(v)) for v in current_income_data.values() if v)
+            current_total_income = sum_money(v for v in current_income_data.values() if v)
 
             if current_total_income <= 0:
                 return TaxProjectionResult(
@@ -744,7 +783,7 @@ class TaxAnalyticsService:
         projection_year = base_year + projection_years
         
         current_income_data = tax_data.get_section('income', base_year)
-        current_total_income = sum(Decimal(str(v)) for v in current_income_data.values() if v)
+        current_total_income = sum_money(v for v in current_income_data.values() if v)
         
         # Project income with compound growth
         projected_income = float(current_total_income * (1 + income_growth) ** projection_years)
@@ -965,9 +1004,9 @@ class TaxAnalyticsService:
             deduction_data = tax_data.get_section('deductions', tax_year)
             credit_data = tax_data.get_section('credits', tax_year)
             
-            base_income = sum(Decimal(str(v)) for v in income_data.values() if v)
-            base_deductions = sum(Decimal(str(v)) for v in deduction_data.values() if v)
-            base_credits = sum(Decimal(str(v)) for v in credit_data.values() if v)
+            base_income = sum_money(v for v in income_data.values() if v)
+            base_deductions = sum_money(v for v in deduction_data.values() if v)
+            base_credits = sum_money(v for v in credit_data.values() if v)
 
             # Assume 3% annual income growth, 2% deduction growth
             for i in range(1, years_ahead + 1):
@@ -1166,7 +1205,7 @@ class TaxAnalyticsService:
             # Simplified calculation - in reality this would be more complex
             tax_year = tax_data.get_current_year()
             income_data = tax_data.get_section('income', tax_year)
-            current_income = sum(Decimal(str(v)) for v in income_data.values() if v)
+            current_income = sum_money(v for v in income_data.values() if v)
 
             # 2024 limits (would need to be updated annually)
             traditional_ira_limit = 7000
@@ -1212,7 +1251,7 @@ class TaxAnalyticsService:
             income_data = tax_data.get_section('income', tax_year)
 
             # Check for common missed deductions
-            current_deductions = sum(Decimal(str(v)) for v in deduction_data.values() if v)
+            current_deductions = sum_money(v for v in deduction_data.values() if v)
 
             # Home office deduction (simplified check)
             if 'home_office' not in deduction_data and 'wages' in income_data:
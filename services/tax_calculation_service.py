@@ -6,13 +6,13 @@ the presentation layer and provides a clean API for tax operations.
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 from dataclasses import dataclass
 from config.tax_year_config import get_tax_year_config, TaxYearConfig
 from utils.tax_calculations import (
     calculate_standard_deduction,
-    calculate_income_tax,
-    calculate_self_employment_tax
+    income_tax_cents,
+    self_employment_tax_cents
 )
 from services.exceptions import (
     InvalidInputException,
@@ -20,9 +20,15 @@ from services.exceptions import (
     ServiceExecutionException
 )
 from services.error_logger import get_error_logger
+from services.tax_curve import TaxCurve
+from utils.money import sum_cents, to_cents, to_dollars
+from utils.result_cache import content_hash, get_result_cache
 
 logger = logging.getLogger(__name__)
 
+# Sections of a return that calculate_complete_return reads
+RESULT_INPUT_SECTIONS = ('filing_status', 'income', 'deductions', 'payments')
+
 
 @dataclass
 class TaxResult:
@@ -128,6 +134,62 @@ class TaxCalculationService:
                 
         return current
     
+    def _get_value_accessor(self, tax_data: Any) -> Callable[..., Any]:
+        """
+        Build a ``get_value(path, default)`` accessor for a return.
+        
+        Args:
+            tax_data: TaxData object, ScenarioOverlay, multi-year dictionary
+                or flat dictionary
+            
+        Returns:
+            Callable that resolves dot-notation paths against the return
+            
+        Raises:
+            InvalidInputException: If tax_data is an unsupported type
+        """
+        from models.tax_data import TaxData
+        from models.scenario_overlay import ScenarioOverlay
+        if isinstance(tax_data, (TaxData, ScenarioOverlay)):
+            # TaxData object or what-if overlay over one
+            return tax_data.get
+        if isinstance(tax_data, dict):
+            # Dictionary - could be old flat format or new multi-year format
+            if 'years' in tax_data:
+                # New multi-year format
+                current_year = tax_data.get('metadata', {}).get('current_year', self.tax_year)
+                year_data = tax_data['years'].get(current_year, {})
+                return lambda k, d=None: self._get_nested_value(year_data, k, d)
+            # Old flat format
+            return lambda k, d=None: tax_data.get(k, d)
+        raise InvalidInputException(
+            field_name="tax_data",
+            details={"unsupported_type": type(tax_data).__name__}
+        )
+    
+    def _result_cache_key(self, tax_data: Any, get_value: Callable[..., Any]) -> Optional[tuple]:
+        """
+        Build the shared result cache key for a return.
+        
+        Only TaxData returns are cached: reopening a saved return or undoing
+        an edit recreates inputs calculated before. What-if overlays and
+        dictionaries (scenario sweeps, batches) are one-off inputs, so they
+        skip the hash and the copies rather than paying them on every point.
+        
+        Args:
+            tax_data: Return being calculated
+            get_value: Accessor from _get_value_accessor
+            
+        Returns:
+            Key of the service, tax year and a content hash of the inputs,
+            or None if the result should not be cached
+        """
+        from models.tax_data import TaxData
+        if not isinstance(tax_data, TaxData):
+            return None
+        inputs = {section: get_value(section) for section in RESULT_INPUT_SECTIONS}
+        return (f"{type(self).__name__}.calculate_complete_return", self.tax_year, content_hash(inputs))
+    
     def calculate_complete_return(self, tax_data: Any) -> TaxResult:
         """
         Calculate complete tax return with all components.
@@ -152,100 +214,90 @@ class TaxCalculationService:
                     details={"reason": "Tax data cannot be None"}
                 )
             
-            result = TaxResult()
-            
             # Get data accessor (handles both dict and TaxData object)
-            from models.tax_data import TaxData
-            if isinstance(tax_data, TaxData):
-                # TaxData object
-                get_value = tax_data.get
-            elif isinstance(tax_data, dict):
-                # Dictionary - could be old flat format or new multi-year format
-                if 'years' in tax_data:
-                    # New multi-year format
-                    current_year = tax_data.get('metadata', {}).get('current_year', self.tax_year)
-                    year_data = tax_data['years'].get(current_year, {})
-                    get_value = lambda k, d=None: self._get_nested_value(year_data, k, d)
-                else:
-                    # Old flat format
-                    get_value = lambda k, d=None: tax_data.get(k, d)
-            else:
-                raise InvalidInputException(
-                    field_name="tax_data",
-                    details={"unsupported_type": type(tax_data).__name__}
-                )
+            get_value = self._get_value_accessor(tax_data)
+            
+            # Identical inputs (an undone edit, a reopened return) reuse the earlier result
+            cache_key = self._result_cache_key(tax_data, get_value)
+            if cache_key is not None:
+                cached = get_result_cache().get(cache_key)
+                if cached is not None:
+                    return cached
+            
+            # Amounts are added in integer cents; the result holds them as floats
+            cents: Dict[str, int] = {}
             
             # Calculate income components
-            result.total_wages = self._calculate_total_wages(get_value)
-            result.taxable_interest = self._calculate_taxable_interest(get_value)
-            result.tax_exempt_interest = self._calculate_tax_exempt_interest(get_value)
-            result.ordinary_dividends = self._calculate_ordinary_dividends(get_value)
-            result.qualified_dividends = self._calculate_qualified_dividends(get_value)
-            result.business_income = self._calculate_business_income(get_value)
+            cents['total_wages'] = to_cents(self._calculate_total_wages(get_value))
+            cents['taxable_interest'] = to_cents(self._calculate_taxable_interest(get_value))
+            cents['tax_exempt_interest'] = to_cents(self._calculate_tax_exempt_interest(get_value))
+            cents['ordinary_dividends'] = to_cents(self._calculate_ordinary_dividends(get_value))
+            cents['qualified_dividends'] = to_cents(self._calculate_qualified_dividends(get_value))
+            cents['business_income'] = to_cents(self._calculate_business_income(get_value))
             
             # Total income (AGI before adjustments)
-            result.total_income = (
-                result.total_wages +
-                result.taxable_interest +
-                result.ordinary_dividends +
-                result.business_income
+            cents['total_income'] = (
+                cents['total_wages'] +
+                cents['taxable_interest'] +
+                cents['ordinary_dividends'] +
+                cents['business_income']
             )
-            result.adjusted_gross_income = result.total_income  # Simplified (no adjustments yet)
+            cents['adjusted_gross_income'] = cents['total_income']  # Simplified (no adjustments yet)
             
             # Validate totals
-            if result.total_income < 0:
+            if cents['total_income'] < 0:
                 raise DataValidationException(
                     message="Total income cannot be negative",
-                    details={"total_income": result.total_income}
+                    details={"total_income": to_dollars(cents['total_income'])}
                 )
             
             # Calculate deductions
             filing_status = get_value('filing_status.status', 'Single')
-            result.standard_deduction = calculate_standard_deduction(filing_status, self.tax_year)
-            result.itemized_deduction = self._calculate_itemized_deductions(get_value)
+            cents['standard_deduction'] = to_cents(calculate_standard_deduction(filing_status, self.tax_year))
+            cents['itemized_deduction'] = to_cents(self._calculate_itemized_deductions(get_value))
             
             # Use larger deduction
             deduction_method = get_value('deductions.method', 'standard')
             if deduction_method == 'itemized':
-                result.deduction_used = result.itemized_deduction
+                cents['deduction_used'] = cents['itemized_deduction']
             else:
-                result.deduction_used = result.standard_deduction
+                cents['deduction_used'] = cents['standard_deduction']
             
             # Taxable income
-            result.taxable_income = max(0, result.adjusted_gross_income - result.deduction_used)
+            cents['taxable_income'] = max(0, cents['adjusted_gross_income'] - cents['deduction_used'])
             
             # Calculate taxes
-            result.income_tax = calculate_income_tax(result.taxable_income, filing_status, self.tax_year)
+            cents['income_tax'] = income_tax_cents(cents['taxable_income'], filing_status, self.tax_year)
             
             # Self-employment tax (if applicable)
-            if result.business_income > 0:
-                result.self_employment_tax = calculate_self_employment_tax(result.business_income)
+            cents['self_employment_tax'] = self_employment_tax_cents(cents['business_income'])
             
-            result.total_tax = result.income_tax + result.self_employment_tax
+            cents['total_tax'] = cents['income_tax'] + cents['self_employment_tax']
             
             # Validate tax calculations
-            if result.total_tax < 0:
+            if cents['total_tax'] < 0:
                 raise DataValidationException(
                     message="Total tax cannot be negative",
-                    details={"total_tax": result.total_tax}
+                    details={"total_tax": to_dollars(cents['total_tax'])}
                 )
             
             # Calculate payments
-            result.federal_withholding = self._calculate_total_withholding(get_value)
-            result.estimated_tax_payments = get_value('payments.estimated_tax', 0)
-            result.total_payments = result.federal_withholding + result.estimated_tax_payments
+            cents['federal_withholding'] = to_cents(self._calculate_total_withholding(get_value))
+            cents['estimated_tax_payments'] = to_cents(get_value('payments.estimated_tax', 0))
+            cents['total_payments'] = cents['federal_withholding'] + cents['estimated_tax_payments']
             
             # Determine refund or amount owed
-            if result.total_payments > result.total_tax:
-                result.refund_amount = result.total_payments - result.total_tax
-                result.amount_owed = 0
-            else:
-                result.refund_amount = 0
-                result.amount_owed = result.total_tax - result.total_payments
+            balance = cents['total_payments'] - cents['total_tax']
+            cents['refund_amount'] = max(0, balance)
+            cents['amount_owed'] = max(0, -balance)
+            
+            result = TaxResult(**{name: to_dollars(amount) for name, amount in cents.items()})
             
             logger.info(f"Completed tax calculation: AGI=${result.adjusted_gross_income:,.2f}, "
                        f"Tax=${result.total_tax:,.2f}, Refund=${result.refund_amount:,.2f}")
             
+            if cache_key is not None:
+                get_result_cache().put(cache_key, result)
             return result
         except (InvalidInputException, DataValidationException) as e:
             error_logger.log_exception(
@@ -270,31 +322,35 @@ class TaxCalculationService:
         """Calculate total wages from all W-2 forms"""
         income_section = get_value('income', {})
         w2_forms = income_section.get('w2_forms', []) if isinstance(income_section, dict) else []
-        return sum(w2.get('wages', 0) for w2 in w2_forms)
+        return to_dollars(sum_cents(w2.get('wages', 0) for w2 in w2_forms))
     
     def _calculate_taxable_interest(self, get_value) -> float:
         """Calculate total taxable interest income"""
         income_section = get_value('income', {})
         interest_income = income_section.get('interest_income', []) if isinstance(income_section, dict) else []
-        return sum(item.get('amount', 0) for item in interest_income if not item.get('tax_exempt', False))
+        return to_dollars(sum_cents(
+            item.get('amount', 0) for item in interest_income if not item.get('tax_exempt', False)
+        ))
     
     def _calculate_tax_exempt_interest(self, get_value) -> float:
         """Calculate total tax-exempt interest income"""
         income_section = get_value('income', {})
         interest_income = income_section.get('interest_income', []) if isinstance(income_section, dict) else []
-        return sum(item.get('amount', 0) for item in interest_income if item.get('tax_exempt', False))
+        return to_dollars(sum_cents(
+            item.get('amount', 0) for item in interest_income if item.get('tax_exempt', False)
+        ))
     
     def _calculate_ordinary_dividends(self, get_value) -> float:
         """Calculate total ordinary dividend income"""
         income_section = get_value('income', {})
         dividend_income = income_section.get('dividend_income', []) if isinstance(income_section, dict) else []
-        return sum(item.get('ordinary', 0) for item in dividend_income)
+        return to_dollars(sum_cents(item.get('ordinary', 0) for item in dividend_income))
     
     def _calculate_qualified_dividends(self, get_value) -> float:
         """Calculate total qualified dividend income"""
         income_section = get_value('income', {})
         dividend_income = income_section.get('dividend_income', []) if isinstance(income_section, dict) else []
-        return sum(item.get('qualified', 0) for item in dividend_income)
+        return to_dollars(sum_cents(item.get('qualified', 0) for item in dividend_income))
     
     def _calculate_business_income(self, get_value) -> float:
         """Calculate total business income (net profit)"""
@@ -303,30 +359,30 @@ class TaxCalculationService:
         # Check for self-employment businesses (new format)
         self_employment = income_section.get('self_employment', [])
         if isinstance(self_employment, list) and self_employment:
-            return sum(biz.get('net_profit', 0) for biz in self_employment)
+            return to_dollars(sum_cents(biz.get('net_profit', 0) for biz in self_employment))
         
         # Fallback to old format
         business_income = income_section.get('business_income', [])
         if isinstance(business_income, (int, float)):
-            return float(business_income)
+            return to_dollars(to_cents(business_income))
         elif isinstance(business_income, list):
-            return sum(biz.get('net_profit', 0) for biz in business_income)
+            return to_dollars(sum_cents(biz.get('net_profit', 0) for biz in business_income))
         return 0.0
     
     def _calculate_itemized_deductions(self, get_value) -> float:
         """Calculate total itemized deductions"""
-        return (
-            get_value('deductions.medical_expenses', 0) +
-            get_value('deductions.state_local_taxes', 0) +
-            get_value('deductions.mortgage_interest', 0) +
+        return to_dollars(sum_cents([
+            get_value('deductions.medical_expenses', 0),
+            get_value('deductions.state_local_taxes', 0),
+            get_value('deductions.mortgage_interest', 0),
             get_value('deductions.charitable_contributions', 0)
-        )
+        ]))
     
     def _calculate_total_withholding(self, get_value) -> float:
         """Calculate total federal withholding from all sources"""
         income_section = get_value('income', {})
         w2_forms = income_section.get('w2_forms', []) if isinstance(income_section, dict) else []
-        return sum(w2.get('federal_withholding', 0) for w2 in w2_forms)
+        return to_dollars(sum_cents(w2.get('federal_withholding', 0) for w2 in w2_forms))
     
     def get_effective_tax_rate(self, tax_result: TaxResult) -> float:
         """
@@ -353,11 +409,39 @@ class TaxCalculationService:
         Returns:
             Marginal tax rate as a percentage
         """
-        brackets = self.config.tax_brackets.get(filing_status, self.config.tax_brackets['Single'])
+        return self.config.get_bracket_table(filing_status).marginal_rate(taxable_income) * 100
+    
+    def build_tax_curve(self, tax_data: Any, variable: str = 'ordinary_income',
+                        include_surtaxes: bool = False) -> TaxCurve:
+        """
+        Build a TaxCurve for changes to one amount of a return.
         
-        for threshold, rate in brackets:
-            if taxable_income <= threshold:
-                return rate * 100
+        The return is calculated once; the curve then answers tax and
+        marginal rate for any change without recalculating.
         
-        # If we get here, use the highest bracket
-        return brackets[-1][1] * 100
+        Args:
+            tax_data: Tax data object or dictionary with taxpayer information
+            variable: Amount that changes (see services.tax_curve.CURVE_VARIABLES)
+            include_surtaxes: Add NIIT and Additional Medicare Tax on wages
+            
+        Returns:
+            TaxCurve whose tax_at(0) equals the return's total tax
+            
+        Raises:
+            InvalidInputException: If tax_data or variable is invalid
+        """
+        result = self.calculate_complete_return(tax_data)
+        get_value = self._get_value_accessor(tax_data)
+        return TaxCurve.from_amounts(
+            variable,
+            filing_status=get_value('filing_status.status', 'Single'),
+            tax_year=self.tax_year,
+            adjusted_gross_income=result.adjusted_gross_income,
+            deduction=result.deduction_used,
+            business_income=result.business_income,
+            wages=result.total_wages,
+            investment_income=result.taxable_interest + result.ordinary_dividends,
+            itemizing=get_value('deductions.method', 'standard') == 'itemized',
+            include_surtaxes=include_surtaxes,
+            base_tax=result.total_tax
+        )
@@ -0,0 +1,276 @@
+"""
+Tax Curve - Precomputed tax as a function of one changing amount
+
+For a fixed return, total tax as a function of one extra dollar of income
+or deduction is piecewise linear. A TaxCurve is built once from a
+calculated return: it collects every breakpoint (the deduction, each bracket
+threshold, the Social Security wage base, the Additional Medicare and NIIT
+thresholds), evaluates tax at each one, and stores the slope of every
+segment. Sliders can then ask for tax or the marginal rate at any delta
+with one bisect instead of recalculating the whole return.
+
+By default the curve reproduces TaxCalculationService.calculate_complete_return
+(income tax plus self-employment tax). With ``include_surtaxes`` it also
+includes the Net Investment Income Tax and the Additional Medicare Tax on
+wages, which that calculation does not yet apply.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.tax_year_config import get_tax_year_config, TaxYearConfig
+from services.exceptions import InvalidInputException
+
+# Net Investment Income Tax rate
+NIIT_RATE = 0.038
+
+# How the changing amount feeds the return, by curve variable:
+# (AGI slope, deduction slope, business income slope, wages slope, investment income slope)
+CURVE_VARIABLES: Dict[str, Tuple[int, int, int, int, int]] = {
+    'ordinary_income': (1, 0, 0, 0, 0),
+    'wages': (1, 0, 0, 1, 0),
+    'business_income': (1, 0, 1, 0, 0),
+    'investment_income': (1, 0, 0, 0, 1),
+    'itemized_deduction': (0, 1, 0, 0, 0),
+}
+
+# A component is a function of the delta plus its labeled breakpoints
+_Component = Tuple[Callable[[float], float], List[Tuple[float, str]]]
+
+
+class TaxCurve:
+    """
+    Piecewise-linear total tax as a function of a change in one amount.
+
+    Segments are closed on the right: a breakpoint belongs to the segment
+    that ends there, so ``marginal_rate_at`` at a bracket threshold is that
+    bracket's rate, as in TaxCalculationService.get_marginal_tax_rate.
+    """
+
+    def __init__(self, variable: str, breakpoints: List[float], labels: List[str],
+                 values: List[float], slopes: List[float]):
+        """
+        Create a curve from precomputed segments.
+
+        Args:
+            variable: Name of the amount that changes
+            breakpoints: Sorted deltas where the slope changes
+            labels: What causes each breakpoint
+            values: Total tax at each breakpoint
+            slopes: slopes[0] applies up to the first breakpoint and
+                slopes[i] between breakpoints i - 1 and i (the last one
+                beyond the final breakpoint)
+        """
+        self.variable = variable
+        self._breakpoints = tuple(breakpoints)
+        self._labels = tuple(labels)
+        self._values = tuple(values)
+        self._slopes = tuple(slopes)
+        self.base_tax = self.tax_at(0.0)
+
+    @property
+    def breakpoints(self) -> Tuple[Tuple[float, str], ...]:
+        """(delta, reason) for every point where the marginal rate changes"""
+        return tuple(zip(self._breakpoints, self._labels))
+
+    def tax_at(self, delta: float) -> float:
+        """
+        Total tax if the amount changes by ``delta``.
+
+        Args:
+            delta: Change in the curve variable (negative to reduce it)
+
+        Returns:
+            Total tax, rounded to cents
+        """
+        index = bisect_left(self._breakpoints, delta)
+        if index == 0:
+            anchor = 0
+        else:
+            anchor = index - 1
+        tax = self._values[anchor] + self._slopes[index] * (delta - self._breakpoints[anchor])
+        return round(tax, 2)
+
+    def tax_change_at(self, delta: float) -> float:
+        """Change in total tax relative to the unchanged return"""
+        return round(self.tax_at(delta) - self.base_tax, 2)
+
+    def marginal_rate_at(self, delta: float) -> float:
+        """
+        Marginal rate (tax per extra dollar) at ``delta``.
+
+        Args:
+            delta: Change in the curve variable
+
+        Returns:
+            Marginal rate as a fraction (0.22 for 22%)
+        """
+        return self._slopes[bisect_left(self._breakpoints, delta)]
+
+    @classmethod
+    def from_amounts(cls, variable: str, filing_status: str, tax_year: int,
+                     adjusted_gross_income: float, deduction: float,
+                     business_income: float = 0.0, wages: float = 0.0,
+                     investment_income: float = 0.0,
+                     itemizing: bool = True,
+                     include_surtaxes: bool = False,
+                     base_tax: Optional[float] = None) -> 'TaxCurve':
+        """
+        Build a curve from the amounts of a calculated return.
+
+        Args:
+            variable: One of CURVE_VARIABLES
+            filing_status: Filing status
+            tax_year: Tax year for bracket and deduction amounts
+            adjusted_gross_income: AGI of the return
+            deduction: Deduction used by the return
+            business_income: Net business income (self-employment)
+            wages: Total wages
+            investment_income: Net investment income (interest and dividends)
+            itemizing: Whether the return uses itemized deductions (otherwise
+                itemized deduction changes have no effect)
+            include_surtaxes: Add NIIT and Additional Medicare Tax on wages
+            base_tax: Total tax of the return as calculated; the calculation
+                rounds each line to the cent, so the curve is shifted by the
+                rounding difference to make tax_at(0) equal it
+
+        Returns:
+            TaxCurve for the variable
+
+        Raises:
+            InvalidInputException: If the variable is unknown
+        """
+        if variable not in CURVE_VARIABLES:
+            raise InvalidInputException(
+                field_name="variable",
+                message=f"Unknown curve variable '{variable}'",
+                details={"supported": sorted(CURVE_VARIABLES)}
+            )
+        agi_slope, deduction_slope, business_slope, wages_slope, investment_slope = CURVE_VARIABLES[variable]
+        if not itemizing:
+            deduction_slope = 0
+        config = get_tax_year_config(tax_year)
+
+        components = [_income_tax_component(
+            config, filing_status, adjusted_gross_income - deduction, agi_slope - deduction_slope
+        )]
+        if business_income > 0 or business_slope:
+            # Self-employment tax uses the default configuration, as calculate_self_employment_tax does
+            components.append(_self_employment_component(get_tax_year_config(), business_income, business_slope))
+        if include_surtaxes:
+            components.append(_niit_component(
+                config, filing_status, adjusted_gross_income, agi_slope,
+                investment_income, investment_slope
+            ))
+            components.append(_additional_medicare_component(config, wages, wages_slope))
+
+        return cls._from_components(variable, components, base_tax)
+
+    @classmethod
+    def _from_components(cls, variable: str, components: List[_Component],
+                         base_tax: Optional[float] = None) -> 'TaxCurve':
+        """Evaluate components at their merged breakpoints and derive segment slopes"""
+        labeled: Dict[float, List[str]] = {}
+        for _, points in components:
+            for delta, label in points:
+                labeled.setdefault(delta, [])
+                if label not in labeled[delta]:
+                    labeled[delta].append(label)
+        breakpoints = sorted(labeled) or [0.0]
+        labels = [', '.join(labeled.get(delta, ['none'])) for delta in breakpoints]
+
+        def total(delta: float) -> float:
+            return sum(function(delta) for function, _ in components)
+
+        values = [total(delta) for delta in breakpoints]
+        slopes = [values[0] - total(breakpoints[0] - 1.0)]
+        for i in range(1, len(breakpoints)):
+            slopes.append((values[i] - values[i - 1]) / (breakpoints[i] - breakpoints[i - 1]))
+        slopes.append(total(breakpoints[-1] + 1.0) - values[-1])
+        if base_tax is not None:
+            offset = base_tax - total(0.0)
+            values = [value + offset for value in values]
+
+        return cls(variable, breakpoints, labels, values, slopes)
+
+
+def _linear_crossing(base: float, slope: float, target: float) -> Optional[float]:
+    """Delta at which ``base + slope * delta`` equals ``target`` (None if it never does)"""
+    if slope == 0:
+        return None
+    return (target - base) / slope
+
+
+def _income_tax_component(config: TaxYearConfig, filing_status: str,
+                          base_taxable: float, slope: int) -> _Component:
+    """Bracket tax on max(0, base_taxable + slope * delta)"""
+    table = config.get_bracket_table(filing_status)
+
+    def income_tax(delta: float) -> float:
+        return table.tax(max(0.0, base_taxable + slope * delta))
+
+    points = []
+    zero = _linear_crossing(base_taxable, slope, 0.0)
+    if zero is not None:
+        points.append((zero, 'deduction'))
+    for threshold, rate in zip(table.thresholds, table.rates):
+        crossing = _linear_crossing(base_taxable, slope, threshold)
+        if crossing is not None and threshold != float('inf'):
+            points.append((crossing, f"{rate:.0%} bracket ends"))
+    return income_tax, points
+
+
+def _self_employment_component(config: TaxYearConfig, business_income: float, slope: int) -> _Component:
+    """Self-employment tax on business_income + slope * delta"""
+
+    def self_employment_tax(delta: float) -> float:
+        net_earnings = business_income + slope * delta
+        if net_earnings <= 0:
+            return 0.0
+        se_income = net_earnings * config.se_tax_rate
+        tax = min(se_income, config.ss_wage_base) * config.ss_tax_rate
+        tax += se_income * config.medicare_tax_rate
+        if se_income > config.medicare_threshold:
+            tax += (se_income - config.medicare_threshold) * config.additional_medicare_rate
+        return tax
+
+    points = []
+    for target, label in ((0.0, 'self-employment income'),
+                          (config.ss_wage_base / config.se_tax_rate, 'SE wage base'),
+                          (config.medicare_threshold / config.se_tax_rate, 'Additional Medicare threshold')):
+        crossing = _linear_crossing(business_income, slope, target)
+        if crossing is not None:
+            points.append((crossing, label))
+    return self_employment_tax, points
+
+
+def _niit_component(config: TaxYearConfig, filing_status: str, magi: float, magi_slope: int,
+                    investment_income: float, investment_slope: int) -> _Component:
+    """NIIT on the smaller of investment income and MAGI over the threshold"""
+    threshold = config.niit_thresholds.get(filing_status, config.niit_thresholds["Single"])
+
+    def niit(delta: float) -> float:
+        excess = min(investment_income + investment_slope * delta,
+                     magi + magi_slope * delta - threshold)
+        return max(0.0, excess) * NIIT_RATE
+
+    points = []
+    for crossing, label in ((_linear_crossing(magi, magi_slope, threshold), 'NIIT threshold'),
+                            (_linear_crossing(investment_income, investment_slope, 0.0), 'investment income')):
+        if crossing is not None:
+            points.append((crossing, label))
+    # Where the two limits cross, the smaller one changes
+    if magi_slope != investment_slope:
+        points.append(((investment_income - magi + threshold) / (magi_slope - investment_slope), 'NIIT limit'))
+    return niit, points
+
+
+def _additional_medicare_component(config: TaxYearConfig, wages: float, slope: int) -> _Component:
+    """Additional Medicare Tax on wages over the threshold"""
+
+    def additional_medicare(delta: float) -> float:
+        return max(0.0, wages + slope * delta - config.medicare_threshold) * config.additional_medicare_rate
+
+    crossing = _linear_crossing(wages, slope, config.medicare_threshold)
+    points = [] if crossing is None else [(crossing, 'Additional Medicare threshold')]
+    return additional_medicare, points
@@ -9,9 +9,13 @@ This service provides sophisticated tax planning capabilities including:
 - Retirement contribution optimization
 """
 
+import itertools
 import logging
-from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime, date
 
 from services.exceptions import (
@@ -22,6 +26,7 @@ from services.exceptions import (
 from services.error_logger import get_error_logger
 from config.tax_year_config import get_tax_year_config, TaxYearConfig
 from services.tax_calculation_service import TaxCalculationService, TaxResult
+from models.scenario_overlay import ScenarioOverlay
 from utils.tax_calculations import calculate_income_tax, calculate_standard_deduction
 
 logger = logging.getLogger(__name__)
@@ -158,6 +163,79 @@ class RetirementOptimization:
         }
 
 
+# Grid axes that set project_future_tax parameters instead of return data
+SWEEP_PROJECTION_AXES = ('income_growth_rate', 'inflation_rate')
+
+
+@dataclass
+class ScenarioSweepRow:
+    """One evaluated grid point of a scenario sweep"""
+
+    index: int
+    parameters: Dict[str, Any]
+    result: ScenarioResult
+    projection: Optional[TaxProjection] = None
+
+    @property
+    def tax_difference(self) -> float:
+        return self.result.tax_difference
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a flat dictionary for display and serialization"""
+        row = {'index': self.index}
+        row.update(self.parameters)
+        row.update({
+            'scenario_name': self.result.scenario_name,
+            'original_tax': self.result.original_tax,
+            'new_tax': self.result.new_tax,
+            'tax_difference': self.result.tax_difference,
+            'refund_difference': self.result.refund_difference,
+            'effective_rate_change': self.result.effective_rate_change
+        })
+        if self.projection is not None:
+            row['projection_year'] = self.projection.projection_year
+            row['projected_tax'] = self.projection.projected_tax
+        return row
+
+
+@dataclass
+class ScenarioSweepTable:
+    """Results of a scenario sweep, one row per grid point"""
+
+    axes: List[str]
+    rows: List[ScenarioSweepRow] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[ScenarioSweepRow]:
+        return iter(self.rows)
+
+    def __getitem__(self, index: int) -> ScenarioSweepRow:
+        return self.rows[index]
+
+    def sort_by(self, column: str = 'tax_difference', descending: bool = False) -> 'ScenarioSweepTable':
+        """
+        Return a copy of the table sorted by a column.
+
+        Args:
+            column: Any column of ScenarioSweepRow.to_dict() (default: tax_difference)
+            descending: Sort largest first
+
+        Returns:
+            New ScenarioSweepTable with the same rows in sorted order
+        """
+        if column == 'tax_difference':
+            key = lambda row: row.result.tax_difference
+        else:
+            key = lambda row: row.to_dict().get(column)
+        return ScenarioSweepTable(self.axes, sorted(self.rows, key=key, reverse=descending))
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Convert every row to a flat dictionary"""
+        return [row.to_dict() for row in self.rows]
+
+
 class TaxPlanningService:
     """
     Advanced tax planning service providing scenario analysis,
@@ -191,7 +269,33 @@ class TaxPlanningService:
         """
         # Calculate original tax
         original_result = self.calc_service.calculate_complete_return(current_tax_data)
+        return self._evaluate_scenario(current_tax_data, original_result,
+                                       scenario_changes, scenario_name)
+
+    def analyze_scenarios(self, current_tax_data: Any,
+                          scenarios: Dict[str, Dict[str, Any]]) -> List[ScenarioResult]:
+        """
+        Analyze several what-if scenarios against the same tax data.
+
+        The original return is calculated once and each scenario is applied
+        as an overlay, so the tax data is never copied.
+
+        Args:
+            current_tax_data: Current tax data (dict or TaxData object)
+            scenarios: Mapping of scenario name to changes
+
+        Returns:
+            ScenarioResult for each scenario, in the given order
+        """
+        original_result = self.calc_service.calculate_complete_return(current_tax_data)
+        return [
+            self._evaluate_scenario(current_tax_data, original_result, changes, name)
+            for name, changes in scenarios.items()
+        ]
 
+    def _evaluate_scenario(self, current_tax_data: Any, original_result: TaxResult,
+                           scenario_changes: Dict[str, Any], scenario_name: str) -> ScenarioResult:
+        """Calculate one scenario and compare it with the original result"""
         # Create modified tax data
         modified_data = self._apply_scenario_changes(current_tax_data, scenario_changes)
 
@@ -499,64 +603,181 @@ class TaxPlanningService:
             reasoning=reasoning
         )
 
+    def sweep_scenarios(self, base: Any, grid: Dict[str, List[Any]],
+                        projection_year: Optional[int] = None,
+                        max_workers: Optional[int] = None,
+                        progress_callback: Optional[Callable[[int, int], None]] = None) -> ScenarioSweepTable:
+        """
+        Evaluate every combination of a scenario grid in parallel.
+
+        Grid keys are dot-notation paths into the return (for example
+        ``filing_status.status`` or ``income.w2_forms``) and values are the
+        settings to try; each combination is applied like analyze_scenario
+        changes. The axes ``income_growth_rate`` and ``inflation_rate`` are
+        passed to project_future_tax when ``projection_year`` is given.
+
+        Each worker process receives one snapshot of the base return (the
+        current year's data only) and evaluates chunks of grid points.
+
+        Args:
+            base: Base tax data (TaxData object or dictionary)
+            grid: Mapping of axis to the values to try
+            projection_year: Also project each scenario to this year
+            max_workers: Worker processes (1 evaluates in this process)
+            progress_callback: Optional callback function(completed, total)
+
+        Returns:
+            ScenarioSweepTable with one row per grid point, in grid order
+
+        Raises:
+            InvalidInputException: If the grid or base is invalid
+            ServiceExecutionException: If a scenario fails to evaluate
+        """
+        if not isinstance(grid, dict) or not grid:
+            raise InvalidInputException(field_name="grid", message="Grid must be a non-empty dictionary")
+        for axis, values in grid.items():
+            if not isinstance(values, (list, tuple)) or not values:
+                raise InvalidInputException(
+                    field_name="grid",
+                    message="Each axis needs a non-empty list of values",
+                    details={"axis": axis}
+                )
+
+        axes = list(grid)
+        tasks = [
+            (index, dict(zip(axes, combination)))
+            for index, combination in enumerate(itertools.product(*grid.values()))
+        ]
+        snapshot = _snapshot_return(base)
+        total = len(tasks)
+        rows: List[ScenarioSweepRow] = []
+
+        try:
+            if max_workers == 1 or total == 1:
+                worker = _ScenarioSweepWorker(self.tax_year, snapshot, projection_year)
+                for task in tasks:
+                    rows.append(worker.evaluate(*task))
+                    if progress_callback:
+                        progress_callback(len(rows), total)
+            else:
+                with ProcessPoolExecutor(max_workers=max_workers,
+                                         initializer=_init_sweep_worker,
+                                         initargs=(self.tax_year, snapshot, projection_year)) as executor:
+                    # Several chunks per worker keeps progress updates flowing
+                    workers = max_workers or os.cpu_count() or 1
+                    chunk_size = max(1, math.ceil(total / (workers * 4)))
+                    futures = [
+                        executor.submit(_run_sweep_chunk, tasks[start:start + chunk_size])
+                        for start in range(0, total, chunk_size)
+                    ]
+                    for future in as_completed(futures):
+                        rows.extend(future.result())
+                        if progress_callback:
+                            progress_callback(len(rows), total)
+        except (InvalidInputException, ServiceExecutionException):
+            raise
+        except Exception as e:
+            raise ServiceExecutionException(
+                service_name="TaxPlanningService",
+                operation="sweep_scenarios",
+                details={"error": str(e), "grid_points": total}
+            ) from e
+
+        rows.sort(key=lambda row: row.index)
+        logger.info(f"Evaluated {total} sweep scenarios over axes {axes}")
+        return ScenarioSweepTable(axes, rows)
+
     def _apply_scenario_changes(self, tax_data: Any, changes: Dict[str, Any]) -> Any:
         """
-        Apply scenario changes to tax data.
+        Apply scenario changes to tax data without copying it.
 
         Args:
             tax_data: Original tax data
             changes: Dictionary of changes to apply
 
         Returns:
-            Modified tax data object
+            ScenarioOverlay over a TaxData object (or another overlay), or a
+            dictionary sharing unchanged sections with the original
         """
-        # If it's a TaxData object, create a copy and modify its data
-        if hasattr(tax_data, 'data'):
-            # Create a deep copy of the TaxData object
-            import copy
-            modified_tax_data = copy.deepcopy(tax_data)
-            
-            # Apply changes to the copied data
-            def apply_nested_changes(target: Dict[str, Any], changes: Dict[str, Any]):
-                for key, value in changes.items():
-                    if isinstance(value, dict) and key in target and isinstance(target[key], dict):
-                        apply_nested_changes(target[key], value)
-                    elif isinstance(value, list) and key in target and isinstance(target[key], list):
-                        # Handle list modifications (like w2_forms)
-                        if key == 'w2_forms' and target[key] and isinstance(target[key][0], dict):
-                            # Modify existing W-2 form
-                            for change_key, change_value in value[0].items():
-                                if change_key in target[key][0]:
-                                    if isinstance(change_value, (int, float)):
-                                        target[key][0][change_key] += change_value
-                                    else:
-                                        target[key][0][change_key] = change_value
-                    else:
-                        target[key] = value
-
-            # Apply changes to the year-specific data
-            current_year = modified_tax_data.get_current_year()
-            year_data = modified_tax_data.data["years"][current_year]
-            apply_nested_changes(year_data, changes)
-            # Clear any caching to ensure fresh calculation
-            if hasattr(modified_tax_data, '_calculation_cache'):
-                modified_tax_data._calculation_cache = {}
-            if hasattr(modified_tax_data, '_cache_timestamp'):
-                modified_tax_data._cache_timestamp = None
-            return modified_tax_data
-
-        # For plain dictionaries, work with copies
-        else:
-            import copy
-            data = copy.deepcopy(tax_data)
-
-            # Apply changes recursively
-            def apply_nested_changes(target: Dict[str, Any], changes: Dict[str, Any]):
-                for key, value in changes.items():
-                    if isinstance(value, dict) and key in target and isinstance(target[key], dict):
-                        apply_nested_changes(target[key], value)
-                    else:
-                        target[key] = value
-
-            apply_nested_changes(data, changes)
-            return data
\ No newline at end of file
+        # TaxData objects get a read-through overlay of the current year
+        if hasattr(tax_data, 'data') or isinstance(tax_data, ScenarioOverlay):
+            return ScenarioOverlay.from_tax_data(tax_data, changes)
+
+        # For plain dictionaries, copy only the sections being changed
+        def merge_changes(target: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+            merged = dict(target)
+            for key, value in changes.items():
+                if isinstance(value, dict) and key in merged and isinstance(merged[key], dict):
+                    merged[key] = merge_changes(merged[key], value)
+                else:
+                    merged[key] = value
+            return merged
+
+        return merge_changes(tax_data, changes)
+
+
+def _snapshot_return(base: Any) -> Tuple[str, Dict[str, Any]]:
+    """
+    Reduce a return to the plain data a sweep worker needs.
+
+    TaxData objects are reduced to their current year's data, leaving out
+    the encryption service, event bus and other years.
+    """
+    if hasattr(base, 'data') and hasattr(base, 'get_current_year'):
+        return 'year', base.data.get('years', {}).get(base.get_current_year(), {})
+    if isinstance(base, dict):
+        return 'dict', base
+    raise InvalidInputException(
+        field_name="base",
+        message="Scenario sweeps need a TaxData object or dictionary",
+        details={"unsupported_type": type(base).__name__}
+    )
+
+
+class _ScenarioSweepWorker:
+    """Evaluates sweep grid points against one base return snapshot"""
+
+    def __init__(self, tax_year: int, snapshot: Tuple[str, Dict[str, Any]],
+                 projection_year: Optional[int]):
+        kind, data = snapshot
+        self.service = TaxPlanningService(tax_year)
+        self.base = ScenarioOverlay.from_year_data(data) if kind == 'year' else data
+        self.projection_year = projection_year
+        self.original_result = self.service.calc_service.calculate_complete_return(self.base)
+
+    def evaluate(self, index: int, parameters: Dict[str, Any]) -> ScenarioSweepRow:
+        changes: Dict[str, Any] = {}
+        projection_args: Dict[str, float] = {}
+        for path, value in parameters.items():
+            if path in SWEEP_PROJECTION_AXES:
+                projection_args[path] = value
+                continue
+            target = changes
+            *parents, leaf = path.split('.')
+            for key in parents:
+                target = target.setdefault(key, {})
+            target[leaf] = value
+
+        name = ", ".join(f"{path}={value}" for path, value in parameters.items())
+        result = self.service._evaluate_scenario(self.base, self.original_result, changes, name)
+
+        projection = None
+        if self.projection_year is not None:
+            modified = self.service._apply_scenario_changes(self.base, changes)
+            projection = self.service.project_future_tax(modified, self.projection_year, **projection_args)
+
+        return ScenarioSweepRow(index=index, parameters=parameters, result=result, projection=projection)
+
+
+# Per-process sweep worker, created once by the pool initializer
+_sweep_worker: Optional[_ScenarioSweepWorker] = None
+
+
+def _init_sweep_worker(tax_year: int, snapshot: Tuple[str, Dict[str, Any]],
+                       projection_year: Optional[int]) -> None:
+    global _sweep_worker
+    _sweep_worker = _ScenarioSweepWorker(tax_year, snapshot, projection_year)
+
+
+def _run_sweep_chunk(tasks: List[Tuple[int, Dict[str, Any]]]) -> List[ScenarioSweepRow]:
+    return [_sweep_worker.evaluate(index, parameters) for index, parameters in tasks]
@@ -0,0 +1,185 @@
+"""
+Benchmark baselines - timings and memory peaks compared across runs
+
+A benchmark is timed over a few rounds (the fastest round counts) and run
+once more under tracemalloc for its peak of traced Python allocations. The
+results are kept in a JSON baseline file; later runs fail when a benchmark
+becomes slower or uses more memory than its baseline by more than a
+threshold. Baselines recorded on another machine or Python version are
+replaced rather than compared.
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASELINE_VERSION = 1
+DEFAULT_THRESHOLD = 0.25
+
+
+def _max_rss_kb() -> Optional[int]:
+    """High-water resident set size of this process and its finished children"""
+    if resource is None:
+        return None
+    rss = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+           + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def environment() -> Dict[str, Any]:
+    """What baselines are only comparable within"""
+    return {
+        'python': platform.python_version(),
+        'system': platform.system(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+@dataclass
+class BenchmarkRecord:
+    """Result of one benchmark"""
+    name: str
+    seconds: float
+    peak_bytes: int
+    rounds: int
+    max_rss_kb: Optional[int] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BenchmarkRecord':
+        """Create from dictionary"""
+        return cls(**data)
+
+
+def measure(name: str, func: Callable[[], Any], rounds: int = 3, **params) -> BenchmarkRecord:
+    """
+    Time a benchmark and measure its memory peak.
+
+    Args:
+        name: Benchmark name, the key of its baseline
+        func: Work to measure; called once to warm caches, then rounds
+            times timed and once traced
+        rounds: Timed calls; the fastest one is recorded
+        **params: Parameters stored with the result
+
+    Returns:
+        BenchmarkRecord of the run
+    """
+    func()
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    # Traced separately: tracing slows allocation-heavy code several times over
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return BenchmarkRecord(name, best, peak, rounds, _max_rss_kb(), params)
+
+
+class BenchmarkBaselines:
+    """Baseline file of benchmark records, checked and extended by a run"""
+
+    def __init__(self, path: Path, threshold: float = DEFAULT_THRESHOLD, update: bool = False):
+        """
+        Load baselines.
+
+        Args:
+            path: Baseline JSON file (created on save)
+            threshold: Allowed slowdown or memory growth as a fraction of
+                the baseline (0.25 allows 25% more)
+            update: Replace existing baselines with this run's results
+                instead of comparing against them
+        """
+        self.path = Path(path)
+        self.threshold = threshold
+        self.update = update
+        self.baselines: Dict[str, BenchmarkRecord] = {}
+        self.results: Dict[str, BenchmarkRecord] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        data = json.loads(self.path.read_text(encoding='utf-8'))
+        if data.get('version') != BASELINE_VERSION or data.get('environment') != environment():
+            warnings.warn(f"Ignoring baselines from another environment: {self.path}")
+            return
+        self.baselines = {
+            name: BenchmarkRecord.from_dict(record) for name, record in data['benchmarks'].items()
+        }
+
+    def check(self, record: BenchmarkRecord) -> List[str]:
+        """
+        Compare a result with its baseline and keep it for saving.
+
+        Args:
+            record: Result of a run
+
+        Returns:
+            Descriptions of regressions past the threshold (empty if none,
+            or if the benchmark has no baseline yet)
+        """
+        self.results[record.name] = record
+        baseline = self.baselines.get(record.name)
+        if baseline is None or self.update:
+            return []
+        limit = 1 + self.threshold
+        problems = []
+        if record.seconds > baseline.seconds * limit:
+            problems.append(f"{record.name}: {record.seconds * 1000:.1f} ms, "
+                            f"baseline {baseline.seconds * 1000:.1f} ms")
+        if record.peak_bytes > baseline.peak_bytes * limit:
+            problems.append(f"{record.name}: peak {record.peak_bytes / 1e6:.1f} MB, "
+                            f"baseline {baseline.peak_bytes / 1e6:.1f} MB")
+        return problems
+
+    def save(self) -> None:
+        """Write baselines for new benchmarks (and all results when updating)"""
+        for name, record in self.results.items():
+            if self.update or name not in self.baselines:
+                self.baselines[name] = record
+        data = {
+            'version': BASELINE_VERSION,
+            'environment': environment(),
+            'benchmarks': {name: record.to_dict() for name, record in sorted(self.baselines.items())},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+        temp_path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+        os.replace(temp_path, self.path)
+
+    def report(self) -> str:
+        """Results of this run next to their baselines"""
+        lines = []
+        for name, record in self.results.items():
+            baseline = self.baselines.get(name)
+            line = f"{name}: {record.seconds * 1000:.1f} ms, peak {record.peak_bytes / 1e6:.1f} MB"
+            if baseline is not None and baseline is not record:
+                line += f" ({record.seconds / baseline.seconds:.2f}x time, " \
+                        f"{record.peak_bytes / max(baseline.peak_bytes, 1):.2f}x memory)"
+            lines.append(line)
+        return "\n".join(lines)
@@ -0,0 +1,169 @@
+"""
+Synthetic fillable PDF forms for testing
+
+The IRS templates are not shipped with the repository, so PDF tests build
+small AcroForm documents with the same structure: hierarchical field names
+(``topmostSubform[0].Page1[0].f1_01[0]``), one widget per terminal field, text
+fields and checkboxes.
+"""
+
+from pathlib import Path
+from typing import Iterable, List, Sequence
+
+from pypdf import PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    FloatObject,
+    NameObject,
+    NumberObject,
+    TextStringObject,
+)
+
+
+def _appearance(writer: PdfWriter, content: bytes):
+    stream = DecodedStreamObject()
+    stream.set_data(content)
+    stream.update({
+        NameObject('/Type'): NameObject('/XObject'),
+        NameObject('/Subtype'): NameObject('/Form'),
+        NameObject('/BBox'): ArrayObject([FloatObject(0), FloatObject(0), FloatObject(10), FloatObject(10)]),
+    })
+    return writer._add_object(stream)
+
+
+def build_form_pdf(path: Path, pages: Sequence[Iterable[str]], checkboxes: Iterable[str] = ()) -> Path:
+    """
+    Write a fillable PDF with the given fields.
+
+    Args:
+        path: Output file
+        pages: Qualified field names for each page; dots separate the
+            parent fields of the hierarchy
+        checkboxes: Names (from pages) that are checkboxes with an ``/1`` on state
+
+    Returns:
+        The path written
+    """
+    checkboxes = set(checkboxes)
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject('/Type'): NameObject('/Font'),
+        NameObject('/Subtype'): NameObject('/Type1'),
+        NameObject('/BaseFont'): NameObject('/Helvetica'),
+        NameObject('/Encoding'): NameObject('/WinAnsiEncoding'),
+    }))
+    top_fields = ArrayObject()
+    parents = {}
+
+    for page_fields in pages:
+        page = writer.add_blank_page(612, 792)
+        page_ref = page.indirect_reference
+        annots = ArrayObject()
+        for row, name in enumerate(page_fields):
+            *ancestors, partial = name.split('.')
+            parent_ref = None
+            for depth in range(len(ancestors)):
+                key = '.'.join(ancestors[:depth + 1])
+                if key not in parents:
+                    node = DictionaryObject({
+                        NameObject('/T'): TextStringObject(ancestors[depth]),
+                        NameObject('/Kids'): ArrayObject(),
+                    })
+                    node_ref = writer._add_object(node)
+                    if parent_ref is None:
+                        top_fields.append(node_ref)
+                    else:
+                        node[NameObject('/Parent')] = parent_ref
+                        parent_ref.get_object()['/Kids'].append(node_ref)
+                    parents[key] = node_ref
+                parent_ref = parents[key]
+
+            y = 760 - 14 * (row % 50)
+            x = 40 + 180 * (row // 50)
+            widget = DictionaryObject({
+                NameObject('/Type'): NameObject('/Annot'),
+                NameObject('/Subtype'): NameObject('/Widget'),
+                NameObject('/T'): TextStringObject(partial),
+                NameObject('/Rect'): ArrayObject([FloatObject(x), FloatObject(y), FloatObject(x + 160), FloatObject(y + 12)]),
+                NameObject('/F'): NumberObject(4),
+                NameObject('/P'): page_ref,
+            })
+            if name in checkboxes:
+                widget[NameObject('/FT')] = NameObject('/Btn')
+                widget[NameObject('/V')] = NameObject('/Off')
+                widget[NameObject('/AS')] = NameObject('/Off')
+                widget[NameObject('/AP')] = DictionaryObject({
+                    NameObject('/N'): DictionaryObject({
+                        NameObject('/1'): _appearance(writer, b'0 0 10 10 re f'),
+                        NameObject('/Off'): _appearance(writer, b''),
+                    })
+                })
+            else:
+                widget[NameObject('/FT')] = NameObject('/Tx')
+                widget[NameObject('/DA')] = TextStringObject('/Helv 0 Tf 0 g')
+            widget_ref = writer._add_object(widget)
+            if parent_ref is None:
+                top_fields.append(widget_ref)
+            else:
+                widget[NameObject('/Parent')] = parent_ref
+                parent_ref.get_object()['/Kids'].append(widget_ref)
+            annots.append(widget_ref)
+        page[NameObject('/Annots')] = annots
+
+    writer._root_object[NameObject('/AcroForm')] = DictionaryObject({
+        NameObject('/Fields'): top_fields,
+        NameObject('/DA'): TextStringObject('/Helv 0 Tf 0 g'),
+        NameObject('/DR'): DictionaryObject({
+            NameObject('/Font'): DictionaryObject({NameObject('/Helv'): font}),
+        }),
+    })
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        writer.write(f)
+    return path
+
+
+def irs_style_field_names(page_number: int, count: int, prefix: str = 'f') -> List[str]:
+    """Field names laid out like the IRS templates (``topmostSubform[0].Page1[0].f1_01[0]``)"""
+    return [
+        f"topmostSubform[0].Page{page_number}[0].{prefix}{page_number}_{index:02d}[0]"
+        for index in range(1, count + 1)
+    ]
+
+
+def build_return_templates(forms_directory: Path, generator, tax_returns: Iterable, extra_fields: int = 60) -> List[Path]:
+    """
+    Write a synthetic template for every form some return needs.
+
+    Each template holds the fields the generator maps for the returns (every
+    copy, signature fields included) plus unused IRS-style fields, so
+    templates are about as large as the real forms.
+
+    Args:
+        forms_directory: Directory the generator reads templates from
+        generator: TaxReturnPDFGenerator whose mapping decides the fields
+        tax_returns: Returns whose forms are built
+        extra_fields: Unused fields added to each page
+
+    Returns:
+        The templates written
+    """
+    forms = {}
+    for tax_data in tax_returns:
+        for job in generator.build_fill_jobs(tax_data, include_signature=True):
+            names = forms.setdefault(job.form_name, set())
+            names.update(job.field_values)
+            if job.lots:
+                for copy in job.iter_copies():
+                    names.update(copy)
+    return [
+        build_form_pdf(Path(forms_directory) / f"{form_name}.pdf", [
+            sorted(names) + irs_style_field_names(1, extra_fields, 'x'),
+            irs_style_field_names(2, extra_fields),
+        ])
+        for form_name, names in forms.items()
+    ]
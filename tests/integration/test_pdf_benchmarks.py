@@ -0,0 +1,197 @@
+"""
+PDF generation benchmarks with baseline regression checks.
+
+Builds synthetic IRS-style templates, then measures single-form fills,
+complete and merged returns of increasing complexity, opening a live and a
+flattened merged return, and batch exports in thread and process mode. Results are compared with JSON baselines (see
+tests/fixtures/benchmark_baselines.py) and a benchmark fails when it is
+slower or uses more memory than its baseline by more than the threshold.
+
+The suite takes minutes, so it only runs when asked to:
+
+    PDF_BENCHMARKS=1 pytest tests/integration/test_pdf_benchmarks.py -s
+    PDF_BENCHMARKS=1 pytest tests/integration/test_pdf_benchmarks.py -m "not slow"
+
+Environment:
+    PDF_BENCHMARK_BASELINE: Baseline file (default .benchmarks/pdf_generation.json)
+    PDF_BENCHMARK_THRESHOLD: Allowed regression as a fraction (default 0.25)
+    PDF_BENCHMARK_UPDATE=1: Record this run as the new baseline
+
+Memory peaks are traced Python allocations of the test process; process mode
+workers are not traced, their resident size shows up in max_rss_kb only.
+"""
+
+import os
+import time
+import pytest
+from pathlib import Path
+from pypdf import PdfReader
+from tests.fixtures.benchmark_baselines import DEFAULT_THRESHOLD, BenchmarkBaselines, measure
+from tests.fixtures.sample_pdf_forms import build_return_templates
+from utils.pdf.pdf_generator import TaxReturnPDFGenerator
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get('PDF_BENCHMARKS'), reason="set PDF_BENCHMARKS=1 to run the PDF benchmarks"
+)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / ".benchmarks" / "pdf_generation.json"
+COMPLEXITIES = ("simple", "itemized", "investor")
+
+
+def _return(index, complexity="simple"):
+    """A return of the given complexity; forms needed grow from Form 1040 alone to six forms"""
+    tax_data = {
+        'personal_info': {
+            'first_name': f'Filer{index}', 'middle_initial': 'Q', 'last_name': 'Taxpayer',
+            'ssn': f'123-45-{index % 10000:04d}', 'address': '123 Main Street',
+            'city': 'Anytown', 'state': 'CA', 'zip_code': '90210'
+        },
+        'filing_status': {'status': 'Single'},
+        'income': {'w2_forms': [{'wages': 75000 + index, 'federal_withholding': 8500}]},
+        'deductions': {'method': 'standard'},
+    }
+    if complexity in ("itemized", "investor"):
+        tax_data['filing_status'] = {'status': 'Married Filing Jointly'}
+        tax_data['spouse_info'] = {'first_name': 'Jane', 'last_name': 'Taxpayer', 'ssn': '234-56-7890'}
+        tax_data['income']['w2_forms'].append({'wages': 52000, 'federal_withholding': 6100})
+        tax_data['income']['interest_income'] = [{'amount': 420.15}, {'amount': 90, 'tax_exempt': True}]
+        tax_data['income']['dividend_income'] = [{'ordinary': 1800, 'qualified': 1200}]
+        tax_data['deductions'] = {
+            'method': 'itemized', 'medical_expenses': 8200, 'state_local_taxes': 10000,
+            'mortgage_interest': 14300, 'cash_contributions': 2500
+        }
+    if complexity == "investor":
+        tax_data['income']['partnership_income'] = 12000
+        tax_data['income']['capital_gains'] = [{
+            'description': f'100 sh XYZ lot {lot}', 'date_acquired': '01/15/2023', 'date_sold': '06/20/2024',
+            'sales_price': 5000 + lot, 'cost_basis': 4200, 'gain_loss': 800 + lot,
+            'holding_period': 'Short-term' if lot % 3 else 'Long-term'
+        } for lot in range(60)]
+    return tax_data
+
+
+@pytest.fixture(scope="module")
+def baselines():
+    """Baselines for the module; new results are saved when it finishes"""
+    store = BenchmarkBaselines(
+        Path(os.environ.get('PDF_BENCHMARK_BASELINE', DEFAULT_BASELINE)),
+        threshold=float(os.environ.get('PDF_BENCHMARK_THRESHOLD', DEFAULT_THRESHOLD)),
+        update=bool(os.environ.get('PDF_BENCHMARK_UPDATE'))
+    )
+    yield store
+    store.save()
+    print(f"\n{store.report()}")
+
+
+@pytest.fixture(scope="module")
+def generator(tmp_path_factory):
+    """Generator over synthetic templates for every form the sample returns need"""
+    root = tmp_path_factory.mktemp("pdf_benchmarks")
+    forms_dir = root / "forms"
+    forms_dir.mkdir()
+    generator = TaxReturnPDFGenerator(str(forms_dir), str(root / "out"))
+    build_return_templates(forms_dir, generator, [_return(0, complexity) for complexity in COMPLEXITIES])
+    return generator
+
+
+def _check(baselines, record):
+    problems = baselines.check(record)
+    assert not problems, "Benchmark regressed:\n" + "\n".join(problems)
+
+
+class TestFormFillBenchmarks:
+    """Benchmark filling single forms and complete returns"""
+
+    def test_single_form_fill(self, baselines, generator, tmp_path):
+        """Benchmark one Form 1040 fill from the cached template"""
+        job = generator.build_fill_jobs(_return(1))[0]
+        output = str(tmp_path / "form1040.pdf")
+
+        record = measure("fill_form[Form 1040]", lambda: generator.form_filler.fill_form(
+            job.form_name, job.field_values, output
+        ), rounds=20)
+
+        assert Path(output).exists()
+        _check(baselines, record)
+
+    @pytest.mark.parametrize("complexity", COMPLEXITIES)
+    def test_complete_return(self, baselines, generator, complexity):
+        """Benchmark every form of a return, written as separate files"""
+        tax_data = _return(2, complexity)
+
+        record = measure(f"generate_complete_return[{complexity}]", lambda: generator.generate_complete_return(
+            tax_data, incremental=False
+        ), forms=len(generator.determine_required_forms(tax_data)))
+
+        _check(baselines, record)
+
+    @pytest.mark.parametrize("flatten", [False, True], ids=["live", "flattened"])
+    def test_merged_return(self, baselines, generator, flatten):
+        """Benchmark the most complex return written as one PDF"""
+        tax_data = _return(3, "investor")
+
+        record = measure(f"generate_merged_return[investor-{'flattened' if flatten else 'live'}]",
+                         lambda: generator.generate_merged_return(tax_data, flatten=flatten, incremental=False))
+
+        _check(baselines, record)
+
+    @pytest.mark.parametrize("flatten", [False, True], ids=["live", "flattened"])
+    def test_open_merged_return(self, baselines, generator, flatten, tmp_path):
+        """Benchmark opening the merged investor return the way a viewer does before drawing"""
+        path = generator.generate_merged_return(_return(3, "investor"), output_path=str(tmp_path / "return.pdf"),
+                                                flatten=flatten, incremental=False)
+
+        def open_and_walk():
+            # Parse pages, annotations and form fields
+            reader = PdfReader(path)
+            reader.get_fields()
+            for page in reader.pages:
+                page.get_contents()
+                for annot in page.get('/Annots', ()):
+                    annot.get_object()
+
+        record = measure(f"open_merged_return[investor-{'flattened' if flatten else 'live'}]", open_and_walk,
+                         size_bytes=path.stat().st_size)
+
+        _check(baselines, record)
+
+
+class TestBatchExportBenchmarks:
+    """Benchmark batch export by size and executor"""
+
+    @pytest.mark.parametrize("size", [10, 100, pytest.param(1000, marks=pytest.mark.slow)])
+    @pytest.mark.parametrize("use_processes", [False, True], ids=["threads", "processes"])
+    def test_batch_export(self, baselines, generator, size, use_processes):
+        """Benchmark exporting simple returns in one batch"""
+        tax_returns = [_return(index) for index in range(size)]
+        workers = min(4, os.cpu_count() or 1)
+
+        def export():
+            results = generator.generate_batch_export(
+                tax_returns, max_workers=workers, use_processes=use_processes,
+                chunk_size=max(1, size // (workers * 4)), incremental=False
+            )
+            assert all(results)
+
+        record = measure(f"generate_batch_export[{'processes' if use_processes else 'threads'}-{size}]",
+                         export, rounds=3 if size <= 10 else 1, returns=size, workers=workers)
+
+        _check(baselines, record)
+
+    @pytest.mark.slow
+    @pytest.mark.skipif((os.cpu_count() or 1) < 2, reason="needs at least two CPUs")
+    def test_process_pool_scales(self, generator):
+        """Test a 1,000-return process pool export speeds up close to linearly with workers"""
+        tax_returns = [_return(index) for index in range(1000)]
+
+        def timed(workers):
+            start = time.perf_counter()
+            results = list(generator.iter_batch_export(tax_returns, max_workers=workers, chunk_size=25))
+            assert len(results) == 1000 and all(result.success for result in results)
+            return time.perf_counter() - start
+
+        workers = min(os.cpu_count(), 4)
+        serial_time = timed(1)
+        parallel_time = timed(workers)
+
+        assert serial_time / parallel_time > workers * 0.6
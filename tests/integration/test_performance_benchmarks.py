@@ -122,3 +122,64 @@ class TestDataModelPerformance:
         """Benchmark converting TaxData to dictionary."""
         result = benchmark(sample_tax_data.to_dict)
         assert isinstance(result, dict)
+
+
+class TestBracketLookupPerformance:
+    """Benchmark precompiled bracket tables against the lru_cache'd bracket walk."""
+
+    @pytest.fixture
+    def incomes(self):
+        import random
+        rng = random.Random(42)
+        statuses = ['Single', 'MFJ', 'HOH']
+        return [(round(rng.uniform(0, 700000), 2), rng.choice(statuses)) for _ in range(50000)]
+
+    def test_benchmark_cached_bracket_walk(self, benchmark, incomes):
+        """Benchmark the bracket walk calculate_income_tax used before tables."""
+        from functools import lru_cache
+        from config.tax_year_config import get_tax_year_config
+
+        def walk_brackets(taxable_income, filing_status, tax_year):
+            config = get_tax_year_config(tax_year)
+            brackets = config.tax_brackets.get(filing_status, config.tax_brackets["Single"])
+            tax = 0.0
+            prev_threshold = 0.0
+            for threshold, rate in brackets:
+                if taxable_income <= threshold:
+                    tax += (taxable_income - prev_threshold) * rate
+                    break
+                tax += (threshold - prev_threshold) * rate
+                prev_threshold = threshold
+            return round(tax, 2)
+
+        cached_walk = lru_cache(maxsize=128)(walk_brackets)
+        benchmark(lambda: [cached_walk(income, status, 2025) for income, status in incomes])
+        assert cached_walk.cache_info().hits < len(incomes) * 0.01  # cache almost never hits
+
+    def test_benchmark_precompiled_lookup(self, benchmark, incomes):
+        """Benchmark calculate_income_tax's precompiled table lookup."""
+        from utils.tax_calculations import calculate_income_tax
+        result = benchmark(lambda: [calculate_income_tax(income, status, 2025) for income, status in incomes])
+        assert len(result) == len(incomes)
+
+
+class TestMoneyEnginePerformance:
+    """Benchmark integer-cents sums against per-value Decimal conversion."""
+
+    @pytest.fixture
+    def amounts(self):
+        import random
+        rng = random.Random(42)
+        return [round(rng.uniform(-5000, 5000), 2) for _ in range(100000)]
+
+    def test_benchmark_decimal_sum(self, benchmark, amounts):
+        """Benchmark sum(Decimal(str(v))) over a large lot list."""
+        from decimal import Decimal
+        result = benchmark(lambda: sum(Decimal(str(v)) for v in amounts))
+        assert result is not None
+
+    def test_benchmark_cents_sum(self, benchmark, amounts):
+        """Benchmark sum_money over the same lot list."""
+        from utils.money import sum_money
+        result = benchmark(sum_money, amounts)
+        assert result is not None
@@ -1,7 +1,15 @@
 import pytest
 import asyncio
+import threading
 from pathlib import Path
-from utils.async_pdf import AsyncPDFGenerator, PDFGenerationTask, generate_pdf_async_wrapper, generate_multiple_pdfs_wrapper
+from utils.async_pdf import (
+    AsyncPDFGenerator, JobPriority, JobStatus, PDFGenerationTask, PDFJobQueue,
+    generate_pdf_async_wrapper, generate_multiple_pdfs_wrapper
+)
+from utils.event_bus import EventBus, EventType
+from utils.pdf.form_filler import PDFFormFiller
+from utils.pdf.template_cache import get_template_cache
+from tests.fixtures.sample_pdf_forms import build_form_pdf, irs_style_field_names
 
 class DummyPDFFormFiller:
     def export_form_1040(self, tax_data, output_path):
@@ -9,6 +17,10 @@ class DummyPDFFormFiller:
         with open(output_path, 'w') as f:
             f.write('PDF content')
 
+    def fill_form_copies(self, form_name, copies, output_path, flatten=False, on_page=None):
+        list(copies)
+        self.export_form_1040(None, output_path)
+
 @pytest.fixture(autouse=True)
 def patch_pdf_form_filler(monkeypatch):
     monkeypatch.setattr('utils.async_pdf.PDFFormFiller', DummyPDFFormFiller)
@@ -77,3 +89,117 @@ def test_shutdown_idempotent():
     generator = AsyncPDFGenerator()
     generator.shutdown()
     generator.shutdown()  # Should not raise
+
+
+@pytest.fixture
+def job_queue_factory(tmp_path):
+    """Job queues filling a synthetic three-page Form 1040"""
+    build_form_pdf(tmp_path / "forms" / "Form 1040.pdf",
+                   [irs_style_field_names(page, 3) for page in (1, 2, 3)])
+    EventBus.reset_instance()
+    queues = []
+
+    def make(max_concurrent=1, **kwargs):
+        generator = AsyncPDFGenerator()
+        generator._filler = PDFFormFiller(str(tmp_path / "forms"))
+        job_queue = PDFJobQueue(generator, max_concurrent=max_concurrent, **kwargs)
+        queues.append(job_queue)
+        return job_queue
+
+    yield make
+    for job_queue in queues:
+        job_queue.shutdown()
+    EventBus.reset_instance()
+
+def _task(tmp_path, name):
+    return PDFGenerationTask(form_name="Form 1040", tax_data={}, output_path=tmp_path / f"{name}.pdf", task_id=name)
+
+def _block_first_job(bus):
+    """Hold the first started job until release is set; returns (started, release)"""
+    started, release = threading.Event(), threading.Event()
+
+    def hold(event):
+        bus.unsubscribe(EventType.PDF_EXPORT_STARTED, hold)
+        started.set()
+        release.wait(10)
+
+    bus.subscribe(EventType.PDF_EXPORT_STARTED, hold)
+    return started, release
+
+def test_job_queue_runs_interactive_before_batch(tmp_path, job_queue_factory):
+    job_queue = job_queue_factory()
+    bus = EventBus.get_instance()
+    started = []
+    bus.subscribe(EventType.PDF_EXPORT_STARTED, lambda event: started.append(event.data['task_id']))
+    blocking, release = _block_first_job(bus)
+
+    blocker = job_queue.submit(_task(tmp_path, "blocker"))
+    assert blocking.wait(10)
+    batch = job_queue.submit_many([_task(tmp_path, f"batch{i}") for i in range(2)])
+    preview = job_queue.submit(_task(tmp_path, "preview"), JobPriority.INTERACTIVE)
+    release.set()
+
+    assert all(job.wait(10).success for job in [blocker, preview, *batch])
+    assert started == ["blocker", "preview", "batch0", "batch1"]
+    assert job_queue.get_stats()['completed'] == 4
+
+def test_job_queue_reports_page_progress_and_reuses_template(tmp_path, job_queue_factory):
+    job_queue = job_queue_factory()
+    bus = EventBus.get_instance()
+    misses = get_template_cache().get_stats()['misses']
+    progress = []
+    bus.subscribe(EventType.PDF_EXPORT_PROGRESS,
+                  lambda event: progress.append((event.data['pages_done'], event.data['total_pages'])))
+
+    jobs = job_queue.submit_many([_task(tmp_path, f"return{i}") for i in range(2)])
+
+    assert all(job.wait(10).success and job.task.output_path.exists() for job in jobs)
+    assert progress == [(1, 3), (2, 3), (3, 3)] * 2
+    assert jobs[0].progress == 100.0
+    assert get_template_cache().get_stats()['misses'] == misses + 1
+
+def test_job_queue_cancels_queued_and_running_jobs(tmp_path, job_queue_factory):
+    job_queue = job_queue_factory()
+    bus = EventBus.get_instance()
+    blocking, release = _block_first_job(bus)
+    cancelled = []
+    bus.subscribe(EventType.PDF_EXPORT_CANCELLED, lambda event: cancelled.append(event.data['task_id']))
+
+    running = job_queue.submit(_task(tmp_path, "running"))
+    assert blocking.wait(10)
+    queued = job_queue.submit(_task(tmp_path, "queued"))
+    assert job_queue.cancel(queued.job_id)
+    assert job_queue.cancel(running.job_id)
+    release.set()
+
+    assert not running.wait(10).success and not queued.wait(10).success
+    assert running.status == JobStatus.CANCELLED and queued.status == JobStatus.CANCELLED
+    assert sorted(cancelled) == ["queued", "running"]
+    assert not running.task.output_path.exists()
+    assert not job_queue.cancel(running.job_id)
+
+def test_job_queue_reports_failures(tmp_path, job_queue_factory):
+    job_queue = job_queue_factory()
+    job = job_queue.submit(PDFGenerationTask(form_name="Unknown Form", tax_data={}, output_path=tmp_path / "x.pdf"))
+
+    result = job.wait(10)
+    assert not result.success and "Unknown form" in result.error
+    assert job.status == JobStatus.FAILED
+
+def test_job_queue_forgets_oldest_finished_jobs(tmp_path, job_queue_factory):
+    job_queue = job_queue_factory(max_finished_jobs=2)
+    jobs = job_queue.submit_many([_task(tmp_path, f"return{i}") for i in range(4)])
+    failed = job_queue.submit(PDFGenerationTask(form_name="Unknown Form", tax_data={}, output_path=tmp_path / "x.pdf"),
+                              JobPriority.BATCH)
+
+    assert all(job.wait(10).success for job in jobs) and not failed.wait(10).success
+    assert [job_queue.get_job(job.job_id) for job in jobs] == [None, None, None, jobs[3]]
+    assert job_queue.get_job(failed.job_id) is failed
+    assert sum(job_queue.get_stats().values()) == 2
+    assert len(job_queue._jobs) == 2
+
+def test_job_queue_rejects_work_after_shutdown(tmp_path, job_queue_factory):
+    job_queue = job_queue_factory()
+    job_queue.shutdown()
+    with pytest.raises(RuntimeError):
+        job_queue.submit(_task(tmp_path, "late"))
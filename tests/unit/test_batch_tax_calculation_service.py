@@ -0,0 +1,202 @@
+"""
+Tests for BatchTaxCalculationService
+
+Verifies that vectorized batch results match the scalar calculation
+path exactly, row by row.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from models.tax_data import TaxData
+from services.batch_tax_calculation_service import (
+    BatchTaxCalculationService,
+    BatchTaxResult,
+    FILING_STATUS_CODES,
+    ReturnBatch,
+    encode_filing_status,
+)
+from services.exceptions import InvalidInputException
+from services.tax_calculation_service import TaxCalculationService
+from utils.tax_calculations import (
+    calculate_child_tax_credit,
+    calculate_earned_income_credit,
+    calculate_retirement_savings_credit,
+    calculate_child_dependent_care_credit,
+)
+
+
+def _random_return(rng: random.Random) -> dict:
+    """Build a flat return dictionary with randomized amounts"""
+    status = rng.choice(FILING_STATUS_CODES)
+    return {
+        'filing_status': {'status': status},
+        'income': {
+            'w2_forms': [
+                {'wages': round(rng.uniform(0, 250000), 2),
+                 'federal_withholding': round(rng.uniform(0, 30000), 2)}
+                for _ in range(rng.randint(0, 3))
+            ],
+            'interest_income': [{'amount': round(rng.uniform(0, 5000), 2)}],
+            'dividend_income': [{'ordinary': round(rng.uniform(0, 8000), 2)}],
+            'self_employment': (
+                [{'net_profit': round(rng.uniform(-5000, 300000), 2)}] if rng.random() < 0.4 else []
+            ),
+        },
+        'deductions': {
+            'method': rng.choice(['standard', 'itemized']),
+            'medical_expenses': round(rng.uniform(0, 5000), 2),
+            'state_local_taxes': round(rng.uniform(0, 10000), 2),
+            'mortgage_interest': round(rng.uniform(0, 20000), 2),
+            'charitable_contributions': round(rng.uniform(0, 5000), 2),
+        },
+        'dependents': [
+            {'relationship': rng.choice(['son', 'daughter', 'parent']),
+             'birth_date': f"01/01/{rng.randint(2000, 2024)}",
+             'months_lived_in_home': 12}
+            for _ in range(rng.randint(0, 3))
+        ],
+        'credits': {
+            'retirement_savings_credit': rng.choice([0, round(rng.uniform(0, 3000), 2)]),
+            'child_dependent_care': {'expenses': rng.choice([0, round(rng.uniform(0, 8000), 2)])},
+            'residential_energy': {'amount': rng.choice([0, 1234.567])},
+            'premium_tax_credit': {'amount': 0},
+        },
+        'payments': {'estimated_tax': round(rng.uniform(0, 5000), 2)},
+    }
+
+
+@pytest.fixture
+def random_returns():
+    """A reproducible set of varied returns"""
+    rng = random.Random(2025)
+    return [_random_return(rng) for _ in range(300)]
+
+
+class TestReturnBatch:
+    """Test batch construction"""
+
+    def test_encode_filing_status_aliases_and_unknown(self):
+        """Test long-form names map to codes and unknown falls back to Single"""
+        codes = encode_filing_status(['MFJ', 'Head of Household', 'Unknown'])
+        assert codes.tolist() == [1, 3, 0]
+
+    def test_from_columns_defaults_missing_columns(self):
+        """Test missing columns default to zeros"""
+        batch = ReturnBatch.from_columns(['Single', 'MFJ'], [50000, 90000])
+        assert len(batch) == 2
+        assert batch.business_income.tolist() == [0.0, 0.0]
+        assert batch.use_itemized.dtype == np.bool_
+
+    def test_from_columns_rejects_unknown_column(self):
+        """Test unknown columns are rejected"""
+        with pytest.raises(InvalidInputException):
+            ReturnBatch.from_columns([0], [1.0], bogus=[1.0])
+
+    def test_from_columns_rejects_length_mismatch(self):
+        """Test columns must all have the same length"""
+        with pytest.raises(InvalidInputException):
+            ReturnBatch.from_columns([0, 1], [1.0, 2.0], taxable_interest=[1.0])
+
+    def test_from_returns_accepts_tax_data(self, sample_w2_form):
+        """Test TaxData objects are read through the scalar accessors"""
+        tax_data = TaxData()
+        tax_data.set('filing_status.status', 'MFJ')
+        tax_data.add_w2_form(sample_w2_form)
+
+        batch = ReturnBatch.from_returns([tax_data])
+        assert batch.filing_status.tolist() == [FILING_STATUS_CODES.index('MFJ')]
+        assert batch.wages.tolist() == [sample_w2_form['wages']]
+
+
+class TestBatchParity:
+    """Test that batch results are identical to the scalar path"""
+
+    def test_matches_calculate_complete_return(self, random_returns):
+        """Test every TaxResult field matches the scalar service exactly"""
+        scalar = TaxCalculationService(tax_year=2025)
+        result = BatchTaxCalculationService(tax_year=2025).calculate_returns(random_returns)
+
+        assert isinstance(result, BatchTaxResult)
+        assert len(result) == len(random_returns)
+        for i, tax_data in enumerate(random_returns):
+            expected = scalar.calculate_complete_return(tax_data).to_dict()
+            actual = result.row(i).to_dict()
+            for key in ('total_income', 'adjusted_gross_income', 'deduction_used',
+                        'taxable_income', 'income_tax', 'self_employment_tax',
+                        'total_tax', 'total_payments', 'refund_amount', 'amount_owed'):
+                assert actual[key] == expected[key], (i, key)
+
+    def test_matches_scalar_credits(self, random_returns):
+        """Test vectorized credits match the scalar credit helpers"""
+        service = BatchTaxCalculationService(tax_year=2025)
+        batch = ReturnBatch.from_returns(random_returns)
+        result = service.calculate_batch(batch)
+
+        for i in range(len(batch)):
+            status = FILING_STATUS_CODES[batch.filing_status[i]]
+            agi = float(result.adjusted_gross_income[i])
+            children = int(batch.qualifying_children[i])
+            others = int(batch.other_dependents[i])
+
+            expected_ctc = calculate_child_tax_credit(children, others, agi, status)
+            assert result.child_tax_credit[i] == expected_ctc
+
+            expected_eic = 0
+            if children and batch.wages[i] > 0:
+                expected_eic = calculate_earned_income_credit(
+                    float(batch.wages[i]), agi, children, status
+                )
+            assert result.earned_income_credit[i] == expected_eic
+
+            contributions = float(batch.retirement_contributions[i])
+            expected_saver = 0
+            if contributions > 0:
+                expected_saver = calculate_retirement_savings_credit(contributions, agi, status, 2025)
+            assert result.retirement_savings_credit[i] == expected_saver
+
+            expenses = float(batch.child_care_expenses[i])
+            expected_care = 0
+            if expenses > 0:
+                expected_care = calculate_child_dependent_care_credit(expenses, agi, status, 2025)
+            assert result.child_dependent_care_credit[i] == expected_care
+
+    def test_tax_after_credits_never_negative(self, random_returns):
+        """Test credits cannot push tax below zero"""
+        result = BatchTaxCalculationService().calculate_returns(random_returns)
+        assert (result.tax_after_credits >= 0).all()
+
+    @pytest.mark.parametrize("taxable_income", [0, 11925, 11925.01, 48475, 626350, 1e7])
+    def test_bracket_boundaries(self, taxable_income):
+        """Test bracket lookup at and around thresholds"""
+        from utils.tax_calculations import calculate_income_tax
+
+        service = BatchTaxCalculationService(tax_year=2025)
+        batch = ReturnBatch.from_columns(
+            ['Single'], [taxable_income],
+            use_itemized=[True], itemized_deductions=[0.0]
+        )
+        result = service.calculate_batch(batch)
+        assert result.income_tax[0] == calculate_income_tax(taxable_income, 'Single', 2025)
+
+
+class TestBatchResultTable:
+    """Test the columnar result table"""
+
+    def test_to_dict_and_records(self):
+        """Test result table conversions"""
+        batch = ReturnBatch.from_columns(['Single', 'HOH'], [40000, 80000])
+        result = BatchTaxCalculationService().calculate_batch(batch)
+
+        columns = result.to_dict()
+        assert set(columns) >= {'income_tax', 'total_credits', 'refund_amount'}
+        records = result.to_records()
+        assert len(records) == 2
+        assert records[1]['total_wages'] == 80000.0
+
+    def test_invalid_batch_type(self):
+        """Test non-batch input is rejected"""
+        with pytest.raises(InvalidInputException):
+            BatchTaxCalculationService().calculate_batch({'wages': [1]})
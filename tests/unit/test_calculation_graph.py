@@ -0,0 +1,157 @@
+"""
+Tests for the calculation dependency graph and incremental TaxData totals
+"""
+
+import copy
+
+import pytest
+
+from models.calculation_graph import CalculationGraph
+from models.tax_data import TaxData
+from utils.result_cache import get_result_cache
+
+
+class TestCalculationGraph:
+    """Test the generic graph"""
+
+    @pytest.fixture
+    def graph(self):
+        graph = CalculationGraph()
+        graph.add_list_node("wages", "income.w2_forms", lambda w2: w2.get("wages", 0))
+        graph.add_node("bonus", lambda ctx, v: ctx["bonus"], paths=("income.bonus",))
+        graph.add_node("total", lambda ctx, v: v["wages"] + v["bonus"], depends_on=("wages", "bonus"))
+        graph.add_node("doubled", lambda ctx, v: v["total"] * 2, depends_on=("total",))
+        return graph
+
+    @pytest.fixture
+    def data(self):
+        return {"income": {"w2_forms": [{"wages": 100}, {"wages": 200}, {"wages": 300}]}}
+
+    def test_evaluate_computes_dependencies(self, graph, data):
+        """Test evaluation pulls values through the graph"""
+        assert graph.evaluate("doubled", {"bonus": 10}, data) == 1220
+
+    def test_clean_nodes_are_not_recomputed(self, graph, data):
+        """Test repeated evaluation uses cached values"""
+        graph.evaluate("doubled", {"bonus": 10}, data)
+        graph.reset_stats()
+        graph.evaluate("doubled", {"bonus": 10}, data)
+        assert graph.recomputed == []
+
+    def test_invalidate_path_marks_only_downstream(self, graph, data):
+        """Test a path change dirties readers and their dependents only"""
+        graph.evaluate("doubled", {"bonus": 10}, data)
+        dirty = graph.invalidate_path("income.bonus")
+        assert dirty == {"bonus", "total", "doubled"}
+        assert not graph.is_dirty("wages")
+
+    def test_invalidate_parent_path(self, graph, data):
+        """Test replacing a whole section dirties every reader in it"""
+        graph.evaluate("doubled", {"bonus": 10}, data)
+        assert graph.invalidate_path("income") == {"wages", "bonus", "total", "doubled"}
+
+    def test_row_update_rereads_single_row(self, graph, data):
+        """Test a single-row change re-reads only that row"""
+        graph.evaluate("doubled", {"bonus": 0}, data)
+        data["income"]["w2_forms"][1] = {"wages": 1000}
+        graph.invalidate_row("income.w2_forms", 1, "update")
+        graph.reset_stats()
+
+        assert graph.evaluate("doubled", {"bonus": 0}, data) == 2800
+        assert graph.rows_recomputed == 1
+        assert "bonus" not in graph.recomputed
+
+    def test_row_append_and_remove(self, graph, data):
+        """Test appended and removed rows keep the row cache aligned"""
+        graph.evaluate("total", {"bonus": 0}, data)
+        data["income"]["w2_forms"].append({"wages": 50})
+        graph.invalidate_row("income.w2_forms", 3, "append")
+        assert graph.evaluate("total", {"bonus": 0}, data) == 650
+
+        data["income"]["w2_forms"].pop(0)
+        graph.invalidate_row("income.w2_forms", 0, "remove")
+        graph.reset_stats()
+        assert graph.evaluate("total", {"bonus": 0}, data) == 550
+        assert graph.rows_recomputed == 0
+
+    def test_unknown_dependency_rejected(self):
+        """Test nodes must depend on existing nodes"""
+        graph = CalculationGraph()
+        with pytest.raises(ValueError):
+            graph.add_node("total", lambda ctx, v: 0, depends_on=("missing",))
+
+    def test_duplicate_node_rejected(self, graph):
+        """Test node names are unique"""
+        with pytest.raises(ValueError):
+            graph.add_node("total", lambda ctx, v: 0)
+
+
+class TestIncrementalTaxTotals:
+    """Test TaxData.calculate_totals recomputes only affected nodes"""
+
+    @pytest.fixture
+    def tax_data(self):
+        tax_data = TaxData()
+        tax_data.set('filing_status.status', 'Single')
+        tax_data.set('income.w2_forms', [
+            {'wages': 1000.0 + i, 'federal_withholding': 150.0} for i in range(200)
+        ])
+        tax_data.set('income.capital_gains', [
+            {'gain_loss': 25.5 * (i % 7 - 3)} for i in range(200)
+        ])
+        # Start from a warm graph rather than a result cached by another test
+        get_result_cache().clear()
+        tax_data.calculate_totals()
+        tax_data._calc_graph.reset_stats()
+        return tax_data
+
+    @staticmethod
+    def _full_recalculation(tax_data):
+        return TaxData.from_dict(copy.deepcopy(tax_data.data)).calculate_totals()
+
+    def test_single_w2_edit_touches_one_row(self, tax_data):
+        """Test editing one W-2 re-reads one row and skips unrelated lines"""
+        tax_data.update_w2_form(42, {'wages': 90000.0, 'federal_withholding': 9000.0})
+        totals = tax_data.calculate_totals()
+
+        graph = tax_data._calc_graph
+        assert graph.rows_recomputed == 2  # wages + withholding for the edited row
+        assert 'capital_gains' not in graph.recomputed
+        assert totals == self._full_recalculation(tax_data)
+
+    def test_unrelated_field_recomputes_nothing(self, tax_data):
+        """Test changing personal info leaves totals cached"""
+        tax_data.set('personal_info.first_name', 'Jane')
+        tax_data.calculate_totals()
+        assert tax_data._calc_graph.recomputed == []
+
+    def test_deduction_change_skips_income(self, tax_data):
+        """Test a deduction change starts recomputation at taxable income"""
+        tax_data.set('deductions.method', 'itemized')
+        tax_data.set('deductions.mortgage_interest', 12000)
+        totals = tax_data.calculate_totals()
+
+        recomputed = tax_data._calc_graph.recomputed
+        assert 'total_income' not in recomputed
+        assert 'taxable_income' in recomputed
+        assert totals == self._full_recalculation(tax_data)
+
+    def test_list_add_and_remove_match_full_recalculation(self, tax_data):
+        """Test list mutations keep incremental totals exact"""
+        tax_data.add_to_list('income.capital_gains', {'gain_loss': 1234.56})
+        tax_data.remove_from_list('income.w2_forms', 0)
+        assert tax_data.calculate_totals() == self._full_recalculation(tax_data)
+
+    def test_year_switch_recalculates(self, tax_data):
+        """Test switching tax year invalidates the graph"""
+        tax_data.set_current_year(2025)
+        assert tax_data.calculate_totals()['total_income'] == 0
+
+    def test_invalidate_calculations_after_direct_edit(self, tax_data):
+        """Test direct data edits are picked up after explicit invalidation"""
+        year = tax_data.get_current_year()
+        tax_data.data['years'][year]['income']['w2_forms'] = [{'wages': 10.0}]
+        tax_data.data['years'][year]['income']['capital_gains'] = []
+        tax_data.invalidate_calculations()
+        assert tax_data.calculate_totals()['total_income'] == 10.0
+        assert self._full_recalculation(tax_data) == tax_data.calculate_totals()
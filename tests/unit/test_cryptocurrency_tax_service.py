@@ -8,6 +8,7 @@ from datetime import datetime, date
 from decimal import Decimal
 
 from services.cryptocurrency_tax_service import (
+    CAPITAL_GAIN_LOSS_COLUMNS,
     CryptocurrencyTaxService,
     CryptoTransaction,
     CryptoTransactionType,
@@ -16,6 +17,7 @@ from services.cryptocurrency_tax_service import (
 )
 from models.tax_data import TaxData
 from config.app_config import AppConfig
+from utils.record_store import RecordStore
 
 
 class TestCryptocurrencyTaxService:
@@ -546,3 +548,54 @@ class TestCryptocurrencyTaxService:
         assert "Bitcoin" in crypto_types
         assert "Ethereum" in crypto_types
         assert "Cardano" in crypto_types
+
+    def test_liability_totals_round_each_lot(self, crypto_service, sample_tax_data):
+        """Test totals add lots rounded to cents, not the exact unrounded sum"""
+        lots = [
+            CapitalGainLoss(
+                description=f"Bitcoin - lot {i}",
+                date_acquired=date(2025, 1, 1),
+                date_sold=date(2025, 6, 1),
+                sales_price=Decimal("100.005"),
+                cost_basis=Decimal("100.00"),
+                gain_loss=Decimal("0.005"),
+                holding_period="short",
+                cryptocurrency="Bitcoin"
+            )
+            for i in range(3)
+        ]
+
+        store = RecordStore(CapitalGainLoss, CAPITAL_GAIN_LOSS_COLUMNS, lots)
+        with patch.object(crypto_service, 'get_capital_gains_store', return_value=store):
+            estimate = crypto_service.get_tax_liability_estimate(sample_tax_data, 2025)
+
+        # Each lot rounds half up to $0.01; the exact sum would be $0.015
+        assert estimate['short_term_gains'] == Decimal('0.03')
+        assert estimate['net_short_term'] == Decimal('0.03')
+
+    def test_gains_store_built_from_year_rows(self, crypto_service, sample_tax_data):
+        """Test lots come from the year's transaction rows, sorted by date"""
+        def transaction(day, kind, amount, value, tx_id):
+            return CryptoTransaction(
+                date=day, type=kind, cryptocurrency="Bitcoin",
+                amount=Decimal(amount), price_per_unit=Decimal("0"),
+                total_value=Decimal(value), fees=Decimal("0"),
+                exchange="Coinbase", transaction_id=tx_id
+            ).to_dict()
+
+        sample_tax_data.get.return_value = [
+            transaction(date(2025, 9, 1), CryptoTransactionType.SELL, "1", "500", "sell"),
+            transaction(date(2024, 12, 1), CryptoTransactionType.BUY, "1", "100", "old_buy"),
+            transaction(date(2025, 2, 1), CryptoTransactionType.BUY, "2", "600", "buy"),
+        ]
+
+        assert len(crypto_service.get_transaction_store(sample_tax_data, 2025)) == 2
+
+        with patch.object(CryptoTransaction, 'from_dict', wraps=CryptoTransaction.from_dict) as parse:
+            store = crypto_service.get_capital_gains_store(sample_tax_data, 2025)
+        assert parse.call_count == 2  # the 2024 row is never parsed
+
+        assert isinstance(store, RecordStore)
+        assert [(lot.cost_basis, lot.gain_loss) for lot in store] == [(Decimal("300"), Decimal("200"))]
+        assert store == crypto_service.calculate_capital_gains_losses(sample_tax_data, 2025)
+        assert "Bitcoin - sell" in crypto_service.export_for_turbotax(sample_tax_data, 2025)
@@ -2,6 +2,7 @@
 Tests for config/dependencies.py
 """
 import pytest
+from config.app_config import AppConfig
 from config.dependencies import DependencyContainer, get_container
 from services.tax_calculation_service import TaxCalculationService
 from services.encryption_service import EncryptionService
@@ -89,3 +90,27 @@ class TestDependencyContainer:
         container = get_container(tax_year=2023)
         
         assert container.tax_year == 2023
+    
+    def test_tax_data_repository_records_in_shared_index(self, tmp_path):
+        """Test repositories from one container share its return index."""
+        config = AppConfig.from_env()
+        config.safe_dir = tmp_path
+        config.key_file = tmp_path / "key"
+        container = DependencyContainer(config)
+        
+        tax_data = container.get_tax_data_repository()
+        
+        assert tax_data.return_index is container.get_return_index_service()
+        assert container.get_tax_data_repository().return_index is tax_data.return_index
+    
+    def test_key_rotation_service_shares_encryption_service(self, tmp_path):
+        """Test key rotation resets the container's cached key."""
+        config = AppConfig.from_env()
+        config.safe_dir = tmp_path
+        config.key_file = tmp_path / "key"
+        container = DependencyContainer(config)
+        
+        service = container.get_key_rotation_service(max_workers=1)
+        
+        assert service.encryption is container.get_encryption_service()
+        assert service.scope == "app" and service.max_workers == 1
@@ -269,6 +269,35 @@ class TestKeyRotation:
         
         assert old_key_data != new_key_data
 
+    def test_staged_key_decrypts_old_data(self, tmp_path):
+        """Should encrypt with the staged key and decrypt with either key"""
+        key_file = tmp_path / "app.key"
+        service = EncryptionService(key_file)
+        old_token = service.encrypt("old secret")
+        old_key = key_file.read_bytes()
+
+        new_key = service.stage_new_key()
+
+        assert key_file.read_bytes() == new_key != old_key
+        assert service.get_retired_keys() == [old_key]
+        assert EncryptionService(key_file).decrypt(old_token) == "old secret"
+        assert Fernet(new_key).decrypt(service.encrypt("new")) == b"new"
+        assert service.stage_new_key() == new_key  # Already staged
+
+    def test_retire_old_keys(self, tmp_path):
+        """Should stop decrypting with retired keys once they are removed"""
+        key_file = tmp_path / "app.key"
+        service = EncryptionService(key_file)
+        old_token = service.encrypt("old secret")
+        service.stage_new_key()
+
+        service.retire_old_keys()
+
+        assert not service.retired_key_file.exists()
+        assert service.get_container_keys() == [service.get_container_key()]
+        with pytest.raises(Exception):
+            service.decrypt(old_token)
+
 
 class TestErrorHandling:
     """Test error handling scenarios"""
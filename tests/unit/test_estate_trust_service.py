@@ -408,6 +408,18 @@ class TestEstateTrustService:
         
         assert estimated_tax == Decimal("4800.00")
 
+    @pytest.mark.parametrize("taxable_income,tax_year,expected", [
+        (Decimal("0"), 2025, Decimal("0")),
+        (Decimal("-500"), 2025, Decimal("0")),
+        (Decimal("100"), 2025, Decimal("10.00")),
+        (Decimal("5000.50"), 2024, Decimal("998.62")),
+        (Decimal("60000"), 2025, Decimal("20223.00")),
+        (Decimal("150000"), 2023, Decimal("42188.00")),
+    ])
+    def test_trust_tax_brackets(self, estate_service, taxable_income, tax_year, expected):
+        """Test trust tax from the precompiled bracket tables"""
+        assert estate_service._calculate_trust_tax(taxable_income, tax_year) == expected
+
     def test_error_handling_invalid_data(self, estate_service, sample_tax_data):
         """Test error handling with invalid data"""
         sample_tax_data.get.side_effect = Exception("Database error")
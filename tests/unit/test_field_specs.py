@@ -0,0 +1,85 @@
+"""
+Unit tests for declarative PDF field specs
+"""
+
+import pytest
+from utils.pdf.field_mapper import DotDict
+from utils.pdf.field_specs import FieldSpec, FormSpec, RowSpec, as_is, compile_path, truncate
+from utils.pdf.form_mappers import FORM_1040_SPEC, Form1040Mapper
+
+
+class TestCompilePath:
+    """Test compiled accessors follow DotDict.get"""
+
+    @pytest.mark.parametrize("path", [
+        'name', 'personal_info.first_name', 'personal_info.missing', 'income.w2_forms.wages', 'missing.key',
+    ])
+    def test_matches_dotdict(self, path):
+        """Test nested, missing and non-dict paths resolve like DotDict"""
+        data = {'name': 'Jo', 'personal_info': {'first_name': 'Ann'}, 'income': {'w2_forms': [1]}}
+        assert compile_path(path)(data) == DotDict(data).get(path)
+
+    def test_whole_dotted_key_wins(self):
+        """Test a key equal to the whole path is used before traversal"""
+        data = {'a.b': 1, 'a': {'b': 2}}
+        assert compile_path('a.b')(data) == 1
+
+
+class TestFormSpec:
+    """Test mapping with compiled field tables"""
+
+    @pytest.fixture
+    def spec(self):
+        return FormSpec(
+            fields=[
+                FieldSpec('name', 'person.name', as_is, '', keep_empty=True),
+                FieldSpec('wages', 'income.wages'),
+                FieldSpec('total', lambda data: sum(data.get('amounts', []))),
+            ],
+            rows=[RowSpec('lots', (
+                FieldSpec('lot{row}', 'description', truncate(3), ''),
+                FieldSpec('price{row}', 'price'),
+            ), max_rows=2)],
+            computed=[lambda data: {'count': str(len(data.get('lots', [])))}]
+        )
+
+    def test_map(self, spec):
+        """Test fields, rows, formatters and computed values"""
+        data = {
+            'person': {'name': 'Ann'},
+            'income': {'wages': 1234.5},
+            'amounts': [1, 2],
+            'lots': [{'description': 'Stock', 'price': 0}, {'description': 'Bond', 'price': 10}, {'price': 99}],
+        }
+
+        assert spec.map(DotDict(data)) == {
+            'name': 'Ann', 'wages': '1,234.50', 'total': '3.00',
+            'lot0': 'Sto', 'lot1': 'Bon', 'price1': '10.00', 'count': '3',
+        }
+
+    def test_empty_values(self, spec):
+        """Test missing data leaves amounts blank and keeps empty text fields"""
+        assert spec.map({'person': 'not a dict'}) == {'name': '', 'count': '0'}
+
+    def test_dotted_keys(self, spec):
+        """Test data holding dotted keys is resolved like DotDict"""
+        assert spec.map({'income.wages': 5, 'income': {'wages': 7}})['wages'] == '5.00'
+
+    def test_add(self, spec):
+        """Test combined specs map the fields of both"""
+        extra = FormSpec(fields=[FieldSpec('city', 'person.city', as_is, '')])
+        assert (spec + extra).map({'person': {'city': 'Oslo'}})['city'] == 'Oslo'
+
+    def test_map_many_matches_map(self):
+        """Test batch mapping gives the same fields as mapping each return"""
+        returns = [{
+            'personal_info': {'first_name': f'Filer{i}', 'ssn': '123-45-6789'},
+            'filing_status': {'status': status},
+            'spouse_info': {'first_name': 'Sam'},
+            'income': {'w2_forms': [{'wages': 1000 * i, 'federal_withholding': 100}]},
+            'deductions': {'method': method, 'medical_expenses': 500},
+        } for i, (status, method) in enumerate([
+            ('Single', 'standard'), ('Married Filing Jointly', 'itemized'), ('Head of Household', 'standard'),
+        ])]
+
+        assert FORM_1040_SPEC.map_many(returns) == [Form1040Mapper.get_all_fields(DotDict(r)) for r in returns]
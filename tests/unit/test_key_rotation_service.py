@@ -0,0 +1,298 @@
+"""
+Unit tests for bulk key rotation
+"""
+
+import hashlib
+import hmac
+import json
+from pathlib import Path
+
+import pytest
+from config.app_config import AppConfig
+from models.tax_data import TaxData
+from services.cloud_backup_service import CloudBackupService
+from services.encryption_service import EncryptionService
+from services.exceptions import InvalidInputException, ServiceExecutionException
+from services import key_rotation_service
+from services.key_rotation_service import KeyRotationService
+from utils.save_journal import journal_path
+from utils.secure_container import write_container
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Config saving returns and keys under a temporary directory"""
+    config = AppConfig.from_env()
+    config.safe_dir = tmp_path / "safe"
+    config.safe_dir.mkdir()
+    config.key_file = tmp_path / "key"
+    return config
+
+
+def _save_returns(config):
+    """Save a return in each format the app can load; returns their paths"""
+    (config.safe_dir / "client_data_c1").mkdir()
+    tax_data = TaxData(config)
+    tax_data.set('personal_info.first_name', 'Segmented')
+    segmented = tax_data.save_to_file('client_data_c1/segmented.enc')
+    tax_data.set('personal_info.last_name', 'Journaled')
+    tax_data.autosave()
+
+    container = config.safe_dir / 'container.enc'
+    tax_data.set('personal_info.first_name', 'Container')
+    with open(container, 'wb') as f:
+        write_container(f, tax_data.encryption.get_container_key(), [json.dumps(tax_data.data).encode()])
+
+    legacy = config.safe_dir / 'legacy.enc'
+    tax_data.set('personal_info.first_name', 'Legacy')
+    json_data = json.dumps(tax_data.data, indent=2, sort_keys=True)
+    mac = hmac.new(tax_data._get_integrity_key(), json_data.encode(), hashlib.sha256).hexdigest()
+    legacy.write_bytes(tax_data.encryption.encrypt(json.dumps({'data': tax_data.data, 'mac': mac})))
+    return segmented, str(container), str(legacy)
+
+
+def _personal_info(config, path):
+    tax_data = TaxData(config)
+    tax_data.load_from_file(path)
+    year = tax_data.get_current_year()
+    years = tax_data.data['years']
+    return (years[year] if year in years else years[str(year)])['personal_info']
+
+
+class TestAppKeyRotation:
+    """Test rotating the application key"""
+
+    def test_rotates_every_artifact(self, config):
+        """Test returns, PTIN records and profile fields move to the new key"""
+        segmented, container, legacy = _save_returns(config)
+        encryption = EncryptionService(config.key_file)
+        ptin_file = config.safe_dir / "ptin_ero" / "ptin_records.json"
+        ptin_file.parent.mkdir()
+        ptin_file.write_bytes(encryption.encrypt('{"P01234567": {}}'))
+        profile = config.safe_dir / "accessibility_profile.json"
+        profile.write_text(json.dumps({'font_size': 12, 'personal_info': {'ssn': encryption.encrypt('123').decode()}}))
+        old_key = config.key_file.read_bytes()
+        progress = []
+
+        report = KeyRotationService(config, max_workers=1).rotate(lambda done, total: progress.append(done))
+
+        assert report.completed
+        assert (report.total_files, report.rotated, report.failures) == (5, 5, {})
+        assert progress == [1, 2, 3, 4, 5]
+        assert report.bytes_processed > 0 and report.to_dict()['files_per_second'] > 0
+        assert config.key_file.read_bytes() != old_key
+        assert not EncryptionService(config.key_file).retired_key_file.exists()
+        personal_info = _personal_info(config, segmented)
+        assert (personal_info['first_name'], personal_info['last_name']) == ('Segmented', 'Journaled')
+        assert not journal_path(segmented).exists()
+        assert _personal_info(config, container)['first_name'] == 'Container'
+        assert _personal_info(config, legacy)['first_name'] == 'Legacy'
+        encryption = EncryptionService(config.key_file)
+        assert encryption.decrypt(ptin_file.read_bytes()) == '{"P01234567": {}}'
+        assert encryption.decrypt_dict(json.loads(profile.read_text()))['personal_info']['ssn'] == '123'
+
+    def test_rotates_in_worker_processes(self, config):
+        """Test the parallel path rotates the same as in-process"""
+        paths = _save_returns(config)
+
+        report = KeyRotationService(config, max_workers=2).rotate()
+
+        assert report.completed and report.rotated == 3
+        assert [_personal_info(config, path)['first_name'] for path in paths] == ['Segmented', 'Container', 'Legacy']
+
+    def test_resumes_after_interruption(self, config):
+        """Test an interrupted rotation keeps both keys and skips finished files"""
+        paths = _save_returns(config)
+
+        def interrupt(done, total):
+            raise RuntimeError("interrupted")
+
+        with pytest.raises(ServiceExecutionException):
+            KeyRotationService(config, max_workers=1).rotate(interrupt)
+        staged_key = config.key_file.read_bytes()
+        assert [_personal_info(config, path)['first_name'] for path in paths] == ['Segmented', 'Container', 'Legacy']
+
+        report = KeyRotationService(config, max_workers=1).rotate()
+
+        assert report.completed
+        assert (report.already_rotated, report.rotated) == (1, 2)
+        assert config.key_file.read_bytes() == staged_key
+        assert [_personal_info(config, path)['first_name'] for path in paths] == ['Segmented', 'Container', 'Legacy']
+
+    def test_failure_keeps_old_keys(self, config):
+        """Test a file no key opens blocks retiring the old key until it's gone"""
+        _save_returns(config)
+        bad = config.safe_dir / 'foreign.enc'
+        bad.write_bytes(b"\x00not a return")
+        service = KeyRotationService(config, max_workers=1)
+
+        report = service.rotate()
+
+        assert not report.completed
+        assert list(report.failures) == ['foreign.enc']
+        assert service.in_progress and service.checkpoint_file.exists()
+
+        bad.unlink()
+        report = service.rotate()
+
+        assert report.completed and report.already_rotated == 3
+        assert not service.in_progress and not service.checkpoint_file.exists()
+
+    def test_plaintext_return_skipped(self, config):
+        """Test a legacy plaintext return is left as is"""
+        path = config.safe_dir / 'plain.enc'
+        path.write_text('{"years": {}}')
+
+        report = KeyRotationService(config, max_workers=1).rotate()
+
+        assert report.completed and report.skipped == 1
+        assert path.read_text() == '{"years": {}}'
+
+    def test_unknown_scope(self, config):
+        """Test only known keys can be rotated"""
+        with pytest.raises(InvalidInputException):
+            KeyRotationService(config, scope="everything")
+
+
+class TestOpenSessions:
+    """Test sessions opened before a rotation keep working after it"""
+
+    def test_open_return_saves_after_rotation(self, config):
+        """Test a return loaded before a rotation saves and autosaves under the new key"""
+        tax_data = TaxData(config)
+        for year in (2024, 2025):
+            tax_data.set('personal_info.first_name', f'John {year}', tax_year=year)
+        path = tax_data.save_to_file('return.enc')
+        session = TaxData(config)
+        session.load_from_file(path)
+        session.set('personal_info.last_name', 'Autosaved')
+        session.autosave()
+
+        assert KeyRotationService(config, max_workers=1).rotate().completed
+
+        assert session.get('personal_info.first_name', tax_year=2024) == 'John 2024'
+        session.set('personal_info.first_name', 'Edited')
+        session.save_to_file('return.enc')
+        session.set('personal_info.middle_initial', 'Q')
+        session.autosave()
+        reloaded = TaxData(config)
+        reloaded.load_from_file(path)
+        assert reloaded.get('personal_info.first_name') == 'Edited'
+        assert reloaded.get('personal_info.last_name') == 'Autosaved'
+        assert reloaded.get('personal_info.middle_initial') == 'Q'
+        assert reloaded.get('personal_info.first_name', tax_year=2025) == 'John 2025'
+
+    def test_unloaded_year_and_autosave_after_rotation(self, config):
+        """Test years not yet loaded and pending autosaves follow the rotated file"""
+        tax_data = TaxData(config)
+        tax_data.set('personal_info.first_name', 'Old year', tax_year=2023)
+        path = tax_data.save_to_file('return.enc')
+        session = TaxData(config)
+        session.load_from_file(path)
+        session.set('personal_info.first_name', 'Pending')
+
+        assert KeyRotationService(config, max_workers=1).rotate().completed
+
+        assert session.get('personal_info.first_name', tax_year=2023) == 'Old year'
+        session.autosave()
+        reloaded = TaxData(config)
+        reloaded.load_from_file(path)
+        assert reloaded.get('personal_info.first_name') == 'Pending'
+
+    def test_unsaved_return_uses_new_key(self, config):
+        """Test a return never saved before the rotation isn't saved with the deleted key"""
+        session = TaxData(config)
+        session.set('personal_info.first_name', 'Before')
+        session.encryption.get_container_key()
+
+        assert KeyRotationService(config, max_workers=1).rotate().completed
+
+        path = session.save_to_file('new.enc')
+        assert _personal_info(config, path)['first_name'] == 'Before'
+
+    def test_open_encryption_service_reloads_key(self, config):
+        """Test a service holding the old key encrypts with the new one afterwards"""
+        encryption = EncryptionService(config.key_file)
+        encryption.encrypt('load key')
+
+        assert KeyRotationService(config, max_workers=1).rotate().completed
+
+        assert EncryptionService(config.key_file).decrypt(encryption.encrypt('after')) == 'after'
+
+    def test_file_saved_during_rotation_is_reread(self, config, monkeypatch):
+        """Test a file saved while being rotated is rotated again, not overwritten"""
+        encryption = EncryptionService(config.key_file)
+        ptin_file = config.safe_dir / "ptin_ero" / "ptin_records.json"
+        ptin_file.parent.mkdir()
+        ptin_file.write_bytes(encryption.encrypt('before'))
+        original = key_rotation_service._RotationWorker._rotate_token_file
+        calls = []
+
+        def save_during_rotation(worker, path):
+            calls.append(path)
+            if len(calls) == 1:
+                path.write_bytes(EncryptionService(config.key_file).encrypt('saved meanwhile'))
+            return original(worker, path)
+
+        monkeypatch.setattr(key_rotation_service._RotationWorker, '_rotate_token_file', save_during_rotation)
+        report = KeyRotationService(config, max_workers=1).rotate()
+
+        assert report.completed and len(calls) == 2
+        assert EncryptionService(config.key_file).decrypt(ptin_file.read_bytes()) == 'saved meanwhile'
+
+
+class TestBackupKeyRotation:
+    """Test rotating the backup key"""
+
+    def test_backups_restore_after_rotation(self, config, tmp_path):
+        """Test rotated archives are uploaded again and still restore"""
+        backup_service = CloudBackupService(config)
+        backup_service.cloud_provider.base_path = tmp_path / "cloud"
+        source = tmp_path / "notes.txt"
+        source.write_text("backed up")
+        backup_id = backup_service.create_backup([source])
+        old_checksum = backup_service.backups[backup_id].checksum
+
+        report = KeyRotationService(config, scope="backups", backup_service=backup_service, max_workers=1).rotate()
+
+        assert report.completed and report.rotated == 2
+        assert backup_service.backups[backup_id].checksum != old_checksum
+        assert backup_service.restore_backup(backup_id, tmp_path / "restored")
+        assert (tmp_path / "restored" / "notes.txt").read_text() == "backed up"
+
+    def test_open_backup_service_sees_rotated_checksums(self, config, tmp_path):
+        """Test a service opened before the rotation restores and keeps the new checksums"""
+        cloud = tmp_path / "cloud"
+        open_service = CloudBackupService(config)
+        open_service.cloud_provider.base_path = cloud
+        source = tmp_path / "notes.txt"
+        source.write_text("backed up")
+        backup_id = open_service.create_backup([source])
+        rotation_service = CloudBackupService(config)
+        rotation_service.cloud_provider.base_path = cloud
+
+        assert KeyRotationService(config, scope="backups", backup_service=rotation_service,
+                                  max_workers=1).rotate().completed
+
+        assert open_service.restore_backup(backup_id, tmp_path / "restored")
+        assert open_service.create_backup([source])
+        assert CloudBackupService(config).backups[backup_id].checksum == rotation_service.backups[backup_id].checksum
+
+    def test_pre_rotation_backup_loads_after_app_rotation(self, config, tmp_path):
+        """Test returns backed up before an app key rotation load once restored"""
+        paths = [Path(path) for path in _save_returns(config)]
+        backup_service = CloudBackupService(config)
+        backup_service.cloud_provider.base_path = tmp_path / "cloud"
+        backup_id = backup_service.create_backup(paths + [journal_path(paths[0])])
+
+        report = KeyRotationService(config, backup_service=backup_service, max_workers=1).rotate()
+
+        assert report.completed and report.rotated == 4
+        assert not EncryptionService(config.key_file).retired_key_file.exists()
+        restored = config.safe_dir / "restored"
+        assert backup_service.restore_backup(backup_id, restored)
+        assert not journal_path(restored / paths[0].name).exists()
+        personal_info = _personal_info(config, str(restored / paths[0].name))
+        assert (personal_info['first_name'], personal_info['last_name']) == ('Segmented', 'Journaled')
+        assert [_personal_info(config, str(restored / path.name))['first_name'] for path in paths[1:]] == [
+            'Container', 'Legacy']
@@ -0,0 +1,166 @@
+"""
+Tests for the integer-cents money engine
+"""
+
+import random
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from utils.money import (
+    cents_array,
+    divide_cents,
+    divide_cents_array,
+    from_cents,
+    multiply_cents,
+    multiply_cents_array,
+    round_to_dollars,
+    sum_cents,
+    sum_cents_array,
+    sum_money,
+    to_cents,
+    to_dollars,
+    to_money,
+)
+
+
+def _reference_cents(value):
+    """Cents via Decimal(str(value)) rounded half up"""
+    return int((Decimal(str(value)) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+class TestConversion:
+    """Test converting amounts to and from cents"""
+
+    @pytest.mark.parametrize("value, expected", [
+        (12, 1200),
+        (0.1, 10),
+        (1.005, 101),
+        (0.125, 13),
+        (-0.125, -13),
+        (Decimal('2.345'), 235),
+        (Decimal('-2.344'), -234),
+        ('19.99', 1999),
+        (np.float64(3.3), 330),
+        (np.int32(7), 700),
+    ])
+    def test_to_cents(self, value, expected):
+        """Test values round half up to the nearest cent"""
+        assert to_cents(value) == expected
+
+    def test_floats_match_decimal_reference(self):
+        """Test float conversion matches Decimal(str(v)) for random amounts"""
+        rng = random.Random(7)
+        values = [round(rng.uniform(-1e6, 1e6), rng.randint(0, 4)) for _ in range(5000)]
+        assert [to_cents(v) for v in values] == [_reference_cents(v) for v in values]
+
+    def test_not_a_number(self):
+        """Test non-numeric values raise like Decimal(str(v)) does"""
+        with pytest.raises(InvalidOperation):
+            to_cents([1, 2])
+
+    def test_from_cents(self):
+        """Test cents come back as exact two-place Decimals"""
+        assert from_cents(123456) == Decimal('1234.56')
+        assert str(from_cents(-5)) == '-0.05'
+        assert str(to_money(7)) == '7.00'
+
+
+class TestArithmetic:
+    """Test sums, rates and rounding"""
+
+    def test_sum_is_exact(self):
+        """Test sums don't accumulate float error"""
+        assert sum_money([0.1] * 10) == Decimal('1.00')
+        assert sum_money([0.1] * 1000) == Decimal('100.00')
+
+    @pytest.mark.parametrize("values", [
+        [Decimal('1.25'), Decimal('2.50'), 3],
+        [Decimal('0.005'), Decimal('0.005')],
+        [1.1, 2.2, '3.3'],
+        [0.015] * 100,
+        [],
+    ])
+    def test_sum_matches_per_value_rounding(self, values):
+        """Test every sum path equals rounding each value then adding"""
+        assert sum_cents(values) == sum(_reference_cents(v) for v in values)
+        assert sum_cents(iter(values)) == sum_cents(values)
+
+    def test_fractional_cents_round_before_adding(self):
+        """Test a sum rounds each amount to cents, unlike the exact Decimal sum"""
+        values = [Decimal('0.005')] * 3
+        assert sum(values) == Decimal('0.015')
+        assert sum_money(values) == Decimal('0.03')
+
+    def test_multiply_cents(self):
+        """Test rates apply exactly with one half-up rounding"""
+        assert multiply_cents(10000, 0.22) == 2200
+        assert multiply_cents(5, Decimal('0.5')) == 3
+        assert multiply_cents(-5, '0.5') == -3
+        assert multiply_cents(10000, Fraction(1, 3)) == 3333
+
+    def test_divide_cents(self):
+        """Test exact quotients round half up, away from zero"""
+        assert divide_cents(5, 2) == 3
+        assert divide_cents(-5, 2) == -3
+        assert divide_cents(7 * 600000 - 10 * 150, 20) == 209925
+
+    def test_to_dollars(self):
+        """Test cents convert to the float round() would give"""
+        assert to_dollars(123457) == round(1234.57, 2)
+        assert to_dollars(np.array([5, -150], dtype=np.int64)).tolist() == [0.05, -1.5]
+
+    @pytest.mark.parametrize("cents, dollars", [(149, 1), (150, 2), (-150, -2), (-149, -1), (0, 0)])
+    def test_round_to_dollars(self, cents, dollars):
+        """Test IRS whole-dollar rounding (50 cents and up round up)"""
+        assert round_to_dollars(cents) == dollars
+
+
+class TestBatch:
+    """Test int64 column conversion"""
+
+    def test_column_matches_scalar_conversion(self):
+        """Test vectorized conversion matches to_cents element for element"""
+        rng = random.Random(11)
+        values = [round(rng.uniform(-1e5, 1e5), 3) for _ in range(5000)] + [0.125, -2.675, 1e14 + 0.5]
+        array = cents_array(np.array(values))
+
+        assert array.dtype == np.int64
+        assert array.tolist() == [to_cents(v) for v in values]
+        assert sum_cents_array(array) == sum(to_cents(v) for v in values)
+
+    def test_integer_and_object_columns(self):
+        """Test integer and Decimal columns convert exactly"""
+        assert cents_array(np.array([1, 2, 3])).tolist() == [100, 200, 300]
+        assert cents_array([Decimal('1.005'), '2']).tolist() == [101, 200]
+
+    def test_overflow_falls_back_to_python_ints(self):
+        """Test sums that would overflow int64 stay exact"""
+        big = np.array([2 ** 62, 2 ** 62, 2 ** 62], dtype=np.int64)
+        assert sum_cents_array(big) == 3 * 2 ** 62
+
+    def test_multiply_array_matches_scalar(self):
+        """Test vectorized rates round exactly like multiply_cents"""
+        rng = random.Random(5)
+        cents = np.array([rng.randint(-10 ** 9, 10 ** 9) for _ in range(2000)] + [5, -5, 50], dtype=np.int64)
+        for rate in (0.9235, 0.124, 0.5, Decimal('0.038')):
+            expected = [multiply_cents(c, rate) for c in cents.tolist()]
+            assert multiply_cents_array(cents, rate).tolist() == expected
+
+        rates = np.array([rng.choice([0.10, 0.12, 0.22, 0.37]) for _ in range(len(cents))])
+        expected = [multiply_cents(c, r) for c, r in zip(cents.tolist(), rates.tolist())]
+        assert multiply_cents_array(cents, rates).tolist() == expected
+
+    def test_multiply_array_overflow_stays_exact(self):
+        """Test products too large for int64 fall back to Python ints"""
+        cents = np.array([2 ** 60, 3], dtype=np.int64)
+        assert multiply_cents_array(cents, 0.9235).tolist() == [multiply_cents(2 ** 60, 0.9235), 3]
+
+    def test_divide_array_matches_scalar(self):
+        """Test per-element divisors round like divide_cents"""
+        numerators = np.array([5, -5, 7, 14, -1], dtype=np.int64)
+        denominators = np.array([2, 2, 3, 4, 3], dtype=np.int64)
+        expected = [divide_cents(n, d) for n, d in zip(numerators.tolist(), denominators.tolist())]
+        assert divide_cents_array(numerators, denominators).tolist() == expected
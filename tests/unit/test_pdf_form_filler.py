@@ -1,8 +1,14 @@
 """
 Unit tests for PDF Form Filler
 """
+import os
 import pytest
 from pathlib import Path
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import NameObject, NumberObject
+from tests.fixtures.sample_pdf_forms import build_form_pdf, irs_style_field_names
+from utils.pdf.template_cache import get_template_cache
+from utils.pdf_exceptions import FormFieldError
 from utils.pdf_form_filler import (
     PDFFormFiller,
     Form1040Mapper,
@@ -220,3 +226,151 @@ class TestPDFFormFiller:
         assert isinstance(fields, dict)
         assert len(fields) > 0
         assert 'topmostSubform[0].Page1[0].f1_01[0]' in fields
+
+
+class TestTemplateCache:
+    """Test fills from the process-wide parsed template cache"""
+
+    TEXT_FIELDS = irs_style_field_names(1, 12) + irs_style_field_names(2, 6)
+    CHECKBOX = 'topmostSubform[0].Page1[0].c1_1[0]'
+
+    @pytest.fixture
+    def filler(self, tmp_path):
+        build_form_pdf(
+            tmp_path / 'Form Test.pdf',
+            [irs_style_field_names(1, 12) + [self.CHECKBOX], irs_style_field_names(2, 6)],
+            checkboxes=[self.CHECKBOX]
+        )
+        get_template_cache().invalidate()
+        return PDFFormFiller(str(tmp_path))
+
+    @staticmethod
+    def _values(path):
+        fields = PdfReader(str(path)).get_fields()
+        return {name: info.get('/V') for name, info in fields.items() if info.get('/V') not in (None, '', '/Off')}
+
+    @staticmethod
+    def _reference_fill(template_path, field_values, output_path):
+        """Fill the way fill_form did before templates were cached"""
+        reader = PdfReader(str(template_path))
+        writer = PdfWriter()
+        writer.append(reader)
+        for page in writer.pages:
+            try:
+                writer.update_page_form_field_values(page, field_values)
+            except Exception:
+                pass
+        with open(output_path, 'wb') as f:
+            writer.write(f)
+
+    def test_fill_matches_uncached_fill(self, filler, tmp_path):
+        """Test qualified, partial and checkbox values land as before"""
+        values = {
+            'topmostSubform[0].Page1[0].f1_01[0]': 'Jane',
+            'f1_05[0]': '75,000',
+            'topmostSubform[0].Page2[0].f2_03[0]': '1,234',
+            self.CHECKBOX: '/1',
+            'not_a_field': 'ignored',
+        }
+        filler.fill_form('Form Test', values, str(tmp_path / 'out' / 'cached.pdf'))
+        self._reference_fill(tmp_path / 'Form Test.pdf', values, tmp_path / 'reference.pdf')
+
+        filled = self._values(tmp_path / 'out' / 'cached.pdf')
+        assert filled == self._values(tmp_path / 'reference.pdf')
+        assert filled['topmostSubform[0].Page1[0].f1_05[0]'] == '75,000'
+        assert filled[self.CHECKBOX] == '/1'
+
+    def test_template_parsed_once(self, filler, tmp_path):
+        """Test repeated fills and field lookups reuse one parsed template"""
+        misses = get_template_cache().get_stats()['misses']
+        for i in range(3):
+            filler.fill_form('Form Test', {'f1_01[0]': str(i)}, str(tmp_path / f'{i}.pdf'))
+        fields = filler.get_form_fields('Form Test')
+
+        assert get_template_cache().get_stats()['misses'] == misses + 1
+        assert len(fields) >= len(self.TEXT_FIELDS)
+        assert self._values(tmp_path / '0.pdf') == {'topmostSubform[0].Page1[0].f1_01[0]': '0'}
+        assert self._values(tmp_path / '2.pdf') == {'topmostSubform[0].Page1[0].f1_01[0]': '2'}
+
+    def test_fills_do_not_share_state(self, filler, tmp_path):
+        """Test a value from one fill never appears in the next"""
+        filler.fill_form('Form Test', {'f1_02[0]': 'first'}, str(tmp_path / 'a.pdf'))
+        filler.fill_form('Form Test', {'f1_03[0]': 'second'}, str(tmp_path / 'b.pdf'))
+        assert self._values(tmp_path / 'b.pdf') == {'topmostSubform[0].Page1[0].f1_03[0]': 'second'}
+
+    def test_changed_template_is_reloaded(self, filler, tmp_path):
+        """Test replacing the file on disk invalidates the cached template"""
+        template = filler.get_template('Form Test')
+        assert 'f1_12[0]' in template.field_index
+
+        stat = (tmp_path / 'Form Test.pdf').stat()
+        build_form_pdf(tmp_path / 'Form Test.pdf', [['renamed[0]']])
+        os.utime(tmp_path / 'Form Test.pdf', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        reloaded = filler.get_template('Form Test')
+        assert reloaded is not template
+        assert 'renamed[0]' in reloaded.field_index
+        assert 'f1_12[0]' not in reloaded.field_index
+
+    def test_failed_page_is_reported(self, filler, tmp_path, monkeypatch):
+        """Test fields that can't be set raise instead of being skipped"""
+        def fail(writer, page, fields, *args, **kwargs):
+            raise ValueError("broken appearance stream")
+
+        monkeypatch.setattr(PdfWriter, 'update_page_form_field_values', fail)
+        with pytest.raises(FormFieldError, match=r"f1_01\[0\].*page 1"):
+            filler.fill_form('Form Test', {'f1_01[0]': 'Jane'}, str(tmp_path / 'out.pdf'))
+        assert not (tmp_path / 'out.pdf').exists()
+
+
+class TestFlatten:
+    """Test flattened output"""
+
+    CHECKBOX = 'topmostSubform[0].Page1[0].c1_1[0]'
+
+    @pytest.fixture
+    def filler(self, tmp_path):
+        build_form_pdf(
+            tmp_path / 'Form Test.pdf',
+            [irs_style_field_names(1, 30) + [self.CHECKBOX], irs_style_field_names(2, 30)],
+            checkboxes=[self.CHECKBOX]
+        )
+        get_template_cache().invalidate()
+        return PDFFormFiller(str(tmp_path))
+
+    def _fill(self, filler, path, flatten):
+        values = {name: f'Value {i}' for i, name in enumerate(irs_style_field_names(1, 30))}
+        values[self.CHECKBOX] = '/1'
+        filler.fill_form('Form Test', values, str(path), flatten=flatten)
+        return PdfReader(str(path))
+
+    def test_values_burned_into_pages(self, filler, tmp_path):
+        """Test widgets and the AcroForm are gone and the values are page content"""
+        reader = self._fill(filler, tmp_path / 'flat.pdf', flatten=True)
+
+        assert reader.get_fields() is None
+        assert '/AcroForm' not in reader.trailer['/Root']
+        assert all('/Annots' not in page for page in reader.pages)
+        text = reader.pages[0].extract_text()
+        assert 'Value 0' in text and 'Value 29' in text
+        assert len(reader.pages[0]['/Resources']['/XObject']) == 31  # 30 text fields and the checkbox
+
+    def test_smaller_than_live_form(self, filler, tmp_path):
+        """Test the flattened file is smaller and its streams are compressed"""
+        self._fill(filler, tmp_path / 'live.pdf', flatten=False)
+        reader = self._fill(filler, tmp_path / 'flat.pdf', flatten=True)
+
+        assert (tmp_path / 'flat.pdf').stat().st_size < (tmp_path / 'live.pdf').stat().st_size
+        assert reader.pages[0]['/Contents'].get_object()['/Filter'] == '/FlateDecode'
+
+    def test_unfilled_and_hidden_widgets_not_drawn(self, filler, tmp_path):
+        """Test only widgets with an appearance that is not hidden are drawn"""
+        from utils.pdf.flatten import flatten_document
+
+        template = filler.get_template('Form Test')
+        writer = template.clone()
+        template.fill(writer, {'f1_01[0]': 'shown', 'f1_02[0]': 'hidden'})
+        writer.pages[0]['/Annots'][1].get_object()[NameObject('/F')] = NumberObject(2)
+
+        # The filled field, plus the checkbox's (empty) Off appearance
+        assert flatten_document(writer) == 2
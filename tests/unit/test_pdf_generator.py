@@ -3,6 +3,11 @@ Test PDF Generator functionality
 """
 import pytest
 from pathlib import Path
+from decimal import Decimal
+from pypdf import PdfReader
+from tests.fixtures.sample_pdf_forms import build_form_pdf, irs_style_field_names
+from utils.pdf import merged_document
+from utils.pdf.form_mappers import Form8949Mapper
 from utils.pdf.pdf_generator import TaxReturnPDFGenerator
 from utils.pdf.field_mapper import DotDict
 
@@ -147,4 +152,412 @@ class TestTaxReturnPDFGenerator:
 
         # Clean up
         for file_path in generated_files.values():
-            Path(file_path).unlink(missing_ok=True)
\ No newline at end of file
+            Path(file_path).unlink(missing_ok=True)
+
+
+def _sample_return(index, **extra):
+    tax_data = {
+        'personal_info': {
+            'first_name': f'Filer{index}',
+            'last_name': 'Doe',
+            'ssn': f'123-45-{index:04d}',
+            'address': '123 Main St',
+            'city': 'Anytown',
+            'state': 'CA',
+            'zip_code': '12345'
+        },
+        'filing_status': {'status': 'Single'},
+        'income': {'w2_forms': [{'wages': 50000 + index, 'federal_withholding': 5000}]},
+        'deductions': {'method': 'standard'}
+    }
+    tax_data.update(extra)
+    return tax_data
+
+
+@pytest.fixture
+def batch_generator(tmp_path):
+    """Generator over a synthetic Form 1040 template holding the mapped fields"""
+    forms_dir = tmp_path / "forms"
+    forms_dir.mkdir()
+    generator = TaxReturnPDFGenerator(str(forms_dir), str(tmp_path / "out"))
+    mapped = [job.field_values for job in generator.build_fill_jobs(_sample_return(1))][0]
+    build_form_pdf(forms_dir / "Form 1040.pdf", [sorted(mapped), irs_style_field_names(2, 30)])
+    return generator
+
+
+def _filled_values(path):
+    return {name: field.get('/V') for name, field in PdfReader(path).get_fields().items()}
+
+
+class TestProcessBatchExport:
+    """Test process pool batch export"""
+
+    def test_matches_thread_export(self, batch_generator, tmp_path):
+        """Test workers write the same forms as the thread pool"""
+        tax_returns = [_sample_return(i) for i in range(6)]
+
+        threaded = batch_generator.generate_batch_export(tax_returns, flatten=False, max_workers=2)
+        threaded_values = [_filled_values(files['Form 1040']) for files in threaded]
+        processed = batch_generator.generate_batch_export(
+            tax_returns, flatten=False, max_workers=2, use_processes=True, chunk_size=4
+        )
+
+        assert len(processed) == 6
+        assert sorted(_filled_values(files['Form 1040'])['topmostSubform[0].Page1[0].f1_01[0]']
+                      for files in processed) == [f'Filer{i}' for i in range(6)]
+        assert sorted(map(str, threaded_values)) == sorted(
+            str(_filled_values(files['Form 1040'])) for files in processed
+        )
+
+    def test_streams_every_return_with_errors(self, batch_generator):
+        """Test a return needing a missing template fails alone"""
+        tax_returns = [_sample_return(0), _sample_return(1, schedules={
+            'schedule_c': {'business_name': 'Shop', 'gross_receipts': 1000}
+        }), _sample_return(2)]
+
+        results = {result.index: result for result in batch_generator.iter_batch_export(
+            tax_returns, max_workers=2
+        )}
+
+        assert sorted(results) == [0, 1, 2]
+        assert results[0].success and results[2].success
+        assert not results[1].success and 'FileNotFoundError' in results[1].error
+        assert Path(results[2].files['Form 1040']).exists()
+
+    def test_batch_premapping_matches_per_return(self, batch_generator):
+        """Test forms mapped across the batch equal each return's own mapping"""
+        tax_returns = [_sample_return(i, deductions={'method': 'itemized', 'medical_expenses': 900 * i},
+                                      income={'partnership_income': 4000 + i})
+                       for i in range(3)]
+
+        required, premapped = batch_generator._premap_batch(tax_returns)
+
+        for tax_return, forms, mapped in zip(tax_returns, required, premapped):
+            assert set(mapped) == {"Form 1040", "Form 1040 (Schedule A)", "Form 1040 (Schedule E)"} <= set(forms)
+            assert mapped == {job.form_name: job.field_values
+                              for job in batch_generator.build_fill_jobs(tax_return, include_signature=False)
+                              if job.form_name in mapped}
+
+    def test_schedule_e_rental_properties(self, batch_generator):
+        """Test rental properties map to their rows and totals"""
+        tax_data = DotDict(_sample_return(0, income={'rental_income': [{
+            'address': '1 Elm St', 'city': 'Town', 'state': 'CA',
+            'gross_rental_income': 12000, 'repairs': 800, 'depreciation': 1500
+        }]}))
+
+        fields = batch_generator._map_schedule_e(tax_data)
+
+        assert fields['topmostSubform[0].Page1[0].Line1_ReadOrder[0].f1_01[0]'] == '1 Elm St'
+        assert fields['topmostSubform[0].Page1[0].Line1_ReadOrder[0].f1_02[0]'] == 'Town, CA'
+        assert fields['topmostSubform[0].Page1[0].Line26_ReadOrder[0].f1_26[0]'] == '9,700.00'
+
+    @pytest.mark.parametrize("option", [{'chunk_size': 0}, {'max_workers': 0}])
+    def test_rejects_bad_options(self, batch_generator, option):
+        """Test chunk size and worker count must be positive"""
+        with pytest.raises(ValueError):
+            list(batch_generator.iter_batch_export([_sample_return(0)], **option))
+
+
+def _lots(count, holding_period, start=0):
+    return [{
+        'description': f'{holding_period} lot {start + i}',
+        'date_acquired': '01/02/2024',
+        'date_sold': '06/03/2024',
+        'sales_price': 100.10 + i,
+        'cost_basis': 90.05,
+        'gain_loss': 10.05 + i,
+        'holding_period': holding_period
+    } for i in range(count)]
+
+
+def _form_8949_part(prefix):
+    columns = ['desc', 'date_acq', 'date_sold', 'sales_price', 'cost', 'gain_loss']
+    rows = [f"{prefix}({chr(97 + i)})_{column}" for i in range(14) for column in columns]
+    return rows + [f"{prefix}_total_{name}" for name in ('proceeds', 'basis', 'gain_loss')]
+
+
+class TestForm8949Continuation:
+    """Test Form 8949 continuation copies"""
+
+    def test_pages_cover_every_lot(self):
+        """Test lots are laid out 14 per part per copy with per-copy totals"""
+        tax_data = DotDict({'income': {'capital_gains': _lots(30, 'Short-term') + _lots(5, 'Long-term')}})
+
+        pages = list(Form8949Mapper.iter_pages(tax_data))
+
+        assert len(pages) == Form8949Mapper.page_count(tax_data) == 3
+        descriptions = [value for page in pages for name, value in page.items() if name.endswith('_desc')]
+        assert len(descriptions) == 35 and len(set(descriptions)) == 35
+        assert '2(a)_desc' not in pages[1]
+
+        grand_totals = Form8949Mapper.calculate_totals(tax_data)
+        page_total = sum(Decimal(page['1_total_gain_loss']) for page in pages)
+        assert page_total == grand_totals['short']['gain_loss']
+        assert grand_totals['long']['proceeds'] == sum(Decimal(str(100.10 + i)) for i in range(5))
+
+    def test_schedule_d_uses_grand_totals(self, tmp_path):
+        """Test Schedule D totals include lots beyond the first copy"""
+        forms_dir = tmp_path / "forms"
+        forms_dir.mkdir()
+        generator = TaxReturnPDFGenerator(str(forms_dir), str(tmp_path / "out"))
+        tax_data = DotDict({'income': {'capital_gains': _lots(40, 'Short-term')}})
+
+        fields = generator._map_schedule_d(tax_data)
+
+        expected = Form8949Mapper.calculate_totals(tax_data)['short']['proceeds']
+        assert fields['topmostSubform[0].Page1[0].Line2_ReadOrder[0].f1_15[0]'] == f"{expected:,.2f}"
+
+    def test_copies_merged_into_one_pdf(self, tmp_path):
+        """Test every copy lands in one PDF with distinct field names"""
+        forms_dir = tmp_path / "forms"
+        build_form_pdf(forms_dir / "Form 8949.pdf", [_form_8949_part('1'), _form_8949_part('2')])
+        generator = TaxReturnPDFGenerator(str(forms_dir), str(tmp_path / "out"))
+        tax_data = DotDict({
+            'personal_info': {'first_name': 'Jane', 'last_name': 'Doe', 'ssn': '123-45-6789'},
+            'income': {'capital_gains': _lots(20, 'Short-term') + _lots(29, 'Long-term')}
+        })
+
+        output_path = generator._generate_single_form("Form 8949", tax_data, False, False)
+
+        reader = PdfReader(output_path)
+        values = {name: field.get('/V') for name, field in reader.get_fields().items()}
+        assert len(reader.pages) == 6
+        assert values['1(a)_desc'] == 'Short-term lot 0'
+        assert values['1(a)_desc_2'] == 'Short-term lot 14'
+        assert values['2(a)_desc_3'] == 'Long-term lot 28'
+        assert values.get('1(a)_desc_3') in (None, '')
+
+        assert reader.trailer['/Root']['/AcroForm']['/NeedAppearances']
+
+        job = generator.build_fill_jobs(tax_data, include_signature=False)[-1]
+        assert job.form_name == "Form 8949" and len(job.lots) == 49
+        assert list(job.iter_copies()) == list(Form8949Mapper.iter_pages(tax_data))
+
+    def test_flattened_copies_draw_every_lot(self, tmp_path):
+        """Test continuation copies get appearances when the form is flattened"""
+        forms_dir = tmp_path / "forms"
+        build_form_pdf(forms_dir / "Form 8949.pdf", [_form_8949_part('1'), _form_8949_part('2')])
+        generator = TaxReturnPDFGenerator(str(forms_dir), str(tmp_path / "out"))
+        tax_data = DotDict({'income': {'capital_gains': _lots(20, 'Short-term')}})
+
+        output_path = generator._generate_single_form("Form 8949", tax_data, True, False)
+
+        text = "".join(page.extract_text() for page in PdfReader(output_path).pages)
+        assert 'Short-term lot 0' in text and 'Short-term lot 19' in text
+
+
+@pytest.fixture
+def capital_gains_return(tmp_path):
+    """Generator with synthetic templates for every form of a capital gains return"""
+    forms_dir = tmp_path / "forms"
+    forms_dir.mkdir()
+    generator = TaxReturnPDFGenerator(str(forms_dir), str(tmp_path / "out"))
+    tax_data = _sample_return(7, income={
+        'w2_forms': [{'wages': 80000, 'federal_withholding': 9000}],
+        'capital_gains': _lots(20, 'Short-term') + _lots(3, 'Long-term')
+    })
+    checkboxes = [f"Checkbox{i}" for i in range(12)]
+    for job in generator.build_fill_jobs(tax_data, include_signature=False):
+        if job.form_name == "Form 8949":
+            pages = [_form_8949_part('1') + checkboxes, _form_8949_part('2')]
+        else:
+            pages = [sorted(job.field_values) + checkboxes, irs_style_field_names(2, 20)]
+        build_form_pdf(forms_dir / f"{job.form_name}.pdf", pages, checkboxes=checkboxes)
+    return generator, tax_data
+
+
+class TestMergedReturn:
+    """Test single-file return output"""
+
+    def test_one_file_with_bookmarks(self, capital_gains_return):
+        """Test every form lands in one PDF with an outline and independent fields"""
+        generator, tax_data = capital_gains_return
+
+        output_path = generator.generate_merged_return(tax_data, include_signature=False)
+
+        reader = PdfReader(output_path)
+        titles = [item.title for item in reader.outline if not isinstance(item, list)]
+        assert titles == generator.determine_required_forms(tax_data)
+        assert [item.title for item in reader.outline[-1]] == ['Continuation 2']
+        assert len(reader.pages) == 2 * (len(titles) + 1)
+
+        values = {name: field.get('/V') for name, field in reader.get_fields().items()}
+        assert values['topmostSubform[0].Page1[0].f1_01[0]'] == 'Filer7'
+        schedule_d_total = 'topmostSubform[0]_Form_1040_Schedule_D.Page1[0].Line2_ReadOrder[0].f1_15[0]'
+        assert values[schedule_d_total] == f"{Form8949Mapper.calculate_totals(tax_data)['short']['proceeds']:,.2f}"
+        assert values['1(a)_desc_Form_8949_2'] == 'Short-term lot 14'
+
+    def test_smaller_than_separate_files(self, capital_gains_return):
+        """Test shared resources make one file smaller than the separate forms"""
+        generator, tax_data = capital_gains_return
+
+        separate = generator.generate_complete_return(tax_data, include_signature=False)
+        separate_size = sum(Path(path).stat().st_size for path in separate.values())
+        merged = generator.generate_complete_return(tax_data, include_signature=False, single_file=True)
+        merged_paths = set(merged.values())
+        undeduplicated = generator.generate_merged_return(
+            tax_data, output_path=str(Path(merged_paths.pop()).with_name('raw.pdf')),
+            include_signature=False, deduplicate=False
+        )
+
+        merged_size = Path(next(iter(merged.values()))).stat().st_size
+        assert merged_paths == set()
+        assert merged_size < separate_size
+        assert merged_size < undeduplicated.stat().st_size
+
+    def test_flattened_single_file(self, capital_gains_return):
+        """Test a flattened merged return keeps its outline but no form fields"""
+        generator, tax_data = capital_gains_return
+
+        live = generator.generate_merged_return(tax_data, include_signature=False)
+        live_size = live.stat().st_size
+        flat = generator.generate_merged_return(tax_data, include_signature=False, flatten=True)
+
+        reader = PdfReader(flat)
+        assert reader.get_fields() is None
+        assert len(reader.outline) == len(generator.determine_required_forms(tax_data)) + 1
+        assert 'Short-term lot 14' in ''.join(page.extract_text() for page in reader.pages)
+        assert flat.stat().st_size < live_size
+
+
+    def test_deduplication_serializes_each_object_once(self, capital_gains_return, monkeypatch):
+        """Test duplicates are found in one pass, hashing each object once"""
+        generator, tax_data = capital_gains_return
+        hashed = []
+        original = merged_document._object_key
+
+        def record_key(obj):
+            hashed.append(obj.indirect_reference.idnum)
+            return original(obj)
+
+        monkeypatch.setattr(merged_document, '_object_key', record_key)
+        merged = generator.generate_merged_return(tax_data, include_signature=False)
+
+        assert hashed and len(hashed) == len(set(hashed))
+        assert len(PdfReader(merged).pages) > 0
+
+def _record_fills(generator):
+    """Collect the names of the forms the generator fills from now on"""
+    filled = []
+    filler = generator.form_filler
+    fill_form, fill_form_copies = filler.fill_form, filler.fill_form_copies
+
+    def record_fill_form(form_name, *args, **kwargs):
+        filled.append(form_name)
+        return fill_form(form_name, *args, **kwargs)
+
+    def record_fill_form_copies(form_name, *args, **kwargs):
+        filled.append(form_name)
+        return fill_form_copies(form_name, *args, **kwargs)
+
+    filler.fill_form, filler.fill_form_copies = record_fill_form, record_fill_form_copies
+    return filled
+
+
+class TestIncrementalRegeneration:
+    """Test re-exports only rewrite forms whose values changed"""
+
+    def test_only_changed_forms_rewritten(self, capital_gains_return):
+        """Test a W-2 edit rewrites Form 1040 and leaves the other forms alone"""
+        generator, tax_data = capital_gains_return
+        first = generator.generate_complete_return(tax_data, include_signature=False)
+        filled = _record_fills(generator)
+
+        assert generator.generate_complete_return(tax_data, include_signature=False) == first
+        assert filled == []
+
+        tax_data['income']['w2_forms'][0]['wages'] = 81000
+        generator.generate_complete_return(tax_data, include_signature=False)
+        assert filled == ["Form 1040"]
+        assert _filled_values(first["Form 1040"])['topmostSubform[0].Page1[0].f1_01[0]'] == 'Filer7'
+
+    def test_options_and_missing_files_force_rewrite(self, capital_gains_return):
+        """Test flattening, a deleted output or incremental=False rewrites forms"""
+        generator, tax_data = capital_gains_return
+        paths = generator.generate_complete_return(tax_data, include_signature=False)
+        filled = _record_fills(generator)
+
+        Path(paths["Form 8949"]).unlink()
+        generator.generate_complete_return(tax_data, include_signature=False)
+        assert filled == ["Form 8949"]
+
+        filled.clear()
+        generator.generate_complete_return(tax_data, include_signature=False, flatten=True)
+        assert filled == list(paths)
+
+        filled.clear()
+        generator.generate_complete_return(tax_data, include_signature=False, flatten=True, incremental=False)
+        assert filled == list(paths)
+
+    def test_manifest_survives_restart(self, capital_gains_return, tmp_path):
+        """Test a new generator reads the manifest and ignores a corrupt one"""
+        generator, tax_data = capital_gains_return
+        generator.generate_complete_return(tax_data, include_signature=False)
+
+        restarted = TaxReturnPDFGenerator(str(tmp_path / "forms"), str(tmp_path / "out"))
+        filled = _record_fills(restarted)
+        restarted.generate_complete_return(tax_data, include_signature=False)
+        assert filled == []
+
+        restarted.export_manifest.path.write_text("{not json")
+        corrupt = TaxReturnPDFGenerator(str(tmp_path / "forms"), str(tmp_path / "out"))
+        filled = _record_fills(corrupt)
+        corrupt.generate_complete_return(tax_data, include_signature=False)
+        assert len(filled) == len(generator.determine_required_forms(tax_data))
+
+    def test_signature_date_not_in_digest(self, capital_gains_return, monkeypatch):
+        """Test a signed return exported again on a later day is not refilled"""
+        generator, tax_data = capital_gains_return
+        generator.generate_complete_return(tax_data)
+        filled = _record_fills(generator)
+        original = generator._get_signature_fields
+
+        def next_day_signature(data):
+            fields = original(data)
+            fields['topmostSubform[0].Page2[0].YourSignature_ReadOrder[0].f2_02[0]'] = '01/02/2099'
+            return fields
+
+        monkeypatch.setattr(generator, '_get_signature_fields', next_day_signature)
+        generator.generate_complete_return(tax_data)
+        assert filled == []
+
+    def test_merged_return_kept_when_unchanged(self, capital_gains_return):
+        """Test the single-file return is only rebuilt when a form changed"""
+        generator, tax_data = capital_gains_return
+        merged = generator.generate_merged_return(tax_data, include_signature=False)
+        written = merged.stat().st_mtime_ns
+
+        assert generator.generate_merged_return(tax_data, include_signature=False) == merged
+        assert merged.stat().st_mtime_ns == written
+
+        tax_data['income']['capital_gains'][0]['sales_price'] = 999.99
+        generator.generate_merged_return(tax_data, include_signature=False)
+        assert merged.stat().st_mtime_ns != written
+
+    def test_changed_forms_mapped_once(self, capital_gains_return, monkeypatch):
+        """Test a rewritten form is mapped once for both its digest and its fill"""
+        generator, tax_data = capital_gains_return
+        generator.generate_complete_return(tax_data, include_signature=False)
+        tax_data['income']['w2_forms'][0]['wages'] = 81000
+        mapped = []
+        original = generator._get_field_mappings
+
+        def record_mapping(form_name, data):
+            mapped.append(form_name)
+            return original(form_name, data)
+
+        monkeypatch.setattr(generator, '_get_field_mappings', record_mapping)
+        generator.generate_complete_return(tax_data, include_signature=False)
+
+        assert sorted(mapped) == sorted(set(mapped))
+
+    def test_batch_saves_manifest_once(self, batch_generator, monkeypatch):
+        """Test a threaded batch writes the manifest once, not once per return"""
+        saves = []
+        monkeypatch.setattr(batch_generator.export_manifest, 'save', lambda: saves.append(1))
+
+        results = batch_generator.generate_batch_export([_sample_return(i) for i in range(4)],
+                                                        flatten=False, max_workers=2)
+
+        assert all(results) and len(saves) == 1
+        assert len(batch_generator.export_manifest) == 4
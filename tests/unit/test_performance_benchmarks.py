@@ -269,3 +269,128 @@ class TestResourceCleanup:
         
         # Should complete without issues
         assert True
+
+
+class TestBracketLookupPerformance:
+    """Test precompiled bracket tables against the per-call bracket walk"""
+
+    @staticmethod
+    def _walk_brackets(taxable_income, filing_status, tax_year=2025):
+        """Bracket walk as calculate_income_tax did it before precompiled tables, exact and rounded half up"""
+        from decimal import Decimal, ROUND_HALF_UP
+        from config.tax_year_config import get_tax_year_config
+
+        config = get_tax_year_config(tax_year)
+        brackets = config.tax_brackets.get(filing_status, config.tax_brackets["Single"])
+        income = Decimal(str(taxable_income))
+        tax = Decimal(0)
+        prev_threshold = Decimal(0)
+        for threshold, rate in brackets:
+            threshold, rate = Decimal(str(threshold)), Decimal(str(rate))
+            if income <= threshold:
+                tax += (income - prev_threshold) * rate
+                break
+            tax += (threshold - prev_threshold) * rate
+            prev_threshold = threshold
+        return float(tax.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+
+    def test_precompiled_lookup_matches_walk(self):
+        """Test table lookup equals the bracket walk on cent-varied incomes"""
+        import random
+        from utils.tax_calculations import calculate_income_tax
+
+        rng = random.Random(42)
+        statuses = ['Single', 'MFJ', 'HOH']
+        inputs = [(round(rng.uniform(0, 700000), 2), rng.choice(statuses)) for _ in range(20000)]
+
+        assert all(calculate_income_tax(i, s, 2025) == self._walk_brackets(i, s) for i, s in inputs)
+
+
+class TestMoneyEnginePerformance:
+    """Test integer-cents sums against per-value Decimal conversion"""
+
+    def test_cents_sum_matches_decimal(self):
+        """Test sum_money equals sum(Decimal(str(v))) on a large lot list"""
+        import random
+        from decimal import Decimal
+        from utils.money import sum_money
+
+        rng = random.Random(42)
+        amounts = [round(rng.uniform(-5000, 5000), 2) for _ in range(100000)]
+
+        assert sum_money(amounts) == sum(Decimal(str(v)) for v in amounts)
+
+
+class TestRecordStoreMemory:
+    """Test columnar record stores against per-row objects and dicts"""
+
+    def test_crypto_store_uses_less_memory(self):
+        """Test a RecordStore of trades is several times smaller than the objects"""
+        import copy
+        import random
+        import tracemalloc
+        from datetime import date, timedelta
+        from decimal import Decimal
+        from services.cryptocurrency_tax_service import (
+            CRYPTO_TRANSACTION_COLUMNS, CryptoTransaction, CryptoTransactionType
+        )
+        from utils.record_store import RecordStore
+
+        rng = random.Random(42)
+        rows = []
+        for i in range(20000):
+            amount = Decimal(str(round(rng.uniform(0.001, 3), 8)))
+            price = Decimal(str(round(rng.uniform(100, 60000), 2)))
+            rows.append(CryptoTransaction(
+                date=date(2024, 1, 1) + timedelta(days=i % 365),
+                type=rng.choice(list(CryptoTransactionType)),
+                cryptocurrency=rng.choice(['BTC', 'ETH', 'SOL']),
+                amount=amount, price_per_unit=price,
+                total_value=(amount * price).quantize(Decimal('0.01')),
+                fees=Decimal('1.25'), exchange=rng.choice(['Coinbase', 'Kraken']),
+                transaction_id=f"tx{i}"
+            ).to_dict())
+
+        def traced(build):
+            source = copy.deepcopy(rows)
+            tracemalloc.start()
+            try:
+                result = build(source)
+                del source
+                return tracemalloc.get_traced_memory()[0], result
+            finally:
+                tracemalloc.stop()
+
+        objects_bytes, objects = traced(lambda src: [CryptoTransaction.from_dict(r) for r in src])
+        store_bytes, store = traced(
+            lambda src: RecordStore.from_dicts(CryptoTransaction, CRYPTO_TRANSACTION_COLUMNS, src)
+        )
+
+        assert store == objects
+        assert store_bytes * 3 < objects_bytes
+
+
+class TestFlattenPerformance:
+    """Test flattened returns against live forms"""
+
+    def test_flattened_return_smaller(self, tmp_path):
+        """Test a flattened sample return is smaller than the live one"""
+        from tests.fixtures.sample_pdf_forms import build_form_pdf, irs_style_field_names
+        from utils.pdf.pdf_generator import TaxReturnPDFGenerator
+
+        forms_dir = tmp_path / "forms"
+        forms_dir.mkdir()
+        generator = TaxReturnPDFGenerator(str(forms_dir), str(tmp_path / "out"))
+        tax_data = {
+            'personal_info': {'first_name': 'Jane', 'last_name': 'Doe', 'ssn': '123-45-6789'},
+            'filing_status': {'status': 'Single'},
+            'income': {'w2_forms': [{'wages': 90000, 'federal_withholding': 11000}]},
+        }
+        mapped = generator.build_fill_jobs(tax_data)[0].field_values
+        build_form_pdf(forms_dir / "Form 1040.pdf",
+                       [sorted(mapped) + irs_style_field_names(1, 60, 'x'), irs_style_field_names(2, 80)])
+
+        live = generator.generate_merged_return(tax_data, output_path=str(tmp_path / "live.pdf"))
+        flat = generator.generate_merged_return(tax_data, output_path=str(tmp_path / "flat.pdf"), flatten=True)
+
+        assert flat.stat().st_size < live.stat().st_size
@@ -0,0 +1,150 @@
+"""
+Tests for columnar record stores
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Optional
+
+import pytest
+
+from services.audit_trail_service import AuditEntry, new_audit_log
+from services.bank_account_linking_service import (
+    BANK_TRANSACTION_COLUMNS,
+    BankTransaction,
+    TransactionCategory,
+)
+from services.cryptocurrency_tax_service import (
+    CRYPTO_TRANSACTION_COLUMNS,
+    CryptoTransaction,
+    CryptoTransactionType,
+)
+from utils.record_store import RecordStore
+
+
+@dataclass(slots=True)
+class Row:
+    label: str
+    amount: Decimal
+    when: datetime
+    score: float
+    flag: bool
+    day: Optional[date] = None
+    extra: Any = None
+
+
+ROW_COLUMNS = {'label': 'category', 'amount': 'decimal', 'when': 'datetime',
+               'score': 'float', 'flag': 'bool', 'day': 'date'}
+
+
+def _rows():
+    start = datetime(2024, 3, 1, 9, 30, tzinfo=timezone.utc)
+    return [
+        Row('a', Decimal('0.50'), start, 1.5, True, date(2024, 1, 2), {'k': 1}),
+        Row('b', Decimal('1E+2'), start + timedelta(seconds=1), 0.1, False),
+        Row('a', Decimal('-3.123456789'), start + timedelta(days=1), -2.25, True, date(2024, 1, 3)),
+    ]
+
+
+class TestRecordStore:
+    """Test storage and materialization"""
+
+    def test_round_trip_is_exact(self):
+        """Test records come back equal, including Decimal exponents"""
+        store = RecordStore(Row, ROW_COLUMNS, _rows())
+
+        assert list(store) == _rows()
+        assert store == _rows()
+        assert [str(row.amount) for row in store] == ['0.50', '1E+2', '-3.123456789']
+        assert store.storage_kinds()['amount'] == 'decimal'
+
+    def test_sequence_behaviour(self):
+        """Test indexing, slicing and clearing like a list"""
+        store = RecordStore(Row, ROW_COLUMNS, _rows())
+
+        assert store[-1] == _rows()[-1]
+        assert store[1:] == _rows()[1:]
+        with pytest.raises(IndexError):
+            store[3]
+        store.clear()
+        assert store == [] and len(store) == 0
+
+    @pytest.mark.parametrize("field, value", [
+        ('amount', Decimal('NaN')),
+        ('amount', Decimal('1' * 25)),
+        ('when', datetime(2024, 1, 1)),
+        ('score', 3),
+        ('label', ['unhashable']),
+    ])
+    def test_unrepresentable_values_fall_back(self, field, value):
+        """Test a typed column converts to objects instead of losing data"""
+        store = RecordStore(Row, ROW_COLUMNS, _rows())
+        row = Row('c', Decimal('1'), datetime(2024, 1, 1, tzinfo=timezone.utc), 1.0, False)
+        setattr(row, field, value)
+        store.append(row)
+
+        assert store.storage_kinds()[field] == 'object'
+        assert store == _rows() + [row]
+
+    def test_views_and_columns(self):
+        """Test slotted views and column access read without building records"""
+        store = RecordStore(Row, ROW_COLUMNS, _rows())
+        view = store.view(0)
+
+        assert view.label == 'a' and view.extra == {'k': 1}
+        assert view.materialize() == _rows()[0]
+        with pytest.raises(AttributeError):
+            view.__dict__
+        assert store.column('label') == ['a', 'b', 'a']
+        assert store.to_numpy('score').tolist() == [1.5, 0.1, -2.25]
+        with pytest.raises(TypeError):
+            store.to_numpy('label')
+
+    def test_unknown_column(self):
+        """Test column layouts must name record fields"""
+        with pytest.raises(ValueError):
+            RecordStore(Row, {'missing': 'float'})
+
+
+class TestServiceRecordStores:
+    """Test the column layouts of the service records"""
+
+    def test_crypto_transactions_dicts(self):
+        """Test lazy dict rows match the record's own serialization"""
+        transaction = CryptoTransaction(
+            date=date(2024, 5, 1), type=CryptoTransactionType.BUY, cryptocurrency='BTC',
+            amount=Decimal('0.12345678'), price_per_unit=Decimal('61000.00'),
+            total_value=Decimal('7530.86'), fees=Decimal('2.50'), exchange='Coinbase',
+            transaction_id='tx-1'
+        )
+        store = RecordStore.from_dicts(CryptoTransaction, CRYPTO_TRANSACTION_COLUMNS,
+                                       [transaction.to_dict()] * 3)
+
+        assert store.dicts()[2] == transaction.to_dict()
+        assert len(store.dicts()[:2]) == 2
+        assert 'object' not in {store.storage_kinds()[name] for name in CRYPTO_TRANSACTION_COLUMNS}
+
+    def test_bank_transactions(self):
+        """Test bank transactions store amounts and categories in typed columns"""
+        transaction = BankTransaction(
+            transaction_id='t1', account_id='acct', date=datetime(2024, 2, 3, 4, 5),
+            amount=-42.17, description='Office supplies', category=TransactionCategory.BUSINESS_EXPENSE
+        )
+        store = RecordStore(BankTransaction, BANK_TRANSACTION_COLUMNS, [transaction])
+
+        assert store[0] == transaction
+        assert store.storage_kinds()['amount'] == 'float'
+
+    def test_audit_log(self):
+        """Test audit entries keep their UTC timestamps"""
+        entry = AuditEntry(
+            id='audit_1', timestamp=datetime(2024, 1, 1, 12, tzinfo=timezone.utc), user_id='u',
+            action='UPDATE', entity_type='income', entity_id=None, field_name='wages',
+            old_value=1, new_value=2, session_id='s', ip_address=None, user_agent=None,
+            metadata={}, calculation_worksheet=None
+        )
+        log = new_audit_log([entry])
+
+        assert log[0] == entry
+        assert log.storage_kinds()['timestamp'] == 'datetime'
@@ -0,0 +1,158 @@
+"""
+Tests for the content-addressed result cache
+"""
+
+import copy
+from decimal import Decimal
+
+import pytest
+
+from models.tax_data import TaxData, calculation_inputs
+from services.tax_calculation_service import TaxCalculationService
+from utils.commands import CommandHistory, SetValueCommand
+from utils.result_cache import ResultCache, content_hash, get_result_cache
+
+
+@pytest.fixture
+def result_cache():
+    cache = get_result_cache()
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+@pytest.fixture
+def tax_data():
+    data = TaxData()
+    data.set('filing_status.status', 'Single')
+    data.set('income.w2_forms', [{'wages': 65000.0, 'federal_withholding': 7000.0}])
+    data.set('deductions.method', 'standard')
+    return data
+
+
+class TestContentHash:
+    """Test structural hashing"""
+
+    def test_key_order_does_not_matter(self):
+        """Test equal dictionaries hash the same regardless of insertion order"""
+        assert content_hash({'a': 1, 'b': [1, 2]}) == content_hash({'b': [1, 2], 'a': 1})
+
+    def test_values_are_distinguished(self):
+        """Test different values and types give different hashes"""
+        assert content_hash({'a': 1}) != content_hash({'a': 2})
+        assert content_hash(Decimal('1.5')) != content_hash('1.5')
+        assert content_hash([1, 2]) != content_hash([2, 1])
+
+    def test_mixed_key_types(self):
+        """Test dictionaries with keys json can't sort still hash"""
+        assert content_hash({1: 'a', 'b': 2}) == content_hash({'b': 2, 1: 'a'})
+
+    def test_timestamps_are_not_calculation_inputs(self, tax_data):
+        """Test metadata timestamps don't change the calculation key"""
+        year_data = tax_data.data['years'][tax_data.get_current_year()]
+        before = content_hash(calculation_inputs(year_data))
+        year_data['metadata']['last_modified'] = '2099-01-01T00:00:00'
+        assert content_hash(calculation_inputs(year_data)) == before
+
+
+class TestResultCache:
+    """Test the bounded LRU cache"""
+
+    def test_least_recently_used_is_evicted(self):
+        """Test the oldest unused entry is evicted when full"""
+        cache = ResultCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        assert 'a' in cache and 'c' in cache and 'b' not in cache
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_results_are_copied(self):
+        """Test modifying a returned result doesn't change the cached one"""
+        cache = ResultCache()
+        value = {'total': [1, 2]}
+        cache.put('key', value)
+        value['total'].append(3)
+        cache.get('key')['total'].append(4)
+        assert cache.get('key') == {'total': [1, 2]}
+
+    def test_get_or_compute(self):
+        """Test compute runs only on a miss"""
+        cache = ResultCache()
+        calls = []
+        for _ in range(3):
+            assert cache.get_or_compute('key', lambda: calls.append(1) or 42) == 42
+        assert len(calls) == 1
+        assert cache.get_stats()['hits'] == 2
+
+    def test_invalid_size(self):
+        """Test the cache needs room for at least one entry"""
+        with pytest.raises(ValueError):
+            ResultCache(max_entries=0)
+
+
+class TestSharedResultCache:
+    """Test services reuse results for identical inputs"""
+
+    def test_undo_reuses_complete_return(self, result_cache, tax_data):
+        """Test undoing an edit finds the result calculated before the edit"""
+        calc = TaxCalculationService(tax_year=2025)
+        original = calc.calculate_complete_return(tax_data)
+
+        history = CommandHistory()
+        history.execute_command(SetValueCommand(tax_data, 'filing_status.status', 'Head of Household'))
+        changed = calc.calculate_complete_return(tax_data)
+        assert changed.total_tax != original.total_tax
+
+        history.undo()
+        hits = result_cache.hits
+        assert calc.calculate_complete_return(tax_data).to_dict() == original.to_dict()
+        assert result_cache.hits == hits + 1
+
+    def test_reloaded_return_reuses_totals(self, result_cache, tax_data):
+        """Test reopening an unchanged return finds its totals in the cache"""
+        totals = tax_data.calculate_totals()
+        reloaded = TaxData.from_dict(copy.deepcopy(tax_data.data))
+        reloaded.data['years'][reloaded.get_current_year()]['metadata']['last_modified'] = 'later'
+
+        hits = result_cache.hits
+        assert reloaded.calculate_totals() == totals
+        assert result_cache.hits == hits + 1
+
+    def test_credits_keyed_on_values_read(self, result_cache, tax_data):
+        """Test editing values calculate_credits doesn't read still finds its result"""
+        credits = tax_data.calculate_credits(50000.0)
+        tax_data.set('income.interest_income', [{'payer': 'Bank', 'amount': 125.0}])
+        tax_data.set('personal_info.first_name', 'Edited')
+
+        hits = result_cache.hits
+        assert tax_data.calculate_credits(50000.0) == credits
+        assert result_cache.hits == hits + 1
+
+        tax_data.set('credits.residential_energy.amount', 1000.0)
+        assert tax_data.calculate_credits(50000.0)['residential_energy_credit'] > 0
+
+    def test_cached_analysis_is_timestamped_now(self, result_cache, tax_data, tmp_path):
+        """Test an analysis found in the cache reports when it was requested"""
+        from config.app_config import AppConfig
+        from services.tax_analytics_service import TaxAnalyticsService
+        config = AppConfig.from_env()
+        config.safe_dir = tmp_path
+        analytics = TaxAnalyticsService(config, TaxCalculationService(tax_year=2025))
+        first = analytics.generate_comprehensive_analysis(tax_data)
+
+        hits = result_cache.hits
+        second = analytics.generate_comprehensive_analysis(tax_data)
+        assert result_cache.hits == hits + 1
+        assert second.calculated_at > first.calculated_at
+
+    def test_scenarios_are_not_cached(self, result_cache, tax_data):
+        """Test what-if overlays and dictionaries skip the shared cache"""
+        from models.scenario_overlay import ScenarioOverlay
+        calc = TaxCalculationService(tax_year=2025)
+        year_data = tax_data.data['years'][tax_data.get_current_year()]
+        calc.calculate_complete_return(ScenarioOverlay.from_year_data(year_data))
+        calc.calculate_complete_return(copy.deepcopy(tax_data.data))
+        assert len(result_cache) == 0
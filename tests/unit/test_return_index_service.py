@@ -0,0 +1,166 @@
+"""
+Unit tests for the return metadata index
+"""
+
+import sqlite3
+
+import pytest
+from config.app_config import AppConfig
+from models.tax_data import TaxData, index_saved_returns
+from services.return_index_service import ReturnIndexService, ReturnSummary, agi_band, client_id_for_path
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Config saving returns, keys and the index under a temporary directory"""
+    config = AppConfig.from_env()
+    config.safe_dir = tmp_path
+    config.key_file = tmp_path / "key"
+    return config
+
+
+@pytest.fixture
+def index(config):
+    service = ReturnIndexService(config)
+    yield service
+    service.close()
+
+
+def _summary(path, year, **fields):
+    return ReturnSummary(path=path, tax_year=year, last_modified=f"{year}-03-01T00:00:00", **fields)
+
+
+class TestHelpers:
+    """Test AGI bands and client directories"""
+
+    @pytest.mark.parametrize("agi,band", [(-500, 0), (0, 0), (24999.99, 0), (25000, 25000),
+                                          (150000, 100000), (5_000_000, 1_000_000)])
+    def test_agi_band(self, agi, band):
+        """Test amounts map to the lower bound of their band"""
+        assert agi_band(agi) == band
+
+    def test_client_id_for_path(self, tmp_path):
+        """Test returns in client data directories belong to that client"""
+        assert client_id_for_path(tmp_path / "client_data_client_ab12" / "r.enc") == "client_ab12"
+        assert client_id_for_path(tmp_path / "r.enc") == ""
+
+
+class TestReturnIndex:
+    """Test recording and querying returns"""
+
+    def test_database_uses_wal(self, index):
+        """Test the index runs in WAL mode"""
+        assert index._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_filter_and_sort(self, index):
+        """Test filters combine and results sort and page"""
+        index.record(_summary("a.enc", 2023, client_id="c1", filing_status="Single", agi_band=50000,
+                              required_forms=["Form 1040", "Schedule C"]))
+        index.record(_summary("a.enc", 2024, client_id="c1", filing_status="MFJ", agi_band=100000,
+                              required_forms=["Form 1040"]))
+        index.record(_summary("b.enc", 2024, client_id="c2", filing_status="MFJ", agi_band=200000,
+                              status="filed", required_forms=["Form 1040", "Schedule C"]))
+
+        assert [(r.path, r.tax_year) for r in index.list_returns(client_id="c1", order_by="tax_year")] == \
+            [("a.enc", 2024), ("a.enc", 2023)]
+        assert [r.path for r in index.list_returns(form="Schedule C", min_agi=150000)] == ["b.enc"]
+        assert [r.tax_year for r in index.list_returns(max_agi=100000, descending=False)] == [2023, 2024]
+        assert [r.path for r in index.list_returns(status="filed")] == ["b.enc"]
+        assert len(index.list_returns(order_by="agi_band", limit=2, offset=2)) == 1
+        assert index.list_returns(client_id="c2")[0].required_forms == ["Form 1040", "Schedule C"]
+        assert index.count_by_client() == {"c1": 2, "c2": 1}
+
+    def test_record_replaces_row_and_drops_removed_years(self, index):
+        """Test re-recording replaces a year and forgets years no longer saved"""
+        index.record(_summary("a.enc", 2023, required_forms=["Schedule C"]))
+        index.record(_summary("a.enc", 2024, required_forms=["Schedule C"]))
+
+        index.record(_summary("a.enc", 2024, required_forms=["Form 1040"]), years=[2024, "2024_amended"])
+
+        assert [r.tax_year for r in index.list_returns()] == [2024]
+        assert index.list_returns(form="Schedule C") == []
+
+    def test_remove_and_unsortable_column(self, index):
+        """Test removing a file and rejecting unknown sort columns"""
+        index.record(_summary("a.enc", 2024))
+        index.remove("a.enc")
+
+        assert index.list_returns() == []
+        with pytest.raises(ValueError):
+            index.list_returns(order_by="path; DROP TABLE returns")
+
+    def test_saves_update_index(self, config, index):
+        """Test saving and autosaving a return records its current year"""
+        (config.safe_dir / "client_data_client_01").mkdir()
+        tax_data = TaxData(config, return_index=index)
+        tax_data.set('filing_status.status', 'MFJ')
+        tax_data.add_to_list('income.w2_forms', {'employer': 'Acme', 'wages': 60000})
+        path = tax_data.save_to_file('client_data_client_01/return.enc')
+
+        tax_data.add_to_list('income.w2_forms', {'employer': 'Beta', 'wages': 50000})
+        tax_data.autosave()
+
+        (summary,) = index.list_returns()
+        assert summary.path == path
+        assert (summary.client_id, summary.tax_year, summary.filing_status) == ("client_01", 2026, "MFJ")
+        assert summary.agi_band == 100000
+        assert "Form 1040" in summary.required_forms
+
+    def test_autosave_skips_index_for_unindexed_changes(self, config, index, monkeypatch):
+        """Test autosaving edits the summary doesn't read leaves the index alone"""
+        tax_data = TaxData(config, return_index=index)
+        tax_data.set('filing_status.status', 'Single')
+        tax_data.save_to_file('return.enc')
+        recorded = []
+        monkeypatch.setattr(index, 'record', lambda summary, years=(): recorded.append(summary))
+
+        tax_data.set('personal_info.first_name', 'Jane')
+        tax_data.autosave()
+        assert recorded == []
+
+        tax_data.set('filing_status.status', 'MFJ')
+        tax_data.set('personal_info.last_name', 'Doe')
+        tax_data.autosave()
+        tax_data.set('personal_info.email', 'jane@example.com')
+        tax_data.autosave()
+        assert [summary.filing_status for summary in recorded] == ['MFJ']
+
+    def test_backfill_indexes_existing_returns_once(self, config, index):
+        """Test returns saved without the index are added once, every year of them"""
+        (config.safe_dir / "client_data_client_01").mkdir()
+        tax_data = TaxData(config)
+        for year in (2025, 2026):
+            tax_data.set('filing_status.status', 'MFJ', tax_year=year)
+        tax_data.set('metadata.filed_date', '2026-04-10T09:00:00', tax_year=2025)
+        path = tax_data.save_to_file('client_data_client_01/return.enc')
+        (config.safe_dir / 'foreign.enc').write_bytes(b"not a return")
+
+        assert index_saved_returns(config, index) == 1
+
+        summaries = index.list_returns(client_id="client_01", order_by="tax_year", descending=False)
+        assert [(s.path, s.tax_year, s.filing_status) for s in summaries] == [(path, 2025, "MFJ"), (path, 2026, "MFJ")]
+        assert summaries[0].filed_date == '2026-04-10T09:00:00'
+        index.remove(path)
+        assert index_saved_returns(config, index) == 0
+        assert index.list_returns() == []
+
+    def test_version_1_database_gains_filed_date(self, config):
+        """Test an index created before filed dates were stored is migrated"""
+        conn = sqlite3.connect(str(config.safe_dir / "return_index.db"))
+        conn.executescript(
+            "CREATE TABLE returns (path TEXT NOT NULL, tax_year INTEGER NOT NULL, client_id TEXT NOT NULL, "
+            "return_type TEXT NOT NULL, filing_status TEXT NOT NULL, agi_band INTEGER NOT NULL, "
+            "status TEXT NOT NULL, last_modified TEXT NOT NULL, required_forms TEXT NOT NULL, "
+            "PRIMARY KEY (path, tax_year));"
+            "INSERT INTO returns VALUES ('a.enc', 2025, '', 'original', '', 0, 'draft', '2026-01-01', '[]');"
+            "PRAGMA user_version=1;"
+        )
+        conn.close()
+
+        service = ReturnIndexService(config)
+        try:
+            assert [s.filed_date for s in service.list_returns()] == [""]
+            service.record(_summary('b.enc', 2025, filed_date='2026-04-15'))
+            assert service.list_returns(tax_year=2025, order_by="path")[0].filed_date == '2026-04-15'
+        finally:
+            service.close()
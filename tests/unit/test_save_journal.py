@@ -0,0 +1,84 @@
+"""
+Unit tests for the autosave journal
+"""
+
+import pytest
+from utils.save_journal import SaveJournal, encode_record, journal_path
+
+KEY = bytes(range(32))
+BASE = b"\x01" * 32
+
+
+def _changes(count, start=0):
+    return [{'op': 'set', 'year': 2024, 'path': 'income.wages', 'value': start + i} for i in range(count)]
+
+
+@pytest.fixture
+def base(tmp_path):
+    return tmp_path / "return.enc"
+
+
+class TestAppendAndReplay:
+    """Test changes survive appending and reopening"""
+
+    def test_appends_replay_in_order(self, base):
+        """Test several appends are read back in order"""
+        journal = SaveJournal(base, KEY)
+        journal.append(BASE, [encode_record(c) for c in _changes(3)])
+        journal.append(BASE, [encode_record(c) for c in _changes(2, start=3)])
+
+        reopened = SaveJournal(base, KEY)
+
+        assert reopened.open(BASE) == _changes(5)
+        assert reopened.size == journal.size == journal_path(base).stat().st_size
+
+    def test_reopened_journal_continues(self, base):
+        """Test appends after reopening follow the replayed records"""
+        SaveJournal(base, KEY).append(BASE, [encode_record(c) for c in _changes(2)])
+        journal = SaveJournal(base, KEY)
+        journal.open(BASE)
+        journal.append(BASE, [encode_record(c) for c in _changes(1, start=2)])
+
+        assert SaveJournal(base, KEY).open(BASE) == _changes(3)
+
+    def test_hides_plaintext(self, base):
+        """Test recorded values are encrypted"""
+        SaveJournal(base, KEY).append(BASE, [encode_record({'op': 'set', 'value': 'John Smith'})])
+
+        assert b"John" not in journal_path(base).read_bytes()
+
+
+class TestRecovery:
+    """Test damaged and stale journals"""
+
+    def test_torn_record_ignored_and_overwritten(self, base):
+        """Test a partial last record is dropped and replaced by the next append"""
+        SaveJournal(base, KEY).append(BASE, [encode_record(c) for c in _changes(3)])
+        path = journal_path(base)
+        path.write_bytes(path.read_bytes()[:-7])
+
+        journal = SaveJournal(base, KEY)
+        assert journal.open(BASE) == _changes(2)
+        journal.append(BASE, [encode_record(c) for c in _changes(1, start=9)])
+
+        assert SaveJournal(base, KEY).open(BASE) == _changes(2) + _changes(1, start=9)
+
+    def test_other_base_discarded(self, base):
+        """Test a journal written against another save of the base is removed"""
+        SaveJournal(base, KEY).append(BASE, [encode_record(c) for c in _changes(2)])
+
+        assert SaveJournal(base, KEY).open(b"\x02" * 32) == []
+        assert not journal_path(base).exists()
+
+    def test_other_key_replays_nothing(self, base):
+        """Test records encrypted with another key aren't applied"""
+        SaveJournal(base, KEY).append(BASE, [encode_record(c) for c in _changes(2)])
+
+        assert SaveJournal(base, bytes(32)).open(BASE) == []
+
+    def test_missing_journal(self, base):
+        """Test a base without a journal has no changes"""
+        journal = SaveJournal(base, KEY)
+
+        assert journal.open(BASE) == []
+        assert journal.size == 0
@@ -0,0 +1,142 @@
+"""
+Tests for copy-on-write scenario overlays
+"""
+
+import copy
+from unittest.mock import patch
+
+import pytest
+
+from models.scenario_overlay import ScenarioOverlay
+from models.tax_data import TaxData
+from services.tax_calculation_service import TaxCalculationService
+from services.tax_planning_service import TaxPlanningService
+
+
+def _deepcopy_apply(tax_data, changes):
+    """Reference implementation: the original deep-copy scenario application"""
+    modified = copy.deepcopy(tax_data)
+
+    def apply_nested_changes(target, changes):
+        for key, value in changes.items():
+            if isinstance(value, dict) and key in target and isinstance(target[key], dict):
+                apply_nested_changes(target[key], value)
+            elif isinstance(value, list) and key in target and isinstance(target[key], list):
+                if key == 'w2_forms' and target[key] and isinstance(target[key][0], dict):
+                    for change_key, change_value in value[0].items():
+                        if change_key in target[key][0]:
+                            if isinstance(change_value, (int, float)):
+                                target[key][0][change_key] += change_value
+                            else:
+                                target[key][0][change_key] = change_value
+            else:
+                target[key] = value
+
+    apply_nested_changes(modified.data["years"][modified.get_current_year()], changes)
+    modified.invalidate_calculations()
+    return modified
+
+
+@pytest.fixture
+def tax_data():
+    data = TaxData()
+    data.set('filing_status.status', 'Single')
+    data.set('income.w2_forms', [
+        {'employer_name': 'Acme', 'wages': 75000.0, 'federal_withholding': 8500.0},
+        {'employer_name': 'Side', 'wages': 5000.0, 'federal_withholding': 300.0},
+    ])
+    data.set('income.interest_income', [{'amount': 250.0}])
+    data.set('deductions.method', 'standard')
+    data.set('deductions.mortgage_interest', 9000.0)
+    return data
+
+
+SCENARIOS = {
+    'raise': {'income': {'w2_forms': [{'wages': 10000, 'employer_name': 'Acme Corp'}]}},
+    'hoh': {'filing_status': {'status': 'Head of Household'}},
+    'itemize': {'deductions': {'method': 'itemized', 'state_local_taxes': 8000.0}},
+    'new_section': {'payments': {'estimated_tax': 2000.0}},
+    'ignored_list': {'income': {'interest_income': [{'amount': 1.0}]}},
+    'replace_scalar': {'income': {'w2_forms': 'not a list'}},
+}
+
+
+class TestScenarioOverlay:
+    """Test overlay reads"""
+
+    @pytest.mark.parametrize("name", sorted(SCENARIOS))
+    def test_matches_deepcopy_semantics(self, tax_data, name):
+        """Test every read matches applying the changes to a deep copy"""
+        changes = SCENARIOS[name]
+        overlay = ScenarioOverlay.from_tax_data(tax_data, changes)
+        reference = _deepcopy_apply(tax_data, changes)
+
+        for path in ('income', 'income.w2_forms', 'income.interest_income',
+                     'filing_status.status', 'deductions', 'deductions.method',
+                     'payments.estimated_tax', 'income.w2_forms.wages', 'missing.path'):
+            assert overlay.get(path, 'default') == reference.get(path, 'default'), path
+
+    def test_base_is_not_modified(self, tax_data):
+        """Test overlays never write through to the base"""
+        before = copy.deepcopy(tax_data.data)
+        overlay = ScenarioOverlay.from_tax_data(tax_data, SCENARIOS['raise'])
+        overlay.get('income.w2_forms')[0]['wages'] = 0
+        overlay.get('income')
+        assert tax_data.data == before
+
+    def test_unchanged_sections_are_shared(self, tax_data):
+        """Test unchanged rows and sections are the base objects, not copies"""
+        overlay = ScenarioOverlay.from_tax_data(tax_data, SCENARIOS['raise'])
+        assert overlay.get('income.w2_forms')[1] is tax_data.get('income.w2_forms')[1]
+        assert overlay.get('income.interest_income') is tax_data.get('income.interest_income')
+
+    def test_overlays_stack(self, tax_data):
+        """Test an overlay can be built on top of another overlay"""
+        first = ScenarioOverlay.from_tax_data(tax_data, SCENARIOS['raise'])
+        second = ScenarioOverlay.from_tax_data(first, SCENARIOS['raise'])
+        assert second.get('income.w2_forms')[0]['wages'] == 95000.0
+        assert second.changes is SCENARIOS['raise']
+
+
+class TestScenarioAnalysis:
+    """Test TaxPlanningService uses overlays"""
+
+    def test_no_deep_copies(self, tax_data):
+        """Test scenario analysis never deep-copies the TaxData object"""
+        service = TaxPlanningService()
+        with patch.object(TaxData, '__deepcopy__', side_effect=AssertionError("deepcopy called"),
+                          create=True):
+            modified = service._apply_scenario_changes(tax_data, SCENARIOS['raise'])
+            result = service.analyze_scenario(tax_data, SCENARIOS['raise'])
+        assert isinstance(modified, ScenarioOverlay)
+        assert result.tax_difference > 0
+
+    @pytest.mark.parametrize("name", sorted(set(SCENARIOS) - {'replace_scalar'}))
+    def test_overlay_results_match_full_copy(self, tax_data, name):
+        """Test calculate_complete_return gives the same result for overlay and copy"""
+        calc = TaxCalculationService(tax_year=2025)
+        overlay = ScenarioOverlay.from_tax_data(tax_data, SCENARIOS[name])
+        expected = calc.calculate_complete_return(_deepcopy_apply(tax_data, SCENARIOS[name]))
+        assert calc.calculate_complete_return(overlay).to_dict() == expected.to_dict()
+
+    def test_analyze_scenarios_matches_single_analysis(self, tax_data):
+        """Test batch analysis returns the same results as one-at-a-time analysis"""
+        service = TaxPlanningService()
+        scenarios = {name: SCENARIOS[name] for name in ('raise', 'hoh', 'itemize')}
+        results = service.analyze_scenarios(tax_data, scenarios)
+
+        assert [r.scenario_name for r in results] == list(scenarios)
+        for result in results:
+            single = service.analyze_scenario(tax_data, scenarios[result.scenario_name],
+                                              result.scenario_name)
+            assert result.to_dict() == single.to_dict()
+
+    def test_dict_scenarios_do_not_modify_input(self):
+        """Test plain dictionary scenarios copy only changed sections"""
+        service = TaxPlanningService()
+        data = {'filing_status': {'status': 'Single'}, 'income': {'wages': 1}}
+        modified = service._apply_scenario_changes(data, {'filing_status': {'status': 'MFJ'}})
+
+        assert modified['filing_status'] == {'status': 'MFJ'}
+        assert data['filing_status'] == {'status': 'Single'}
+        assert modified['income'] is data['income']
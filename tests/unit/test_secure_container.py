@@ -0,0 +1,75 @@
+"""
+Unit tests for the secure container file format
+"""
+
+import io
+import os
+import pytest
+from utils.secure_container import ContainerError, ContainerWriter, is_container, read_container, write_container
+
+KEY = bytes(range(32))
+
+
+def _container(payload, **options):
+    buffer = io.BytesIO()
+    write_container(buffer, KEY, [payload[i:i + 1000] for i in range(0, len(payload), 1000)], **options)
+    return buffer.getvalue()
+
+
+class TestRoundTrip:
+    """Test payloads survive writing and reading"""
+
+    @pytest.mark.parametrize("size", [0, 1, 4095, 4096, 4097, 50000])
+    @pytest.mark.parametrize("compress", [True, False])
+    def test_round_trip(self, size, compress):
+        """Test empty, chunk-sized and multi-chunk payloads"""
+        payload = os.urandom(size // 2) + b"x" * (size - size // 2)
+
+        raw = _container(payload, compress=compress, chunk_size=4096)
+
+        assert is_container(raw)
+        assert read_container(io.BytesIO(raw), KEY) == payload
+
+    def test_compresses_and_hides_plaintext(self):
+        """Test repetitive JSON shrinks and no plaintext is visible"""
+        payload = b'{"first_name":"John","lots":[' + b'{"gain_loss":12.5},' * 5000 + b'{}]}'
+
+        raw = _container(payload)
+
+        assert len(raw) < len(payload) // 10
+        assert b"John" not in raw
+
+    def test_rejects_writes_after_close(self):
+        """Test a closed writer can't take more data"""
+        writer = ContainerWriter(io.BytesIO(), KEY)
+        writer.close()
+        with pytest.raises(ValueError):
+            writer.write(b"late")
+
+
+class TestAuthentication:
+    """Test altered, cut or extended containers are rejected"""
+
+    @pytest.fixture
+    def raw(self):
+        return _container(os.urandom(20000), compress=False, chunk_size=4096)
+
+    def test_flipped_byte(self, raw):
+        """Test a changed byte in a chunk or the header fails"""
+        for position in (10, len(raw) // 2, len(raw) - 1):
+            tampered = bytearray(raw)
+            tampered[position] ^= 1
+            with pytest.raises(ContainerError):
+                read_container(io.BytesIO(bytes(tampered)), KEY)
+
+    def test_truncated_and_extended(self, raw):
+        """Test dropping whole chunks or appending data fails"""
+        chunk = 4 + 4096 + 16
+        for damaged in (raw[:-1], raw[:28 + 2 * chunk], raw + b"\0" * 8, raw[:20]):
+            with pytest.raises(ContainerError):
+                read_container(io.BytesIO(damaged), KEY)
+
+    def test_wrong_key(self, raw):
+        """Test another key can't read the container"""
+        with pytest.raises(ContainerError):
+            read_container(io.BytesIO(raw), os.urandom(32))
@@ -0,0 +1,174 @@
+"""
+Unit tests for the segmented container file format
+"""
+
+import copy
+import json
+import pickle
+import pytest
+from utils.secure_container import ContainerError
+from utils.segmented_container import LazySegments, is_segmented, read_segmented, write_segmented
+
+KEY = bytes(range(32))
+
+
+def _save(path, segments, shared=None):
+    """Write a segmented file and back the segments with it"""
+    temp = path.with_name(path.name + ".tmp")
+    with open(temp, 'wb') as f:
+        base, refs = write_segmented(f, KEY, shared or {'metadata': {'current_year': 2024}}, segments)
+    temp.replace(path)
+    if not isinstance(segments, LazySegments):
+        segments = LazySegments(segments)
+    segments.attach(path, KEY, base, refs)
+    return segments
+
+
+def _open(path):
+    with open(path, 'rb') as f:
+        return read_segmented(f, KEY, path)
+
+
+def _years():
+    return {year: {'income': {'lots': [{'gain': year + lot} for lot in range(200)]}} for year in range(2020, 2025)}
+
+
+class TestLazyLoading:
+    """Test segments are read only when accessed"""
+
+    def test_round_trip_keeps_key_types(self, tmp_path):
+        """Test shared data, values and int/str keys survive a round trip"""
+        years = _years()
+        years['2023_amended'] = {'metadata': {'return_type': 'amended'}}
+        _save(tmp_path / "r.enc", years, {'metadata': {'version': '2.0'}})
+
+        shared, loaded = _open(tmp_path / "r.enc")
+
+        assert shared == {'metadata': {'version': '2.0'}}
+        assert list(loaded.keys()) == list(years.keys())
+        assert loaded == years
+        assert is_segmented((tmp_path / "r.enc").read_bytes()[:4])
+
+    def test_only_accessed_segments_load(self, tmp_path):
+        """Test keys and membership are free and a lookup loads one segment"""
+        _save(tmp_path / "r.enc", _years())
+        _, loaded = _open(tmp_path / "r.enc")
+
+        assert len(loaded) == 5 and 2022 in loaded and 2030 not in loaded
+        assert loaded.get(2022)['income']['lots'][0] == {'gain': 2022}
+        assert [year for year in loaded if loaded.is_loaded(year)] == [2022]
+        assert loaded.get(2030, 'missing') == 'missing'
+
+    @pytest.mark.parametrize("convert", [
+        dict,
+        copy.deepcopy,
+        lambda segments: json.loads(json.dumps(segments)),
+        lambda segments: pickle.loads(pickle.dumps(segments)),
+        lambda segments: {**segments},
+    ])
+    def test_conversions_load_values(self, tmp_path, convert):
+        """Test copies and serialization see values, not placeholders"""
+        _save(tmp_path / "r.enc", _years())
+        _, loaded = _open(tmp_path / "r.enc")
+
+        result = convert(loaded)
+
+        assert len(result) == 5
+        assert all(isinstance(value, dict) for value in result.values())
+
+    def test_swapped_segment_rejected(self, tmp_path):
+        """Test a segment from an older save of the same file fails on access"""
+        path = tmp_path / "r.enc"
+        years = _save(path, _years())
+        old = path.read_bytes()
+        years[2024]['income']['lots'] = []
+        _save(path, years)
+        new = path.read_bytes()
+        # Same length index; put the old last segment behind the new index
+        _, current = _open(path)
+        last = current._refs[2024]
+        path.write_bytes(new[:current._base + last.offset] + old[len(old) - len(new) + current._base + last.offset:])
+
+        _, loaded = _open(path)
+        assert loaded[2020]['income']['lots'][0] == {'gain': 2020}
+        with pytest.raises(ContainerError):
+            loaded[2024]
+
+
+class TestIncrementalSave:
+    """Test saves copy segments that weren't loaded or changed"""
+
+    def _segment_bytes(self, path, key):
+        _, loaded = _open(path)
+        ref = loaded._refs[key]
+        return path.read_bytes()[loaded._base + ref.offset:][:ref.length]
+
+    def test_unchanged_segments_copied(self, tmp_path):
+        """Test only the edited year is encrypted again"""
+        path = tmp_path / "r.enc"
+        _save(path, _years())
+        before = {year: self._segment_bytes(path, year) for year in range(2020, 2025)}
+
+        _, loaded = _open(path)
+        loaded[2021]
+        loaded[2022]['income']['lots'].append({'gain': 0})
+        _save(path, loaded)
+
+        after = {year: self._segment_bytes(path, year) for year in range(2020, 2025)}
+        assert [year for year in before if before[year] != after[year]] == [2022]
+        assert not loaded.is_loaded(2023)
+        _, reloaded = _open(path)
+        assert len(reloaded[2022]['income']['lots']) == 201
+        assert reloaded == loaded
+
+    def test_save_as_and_delete(self, tmp_path):
+        """Test saving to another file copies unloaded segments and drops deleted ones"""
+        _save(tmp_path / "a.enc", _years())
+        _, loaded = _open(tmp_path / "a.enc")
+        del loaded[2020]
+        loaded[2025] = {'income': {}}
+
+        _save(tmp_path / "b.enc", loaded)
+        (tmp_path / "a.enc").unlink()
+
+        _, reloaded = _open(tmp_path / "b.enc")
+        assert list(reloaded.keys()) == [2021, 2022, 2023, 2024, 2025]
+        assert reloaded[2023]['income']['lots'][-1] == {'gain': 2023 + 199}
+
+    def test_loaded_segments_survive_missing_source(self, tmp_path):
+        """Test loaded segments are encrypted again when their file is gone or replaced"""
+        path = tmp_path / "r.enc"
+        _save(path, _years())
+        _, loaded = _open(path)
+        expected = loaded.copy()
+        path.unlink()
+
+        _save(tmp_path / "b.enc", loaded)
+
+        _save(path, {2020: {'income': {}}})
+        _save(tmp_path / "c.enc", loaded)
+        for name in ("b.enc", "c.enc"):
+            _, reloaded = _open(tmp_path / name)
+            assert reloaded == expected
+
+    def test_unloaded_segment_of_missing_source_fails(self, tmp_path):
+        """Test a segment only in a deleted file can't be saved"""
+        path = tmp_path / "r.enc"
+        _save(path, _years())
+        _, loaded = _open(path)
+        path.unlink()
+
+        with pytest.raises(ContainerError):
+            _save(tmp_path / "copy.enc", loaded)
+
+    def test_changed_source_fails_save(self, tmp_path):
+        """Test copying a segment that no longer matches the index fails"""
+        path = tmp_path / "r.enc"
+        _save(path, _years())
+        _, loaded = _open(path)
+        raw = bytearray(path.read_bytes())
+        raw[-1] ^= 1
+        path.write_bytes(bytes(raw))
+
+        with pytest.raises(ContainerError):
+            _save(tmp_path / "copy.enc", loaded)
@@ -2,12 +2,15 @@
 Unit tests for State Form PDF Generator
 """
 import pytest
-import tempfile
 import os
 from pathlib import Path
 from unittest.mock import Mock, patch
+from pypdf import PdfReader
+from constants.pdf_fields import California540Fields
 from services.state_form_pdf_generator import StateFormPDFGenerator, StateFormData
 from services.state_tax_service import StateCode, StateTaxCalculation
+from tests.fixtures.sample_pdf_forms import build_form_pdf
+from utils.pdf.form_filler import PDFFormFiller
 
 
 class TestStateFormPDFGenerator:
@@ -33,7 +36,7 @@ class TestStateFormPDFGenerator:
         assert StateCode.NY in supported
         assert StateCode.NJ in supported
 
-    def test_generate_state_form_pdf_california(self):
+    def test_generate_state_form_pdf_california(self, tmp_path):
         """Test PDF generation for California"""
 
         # Create test data
@@ -71,29 +74,54 @@ class TestStateFormPDFGenerator:
             dependents=0
         )
 
-        # Mock template path to exist
-        with patch.object(self.generator, '_get_template_path') as mock_template:
-            mock_template_path = Mock()
-            mock_template_path.exists.return_value = True
-            mock_template.return_value = mock_template_path
-
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-                output_path = tmp_file.name
-
-            try:
-                result = self.generator.generate_state_form_pdf(form_data, output_path)
-
-                # Verify the result
-                assert result == output_path
-                # Verify the PDF file was created
-                assert os.path.exists(output_path)
-                assert os.path.getsize(output_path) > 0
-
-            finally:
-                if os.path.exists(output_path):
-                    os.unlink(output_path)
-                if os.path.exists(output_path):
-                    os.unlink(output_path)
+        # Install a fillable Form 540 template
+        template_fields = [
+            California540Fields.SSN, California540Fields.FIRST_NAME, California540Fields.LAST_NAME,
+            California540Fields.CITY, California540Fields.SINGLE, California540Fields.TAX,
+        ]
+        build_form_pdf(tmp_path / "ca_540.pdf", [template_fields], checkboxes=[California540Fields.SINGLE])
+        self.generator.templates_dir = tmp_path
+        self.generator.form_filler = PDFFormFiller(str(tmp_path))
+        output_path = str(tmp_path / "out" / "ca.pdf")
+
+        result = self.generator.generate_state_form_pdf(form_data, output_path)
+
+        # Verify the result
+        assert result == output_path
+        # Verify the PDF file was created
+        assert os.path.exists(output_path)
+        assert os.path.getsize(output_path) > 0
+        values = {name: field.get('/V') for name, field in PdfReader(output_path).get_fields().items()}
+        assert values[California540Fields.FIRST_NAME] == 'John'
+        assert values[California540Fields.TAX] == '8500.00'
+        assert values[California540Fields.SINGLE] == '/1'
+
+    def test_generate_summary_form_reuses_background(self, tmp_path):
+        """Test states without a template stamp values on a background rendered once"""
+        form_data = StateFormData(
+            state_code=StateCode.GA,
+            tax_year=2031,
+            taxpayer_info={'first_name': 'Ann (Jr)', 'last_name': 'Lee', 'city': 'Atlanta', 'state': 'GA'},
+            income_data={'federal_agi': 52000.0, 'wages': 50000.0},
+            tax_calculation=StateTaxCalculation(
+                state_code=StateCode.GA, taxable_income=45000.0, tax_owed=2300.0,
+                effective_rate=0.05, credits=100.0, deductions=5000.0
+            ),
+            filing_status='single',
+            dependents=1
+        )
+
+        with patch.object(StateFormPDFGenerator, '_render_summary_background',
+                          autospec=True, side_effect=StateFormPDFGenerator._render_summary_background) as render:
+            paths = [self.generator.generate_state_form_pdf(form_data, str(tmp_path / f"ga{i}.pdf"))
+                     for i in range(2)]
+            StateFormPDFGenerator().generate_state_form_pdf(form_data, str(tmp_path / "ga2.pdf"))
+
+        assert render.call_count == 1
+        text = PdfReader(paths[1]).pages[0].extract_text()
+        assert 'Georgia State Income Tax Return - 2031' in text
+        for expected in ('Net Tax Due', 'Ann (Jr) Lee', 'Atlanta, GA', '$52,000.00', '5.00%', '$2,200.00'):
+            assert expected in text
 
     def test_generate_state_form_pdf_unsupported_state(self):
         """Test PDF generation for unsupported state"""
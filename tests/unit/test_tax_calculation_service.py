@@ -8,6 +8,7 @@ orchestration service including all calculation workflows.
 import pytest
 from models.tax_data import TaxData
 from services.tax_calculation_service import TaxCalculationService, TaxResult
+from utils.money import to_cents
 
 
 class TestTaxResultDataclass:
@@ -315,8 +316,8 @@ class TestSelfEmploymentIncome:
         assert result.business_income == 50000
         assert result.total_income == 50000
         assert result.self_employment_tax > 0
-        # Total tax includes both income tax and SE tax
-        assert result.total_tax == result.income_tax + result.self_employment_tax
+        # Total tax includes both income tax and SE tax, added in cents
+        assert to_cents(result.total_tax) == to_cents(result.income_tax) + to_cents(result.self_employment_tax)
     
     def test_w2_plus_business_income(self):
         """Test combined W-2 and self-employment income"""
@@ -122,6 +122,88 @@ class TestIncomeTaxCalculation:
         assert result1 == result2
 
 
+def _sequential_bracket_tax(brackets, income):
+    """Reference bracket walk used before tables were precompiled"""
+    tax = 0 * income
+    prev_threshold = 0 * income
+    for threshold, rate in brackets:
+        if income <= threshold:
+            tax += (income - prev_threshold) * rate
+            break
+        tax += (threshold - prev_threshold) * rate
+        prev_threshold = threshold
+    return tax
+
+
+class TestBracketTable:
+    """Test precompiled bracket tables"""
+
+    @pytest.mark.parametrize("tax_year", [2023, 2025, 2026])
+    @pytest.mark.parametrize("filing_status", ['Single', 'MFJ', 'MFS', 'HOH', 'QW'])
+    def test_matches_sequential_walk(self, tax_year, filing_status):
+        """Test table lookup is bit-identical to walking the brackets"""
+        import random
+        from config.tax_year_config import get_tax_year_config
+
+        config = get_tax_year_config(tax_year)
+        brackets = config.tax_brackets[filing_status]
+        table = config.get_bracket_table(filing_status)
+
+        rng = random.Random(tax_year)
+        incomes = [0.0, -50.0, 1e9] + [threshold for threshold, _ in brackets[:-1]]
+        incomes += [threshold + 0.01 for threshold, _ in brackets[:-1]]
+        incomes += [round(rng.uniform(0, 800000), 2) for _ in range(500)]
+        for income in incomes:
+            assert table.tax(income) == _sequential_bracket_tax(brackets, income), income
+
+    @pytest.mark.parametrize("filing_status", ['Single', 'MFJ', 'HOH'])
+    def test_cents_table_matches_exact_walk(self, filing_status):
+        """Test the cents table rounds the exact bracket tax once, half up"""
+        import random
+        from decimal import Decimal, ROUND_HALF_UP
+        from config.tax_year_config import get_tax_year_config
+
+        config = get_tax_year_config(2025)
+        brackets = [(Decimal(str(t)), Decimal(str(r))) for t, r in config.tax_brackets[filing_status]]
+        table = config.get_cents_bracket_table(filing_status)
+
+        rng = random.Random(7)
+        incomes = [0, 1, 105] + [int(t * 100) + d for t, _ in brackets[:-1] for d in (-1, 0, 1)]
+        incomes += [rng.randint(0, 10 ** 9) for _ in range(500)]
+        for cents in incomes:
+            tax = _sequential_bracket_tax(brackets, Decimal(cents) / 100)
+            expected = int((tax * 100).to_integral_value(rounding=ROUND_HALF_UP))
+            assert table.tax(cents) == expected, cents
+
+    def test_marginal_rate(self):
+        """Test marginal rate at and just above a threshold"""
+        from config.tax_year_config import get_tax_year_config
+
+        table = get_tax_year_config(2025).get_bracket_table('Single')
+        assert table.marginal_rate(11925) == 0.10
+        assert table.marginal_rate(11925.01) == 0.12
+        assert table.marginal_rate(1e9) == 0.37
+
+    def test_unknown_status_uses_single(self):
+        """Test unknown filing statuses fall back to Single"""
+        from config.tax_year_config import get_tax_year_config
+
+        config = get_tax_year_config(2025)
+        assert config.get_bracket_table('Unknown') is config.get_bracket_table('Single')
+
+    def test_decimal_schedule(self):
+        """Test Decimal schedules stay exact"""
+        from decimal import Decimal
+        from config.tax_year_config import BracketTable
+
+        table = BracketTable.from_brackets(
+            [(Decimal('100'), Decimal('0.10')), (Decimal('Infinity'), Decimal('0.20'))],
+            zero=Decimal('0')
+        )
+        assert table.tax(Decimal('150.05')) == Decimal('20.010')
+        assert table.cumulative_tax[1] == Decimal('10.00')
+
+
 class TestSelfEmploymentTax:
     """Test self-employment tax calculations"""
     
@@ -0,0 +1,109 @@
+"""
+Tests for precomputed tax curves
+"""
+
+import pytest
+
+from services.exceptions import InvalidInputException
+from services.tax_calculation_service import TaxCalculationService
+from services.tax_curve import TaxCurve
+
+
+@pytest.fixture
+def service():
+    return TaxCalculationService(tax_year=2025)
+
+
+def _return(wages=62000.0, net_profit=30000.0, mortgage_interest=14000.0, method='itemized'):
+    """Multi-year return dictionary with the amounts the curves vary"""
+    return {
+        'metadata': {'current_year': 2025},
+        'years': {2025: {
+            'filing_status': {'status': 'Single'},
+            'income': {
+                'w2_forms': [{'wages': wages, 'federal_withholding': 7000.0}],
+                'interest_income': [{'amount': 1500.0}],
+                'self_employment': [{'net_profit': net_profit}],
+            },
+            'deductions': {'method': method, 'mortgage_interest': mortgage_interest},
+        }},
+    }
+
+
+@pytest.fixture
+def tax_data():
+    return _return()
+
+
+# Returns with each curve variable moved by a given delta
+RETURN_FOR_VARIABLE = {
+    'wages': lambda delta: _return(wages=62000.0 + delta),
+    'business_income': lambda delta: _return(net_profit=30000.0 + delta),
+    'itemized_deduction': lambda delta: _return(mortgage_interest=14000.0 + delta),
+}
+
+DELTAS = [-93500.0, -60000.0, -29999.99, -12345.67, 0.0, 0.01, 1000.0, 25000.0,
+          87654.32, 150000.0, 400000.0, 2500000.0]
+
+
+class TestTaxCurve:
+    """Test the curve against full recalculation"""
+
+    @pytest.mark.parametrize("variable", sorted(RETURN_FOR_VARIABLE))
+    def test_matches_complete_return(self, service, tax_data, variable):
+        """Test tax_at matches calculate_complete_return to the cent"""
+        curve = service.build_tax_curve(tax_data, variable)
+        assert curve.base_tax == service.calculate_complete_return(tax_data).total_tax
+
+        for delta in DELTAS:
+            expected = service.calculate_complete_return(RETURN_FOR_VARIABLE[variable](delta)).total_tax
+            assert curve.tax_at(delta) == pytest.approx(expected, abs=0.011), (variable, delta)
+
+    def test_breakpoints_cover_sources(self, service, tax_data):
+        """Test breakpoints name the deduction, brackets and SE thresholds"""
+        curve = service.build_tax_curve(tax_data, 'business_income')
+        labels = ', '.join(label for _, label in curve.breakpoints)
+        for expected in ('deduction', '22% bracket ends', 'SE wage base', 'Additional Medicare threshold'):
+            assert expected in labels
+        deltas = [delta for delta, _ in curve.breakpoints]
+        assert deltas == sorted(deltas)
+
+    def test_marginal_rate_matches_brackets(self, service, tax_data):
+        """Test the ordinary income marginal rate equals the bracket rate"""
+        curve = service.build_tax_curve(tax_data, 'ordinary_income')
+        result = service.calculate_complete_return(tax_data)
+        for delta in (-500.0, 0.0, 20000.0, 300000.0):
+            taxable = result.taxable_income + delta
+            expected = service.get_marginal_tax_rate(taxable, 'Single') / 100
+            assert curve.marginal_rate_at(delta) == pytest.approx(expected)
+
+    def test_standard_deduction_ignores_itemized_changes(self, service):
+        """Test itemized deductions are flat when the return takes the standard deduction"""
+        curve = service.build_tax_curve(_return(method='standard'), 'itemized_deduction')
+        assert curve.tax_change_at(50000.0) == 0.0
+        assert curve.marginal_rate_at(50000.0) == 0.0
+
+    def test_surtaxes(self):
+        """Test NIIT and Additional Medicare Tax breakpoints and slopes"""
+        curve = TaxCurve.from_amounts(
+            'investment_income', 'Single', 2025,
+            adjusted_gross_income=190000.0, deduction=15750.0,
+            wages=180000.0, investment_income=10000.0, include_surtaxes=True
+        )
+        # Below the NIIT threshold the marginal rate is the bracket rate only
+        assert curve.marginal_rate_at(5000.0) == pytest.approx(0.24)
+        # Above it each extra dollar of investment income adds 3.8%
+        assert curve.marginal_rate_at(20000.0) == pytest.approx(0.24 + 0.038)
+        assert (10000.0, 'NIIT threshold') in curve.breakpoints
+
+        wage_curve = TaxCurve.from_amounts(
+            'wages', 'Single', 2025, adjusted_gross_income=190000.0, deduction=15750.0,
+            wages=190000.0, include_surtaxes=True
+        )
+        assert wage_curve.marginal_rate_at(5000.0) == pytest.approx(0.24)
+        assert wage_curve.marginal_rate_at(15000.0) == pytest.approx(0.24 + 0.009)
+
+    def test_unknown_variable(self, service, tax_data):
+        """Test unknown curve variables are rejected"""
+        with pytest.raises(InvalidInputException):
+            service.build_tax_curve(tax_data, 'lottery')
@@ -1,8 +1,15 @@
 """
 Unit tests for TaxData model
 """
+import hashlib
+import hmac
+import json
+import os
 import pytest
+from config.app_config import AppConfig
 from models.tax_data import TaxData
+from utils.secure_container import write_container
+from utils.segmented_container import is_segmented
 
 
 class TestTaxDataInitialization:
@@ -241,6 +248,238 @@ class TestTaxDataSerialization:
         assert loaded_data.get('personal_info.first_name') == 'John'
 
 
+@pytest.fixture
+def file_config(tmp_path):
+    """Config saving returns and keys under a temporary directory"""
+    config = AppConfig.from_env()
+    config.safe_dir = tmp_path
+    config.key_file = tmp_path / "key"
+    return config
+
+
+class TestTaxDataFileFormat:
+    """Test the encrypted save container and older formats"""
+
+    def test_save_and_load_container(self, file_config):
+        """Test a multi-year return round-trips through a segmented container"""
+        tax_data = TaxData(file_config)
+        tax_data.set('personal_info.first_name', 'John')
+        tax_data._initialize_year_data(2024)
+        tax_data.data['years'][2024]['income']['capital_gains'] = [
+            {'description': f'lot {i}', 'gain_loss': i * 1.5} for i in range(2000)
+        ]
+
+        path = tax_data.save_to_file('return.enc')
+        loaded = TaxData(file_config)
+        loaded.load_from_file(path)
+
+        with open(path, 'rb') as f:
+            assert is_segmented(f.read(4))
+        expected = json.loads(json.dumps({**tax_data.data, 'years': {}}))
+        expected['metadata']['last_modified'] = loaded.data['metadata']['last_modified']
+        assert {**loaded.data, 'years': {}} == expected
+        assert loaded.data['years'] == tax_data.data['years']
+        assert list(file_config.safe_dir.glob('.*.tmp')) == []
+
+    def test_years_load_on_access(self, file_config):
+        """Test opening a return decrypts only the current year"""
+        tax_data = TaxData(file_config)
+        for year in (2022, 2023, 2024):
+            tax_data.set('personal_info.first_name', f'John {year}', tax_year=year)
+        path = tax_data.save_to_file('return.enc')
+
+        loaded = TaxData(file_config)
+        loaded.load_from_file(path)
+        years = loaded.data['years']
+
+        assert loaded.get_available_years() == [2022, 2023, 2024, 2026]
+        assert [year for year in years if years.is_loaded(year)] == [2026]
+        assert loaded.get('personal_info.first_name', tax_year=2023) == 'John 2023'
+        assert [year for year in years if years.is_loaded(year)] == [2026, 2023]
+
+    def test_resave_copies_unchanged_years(self, file_config):
+        """Test saving again re-encrypts only the edited year"""
+        tax_data = TaxData(file_config)
+        for year in (2023, 2024):
+            tax_data.set('personal_info.first_name', 'John', tax_year=year)
+        path = tax_data.save_to_file('return.enc')
+        loaded = TaxData(file_config)
+        loaded.load_from_file(path)
+        before = dict(loaded.data['years']._refs)
+
+        loaded.set('personal_info.first_name', 'Jane', tax_year=2024)
+        loaded.save_to_file('return.enc')
+
+        after = loaded.data['years']._refs
+        assert [year for year in after if after[year].sha256 != before[year].sha256] == [2024]
+        reloaded = TaxData(file_config)
+        reloaded.load_from_file(path)
+        assert reloaded.get('personal_info.first_name', tax_year=2024) == 'Jane'
+        assert reloaded.get('personal_info.first_name', tax_year=2023) == 'John'
+
+    def test_save_after_file_deleted(self, file_config):
+        """Test a return with every year loaded saves after its file was deleted"""
+        tax_data = TaxData(file_config)
+        tax_data.set('personal_info.first_name', 'John', tax_year=2022)
+        path = tax_data.save_to_file('return.enc')
+        os.remove(path)
+
+        tax_data.set('personal_info.first_name', 'Jane')
+        tax_data.save_to_file('return.enc')
+
+        reloaded = TaxData(file_config)
+        reloaded.load_from_file(path)
+        assert reloaded.get('personal_info.first_name', tax_year=2022) == 'John'
+        assert reloaded.get('personal_info.first_name') == 'Jane'
+
+    def test_two_sessions_save_same_file(self, file_config):
+        """Test a session saves over a file another session rewrote since it was loaded"""
+        tax_data = TaxData(file_config)
+        tax_data.set('personal_info.first_name', 'John', tax_year=2022)
+        path = tax_data.save_to_file('return.enc')
+        first, second = TaxData(file_config), TaxData(file_config)
+        for session in (first, second):
+            session.load_from_file(path)
+            session.get('personal_info.first_name', tax_year=2022)
+
+        first.set('personal_info.first_name', 'First', tax_year=2022)
+        first.save_to_file('return.enc')
+        second.set('personal_info.first_name', 'Second')
+        second.save_to_file('return.enc')
+
+        reloaded = TaxData(file_config)
+        reloaded.load_from_file(path)
+        assert reloaded.get('personal_info.first_name', tax_year=2022) == 'John'
+        assert reloaded.get('personal_info.first_name') == 'Second'
+
+    def test_loads_single_container(self, file_config):
+        """Test files saved as one container by the previous version still load"""
+        tax_data = TaxData(file_config)
+        tax_data.set('personal_info.first_name', 'Single')
+        path = file_config.safe_dir / 'single.enc'
+        with open(path, 'wb') as f:
+            write_container(f, tax_data.encryption.get_container_key(), [json.dumps(tax_data.data).encode()])
+
+        loaded = TaxData(file_config)
+        loaded.load_from_file(str(path))
+
+        assert loaded.data['years'][str(loaded.get_current_year())]['personal_info']['first_name'] == 'Single'
+
+    def test_tampered_container_rejected(self, file_config):
+        """Test a modified current-year segment fails to load"""
+        path = TaxData(file_config).save_to_file('return.enc')
+        with open(path, 'r+b') as f:
+            f.seek(-5, 2)
+            byte = f.read(1)
+            f.seek(-5, 2)
+            f.write(bytes([byte[0] ^ 1]))
+
+        with pytest.raises(ValueError):
+            TaxData(file_config).load_from_file(path)
+
+    def test_loads_fernet_package(self, file_config):
+        """Test files in the previous Fernet + HMAC format still load"""
+        tax_data = TaxData(file_config)
+        tax_data.set('personal_info.first_name', 'Legacy')
+        tax_data.encryption.encrypt('create key file')
+        json_data = json.dumps(tax_data.data, indent=2, sort_keys=True)
+        mac = hmac.new(tax_data._get_integrity_key(), json_data.encode(), hashlib.sha256).hexdigest()
+        path = file_config.safe_dir / 'legacy.enc'
+        path.write_bytes(tax_data.encryption.encrypt(json.dumps({'data': tax_data.data, 'mac': mac, 'version': '2.0'})))
+
+        loaded = TaxData(file_config)
+        loaded.load_from_file(str(path))
+
+        assert loaded.data['years'][str(loaded.get_current_year())]['personal_info']['first_name'] == 'Legacy'
+
+
+class TestTaxDataAutosave:
+    """Test journaled autosave and recovery"""
+
+    def _open(self, config, path):
+        tax_data = TaxData(config)
+        tax_data.load_from_file(path)
+        return tax_data
+
+    def test_autosave_appends_to_journal(self, file_config):
+        """Test autosaves after the first only append changes"""
+        tax_data = TaxData(file_config)
+        path = tax_data.autosave('return.enc')
+        base = (file_config.safe_dir / 'return.enc').read_bytes()
+
+        tax_data.set('personal_info.first_name', 'John')
+        tax_data.add_to_list('income.w2_forms', {'employer': 'Acme', 'wages': 50000})
+        tax_data.add_to_list('income.w2_forms', {'employer': 'Beta', 'wages': 1000})
+        tax_data.update_in_list('income.w2_forms', 1, {'employer': 'Beta', 'wages': 2000})
+        tax_data.remove_from_list('income.w2_forms', 0)
+        tax_data.set_current_year(2025)
+        tax_data.set('personal_info.last_name', 'Smith')
+        tax_data.autosave()
+
+        assert (file_config.safe_dir / 'return.enc').read_bytes() == base
+        recovered = self._open(file_config, path)
+        assert recovered.get_current_year() == 2025
+        assert recovered.get('personal_info.last_name') == 'Smith'
+        assert recovered.get('personal_info.first_name', tax_year=2026) == 'John'
+        assert recovered.get('income.w2_forms', tax_year=2026) == [{'employer': 'Beta', 'wages': 2000}]
+
+    def test_recovered_changes_keep_journaling(self, file_config):
+        """Test a session reopened from a journal appends to it"""
+        tax_data = TaxData(file_config)
+        path = tax_data.autosave('return.enc')
+        tax_data.set('personal_info.first_name', 'John')
+        tax_data.autosave()
+
+        reopened = self._open(file_config, path)
+        reopened.set('personal_info.last_name', 'Smith')
+        reopened.autosave()
+
+        recovered = self._open(file_config, path)
+        assert recovered.get('personal_info.first_name') == 'John'
+        assert recovered.get('personal_info.last_name') == 'Smith'
+
+    def test_unsaved_changes_are_lost(self, file_config):
+        """Test changes made after the last autosave aren't recovered"""
+        tax_data = TaxData(file_config)
+        path = tax_data.autosave('return.enc')
+        tax_data.set('personal_info.first_name', 'John')
+
+        assert self._open(file_config, path).get('personal_info.first_name') == ''
+
+    def test_compacts_past_threshold(self, file_config):
+        """Test a large journal is folded into a new base file"""
+        file_config.journal_compact_size = 1
+        tax_data = TaxData(file_config)
+        path = tax_data.autosave('return.enc')
+        journal = file_config.safe_dir / 'return.enc.journal'
+        tax_data.set('personal_info.first_name', 'John')
+        tax_data.autosave()
+        assert journal.exists()
+
+        tax_data.set('personal_info.last_name', 'Smith')
+        tax_data.autosave()
+
+        assert not journal.exists()
+        recovered = self._open(file_config, path)
+        assert recovered.get('personal_info.first_name') == 'John'
+        assert recovered.get('personal_info.last_name') == 'Smith'
+
+    def test_full_save_replaces_journal(self, file_config):
+        """Test a journal left over from before a full save isn't replayed"""
+        tax_data = TaxData(file_config)
+        path = tax_data.autosave('return.enc')
+        tax_data.add_to_list('dependents', {'first_name': 'Ann'})
+        tax_data.autosave()
+        journal = file_config.safe_dir / 'return.enc.journal'
+        stale = journal.read_bytes()
+
+        tax_data.save_to_file('return.enc')
+        journal.write_bytes(stale)
+
+        assert self._open(file_config, path).get('dependents') == [{'first_name': 'Ann'}]
+        assert not journal.exists()
+
+
 class TestTaxDataCalculateTotalIncome:
     """Test _calculate_total_income helper method"""
     
@@ -696,3 +935,21 @@ class TestTaxDataCalculateTotals:
         if totals['total_tax'] > totals['total_payments']:
             assert totals['amount_owed'] > 0
             assert totals['refund'] == 0
+    
+    def test_calculate_totals_adds_in_cents(self):
+        """Test totals are exact to the cent, matching the scalar service"""
+        from services.tax_calculation_service import TaxCalculationService
+        
+        tax_data = TaxData()
+        tax_data.set('filing_status.status', 'Single')
+        for _ in range(10):
+            tax_data.add_w2_form({'wages': 5000.1, 'federal_withholding': 0.1})
+        tax_data.set('income.business_income', [{'net_profit': 0.2}])
+        
+        totals = tax_data.calculate_totals()
+        
+        # Float addition would give 50001.19999999999 and 0.9999999999999999
+        assert totals['total_income'] == 50001.2
+        assert totals['total_payments'] == 1.0
+        result = TaxCalculationService(tax_year=2025).calculate_complete_return(tax_data)
+        assert totals['total_tax'] == result.total_tax
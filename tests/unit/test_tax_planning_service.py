@@ -11,8 +11,10 @@ from services.tax_planning_service import (
     TaxProjection,
     EstimatedTaxPayment,
     WithholdingRecommendation,
-    RetirementOptimization
+    RetirementOptimization,
+    ScenarioSweepTable
 )
+from services.exceptions import InvalidInputException
 from models.tax_data import TaxData
 from config.app_config import AppConfig
 
@@ -285,4 +287,78 @@ class TestConvenienceFunctions:
 
         # Near past should still be high confidence (using available config)
         projection_2023 = planning_service.project_future_tax(tax_data, 2023)
-        assert projection_2023.confidence_level == 'high'
\ No newline at end of file
+        assert projection_2023.confidence_level == 'high'
+
+
+class TestScenarioSweep:
+    """Test grid sweeps over scenarios"""
+
+    @pytest.fixture
+    def tax_data(self):
+        """Create sample tax data for testing"""
+        data = TaxData()
+        data.set('filing_status.status', 'Single')
+        data.set('income.w2_forms', [{'wages': 75000.00, 'federal_withholding': 8500.00}])
+        data.set('deductions.method', 'standard')
+        return data
+
+    @pytest.fixture
+    def grid(self):
+        return {
+            'income.w2_forms': [[{'wages': -23000}], [{'wages': 0}], [{'wages': 10000}]],
+            'filing_status.status': ['Single', 'Head of Household'],
+        }
+
+    def test_sweep_matches_analyze_scenario(self, tax_data, grid):
+        """Test each grid point matches a single analyze_scenario call"""
+        service = TaxPlanningService()
+        table = service.sweep_scenarios(tax_data, grid, max_workers=1)
+
+        assert isinstance(table, ScenarioSweepTable)
+        assert len(table) == 6
+        assert [row.index for row in table] == list(range(6))
+        for row in table:
+            changes = {
+                'income': {'w2_forms': row.parameters['income.w2_forms']},
+                'filing_status': {'status': row.parameters['filing_status.status']},
+            }
+            expected = service.analyze_scenario(tax_data, changes)
+            assert row.result.new_tax == expected.new_tax
+            assert row.result.tax_difference == expected.tax_difference
+
+    def test_process_pool_matches_inline(self, tax_data, grid):
+        """Test the process pool gives the same table as inline evaluation"""
+        service = TaxPlanningService()
+        progress = []
+        pooled = service.sweep_scenarios(tax_data, grid, max_workers=2,
+                                         progress_callback=lambda done, total: progress.append((done, total)))
+        inline = service.sweep_scenarios(tax_data, grid, max_workers=1)
+
+        assert pooled.to_records() == inline.to_records()
+        assert progress[-1] == (6, 6)
+        assert all(total == 6 for _, total in progress)
+
+    def test_sort_by_tax_difference(self, tax_data, grid):
+        """Test the result table sorts by tax difference"""
+        table = TaxPlanningService().sweep_scenarios(tax_data, grid, max_workers=1)
+        differences = [row.tax_difference for row in table.sort_by()]
+        assert differences == sorted(differences)
+        assert table.sort_by('new_tax', descending=True)[0].result.new_tax == \
+            max(row.result.new_tax for row in table)
+
+    def test_projection_axes(self, tax_data):
+        """Test growth axes feed project_future_tax"""
+        grid = {'filing_status.status': ['Single'], 'income_growth_rate': [0.0, 0.10]}
+        table = TaxPlanningService().sweep_scenarios(tax_data, grid, projection_year=2026,
+                                                     max_workers=1)
+        assert table[1].projection.projected_income > table[0].projection.projected_income
+        assert 'projected_tax' in table[0].to_dict()
+
+    def test_invalid_grid(self, tax_data):
+        """Test empty grids and axes are rejected"""
+        service = TaxPlanningService()
+        with pytest.raises(InvalidInputException):
+            service.sweep_scenarios(tax_data, {})
+        with pytest.raises(InvalidInputException):
+            service.sweep_scenarios(tax_data, {'filing_status.status': []})
+
@@ -220,4 +220,112 @@ class TestWashSaleDetection:
         # Test invalid date
         assert tax_data._parse_date('invalid') is None
         assert tax_data._parse_date('') is None
-        assert tax_data._parse_date(None) is None
\ No newline at end of file
+        assert tax_data._parse_date(None) is None
+
+class TestIndexedWashSaleDetector:
+    """Test cases for the indexed, streaming wash sale detector"""
+
+    @pytest.fixture
+    def tax_data(self):
+        """Create a TaxData instance for testing"""
+        config = AppConfig.from_env()
+        return TaxData(config)
+
+    @staticmethod
+    def _pairwise_wash_sales(tax_data, lots):
+        """Reference pairwise scan used before the detector was indexed"""
+        from datetime import timedelta
+
+        results = []
+        for i, sale in enumerate(lots):
+            if sale.get('gain_loss', 0) >= 0:
+                continue
+            sale_date = tax_data._parse_date(sale.get('date_sold', ''))
+            if not sale_date:
+                continue
+            for j, purchase in enumerate(lots):
+                if i == j:
+                    continue
+                purchase_date = tax_data._parse_date(purchase.get('date_acquired', ''))
+                if not purchase_date:
+                    continue
+                if sale_date - timedelta(days=30) <= purchase_date <= sale_date + timedelta(days=30):
+                    if tax_data._are_similar_securities(sale.get('description', '').lower(),
+                                                        purchase.get('description', '').lower()):
+                        results.append((i, j, abs((purchase_date - sale_date).days)))
+        return results
+
+    @staticmethod
+    def _random_lots(count, seed=7, extra_issuers=0):
+        import random
+        rng = random.Random(seed)
+        names = ['Apple Inc', 'Apple Inc.', 'Microsoft Corp', 'Microsoft Corporation',
+                 'Tesla Inc Class A', 'Tesla Inc Class B', 'Vanguard Total Bond']
+        names += [f"Issuer {n} Holdings Inc" for n in range(extra_issuers)]
+        lots = []
+        for _ in range(count):
+            month, day = rng.randint(1, 12), rng.randint(1, 28)
+            sold = f"{month:02d}/{day:02d}/2025" if rng.random() < 0.7 else ''
+            acq_month, acq_day = rng.randint(1, 12), rng.randint(1, 28)
+            lots.append({
+                'description': f"{rng.choice(names)} Common Stock",
+                'date_acquired': f"2025-{acq_month:02d}-{acq_day:02d}",
+                'date_sold': sold,
+                'gain_loss': rng.choice([-1, 1]) * round(rng.uniform(1, 500), 2),
+            })
+        return lots
+
+    def test_iter_wash_sales_is_generator(self, tax_data):
+        """Test results can be consumed lazily"""
+        import types
+
+        tax_data.set('income.capital_gains', self._random_lots(50))
+        stream = tax_data.iter_wash_sales()
+        assert isinstance(stream, types.GeneratorType)
+        assert list(stream) == tax_data.detect_wash_sales()
+
+    def test_matches_pairwise_scan(self, tax_data):
+        """Test indexed results equal the pairwise scan, in the same order"""
+        lots = self._random_lots(300)
+        tax_data.set('income.capital_gains', lots)
+
+        expected = self._pairwise_wash_sales(tax_data, lots)
+        actual = [(w['sale_index'], w['purchase_index'], w['days_between'])
+                  for w in tax_data.detect_wash_sales()]
+        assert actual == expected
+
+    def test_security_key_normalization(self):
+        """Test formatting and corporate suffix variations share a key"""
+        from utils.wash_sales import security_key
+
+        assert security_key('Microsoft Corp Common Stock') == security_key('MICROSOFT CORPORATION common stock')
+        assert security_key('Apple Inc. Common Stock Class A') == security_key('Apple Inc Common Stock Class B')
+        assert security_key('Apple Inc Common Stock') != security_key('Apple Inc Preferred Stock')
+        assert security_key('') is None
+
+    def test_substring_issuers_are_not_similar(self, tax_data):
+        """Test issuers that only match by substring are different securities"""
+        from utils.wash_sales import security_key
+
+        assert not tax_data._are_similar_securities('Apple Common Stock', 'Apple Hospitality REIT Common Stock')
+        assert security_key('Apple Common Stock') != security_key('Apple Hospitality REIT Common Stock')
+        tax_data.set('income.capital_gains', [
+            {'description': 'Apple Common Stock', 'date_acquired': '01/01/2025',
+             'date_sold': '03/01/2025', 'gain_loss': -500.0},
+            {'description': 'Apple Hospitality REIT Common Stock', 'date_acquired': '03/10/2025',
+             'date_sold': '', 'gain_loss': 0.0},
+        ])
+        assert tax_data.detect_wash_sales() == []
+
+    def test_large_import(self, tax_data):
+        """Test every pair found in a 20k-lot import is a wash sale"""
+        lots = self._random_lots(20000, extra_issuers=1000)
+        tax_data.set('income.capital_gains', lots)
+
+        wash_sales = tax_data.detect_wash_sales()
+
+        assert wash_sales
+        for wash_sale in wash_sales:
+            sale, purchase = lots[wash_sale['sale_index']], lots[wash_sale['purchase_index']]
+            assert sale['gain_loss'] < 0 and wash_sale['days_between'] <= 30
+            assert tax_data._are_similar_securities(sale['description'], purchase['description'])
@@ -3,21 +3,46 @@ Async PDF Generation
 
 This module provides asynchronous PDF generation capabilities for better
 performance when generating multiple forms or large tax returns.
+
+PDFJobQueue runs generation jobs on a fixed number of background threads.
+Interactive previews are taken ahead of queued batch exports, jobs can be
+cancelled between pages, and per-page progress is published on the EventBus
+(from the worker thread, so GUI handlers must hand off to their own thread).
+All jobs share one form filler, so templates are parsed once.
 """
 
 import asyncio
+import itertools
 import logging
-from typing import Dict, Any, List, Callable, Optional
+import queue
+import threading
+from collections import deque
+from typing import Dict, Any, Iterable, List, Callable, Optional, Tuple
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from enum import Enum, IntEnum
 
 from utils.pdf.form_filler import PDFFormFiller
+from utils.pdf.field_mapper import DotDict
 from utils.event_bus import EventBus, Event, EventType
 
 logger = logging.getLogger(__name__)
 
+# Short task form names and the IRS form they are filled on
+SCHEDULE_FORMS = {
+    "Schedule A": "Form 1040 (Schedule A)",
+    "Schedule C": "Form 1040 (Schedule C)",
+    "Schedule D": "Form 1040 (Schedule D)",
+    "Schedule E": "Form 1040 (Schedule E)",
+    "Schedule SE": "Form 1040 (Schedule SE)",
+}
+
+
+class JobCancelledError(Exception):
+    """Raised inside a running job when it has been cancelled"""
+
 
 @dataclass
 class PDFGenerationTask:
@@ -48,22 +73,37 @@ class AsyncPDFGenerator:
     Async PDF generator that can generate multiple PDFs concurrently
     """
     
-    def __init__(self, max_workers: int = 4):
+    def __init__(self, max_workers: int = 4, forms_directory: Optional[str] = None):
         """
         Initialize the async PDF generator
         
         Args:
             max_workers: Maximum number of concurrent PDF generation tasks
+            forms_directory: Path to IRS form PDFs (default: the filler's default)
         """
         self.max_workers = max_workers
+        self.forms_directory = forms_directory
         self.event_bus = EventBus.get_instance()
         self._executor = None
+        self._filler = None
+        self._mapping_generator = None
+        self._lock = threading.Lock()
     
     def _get_executor(self) -> ThreadPoolExecutor:
         """Get or create thread pool executor"""
         if self._executor is None:
             self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
         return self._executor
+
+    def _get_filler(self) -> PDFFormFiller:
+        """Get the form filler shared by all tasks"""
+        with self._lock:
+            if self._filler is None:
+                if self.forms_directory is None:
+                    self._filler = PDFFormFiller()
+                else:
+                    self._filler = PDFFormFiller(self.forms_directory)
+            return self._filler
     
     async def generate_pdf_async(
         self,
@@ -75,7 +115,8 @@ class AsyncPDFGenerator:
         
         Args:
             task: PDF generation task
-            progress_callback: Optional callback function(task_id, progress_percent)
+            progress_callback: Optional callback function(task_id, progress_percent),
+                called on the event loop after each page
         
         Returns:
             PDFGenerationResult with success status and output path or error
@@ -89,23 +130,26 @@ class AsyncPDFGenerator:
             data={'task_id': task.task_id, 'form_name': task.form_name}
         ))
         
-        if progress_callback:
-            progress_callback(task.task_id, 0.0)
-        
         try:
             # Run PDF generation in thread pool
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             executor = self._get_executor()
-            
-            # Update progress
+
+            page_progress = None
             if progress_callback:
-                progress_callback(task.task_id, 25.0)
+                progress_callback(task.task_id, 0.0)
+
+                def page_progress(pages_done: int, total_pages: int) -> None:
+                    loop.call_soon_threadsafe(
+                        progress_callback, task.task_id, 100.0 * pages_done / total_pages
+                    )
             
             # Execute PDF generation in thread pool
             await loop.run_in_executor(
                 executor,
                 self._generate_pdf_sync,
-                task
+                task,
+                page_progress
             )
             
             if progress_callback:
@@ -157,84 +201,78 @@ class AsyncPDFGenerator:
                 duration=duration
             )
     
-    def _generate_pdf_sync(self, task: PDFGenerationTask):
+    def _generate_pdf_sync(
+        self,
+        task: PDFGenerationTask,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> None:
         """
         Synchronous PDF generation (called in thread pool)
+
+        Args:
+            task: PDF generation task
+            progress: Called with (pages done, total pages) after each page
+            cancel_event: Checked before each page; when set the task stops
+                with JobCancelledError and no file is written
+
+        Raises:
+            ValueError: If the form is not supported
+            JobCancelledError: If cancel_event was set
         """
-        filler = PDFFormFiller()
+        form_name, copies, copy_count = self._map_task(task)
+        filler = self._get_filler()
+
+        on_page = None
+        if progress is not None or cancel_event is not None:
+            if cancel_event is not None and cancel_event.is_set():
+                raise JobCancelledError(task.task_id)
+            total_pages = max(copy_count, 1) * filler.get_template(form_name).page_count
+
+            def on_page(page_index: int) -> None:
+                if progress is not None:
+                    progress(page_index + 1, total_pages)
+                if cancel_event is not None and cancel_event.is_set():
+                    raise JobCancelledError(task.task_id)
+
+        filler.fill_form_copies(form_name, copies, str(task.output_path), on_page=on_page)
         
+        logger.info(f"Generated PDF: {task.output_path}")
+
+    def _map_task(self, task: PDFGenerationTask) -> Tuple[str, Iterable[Dict[str, str]], int]:
+        """
+        Map a task's data to the form to fill and the values of each copy
+
+        Returns:
+            (template form name, field values per copy, number of copies);
+            Form 8949 copies are built lazily
+
+        Raises:
+            ValueError: If the form is not supported
+        """
+        from utils.pdf.form_mappers import Form1040Mapper, Form8949Mapper
+
+        tax_data = task.tax_data if isinstance(task.tax_data, DotDict) else DotDict(task.tax_data)
+
         if task.form_name == "Form 1040":
-            filler.export_form_1040(task.tax_data, task.output_path)
-        elif task.form_name == "Schedule C":
-            self._generate_schedule_c(task)
+            return "Form 1040", [Form1040Mapper.get_all_fields(tax_data)], 1
         elif task.form_name == "Form 8949":
-            self._generate_form_8949(task)
-        elif task.form_name == "Schedule A":
-            self._generate_schedule_a(task)
-        elif task.form_name == "Schedule E":
-            self._generate_schedule_e(task)
+            return "Form 8949", Form8949Mapper.iter_pages(tax_data), Form8949Mapper.page_count(tax_data)
+        elif task.form_name in SCHEDULE_FORMS:
+            form_name = SCHEDULE_FORMS[task.form_name]
+            return form_name, [self._get_mapping_generator()._get_field_mappings(form_name, tax_data)], 1
         else:
             raise ValueError(f"Unknown form: {task.form_name}")
-        
-        logger.info(f"Generated PDF: {task.output_path}")
-    
-    def _generate_schedule_c(self, task: PDFGenerationTask) -> None:
-        """
-        Generate Schedule C PDF using the plugin system
-        """
-        from utils.plugins import get_plugin_registry
-        registry = get_plugin_registry()
-        plugin = registry.get_plugin("Schedule C")
-        
-        if not plugin:
-            raise ValueError("Schedule C plugin not found")
-        
-        # Get field mappings from plugin
-        calculated_data = plugin.calculate_schedule_data(task.tax_data)
-        field_mappings = plugin.map_to_pdf_fields(task.tax_data, calculated_data)
-        
-        # Generate PDF
-        filler = PDFFormFiller()
-        filler.fill_form("Form 1040 (Schedule C)", field_mappings, str(task.output_path))
-    
-    def _generate_form_8949(self, task: PDFGenerationTask) -> None:
-        """
-        Generate Form 8949 PDF for capital gains/losses
-        """
-        from utils.pdf.form_mappers import Form8949Mapper
-        
-        # Get field mappings from Form8949Mapper
-        field_mappings = Form8949Mapper.get_all_fields(task.tax_data)
-        
-        # Generate PDF
-        filler = PDFFormFiller()
-        filler.fill_form("f8949.pdf", field_mappings, str(task.output_path))
-    
-    def _generate_schedule_a(self, task: PDFGenerationTask) -> None:
-        """
-        Generate Schedule A PDF for itemized deductions
-        """
-        from utils.pdf.pdf_generator import TaxReturnPDFGenerator
-        
-        # Use the mapping from pdf_generator
-        generator = TaxReturnPDFGenerator()
-        field_mappings = generator._map_schedule_a(task.tax_data)
-        
-        filler = PDFFormFiller()
-        filler.fill_form("f1040sa.pdf", field_mappings, str(task.output_path))
-    
-    def _generate_schedule_e(self, task: PDFGenerationTask) -> None:
-        """
-        Generate Schedule E PDF for rental income
-        """
+
+    def _get_mapping_generator(self):
+        """Generator whose schedule mappings (and plugins) are shared by all tasks"""
         from utils.pdf.pdf_generator import TaxReturnPDFGenerator
-        
-        # Use the mapping from pdf_generator
-        generator = TaxReturnPDFGenerator()
-        field_mappings = generator._map_schedule_e(task.tax_data)
-        
-        filler = PDFFormFiller()
-        filler.fill_form("f1040se.pdf", field_mappings, str(task.output_path))
+
+        filler = self._get_filler()
+        with self._lock:
+            if self._mapping_generator is None:
+                self._mapping_generator = TaxReturnPDFGenerator(str(filler.forms_directory))
+            return self._mapping_generator
     
     async def generate_multiple_pdfs(
         self,
@@ -387,6 +425,346 @@ class AsyncPDFGenerator:
             logger.info("AsyncPDFGenerator executor shutdown")
 
 
+class JobPriority(IntEnum):
+    """Queue lanes; lower values are taken first"""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BATCH = 2
+
+
+class JobStatus(Enum):
+    """Lifecycle of a queued PDF job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class PDFJob:
+    """A PDF generation task submitted to a PDFJobQueue"""
+    job_id: str
+    task: PDFGenerationTask
+    priority: JobPriority = JobPriority.NORMAL
+    status: JobStatus = JobStatus.QUEUED
+    pages_done: int = 0
+    total_pages: int = 0
+    result: Optional[PDFGenerationResult] = None
+    future: Future = field(default_factory=Future, repr=False)
+    _cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def progress(self) -> float:
+        """Percent of pages filled"""
+        if self.status == JobStatus.COMPLETED:
+            return 100.0
+        if not self.total_pages:
+            return 0.0
+        return 100.0 * self.pages_done / self.total_pages
+
+    @property
+    def cancel_requested(self) -> bool:
+        """Whether cancel() has been called"""
+        return self._cancel_event.is_set()
+
+    def done(self) -> bool:
+        """Whether the job has finished, failed or been cancelled"""
+        return self.future.done()
+
+    def wait(self, timeout: Optional[float] = None) -> PDFGenerationResult:
+        """
+        Block until the job finishes.
+
+        Args:
+            timeout: Seconds to wait (None waits indefinitely)
+
+        Returns:
+            The job's result; cancelled jobs return an unsuccessful result
+
+        Raises:
+            concurrent.futures.TimeoutError: If the job is still running
+        """
+        return self.future.result(timeout)
+
+    async def wait_async(self) -> PDFGenerationResult:
+        """Await the job's result from a coroutine"""
+        return await asyncio.wrap_future(self.future)
+
+    def cancel(self) -> None:
+        """Request cancellation; a running job stops at its next page"""
+        self._cancel_event.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            'job_id': self.job_id,
+            'task_id': self.task.task_id,
+            'form_name': self.task.form_name,
+            'output_path': str(self.task.output_path),
+            'priority': self.priority.name,
+            'status': self.status.value,
+            'pages_done': self.pages_done,
+            'total_pages': self.total_pages,
+            'progress': self.progress,
+            'error': self.result.error if self.result else None,
+        }
+
+
+class PDFJobQueue:
+    """
+    Persistent PDF job queue with bounded concurrency.
+
+    A fixed set of worker threads takes jobs in priority order (FIFO within a
+    priority) and fills them with one shared AsyncPDFGenerator, so parsed
+    templates and the form mapping generator are reused across jobs.
+    Cancelling a queued job finishes it at once as cancelled; its entry stays
+    in the queue and is skipped when a worker takes it. A running job stops
+    at the next page boundary and its output file is not written.
+
+    Finished jobs stay available from get_job() until max_finished_jobs
+    newer ones have finished; callers holding a PDFJob keep its result.
+    """
+
+    _SHUTDOWN = object()
+
+    def __init__(self, generator: Optional[AsyncPDFGenerator] = None, max_concurrent: int = 2,
+                 max_finished_jobs: int = 100):
+        """
+        Start the queue's workers.
+
+        Args:
+            generator: Generator used to fill the jobs (default: a new one)
+            max_concurrent: Number of jobs filled at the same time
+            max_finished_jobs: Number of finished jobs kept for get_job()
+                and get_stats() before the oldest is forgotten
+
+        Raises:
+            ValueError: If max_concurrent is less than 1 or
+                max_finished_jobs is negative
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if max_finished_jobs < 0:
+            raise ValueError("max_finished_jobs cannot be negative")
+        self.generator = generator or AsyncPDFGenerator()
+        self.max_concurrent = max_concurrent
+        self.max_finished_jobs = max_finished_jobs
+        self.event_bus = EventBus.get_instance()
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count(1)
+        self._jobs: Dict[str, PDFJob] = {}
+        # Ids of finished jobs still in _jobs, oldest first
+        self._finished: "deque[str]" = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"PDFJobQueue-{index}", daemon=True)
+            for index in range(max_concurrent)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, task: PDFGenerationTask, priority: JobPriority = JobPriority.NORMAL) -> PDFJob:
+        """
+        Queue a PDF generation task.
+
+        Args:
+            task: Task to run
+            priority: Lane to queue it in; interactive jobs run before batch ones
+
+        Returns:
+            PDFJob tracking the task
+
+        Raises:
+            RuntimeError: If the queue has been shut down
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("PDF job queue has been shut down")
+            sequence = next(self._sequence)
+            job = PDFJob(job_id=f"pdf_job_{sequence}", task=task, priority=JobPriority(priority))
+            self._jobs[job.job_id] = job
+            self._queue.put((job.priority, sequence, job))
+        logger.debug(f"Queued {job.job_id} ({task.form_name}, {job.priority.name})")
+        return job
+
+    def submit_many(
+        self,
+        tasks: Iterable[PDFGenerationTask],
+        priority: JobPriority = JobPriority.BATCH
+    ) -> List[PDFJob]:
+        """Queue several tasks in one lane, in order"""
+        return [self.submit(task, priority) for task in tasks]
+
+    def get_job(self, job_id: str) -> Optional[PDFJob]:
+        """Get a job by id"""
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job.
+
+        Args:
+            job_id: Job to cancel
+
+        Returns:
+            True if the job was still queued or running
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.done():
+            return False
+        job.cancel()
+        with self._lock:
+            queued = job.status == JobStatus.QUEUED
+            if queued:
+                job.status = JobStatus.CANCELLED
+        if queued:
+            # The worker skips it when it comes off the queue
+            self._finish_cancelled(job)
+        return True
+
+    def cancel_all(self, priority: Optional[JobPriority] = None) -> int:
+        """
+        Cancel every unfinished job, or those in one lane.
+
+        Returns:
+            Number of jobs cancelled
+        """
+        jobs = [job for job in list(self._jobs.values())
+                if priority is None or job.priority == priority]
+        return sum(1 for job in jobs if self.cancel(job.job_id))
+
+    def get_stats(self) -> Dict[str, int]:
+        """Count unfinished jobs and the finished ones still kept, by status"""
+        stats = {status.value: 0 for status in JobStatus}
+        for job in list(self._jobs.values()):
+            stats[job.status.value] += 1
+        return stats
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = True) -> None:
+        """
+        Stop the workers.
+
+        Args:
+            wait: Block until the workers have exited
+            cancel_pending: Cancel unfinished jobs instead of running them first
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if cancel_pending:
+            self.cancel_all()
+        for _ in self._workers:
+            # Sorts after every real job
+            self._queue.put((len(JobPriority), next(self._sequence), self._SHUTDOWN))
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        logger.info("PDFJobQueue shutdown")
+
+    def _worker(self) -> None:
+        while True:
+            _, _, job = self._queue.get()
+            if job is self._SHUTDOWN:
+                return
+            with self._lock:
+                if job.status != JobStatus.QUEUED:
+                    continue
+                job.status = JobStatus.RUNNING
+            self._run(job)
+
+    def _run(self, job: PDFJob) -> None:
+        task = job.task
+        start_time = datetime.now()
+        self._publish(EventType.PDF_EXPORT_STARTED, job)
+
+        def progress(pages_done: int, total_pages: int) -> None:
+            job.pages_done = pages_done
+            job.total_pages = total_pages
+            self._publish(EventType.PDF_EXPORT_PROGRESS, job,
+                          pages_done=pages_done, total_pages=total_pages, progress=job.progress)
+
+        try:
+            self.generator._generate_pdf_sync(task, progress, job._cancel_event)
+        except JobCancelledError:
+            job.status = JobStatus.CANCELLED
+            self._finish_cancelled(job)
+            return
+        except Exception as e:
+            logger.error(f"PDF generation failed for {task.form_name}: {e}")
+            job.status = JobStatus.FAILED
+            job.result = PDFGenerationResult(
+                task_id=task.task_id,
+                form_name=task.form_name,
+                success=False,
+                error=str(e),
+                duration=(datetime.now() - start_time).total_seconds()
+            )
+            self._publish(EventType.PDF_EXPORT_FAILED, job, error=str(e))
+            self._retire(job)
+            job.future.set_result(job.result)
+            return
+
+        job.status = JobStatus.COMPLETED
+        job.result = PDFGenerationResult(
+            task_id=task.task_id,
+            form_name=task.form_name,
+            success=True,
+            output_path=task.output_path,
+            duration=(datetime.now() - start_time).total_seconds()
+        )
+        self._publish(EventType.PDF_EXPORT_COMPLETED, job,
+                      output_path=str(task.output_path), duration=job.result.duration)
+        self._retire(job)
+        job.future.set_result(job.result)
+
+    def _finish_cancelled(self, job: PDFJob) -> None:
+        job.result = PDFGenerationResult(
+            task_id=job.task.task_id,
+            form_name=job.task.form_name,
+            success=False,
+            error="Cancelled"
+        )
+        self._publish(EventType.PDF_EXPORT_CANCELLED, job)
+        self._retire(job)
+        job.future.set_result(job.result)
+
+    def _retire(self, job: PDFJob) -> None:
+        """Move a finished job into the bounded history, forgetting the oldest beyond it"""
+        with self._lock:
+            self._finished.append(job.job_id)
+            while len(self._finished) > self.max_finished_jobs:
+                self._jobs.pop(self._finished.popleft(), None)
+
+    def _publish(self, event_type: EventType, job: PDFJob, **data: Any) -> None:
+        self.event_bus.publish(Event(
+            type=event_type,
+            source='PDFJobQueue',
+            data={'job_id': job.job_id, 'task_id': job.task.task_id,
+                  'form_name': job.task.form_name, **data}
+        ))
+
+
+# Global job queue instance
+_pdf_job_queue: Optional[PDFJobQueue] = None
+
+
+def get_pdf_job_queue() -> PDFJobQueue:
+    """
+    Get the application's PDF job queue (singleton).
+
+    Returns:
+        Shared PDFJobQueue instance
+    """
+    global _pdf_job_queue
+
+    if _pdf_job_queue is None:
+        _pdf_job_queue = PDFJobQueue()
+    return _pdf_job_queue
+
+
 # Convenience function for synchronous code
 def generate_pdf_async_wrapper(
     form_name: str,
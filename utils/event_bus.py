@@ -36,6 +36,8 @@ class EventType(Enum):
     PDF_EXPORT_STARTED = "pdf_export_started"
     PDF_EXPORT_COMPLETED = "pdf_export_completed"
     PDF_EXPORT_FAILED = "pdf_export_failed"
+    PDF_EXPORT_PROGRESS = "pdf_export_progress"
+    PDF_EXPORT_CANCELLED = "pdf_export_cancelled"
     
     # UI events
     PAGE_CHANGED = "page_changed"
@@ -0,0 +1,358 @@
+"""
+Money - Exact integer-cents arithmetic shared by the calculation services
+
+Amounts are held as integer cents. Converting to cents is the one point where
+rounding happens (half up, to the nearest cent); sums and differences of
+cents are exact after that. Results are handed back as two-place Decimals.
+
+Whole-dollar rounding for form lines follows the IRS rule: drop amounts under
+50 cents and round 50 to 99 cents up to the next dollar (away from zero).
+
+For batch work the same conversion is applied to whole columns, giving int64
+NumPy arrays whose sums are exact as long as they fit in 64 bits (checked).
+
+Scope: the engine backs the services that keep Decimal amounts (analytics,
+cryptocurrency, estate/trust and partnership/S-corp) and the 1040 engine:
+utils.tax_calculations, TaxData totals, TaxCalculationService and
+BatchTaxCalculationService compute in cents and hand back floats (to_dollars)
+for their existing float APIs. Rates are applied with multiply_cents and
+multiply_cents_array, so the scalar and batch paths round the same way.
+
+Because every amount is rounded to cents before it is added, a total of
+amounts with fractions of a cent (crypto lots priced per unit, K-1 lines
+carried to more places) is the sum of the rounded amounts - what the
+forms report line by line - and can differ by a few cents from the exact
+sum ``sum(Decimal(str(v)) for v in values)`` the services used before.
+"""
+
+from decimal import Context, Decimal, Inexact, localcontext, MAX_PREC, ROUND_HALF_UP
+from fractions import Fraction
+from functools import lru_cache
+from math import lcm
+from typing import Any, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+CENTS_PER_DOLLAR = 100
+
+# Floats this large no longer have cent resolution; convert them via Decimal
+_FLOAT_EXACT_LIMIT = 1e13
+
+# A scaled float this close to half a cent is converted via its decimal repr
+_HALF_CENT_TOLERANCE = 1e-6
+
+_INT64_MAX = np.iinfo(np.int64).max
+
+# Sequences of plain floats this long are converted as a NumPy column
+_COLUMN_MIN_SIZE = 64
+
+_DECIMAL_TYPES = frozenset({Decimal, int})
+_FLOAT_TYPES = frozenset({float, int})
+
+# Raises instead of rounding, so a fast Decimal sum is known to be exact
+_EXACT_CONTEXT = Context(prec=MAX_PREC, traps=[Inexact])
+
+Rate = Union[Decimal, float, int, str, Fraction]
+
+
+def _half_up(numerator: int, denominator: int) -> int:
+    """Round numerator / denominator to the nearest integer, halves away from zero"""
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if remainder * 2 >= denominator:
+        quotient += 1
+    return quotient if (numerator < 0) == (denominator < 0) else -quotient
+
+
+def _float_to_cents(value: float) -> int:
+    scaled = value * CENTS_PER_DOLLAR
+    fraction = abs(scaled) % 1.0
+    if abs(value) < _FLOAT_EXACT_LIMIT and abs(fraction - 0.5) > _HALF_CENT_TOLERANCE:
+        return int(round(scaled))
+    return _decimal_to_cents(Decimal(repr(value)))
+
+
+def _decimal_to_cents(value: Decimal) -> int:
+    return int((value * CENTS_PER_DOLLAR).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def to_cents(value: Any) -> int:
+    """
+    Convert an amount to integer cents, rounding half up to the nearest cent.
+
+    Floats are treated as the decimal number they print as (0.1 is ten cents,
+    not 0.1000000000000000055...).
+
+    Args:
+        value: int, float, Decimal or numeric string amount in dollars
+
+    Returns:
+        Amount in cents
+
+    Raises:
+        decimal.InvalidOperation: If the value is not a number
+    """
+    value_type = type(value)
+    if value_type is int:
+        return value * CENTS_PER_DOLLAR
+    if value_type is float:
+        return _float_to_cents(value)
+    if value_type is Decimal:
+        return _decimal_to_cents(value)
+    if isinstance(value, np.integer):
+        return int(value) * CENTS_PER_DOLLAR
+    if isinstance(value, np.floating):
+        return _float_to_cents(float(value))
+    return _decimal_to_cents(Decimal(str(value)))
+
+
+def from_cents(cents: int) -> Decimal:
+    """
+    Convert integer cents to a two-place Decimal amount.
+
+    Args:
+        cents: Amount in cents
+
+    Returns:
+        Exact Decimal amount in dollars
+    """
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def to_dollars(cents: Any) -> Any:
+    """
+    Convert cents to a float dollar amount.
+
+    For the calculation APIs that return floats. The result is the float
+    nearest the exact amount, as ``round(value, 2)`` would give.
+
+    Args:
+        cents: Amount in cents, or an int64 array of cents
+
+    Returns:
+        float, or a float64 array for an array argument
+    """
+    return cents / CENTS_PER_DOLLAR
+
+
+def to_money(value: Any) -> Decimal:
+    """Round an amount to cents and return it as a two-place Decimal"""
+    return from_cents(to_cents(value))
+
+
+def sum_cents(values: Iterable[Any]) -> int:
+    """
+    Exact sum of amounts in cents.
+
+    Args:
+        values: Amounts in dollars (each rounded to cents first); a NumPy
+            array is summed as a column
+
+    Returns:
+        Total in cents
+    """
+    if isinstance(values, np.ndarray):
+        return sum_cents_array(cents_array(values))
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+
+    value_types = set(map(type, values))
+    if value_types <= _DECIMAL_TYPES:
+        total = _sum_exact_cents(values)
+        if total is not None:
+            return total
+    elif value_types <= _FLOAT_TYPES and len(values) >= _COLUMN_MIN_SIZE:
+        return sum_cents_array(cents_array(np.array(values, dtype=np.float64)))
+    return sum(map(to_cents, values))
+
+
+def _sum_exact_cents(values) -> Optional[int]:
+    """
+    Sum Decimal/int amounts directly when none has fractional cents.
+
+    Decimal addition keeps the smallest exponent of its operands, so the
+    total has at most two places exactly when every amount does; in that
+    case adding first and converting once equals converting each amount.
+    Returns None if some amount needs rounding or the sum was inexact.
+    """
+    with localcontext(_EXACT_CONTEXT):
+        try:
+            total = sum(values, Decimal(0))
+        except Inexact:
+            return None
+        if total.as_tuple().exponent < -2:
+            return None
+        return int(total.scaleb(2))
+
+
+def sum_money(values: Iterable[Any]) -> Decimal:
+    """
+    Exact sum of amounts as a two-place Decimal.
+
+    Replaces ``sum(Decimal(str(v)) for v in values)``, converting each value
+    once and adding integers instead of Decimals. Each value is rounded to
+    cents first, so amounts with fractions of a cent may total differently
+    from the exact sum.
+
+    Args:
+        values: Amounts in dollars
+
+    Returns:
+        Total in dollars
+    """
+    return from_cents(sum_cents(values))
+
+
+def multiply_cents(cents: int, rate: Rate) -> int:
+    """
+    Apply a rate or ratio to an amount, rounding half up to the nearest cent.
+
+    The product is computed exactly before the single rounding step.
+
+    Args:
+        cents: Amount in cents
+        rate: Multiplier (0.22, Decimal('0.22'), '0.22' or a Fraction)
+
+    Returns:
+        Product in cents
+    """
+    numerator, denominator = _rate_ratio(rate)
+    return _half_up(cents * numerator, denominator)
+
+
+@lru_cache(maxsize=256)
+def _rate_ratio(rate: Rate) -> Tuple[int, int]:
+    """Exact (numerator, denominator) of a rate; floats are taken as the decimal they print as"""
+    if isinstance(rate, (float, np.floating)):
+        rate = Decimal(repr(float(rate)))
+    ratio = Fraction(rate)
+    return ratio.numerator, ratio.denominator
+
+
+def divide_cents(numerator: int, denominator: int) -> int:
+    """
+    Round an exact quotient to cents, half up.
+
+    For amounts built from several rates: scale everything to one integer
+    numerator over one denominator and round once.
+
+    Args:
+        numerator: Amount in cents times the denominator's units
+        denominator: Positive divisor
+
+    Returns:
+        Quotient in cents
+    """
+    return _half_up(numerator, denominator)
+
+
+def round_to_dollars(cents: int) -> int:
+    """
+    Round cents to whole dollars using the IRS rule (50 cents and up round up).
+
+    Args:
+        cents: Amount in cents
+
+    Returns:
+        Amount in whole dollars
+    """
+    return _half_up(cents, CENTS_PER_DOLLAR)
+
+
+def cents_array(values: Any) -> np.ndarray:
+    """
+    Convert a column of amounts to an int64 array of cents.
+
+    Float columns are converted vectorized; values at an exact half cent or
+    beyond cent resolution fall back to the scalar conversion, so every
+    element matches to_cents.
+
+    Args:
+        values: Sequence or array of amounts in dollars
+
+    Returns:
+        int64 array of cents
+    """
+    array = np.asarray(values)
+    if array.dtype.kind in 'iu':
+        return array.astype(np.int64) * CENTS_PER_DOLLAR
+    if array.dtype.kind != 'f':
+        return np.fromiter((to_cents(value) for value in array.tolist()), dtype=np.int64, count=array.size)
+
+    array = array.astype(np.float64, copy=False)
+    scaled = array * CENTS_PER_DOLLAR
+    cents = np.rint(scaled)
+    ambiguous = (np.abs(np.abs(scaled) % 1.0 - 0.5) <= _HALF_CENT_TOLERANCE) | (np.abs(array) >= _FLOAT_EXACT_LIMIT)
+    result = cents.astype(np.int64)
+    for index in np.flatnonzero(ambiguous):
+        result[index] = _float_to_cents(float(array[index]))
+    return result
+
+
+def sum_cents_array(cents: np.ndarray) -> int:
+    """
+    Exact sum of an int64 cents array.
+
+    Falls back to Python integers if the column could overflow int64.
+
+    Args:
+        cents: Array from cents_array
+
+    Returns:
+        Total in cents
+    """
+    if cents.size == 0:
+        return 0
+    bound = int(np.abs(cents).max()) * cents.size
+    if bound <= _INT64_MAX:
+        return int(cents.sum(dtype=np.int64))
+    return sum(int(value) for value in cents.tolist())
+
+
+def multiply_cents_array(cents: np.ndarray, rate: Any) -> np.ndarray:
+    """
+    Vectorized multiply_cents over an int64 cents array.
+
+    Args:
+        cents: int64 array of cents
+        rate: One rate for every element, or an array with a rate per element
+
+    Returns:
+        int64 array of products in cents, each equal to multiply_cents
+    """
+    cents = np.asarray(cents, dtype=np.int64)
+    if np.ndim(rate) == 0:
+        numerator, denominator = _rate_ratio(rate)
+        numerators = np.int64(numerator)
+        largest = abs(numerator)
+    else:
+        values, inverse = np.unique(np.asarray(rate), return_inverse=True)
+        ratios = [_rate_ratio(value) for value in values.tolist()]
+        denominator = lcm(*(d for _, d in ratios)) if ratios else 1
+        scaled = [n * (denominator // d) for n, d in ratios]
+        numerators = np.array(scaled, dtype=np.int64)[inverse.reshape(cents.shape)]
+        largest = max(map(abs, scaled), default=0)
+
+    if cents.size and int(np.abs(cents).max()) * largest * 2 > _INT64_MAX:
+        rates = np.broadcast_to(np.asarray(rate, dtype=object), cents.shape)
+        return np.array(
+            [multiply_cents(int(c), r) for c, r in zip(cents.tolist(), rates.tolist())],
+            dtype=np.int64
+        )
+    return divide_cents_array(cents * numerators, denominator)
+
+
+def divide_cents_array(numerators: np.ndarray, denominators: Any) -> np.ndarray:
+    """
+    Vectorized divide_cents.
+
+    Args:
+        numerators: int64 array of scaled amounts
+        denominators: Positive divisor, or an int64 array of divisors
+
+    Returns:
+        int64 array of quotients in cents, rounded half up
+    """
+    numerators = np.asarray(numerators, dtype=np.int64)
+    quotient, remainder = np.divmod(np.abs(numerators), denominators)
+    quotient += remainder * 2 >= denominators
+    return np.where(numerators < 0, -quotient, quotient)
@@ -0,0 +1,160 @@
+"""
+Export Manifest - Skip rewriting forms whose content hasn't changed
+
+Each output directory keeps a small JSON manifest recording, for every PDF
+written there, a digest of what went into it: the mapped field values of
+every copy, the fill options and the template file's size and modification
+time. On re-export a form whose digest matches, and whose output file is
+still the one that was written, is left alone.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".export_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def fingerprint(
+    form_name: str,
+    copies: Iterable[Dict[str, Any]],
+    options: Optional[Dict[str, Any]] = None,
+    template_path: Optional[Path] = None
+) -> str:
+    """
+    Digest of everything that determines a generated form.
+
+    Args:
+        form_name: Form being generated
+        copies: Field values of each copy, in order (consumed once)
+        options: Fill options such as flattening
+        template_path: Template the form is filled from; its size and
+            modification time are included so replacing it forces a rewrite
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    header = {'form': form_name, 'options': options or {}}
+    if template_path is not None:
+        stat = os.stat(template_path)
+        header['template'] = [str(template_path), stat.st_size, stat.st_mtime_ns]
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode())
+    for copy in copies:
+        digest.update(b"\0")
+        digest.update(json.dumps(copy, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """Digest and on-disk identity of one written PDF"""
+    digest: str
+    size: int
+    mtime_ns: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ManifestEntry':
+        """Create from dictionary"""
+        return cls(digest=data['digest'], size=int(data['size']), mtime_ns=int(data['mtime_ns']))
+
+
+class ExportManifest:
+    """Digests of the PDFs in one output directory, keyed by output path"""
+
+    def __init__(self, path: Path):
+        """
+        Load the manifest, starting empty if it is missing or unreadable.
+
+        Args:
+            path: Manifest file
+        """
+        self.path = Path(path)
+        self._entries: Dict[str, ManifestEntry] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def for_directory(cls, directory: Path) -> 'ExportManifest':
+        """Manifest of an output directory"""
+        return cls(Path(directory) / MANIFEST_NAME)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get('version') != MANIFEST_VERSION:
+                logger.info(f"Ignoring export manifest version {data.get('version')}: {self.path}")
+                return
+            self._entries = {
+                output: ManifestEntry.from_dict(entry) for output, entry in data['entries'].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable export manifest {self.path}: {e}")
+            self._entries = {}
+
+    def is_current(self, output_path: str, digest: str) -> bool:
+        """
+        Whether an output file is up to date.
+
+        Args:
+            output_path: Generated PDF
+            digest: Fingerprint of what would be written now
+
+        Returns:
+            True if the recorded digest matches and the file hasn't been
+            replaced or removed since it was written
+        """
+        with self._lock:
+            entry = self._entries.get(str(output_path))
+        if entry is None or entry.digest != digest:
+            return False
+        try:
+            stat = os.stat(output_path)
+        except OSError:
+            return False
+        return stat.st_size == entry.size and stat.st_mtime_ns == entry.mtime_ns
+
+    def record(self, output_path: str, digest: str) -> None:
+        """
+        Record a freshly written output file.
+
+        Args:
+            output_path: Generated PDF
+            digest: Fingerprint it was written from
+        """
+        stat = os.stat(output_path)
+        with self._lock:
+            self._entries[str(output_path)] = ManifestEntry(digest, stat.st_size, stat.st_mtime_ns)
+
+    def forget(self, output_path: str) -> None:
+        """Drop an output file's entry so it is rewritten next time"""
+        with self._lock:
+            self._entries.pop(str(output_path), None)
+
+    def save(self) -> None:
+        """Write the manifest atomically"""
+        with self._lock:
+            data = {
+                'version': MANIFEST_VERSION,
+                'entries': {output: entry.to_dict() for output, entry in sorted(self._entries.items())},
+            }
+            temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(data, indent=1), encoding='utf-8')
+            os.replace(temp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
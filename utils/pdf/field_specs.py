@@ -0,0 +1,289 @@
+"""
+Field Specs - Declarative PDF field tables compiled to accessors
+
+A form's mapping is described as data: each FieldSpec names a PDF field,
+where its value comes from (a dotted data path or a function of the return)
+and how it is formatted. Repeating groups such as transaction lines are
+RowSpecs, and anything that needs arithmetic across several values is a
+computed function returning extra fields.
+
+A FormSpec compiles its table once into accessors grouped by parent path,
+so each parent dict is looked up once per mapping, and the field names of
+every repeated row are formatted up front. Mapping a return is then a
+single call per table, and map_many() maps a whole batch table by table.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from utils.pdf.field_mapper import DotDict
+
+logger = logging.getLogger(__name__)
+
+Source = Union[str, Callable[[Dict[str, Any]], Any]]
+Formatter = Callable[[Any], str]
+Accessor = Callable[[Dict[str, Any]], Any]
+
+_MISSING = object()
+
+# Parent of fields whose path is missing; only ever read
+_EMPTY: Dict[str, Any] = {}
+
+
+def money(value: Any) -> str:
+    """Amount with thousands separators and cents (``1,234.50``)"""
+    return f"{value:,.2f}"
+
+
+def as_is(value: Any) -> Any:
+    """Value unchanged, for text fields"""
+    return value
+
+
+def truncate(length: int) -> Formatter:
+    """Formatter cutting text to a field's width"""
+    def formatter(value: Any) -> str:
+        return value[:length]
+    return formatter
+
+
+def compile_path(path: str) -> Accessor:
+    """
+    Compile a dotted path into an accessor.
+
+    Follows DotDict.get: a key equal to the whole dotted path wins, a
+    missing key or a non-dict along the way gives None.
+
+    Args:
+        path: Dot-separated keys (``'personal_info.first_name'``)
+
+    Returns:
+        Function of a data dict returning the value or None
+    """
+    keys = tuple(path.split('.'))
+    if len(keys) == 1:
+        key = keys[0]
+
+        def get_key(data: Dict[str, Any]) -> Any:
+            return data.get(key)
+        return get_key
+
+    def get_path(data: Dict[str, Any]) -> Any:
+        value = data.get(path, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = data
+        for key in keys:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+            if value is None:
+                return None
+        return value
+    return get_path
+
+
+def _compile_source(source: Source) -> Accessor:
+    return compile_path(source) if isinstance(source, str) else source
+
+
+def _unwrap(tax_data: Any) -> Dict[str, Any]:
+    return tax_data.data if isinstance(tax_data, DotDict) else tax_data
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    One PDF field.
+
+    Attributes:
+        field: PDF field name; inside a RowSpec it may contain ``{row}``
+        source: Dotted path into the data, or a function of the data
+        formatter: Turns the value into the field text
+        default: Value used when the source gives None
+        keep_empty: Write the field even when the value is falsy (by
+            default zero amounts and empty text are left blank)
+    """
+    field: str
+    source: Source
+    formatter: Formatter = money
+    default: Any = 0
+    keep_empty: bool = False
+
+
+@dataclass(frozen=True)
+class RowSpec:
+    """
+    A repeating group of fields, one row per item of a list.
+
+    Attributes:
+        source: Path or function giving the list of row items
+        fields: Fields of one row; sources are relative to the row item
+        max_rows: Rows the form has room for; later items are ignored
+    """
+    source: Source
+    fields: Tuple[FieldSpec, ...]
+    max_rows: int
+
+
+def _compile_parent(keys: Tuple[str, ...]) -> Accessor:
+    """Accessor for the dict at a parent path; a missing or non-dict parent gives an empty dict"""
+    def get_parent(data: Dict[str, Any]) -> Dict[str, Any]:
+        value = data
+        for key in keys:
+            value = value.get(key) if isinstance(value, dict) else None
+        return value if isinstance(value, dict) else _EMPTY
+    return get_parent
+
+
+def _compile_table(specs: Sequence[FieldSpec], names: Sequence[str]) -> Callable[[Dict[str, Any], Dict[str, str]], None]:
+    """
+    Build one function setting a table's path fields.
+
+    Fields are grouped by their parent path so each parent dict is looked up
+    once per call; every field is then a single ``dict.get`` and its
+    formatter.
+    """
+    groups: Dict[Tuple[str, ...], List[Tuple[str, str, Formatter, Any, bool]]] = {}
+    for spec, name in zip(specs, names):
+        *parent, key = spec.source.split('.')
+        groups.setdefault(tuple(parent), []).append(
+            (name, key, spec.formatter, spec.default, spec.keep_empty)
+        )
+    compiled = [(_compile_parent(parent), tuple(entries)) for parent, entries in groups.items()]
+
+    def set_fields(data: Dict[str, Any], fields: Dict[str, str]) -> None:
+        for get_parent, entries in compiled:
+            parent = get_parent(data)
+            for name, key, formatter, default, keep_empty in entries:
+                value = parent.get(key)
+                if value is None:
+                    value = default
+                if value or keep_empty:
+                    fields[name] = formatter(value)
+    return set_fields
+
+
+class _CompiledTable:
+    """Fields compiled for evaluation"""
+
+    __slots__ = ('set_fields', 'computed', 'exact')
+
+    def __init__(self, specs: Sequence[FieldSpec], names: Sequence[str]):
+        paths = [(spec, name) for spec, name in zip(specs, names) if isinstance(spec.source, str)]
+        self.set_fields = _compile_table([spec for spec, _ in paths], [name for _, name in paths])
+        # Full-path accessors, for data holding dotted keys (see compile_path)
+        self.exact = [
+            (name, compile_path(spec.source), spec.formatter, spec.default, spec.keep_empty)
+            for spec, name in paths
+        ]
+        self.computed = [
+            (name, spec.source, spec.formatter, spec.default, spec.keep_empty)
+            for spec, name in zip(specs, names) if not isinstance(spec.source, str)
+        ]
+
+    def map_into(self, data: Dict[str, Any], fields: Dict[str, str], dotted_keys: bool = False) -> None:
+        if dotted_keys:
+            _map_accessors(self.exact, data, fields)
+        else:
+            self.set_fields(data, fields)
+        if self.computed:
+            _map_accessors(self.computed, data, fields)
+
+
+def _map_accessors(compiled, data: Dict[str, Any], fields: Dict[str, str]) -> None:
+    for field, get, formatter, default, keep_empty in compiled:
+        value = get(data)
+        if value is None:
+            value = default
+        if value or keep_empty:
+            fields[field] = formatter(value)
+
+
+def _has_dotted_keys(data: Dict[str, Any]) -> bool:
+    try:
+        return '.' in ''.join(data)
+    except TypeError:
+        return any('.' in key for key in data if isinstance(key, str))
+
+
+class FormSpec:
+    """A form's field table, compiled for repeated mapping"""
+
+    def __init__(
+        self,
+        fields: Sequence[FieldSpec] = (),
+        rows: Sequence[RowSpec] = (),
+        computed: Sequence[Callable[[Dict[str, Any]], Dict[str, str]]] = ()
+    ):
+        """
+        Compile a field table.
+
+        Args:
+            fields: Single fields
+            rows: Repeating groups
+            computed: Functions of the data returning further fields, for
+                totals and other values derived from several inputs
+        """
+        self.fields = tuple(fields)
+        self.rows = tuple(rows)
+        self.computed = tuple(computed)
+        self._table = _CompiledTable(self.fields, [spec.field for spec in self.fields])
+        self._row_tables = [
+            (
+                _compile_source(row.source),
+                [_CompiledTable(row.fields, [spec.field.format(row=index) for spec in row.fields])
+                 for index in range(row.max_rows)]
+            )
+            for row in self.rows
+        ]
+
+    def __add__(self, other: 'FormSpec') -> 'FormSpec':
+        return FormSpec(self.fields + other.fields, self.rows + other.rows, self.computed + other.computed)
+
+    def _map_rows(self, data: Dict[str, Any], fields: Dict[str, str]) -> None:
+        for get_items, tables in self._row_tables:
+            for item, table in zip(get_items(data) or (), tables):
+                table.map_into(item, fields)
+
+    def map(self, tax_data: Any) -> Dict[str, str]:
+        """
+        Map one return to field values.
+
+        Args:
+            tax_data: Return data (dict or DotDict)
+
+        Returns:
+            PDF field name to value
+        """
+        data = _unwrap(tax_data)
+        fields: Dict[str, str] = {}
+        self._table.map_into(data, fields, _has_dotted_keys(data))
+        if self._row_tables:
+            self._map_rows(data, fields)
+        for compute in self.computed:
+            fields.update(compute(data))
+        return fields
+
+    def map_many(self, returns: Sequence[Any]) -> List[Dict[str, str]]:
+        """
+        Map a batch of returns, evaluating the table one group at a time.
+
+        Args:
+            returns: Return data (dicts or DotDicts)
+
+        Returns:
+            Field values per return, in order
+        """
+        records = [_unwrap(tax_data) for tax_data in returns]
+        results: List[Dict[str, str]] = [{} for _ in records]
+        dotted = [_has_dotted_keys(data) for data in records]
+        for data, fields, dotted_keys in zip(records, results, dotted):
+            self._table.map_into(data, fields, dotted_keys)
+        for data, fields in zip(records, results):
+            self._map_rows(data, fields)
+        for compute in self.computed:
+            for data, fields in zip(records, results):
+                fields.update(compute(data))
+        return results
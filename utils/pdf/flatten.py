@@ -0,0 +1,213 @@
+"""
+PDF Flattening - Burn form field values into page content
+
+A filled form keeps every field as a live widget annotation that viewers
+have to lay out on each render. Flattening draws each widget's current
+appearance stream into its page's content, removes the widgets and the
+AcroForm dictionary, drops the objects nothing refers to any more and
+Flate-compresses the remaining streams. The result looks the same but is no
+longer editable, and is smaller and faster to open and print.
+"""
+
+import logging
+from typing import Any, List, Optional, Set
+
+from pypdf import PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NullObject,
+    StreamObject,
+)
+
+logger = logging.getLogger(__name__)
+
+# Annotation flag: hidden (PDF 32000-1 table 165)
+_HIDDEN_FLAG = 2
+
+
+def _appearance(widget: DictionaryObject) -> Optional[StreamObject]:
+    """The widget's normal appearance in its current state, if it has one"""
+    appearances = widget.get('/AP')
+    if appearances is None:
+        return None
+    normal = appearances.get_object().get('/N')
+    if normal is None:
+        return None
+    normal = normal.get_object()
+    if isinstance(normal, StreamObject):
+        return normal
+    # Checkboxes and radio buttons keep one stream per state
+    state = widget.get('/AS')
+    if state is None or state not in normal:
+        return None
+    appearance = normal[state].get_object()
+    return appearance if isinstance(appearance, StreamObject) else None
+
+
+def _placement(appearance: StreamObject, rect: List[float]) -> List[float]:
+    """Matrix mapping the appearance's transformed bounding box onto the widget rectangle"""
+    x0, y0, x1, y1 = (float(value) for value in appearance.get('/BBox', [0, 0, 1, 1]))
+    a, b, c, d, e, f = (float(value) for value in appearance.get('/Matrix', [1, 0, 0, 1, 0, 0]))
+    corners = [(a * x + c * y + e, b * x + d * y + f) for x in (x0, x1) for y in (y0, y1)]
+    min_x, max_x = min(x for x, _ in corners), max(x for x, _ in corners)
+    min_y, max_y = min(y for _, y in corners), max(y for _, y in corners)
+
+    left, right = sorted(float(value) for value in rect[0::2])
+    bottom, top = sorted(float(value) for value in rect[1::2])
+    scale_x = (right - left) / (max_x - min_x) if max_x > min_x else 1.0
+    scale_y = (top - bottom) / (max_y - min_y) if max_y > min_y else 1.0
+    return [scale_x, 0.0, 0.0, scale_y, left - scale_x * min_x, bottom - scale_y * min_y]
+
+
+def _add_content(writer: PdfWriter, page: DictionaryObject, drawing: bytes) -> None:
+    """Append drawing operators to a page, isolated from its existing graphics state"""
+    def stream(data: bytes) -> IndirectObject:
+        content = DecodedStreamObject()
+        content.set_data(data)
+        return writer._add_object(content)
+
+    if '/Contents' not in page:
+        page[NameObject('/Contents')] = stream(drawing)
+        return
+    contents = page.raw_get('/Contents')
+    resolved = contents.get_object()
+    existing = list(resolved) if isinstance(resolved, ArrayObject) else [contents]
+    page[NameObject('/Contents')] = ArrayObject([stream(b"q\n"), *existing, stream(b"\nQ\n" + drawing)])
+
+
+def flatten_page(writer: PdfWriter, page: DictionaryObject) -> int:
+    """
+    Draw a page's widgets into its content and remove them.
+
+    Args:
+        writer: Document owning the page
+        page: Page to flatten
+
+    Returns:
+        Number of widgets drawn
+    """
+    annots = page.get('/Annots')
+    if annots is None:
+        return 0
+
+    resources = page.setdefault(NameObject('/Resources'), DictionaryObject()).get_object()
+    xobjects = resources.setdefault(NameObject('/XObject'), DictionaryObject()).get_object()
+    kept = ArrayObject()
+    drawing = []
+    for annot_ref in annots.get_object():
+        annot = annot_ref.get_object()
+        if annot.get('/Subtype') != '/Widget':
+            kept.append(annot_ref)
+            continue
+        appearance = _appearance(annot)
+        if appearance is None or int(annot.get('/F', 0)) & _HIDDEN_FLAG or '/Rect' not in annot:
+            continue
+        name = f"/FlatField{len(xobjects)}"
+        while name in xobjects:
+            name += "_"
+        if appearance.indirect_reference is None:
+            appearance = writer._add_object(appearance).get_object()
+        xobjects[NameObject(name)] = appearance.indirect_reference
+        matrix = " ".join(f"{value:.6g}" for value in _placement(appearance, annot['/Rect']))
+        drawing.append(f"q {matrix} cm {name} Do Q")
+
+    if drawing:
+        _add_content(writer, page, ("\n".join(drawing) + "\n").encode())
+    if kept:
+        page[NameObject('/Annots')] = kept
+    else:
+        del page['/Annots']
+    return len(drawing)
+
+
+def drop_unreachable_objects(writer: PdfWriter) -> int:
+    """
+    Null out objects that can't be reached from the document catalog or info.
+
+    PdfWriter writes every object it holds, including ones no longer
+    referenced (removed widgets, replaced streams). Object numbers stay
+    valid; the dropped objects are written as ``null``.
+
+    Args:
+        writer: Document to compact in place
+
+    Returns:
+        Number of objects dropped
+    """
+    roots = [writer._root_object]
+    info = getattr(writer, '_info_obj', None) or getattr(writer, '_info', None)
+    if info is not None:
+        roots.append(info.get_object())
+    reachable: Set[int] = set()
+    for root in roots:
+        if root.indirect_reference is not None:
+            reachable.add(root.indirect_reference.idnum)
+    stack: List[Any] = list(roots)
+    while stack:
+        obj = stack.pop()
+        # Raw access: indexing a pypdf container would resolve references
+        if isinstance(obj, dict):
+            values = dict.values(obj)
+        elif isinstance(obj, list):
+            values = list.__iter__(obj)
+        else:
+            continue
+        for value in values:
+            if isinstance(value, IndirectObject):
+                if value.pdf is writer and value.idnum not in reachable:
+                    reachable.add(value.idnum)
+                    target = writer._objects[value.idnum - 1]
+                    if target is not None:
+                        stack.append(target)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+
+    dropped = 0
+    for index, obj in enumerate(writer._objects):
+        if obj is not None and index + 1 not in reachable and not isinstance(obj, NullObject):
+            writer._objects[index] = NullObject()
+            dropped += 1
+    return dropped
+
+
+def compress_streams(writer: PdfWriter) -> int:
+    """
+    Flate-compress every stream that has no filter yet.
+
+    Args:
+        writer: Document to compress in place
+
+    Returns:
+        Number of streams compressed
+    """
+    compressed = 0
+    for index, obj in enumerate(writer._objects):
+        if isinstance(obj, StreamObject) and '/Filter' not in obj:
+            encoded = obj.flate_encode()
+            encoded.indirect_reference = IndirectObject(index + 1, 0, writer)
+            writer._objects[index] = encoded
+            compressed += 1
+    return compressed
+
+
+def flatten_document(writer: PdfWriter) -> int:
+    """
+    Flatten every page, remove the AcroForm and compact the document.
+
+    Args:
+        writer: Filled document to flatten in place
+
+    Returns:
+        Number of widgets drawn into page content
+    """
+    drawn = sum(flatten_page(writer, page) for page in writer.pages)
+    if '/AcroForm' in writer._root_object:
+        del writer._root_object['/AcroForm']
+    dropped = drop_unreachable_objects(writer)
+    compressed = compress_streams(writer)
+    logger.debug(f"Flattened {drawn} widgets, dropped {dropped} objects, compressed {compressed} streams")
+    return drawn
@@ -3,16 +3,18 @@ PDF Form Filler - Core functionality for filling IRS PDF forms
 
 This module handles the low-level PDF operations including
 reading form fields, writing data to PDFs, and managing form files.
+Templates are parsed once per process (see utils.pdf.template_cache).
 """
 
 import os
 import logging
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from functools import lru_cache
-from pypdf import PdfReader, PdfWriter
+from typing import Dict, Any, Callable, Iterable, List, Optional
 from utils.pdf.form_mappers import Form1040Mapper
 from utils.pdf.field_mapper import DotDict
+from utils.pdf.flatten import flatten_document
+from utils.pdf.merged_document import MergedDocument
+from utils.pdf.template_cache import FormTemplate, get_template_cache
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +63,18 @@ class PDFFormFiller:
             raise FileNotFoundError(f"Form not found: {pdf_path}")
         
         return pdf_path
+
+    def get_template(self, form_name: str) -> FormTemplate:
+        """
+        Get the parsed template for a form from the process-wide cache.
+
+        Args:
+            form_name: Name of the form
+
+        Returns:
+            Cached FormTemplate (reloaded if the file changed on disk)
+        """
+        return get_template_cache().get(self.get_form_path(form_name))
     
     def get_form_fields(self, form_name: str) -> Dict[str, Any]:
         """
@@ -72,20 +86,8 @@ class PDFFormFiller:
         Returns:
             Dictionary of field names and their properties
         """
-        form_path = self.get_form_path(form_name)
-        
-        reader = PdfReader(str(form_path))
-        
-        fields = {}
-        if reader.get_fields():
-            for field_name, field_info in reader.get_fields().items():
-                fields[field_name] = {
-                    'type': field_info.get('/FT', 'unknown'),
-                    'value': field_info.get('/V', ''),
-                    'flags': field_info.get('/Ff', 0)
-                }
-        
-        return fields
+        template = self.get_template(form_name)
+        return {name: dict(info) for name, info in template.fields.items()}
     
     def inspect_form_fields(self, form_name: str) -> None:
         """
@@ -120,27 +122,11 @@ class PDFFormFiller:
             output_path: Path where filled PDF should be saved
             flatten: If True, flatten form (make fields non-editable)
         """
-        form_path = self.get_form_path(form_name)
-        
-        # Read the form
-        reader = PdfReader(str(form_path))
-        writer = PdfWriter()
-        
-        # Clone all pages first
-        writer.append(reader)
-        
-        # Update form fields if they exist
-        if field_values and reader.get_fields():
-            # Update fields on each page (fields can be on any page)
-            for page in writer.pages:
-                try:
-                    writer.update_page_form_field_values(
-                        page,
-                        field_values
-                    )
-                except Exception:
-                    # Skip if page doesn't have form fields
-                    pass
+        template = self.get_template(form_name)
+        writer = template.clone()
+        template.fill(writer, field_values)
+        if flatten:
+            flatten_document(writer)
         
         # Write output
         output_file = Path(output_path)
@@ -150,6 +136,78 @@ class PDFFormFiller:
             writer.write(f)
         
         logger.info(f"Created PDF: {output_file}")
+
+    def fill_form_copies(
+        self,
+        form_name: str,
+        copies: Iterable[Dict[str, str]],
+        output_path: str,
+        flatten: bool = False,
+        on_page: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Fill one copy of a form per set of values and save them as one PDF.
+
+        Used for continuation copies (e.g. Form 8949 with more lots than fit
+        on one form). ``copies`` is consumed lazily, so each copy's values
+        can be built just before it is filled. Fields of the second and
+        later copies are renamed with a ``_<copy number>`` suffix on their
+        top-level name so copies don't share values. Unless the form is
+        flattened, appearance streams are generated for the first copy only;
+        viewers draw the continuation copies' fields themselves.
+
+        Args:
+            form_name: Name of the form to fill
+            copies: Field values for each copy, in page order
+            output_path: Path where the merged PDF should be saved
+            flatten: If True, flatten form (make fields non-editable)
+            on_page: Called with each output page's index once it is filled;
+                an exception it raises abandons the fill before anything is saved
+
+        Returns:
+            Number of copies written (a blank form is saved when there are none)
+        """
+        document = MergedDocument()
+        count = self.add_form_copies(document, form_name, copies, on_page=on_page,
+                                     continuation_appearances=flatten)
+        if count == 0:
+            document.add_form(self.get_template(form_name), {}, on_page=on_page)
+        document.write(output_path, flatten=flatten)
+        return count
+
+    def add_form_copies(
+        self,
+        document: MergedDocument,
+        form_name: str,
+        copies: Iterable[Dict[str, str]],
+        field_suffix: str = "",
+        on_page: Optional[Callable[[int], None]] = None,
+        continuation_appearances: bool = True
+    ) -> int:
+        """
+        Append filled copies of a form to a merged document.
+
+        Args:
+            document: Document being assembled
+            form_name: Name of the form to fill
+            copies: Field values for each copy, consumed lazily
+            field_suffix: Appended to every copy's top-level field names
+                (copies after the first also get ``_<copy number>``)
+            on_page: Called with each page's index once it is filled
+            continuation_appearances: Generate appearance streams for the
+                copies after the first; needed when the document is flattened,
+                otherwise skipping them saves most of the fill time
+
+        Returns:
+            Number of copies added
+        """
+        template = self.get_template(form_name)
+        count = 0
+        for count, field_values in enumerate(copies, 1):
+            copy_suffix = field_suffix if count == 1 else f"{field_suffix}_{count}"
+            document.add_form(template, field_values, copy_suffix, on_page,
+                              appearances=count == 1 or continuation_appearances)
+        return count
     
     def export_form_1040(
         self,
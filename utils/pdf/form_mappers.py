@@ -7,232 +7,294 @@ into PDF-specific field structures.
 """
 
 import logging
-from typing import Dict, Any
+from decimal import Decimal
+from typing import Dict, Any, Iterator, List, Sequence, Tuple
 from constants.pdf_fields import Form1040Fields
+from utils.pdf.field_specs import FieldSpec, FormSpec, RowSpec, as_is, compile_path, money, truncate
+from utils.money import sum_money
 from utils.w2_calculator import W2Calculator
 from utils.tax_calculations import calculate_standard_deduction
 
 logger = logging.getLogger(__name__)
 
 
+_filing_status = compile_path('filing_status.status')
+_deduction_method = compile_path('deductions.method')
+_tax_year = compile_path('basic_info.tax_year')
+_itemized = [compile_path(f'deductions.{key}') for key in
+             ('medical_expenses', 'state_local_taxes', 'mortgage_interest', 'charitable_contributions')]
+
+
+def _get(accessor, data: Dict[str, Any], default: Any) -> Any:
+    value = accessor(data)
+    return default if value is None else value
+
+
+def _income(data: Dict[str, Any]) -> Dict[str, Any]:
+    return data.get('income') or {}
+
+
+def _interest_total(data: Dict[str, Any], tax_exempt: bool) -> float:
+    return sum(item.get('amount', 0) for item in _income(data).get('interest_income', [])
+               if item.get('tax_exempt', False) == tax_exempt)
+
+
+def _map_filing_status(data: Dict[str, Any]) -> Dict[str, str]:
+    field = Form1040Mapper.FILING_STATUS_FIELDS.get(_get(_filing_status, data, 'Single'))
+    return {field: Form1040Fields.CHECKBOX_CHECKED} if field else {}
+
+
+def _map_spouse(data: Dict[str, Any]) -> Dict[str, str]:
+    # Spouse information (if filing jointly)
+    if _filing_status(data) != 'Married Filing Jointly':
+        return {}
+    return SPOUSE_SPEC.map(data)
+
+
+def _map_deductions(data: Dict[str, Any]) -> Dict[str, str]:
+    if _get(_deduction_method, data, 'standard') == 'standard':
+        # Calculate standard deduction based on filing status
+        amount = calculate_standard_deduction(
+            _get(_filing_status, data, 'Single'),
+            _get(_tax_year, data, 2025)
+        )
+    else:
+        # Itemized deductions total (from Schedule A)
+        amount = sum(_get(accessor, data, 0) for accessor in _itemized)
+    # Line 12 - Standard or itemized deduction
+    return {Form1040Fields.LINE_12_STANDARD_DEDUCTION: money(amount)} if amount else {}
+
+
+PERSONAL_INFO_SPEC = FormSpec(
+    fields=[
+        FieldSpec(Form1040Fields.FIRST_NAME, 'personal_info.first_name', as_is, '', keep_empty=True),
+        FieldSpec(Form1040Fields.MIDDLE_INITIAL, 'personal_info.middle_initial', as_is, '', keep_empty=True),
+        FieldSpec(Form1040Fields.LAST_NAME, 'personal_info.last_name', as_is, '', keep_empty=True),
+        # SSN (format: xxx-xx-xxxx)
+        FieldSpec(Form1040Fields.SSN, 'personal_info.ssn', as_is, ''),
+        FieldSpec(Form1040Fields.ADDRESS, 'personal_info.address', as_is, '', keep_empty=True),
+        FieldSpec(Form1040Fields.CITY, 'personal_info.city', as_is, '', keep_empty=True),
+        # State (2-letter code)
+        FieldSpec(Form1040Fields.STATE, 'personal_info.state', as_is, '', keep_empty=True),
+        FieldSpec(Form1040Fields.ZIP_CODE, 'personal_info.zip_code', as_is, '', keep_empty=True),
+    ],
+    computed=[_map_spouse]
+)
+
+SPOUSE_SPEC = FormSpec(fields=[
+    FieldSpec(Form1040Fields.SPOUSE_FIRST_NAME, 'spouse_info.first_name', as_is, '', keep_empty=True),
+    FieldSpec(Form1040Fields.SPOUSE_MIDDLE_INITIAL, 'spouse_info.middle_initial', as_is, '', keep_empty=True),
+    FieldSpec(Form1040Fields.SPOUSE_LAST_NAME, 'spouse_info.last_name', as_is, '', keep_empty=True),
+    FieldSpec(Form1040Fields.SPOUSE_SSN, 'spouse_info.ssn', as_is, ''),
+])
+
+FILING_STATUS_SPEC = FormSpec(computed=[_map_filing_status])
+
+INCOME_SPEC = FormSpec(fields=[
+    # Line 1a - Total wages from all W-2 forms
+    FieldSpec(Form1040Fields.LINE_1A_WAGES,
+              lambda data: W2Calculator.calculate_total_wages(_income(data).get('w2_forms', []))),
+    # Line 2a - Tax-exempt interest
+    FieldSpec(Form1040Fields.LINE_2A_TAX_EXEMPT_INTEREST, lambda data: _interest_total(data, True)),
+    # Line 2b - Taxable interest
+    FieldSpec(Form1040Fields.LINE_2B_TAXABLE_INTEREST, lambda data: _interest_total(data, False)),
+    # Line 3a - Qualified dividends
+    FieldSpec(Form1040Fields.LINE_3A_QUALIFIED_DIVIDENDS,
+              lambda data: sum(item.get('qualified', 0) for item in _income(data).get('dividend_income', []))),
+    # Line 3b - Ordinary dividends
+    FieldSpec(Form1040Fields.LINE_3B_ORDINARY_DIVIDENDS,
+              lambda data: sum(item.get('ordinary', 0) for item in _income(data).get('dividend_income', []))),
+])
+
+DEDUCTIONS_SPEC = FormSpec(computed=[_map_deductions])
+
+PAYMENTS_SPEC = FormSpec(fields=[
+    # Total federal withholding from W-2s
+    FieldSpec(Form1040Fields.LINE_25A_FEDERAL_WITHHOLDING,
+              lambda data: sum(w2.get('federal_withholding', 0) for w2 in _income(data).get('w2_forms', []))),
+    # Estimated tax payments
+    FieldSpec(Form1040Fields.LINE_25B_2024_ESTIMATED_TAX, 'payments.estimated_tax'),
+])
+
+FORM_1040_SPEC = PERSONAL_INFO_SPEC + FILING_STATUS_SPEC + INCOME_SPEC + DEDUCTIONS_SPEC + PAYMENTS_SPEC
+
+
 class Form1040Mapper:
-    """Maps tax data to Form 1040 PDF fields"""
+    """Maps tax data to Form 1040 PDF fields (see FORM_1040_SPEC)"""
+
+    FILING_STATUS_FIELDS = {
+        'Single': Form1040Fields.FILING_STATUS_SINGLE,
+        'Married Filing Jointly': Form1040Fields.FILING_STATUS_MARRIED_JOINTLY,
+        'Married Filing Separately': Form1040Fields.FILING_STATUS_MARRIED_SEPARATELY,
+        'Head of Household': Form1040Fields.FILING_STATUS_HEAD_OF_HOUSEHOLD,
+        'Qualifying Widow(er)': Form1040Fields.FILING_STATUS_QUALIFYING_SURVIVING_SPOUSE,
+        'Qualifying Surviving Spouse': Form1040Fields.FILING_STATUS_QUALIFYING_SURVIVING_SPOUSE,
+    }
     
     @staticmethod
     def map_personal_info(tax_data) -> Dict[str, str]:
         """Map personal information to Form 1040 fields"""
-        fields = {}
-        
-        # Taxpayer information
-        first_name = tax_data.get('personal_info.first_name', '')
-        middle_initial = tax_data.get('personal_info.middle_initial', '')
-        last_name = tax_data.get('personal_info.last_name', '')
-        
-        fields[Form1040Fields.FIRST_NAME] = first_name
-        fields[Form1040Fields.MIDDLE_INITIAL] = middle_initial  
-        fields[Form1040Fields.LAST_NAME] = last_name
-        
-        # SSN (format: xxx-xx-xxxx)
-        ssn = tax_data.get('personal_info.ssn', '')
-        if ssn:
-            fields[Form1040Fields.SSN] = ssn
-        
-        # Address (street)
-        fields[Form1040Fields.ADDRESS] = tax_data.get('personal_info.address', '')
-        
-        # City
-        city = tax_data.get('personal_info.city', '')
-        fields[Form1040Fields.CITY] = city
-        
-        # State (2-letter code)
-        state = tax_data.get('personal_info.state', '')
-        fields[Form1040Fields.STATE] = state
-        
-        # ZIP code
-        zip_code = tax_data.get('personal_info.zip_code', '')
-        fields[Form1040Fields.ZIP_CODE] = zip_code
-        
-        # Spouse information (if filing jointly)
-        filing_status = tax_data.get('filing_status.status', '')
-        if filing_status == 'Married Filing Jointly':
-            spouse_first = tax_data.get('spouse_info.first_name', '')
-            spouse_mi = tax_data.get('spouse_info.middle_initial', '')
-            spouse_last = tax_data.get('spouse_info.last_name', '')
-            
-            fields[Form1040Fields.SPOUSE_FIRST_NAME] = spouse_first
-            fields[Form1040Fields.SPOUSE_MIDDLE_INITIAL] = spouse_mi
-            fields[Form1040Fields.SPOUSE_LAST_NAME] = spouse_last
-            
-            spouse_ssn = tax_data.get('spouse_info.ssn', '')
-            if spouse_ssn:
-                fields[Form1040Fields.SPOUSE_SSN] = spouse_ssn
-        
-        return fields
+        return PERSONAL_INFO_SPEC.map(tax_data)
     
     @staticmethod
     def map_filing_status(tax_data) -> Dict[str, str]:
         """Map filing status to Form 1040 checkboxes"""
-        fields = {}
-        
-        filing_status = tax_data.get('filing_status.status', 'Single')
-        
-        # Checkboxes for filing status
-        if filing_status == 'Single':
-            fields[Form1040Fields.FILING_STATUS_SINGLE] = Form1040Fields.CHECKBOX_CHECKED
-        elif filing_status == 'Married Filing Jointly':
-            fields[Form1040Fields.FILING_STATUS_MARRIED_JOINTLY] = Form1040Fields.CHECKBOX_CHECKED
-        elif filing_status == 'Married Filing Separately':
-            fields[Form1040Fields.FILING_STATUS_MARRIED_SEPARATELY] = Form1040Fields.CHECKBOX_CHECKED
-        elif filing_status == 'Head of Household':
-            fields[Form1040Fields.FILING_STATUS_HEAD_OF_HOUSEHOLD] = Form1040Fields.CHECKBOX_CHECKED
-        elif filing_status in ['Qualifying Widow(er)', 'Qualifying Surviving Spouse']:
-            fields[Form1040Fields.FILING_STATUS_QUALIFYING_SURVIVING_SPOUSE] = Form1040Fields.CHECKBOX_CHECKED
-        
-        return fields
+        return FILING_STATUS_SPEC.map(tax_data)
     
     @staticmethod
     def map_income(tax_data) -> Dict[str, str]:
         """Map income items to Form 1040 fields"""
-        fields = {}
-        
-        # Performance: Get income section once
-        income_section = tax_data.get('income', {}) if hasattr(tax_data, 'get') else tax_data.data.get('income', {})
-        
-        # Line 1a - Total wages from all W-2 forms
-        w2_forms = income_section.get('w2_forms', [])
-        total_wages = W2Calculator.calculate_total_wages(w2_forms)
-        
-        if total_wages:
-            fields[Form1040Fields.LINE_1A_WAGES] = f"{total_wages:,.2f}"
-        
-        # Performance: Get interest/dividend income once
-        interest_income = income_section.get('interest_income', [])
-        dividend_income = income_section.get('dividend_income', [])
-        
-        # Line 2a - Tax-exempt interest
-        tax_exempt_interest = sum(item.get('amount', 0) for item in interest_income if item.get('tax_exempt', False))
-        if tax_exempt_interest:
-            fields[Form1040Fields.LINE_2A_TAX_EXEMPT_INTEREST] = f"{tax_exempt_interest:,.2f}"
-        
-        # Line 2b - Taxable interest
-        taxable_interest = sum(item.get('amount', 0) for item in interest_income if not item.get('tax_exempt', False))
-        if taxable_interest:
-            fields[Form1040Fields.LINE_2B_TAXABLE_INTEREST] = f"{taxable_interest:,.2f}"
-        
-        # Line 3a - Qualified dividends
-        qualified_divs = sum(item.get('qualified', 0) for item in dividend_income)
-        if qualified_divs:
-            fields[Form1040Fields.LINE_3A_QUALIFIED_DIVIDENDS] = f"{qualified_divs:,.2f}"
-        
-        # Line 3b - Ordinary dividends
-        ordinary_divs = sum(item.get('ordinary', 0) for item in dividend_income)
-        if ordinary_divs:
-            fields[Form1040Fields.LINE_3B_ORDINARY_DIVIDENDS] = f"{ordinary_divs:,.2f}"
-        
-        return fields
+        return INCOME_SPEC.map(tax_data)
     
     @staticmethod
     def map_deductions(tax_data) -> Dict[str, str]:
         """Map deduction fields to Form 1040"""
-        fields = {}
-        
-        # Determine deduction method
-        deduction_method = tax_data.get('deductions.method', 'standard')
-        
-        if deduction_method == 'standard':
-            # Calculate standard deduction based on filing status
-            filing_status = tax_data.get('filing_status.status', 'Single')
-            tax_year = tax_data.get('basic_info.tax_year', 2025)
-            
-            standard_deduction = calculate_standard_deduction(
-                filing_status,
-                tax_year
-            )
-            
-            # Line 12 - Standard deduction
-            if standard_deduction:
-                fields[Form1040Fields.LINE_12_STANDARD_DEDUCTION] = f"{standard_deduction:,.2f}"
-        else:
-            # Itemized deductions total (from Schedule A)
-            itemized_total = (
-                tax_data.get('deductions.medical_expenses', 0) +
-                tax_data.get('deductions.state_local_taxes', 0) +
-                tax_data.get('deductions.mortgage_interest', 0) +
-                tax_data.get('deductions.charitable_contributions', 0)
-            )
-            if itemized_total:
-                fields[Form1040Fields.LINE_12_STANDARD_DEDUCTION] = f"{itemized_total:,.2f}"
-        
-        return fields
+        return DEDUCTIONS_SPEC.map(tax_data)
     
     @staticmethod
     def map_payments(tax_data) -> Dict[str, str]:
         """Map payment and withholding information"""
-        fields = {}
-        
-        # Get income section for W-2 withholding
-        income_section = tax_data.get('income', {}) if hasattr(tax_data, 'get') else tax_data.data.get('income', {})
-        w2_forms = income_section.get('w2_forms', [])
-        
-        # Calculate total federal withholding from W-2s
-        total_withholding = sum(w2.get('federal_withholding', 0) for w2 in w2_forms)
-        
-        if total_withholding:
-            fields[Form1040Fields.LINE_25A_FEDERAL_WITHHOLDING] = f"{total_withholding:,.2f}"
-        
-        # Estimated tax payments
-        estimated_tax = tax_data.get('payments.estimated_tax', 0)
-        if estimated_tax:
-            fields[Form1040Fields.LINE_25B_2024_ESTIMATED_TAX] = f"{estimated_tax:,.2f}"
-        
-        return fields
+        return PAYMENTS_SPEC.map(tax_data)
     
     @staticmethod
     def get_all_fields(tax_data) -> Dict[str, str]:
         """Get all mapped fields for Form 1040"""
-        fields = {}
-        
-        # Combine all field mappings
-        fields.update(Form1040Mapper.map_personal_info(tax_data))
-        fields.update(Form1040Mapper.map_filing_status(tax_data))
-        fields.update(Form1040Mapper.map_income(tax_data))
-        fields.update(Form1040Mapper.map_deductions(tax_data))
-        fields.update(Form1040Mapper.map_payments(tax_data))
-        
-        return fields
+        return FORM_1040_SPEC.map(tax_data)
+
+    @staticmethod
+    def get_all_fields_many(returns: Sequence[Any]) -> List[Dict[str, str]]:
+        """Get all mapped Form 1040 fields for a batch of returns"""
+        return FORM_1040_SPEC.map_many(returns)
 
 
 class Form8949Mapper:
-    """Maps tax data to Form 8949 PDF fields"""
+    """
+    Maps tax data to Form 8949 PDF fields
 
-    @staticmethod
-    def map_capital_gains(tax_data) -> Dict[str, str]:
-        """Map capital gains/losses to Form 8949 fields"""
-        fields = {}
-        capital_gains = tax_data.get('income', {}).get('capital_gains', [])
+    Each copy of the form has room for 14 lots per part. Returns with more
+    lots are laid out across continuation copies (see iter_pages); each copy
+    carries the totals of its own lots, and the grand totals over all copies
+    feed Schedule D.
+    """
 
-        if not capital_gains:
-            return fields
+    LOTS_PER_PART = 14
 
-        # Separate short-term and long-term transactions
+    @staticmethod
+    def capital_gains(tax_data) -> List[Any]:
+        """The return's lots, in entry order"""
+        return tax_data.get('income', {}).get('capital_gains', []) or []
+
+    @staticmethod
+    def _split_lots(capital_gains: Sequence[Any]) -> Tuple[List[Any], List[Any]]:
+        """Short-term and long-term lots, in entry order"""
         short_term = [cg for cg in capital_gains if cg.get('holding_period') == 'Short-term']
         long_term = [cg for cg in capital_gains if cg.get('holding_period') == 'Long-term']
+        return short_term, long_term
 
-        # Map short-term transactions (Part I)
-        fields.update(Form8949Mapper._map_transactions(short_term, "short"))
+    @staticmethod
+    def _split_terms(tax_data) -> Tuple[List[Any], List[Any]]:
+        """Short-term and long-term lots of a return, in entry order"""
+        return Form8949Mapper._split_lots(Form8949Mapper.capital_gains(tax_data))
+
+    @staticmethod
+    def _pages_for(short_term: list, long_term: list) -> int:
+        per_part = Form8949Mapper.LOTS_PER_PART
+        return max(-(-len(short_term) // per_part), -(-len(long_term) // per_part))
 
-        # Map long-term transactions (Part II)
-        fields.update(Form8949Mapper._map_transactions(long_term, "long"))
+    @staticmethod
+    def page_count(tax_data) -> int:
+        """Number of Form 8949 copies needed for all lots (0 without capital gains)"""
+        return Form8949Mapper._pages_for(*Form8949Mapper._split_terms(tax_data))
 
+    @staticmethod
+    def _map_page(short_term: list, long_term: list, page: int) -> Dict[str, str]:
+        """Map one copy's share of the short-term and long-term lots"""
+        per_part = Form8949Mapper.LOTS_PER_PART
+        start = page * per_part
+        fields = Form8949Mapper._map_transactions(short_term[start:start + per_part], "short")
+        fields.update(Form8949Mapper._map_transactions(long_term[start:start + per_part], "long"))
         return fields
 
+    @staticmethod
+    def map_capital_gains(tax_data) -> Dict[str, str]:
+        """Map the lots on the first copy of Form 8949"""
+        short_term, long_term = Form8949Mapper._split_terms(tax_data)
+        if not short_term and not long_term:
+            return {}
+        return Form8949Mapper._map_page(short_term, long_term, 0)
+
+    @staticmethod
+    def iter_pages(tax_data) -> Iterator[Dict[str, str]]:
+        """
+        Map every copy of Form 8949, one at a time.
+
+        Field dicts are built only as each copy is requested, so a return with
+        tens of thousands of lots never holds more than one copy's fields.
+
+        Args:
+            tax_data: Tax data
+
+        Yields:
+            Field values for each copy, with that copy's totals
+        """
+        personal_info = Form1040Mapper.map_personal_info(tax_data)
+        for lot_fields in Form8949Mapper.iter_lot_pages(Form8949Mapper.capital_gains(tax_data)):
+            fields = dict(personal_info)
+            fields.update(lot_fields)
+            yield fields
+
+    @staticmethod
+    def iter_lot_pages(capital_gains: Sequence[Any]) -> Iterator[Dict[str, str]]:
+        """
+        Map the lots of every copy of Form 8949, one copy at a time.
+
+        Like iter_pages without the personal info, so a filler given only
+        the lots can map the copies as it fills them.
+
+        Args:
+            capital_gains: The return's lots (see capital_gains)
+
+        Yields:
+            Lot and total fields for each copy
+        """
+        short_term, long_term = Form8949Mapper._split_lots(capital_gains)
+        for page in range(Form8949Mapper._pages_for(short_term, long_term)):
+            yield Form8949Mapper._map_page(short_term, long_term, page)
+
+    @staticmethod
+    def calculate_totals(tax_data) -> Dict[str, Dict[str, Decimal]]:
+        """
+        Grand totals over all copies, as carried to Schedule D.
+
+        Args:
+            tax_data: Tax data
+
+        Returns:
+            ``{'short': {...}, 'long': {...}}`` with proceeds, basis and
+            gain_loss per part; parts without lots are omitted
+        """
+        totals = {}
+        for term_type, transactions in zip(("short", "long"), Form8949Mapper._split_terms(tax_data)):
+            if transactions:
+                totals[term_type] = Form8949Mapper._part_totals(transactions)
+        return totals
+
+    @staticmethod
+    def _part_totals(transactions: list) -> Dict[str, Decimal]:
+        """Proceeds, basis and gain/loss totals in exact cents"""
+        return {
+            'proceeds': sum_money(t.get('sales_price', 0) for t in transactions),
+            'basis': sum_money(t.get('adjusted_basis', t.get('cost_basis', 0)) for t in transactions),
+            'gain_loss': sum_money(t.get('gain_loss', 0) for t in transactions),
+        }
+
     @staticmethod
     def _map_transactions(transactions: list, term_type: str) -> Dict[str, str]:
-        """Map transactions to Form 8949 fields"""
+        """Map one copy's transactions (at most 14) to Form 8949 fields"""
         fields = {}
         prefix = "1" if term_type == "short" else "2"  # Part I or Part II
 
-        for i, transaction in enumerate(transactions[:14]):  # Form 8949 has space for 14 transactions per part
+        for i, transaction in enumerate(transactions[:Form8949Mapper.LOTS_PER_PART]):
             base_field = f"{prefix}({chr(97 + i)})"  # a, b, c, etc.
 
             # Column (a) - Description
@@ -256,21 +318,18 @@ class Form8949Mapper:
             gain_loss = transaction.get('gain_loss', 0)
             fields[f"{base_field}_gain_loss"] = f"{gain_loss:.2f}"
 
-        # Calculate totals for this part
+        # Totals for this copy
         if transactions:
-            total_proceeds = sum(t.get('sales_price', 0) for t in transactions)
-            total_basis = sum(t.get('adjusted_basis', t.get('cost_basis', 0)) for t in transactions)
-            total_gain_loss = sum(t.get('gain_loss', 0) for t in transactions)
-
-            fields[f"{prefix}_total_proceeds"] = f"{total_proceeds:.2f}"
-            fields[f"{prefix}_total_basis"] = f"{total_basis:.2f}"
-            fields[f"{prefix}_total_gain_loss"] = f"{total_gain_loss:.2f}"
+            totals = Form8949Mapper._part_totals(transactions[:Form8949Mapper.LOTS_PER_PART])
+            fields[f"{prefix}_total_proceeds"] = f"{totals['proceeds']:.2f}"
+            fields[f"{prefix}_total_basis"] = f"{totals['basis']:.2f}"
+            fields[f"{prefix}_total_gain_loss"] = f"{totals['gain_loss']:.2f}"
 
         return fields
 
     @staticmethod
     def get_all_fields(tax_data) -> Dict[str, str]:
-        """Get all mapped fields for Form 8949"""
+        """Get mapped fields for the first copy of Form 8949 (see iter_pages for the rest)"""
         fields = {}
 
         # Map personal info (for identification)
@@ -280,3 +339,160 @@ class Form8949Mapper:
         fields.update(Form8949Mapper.map_capital_gains(tax_data))
 
         return fields
+
+
+# Schedules of Form 1040. Field names are the IRS template's; ``{row}`` is
+# the line's position in a repeating group.
+
+def _schedule_1_other_business_income(data: Dict[str, Any]) -> Any:
+    income = _income(data)
+    return income.get('rental_income', 0) + income.get('partnership_income', 0) + income.get('s_corp_income', 0)
+
+
+SCHEDULE_1_SPEC = FormSpec(fields=[
+    # Part I: Additional Income
+    # Line 1: Taxable refunds, credits, or offsets of state and local income taxes
+    FieldSpec('topmostSubform[0].Page1[0].Line1_ReadOrder[0].f1_01[0]', 'income.state_tax_refunds'),
+    # Line 2b: Taxable interest
+    FieldSpec('topmostSubform[0].Page1[0].Line2b_ReadOrder[0].f1_02[0]', lambda data: _interest_total(data, False)),
+    # Line 3b: Ordinary dividends
+    FieldSpec('topmostSubform[0].Page1[0].Line3b_ReadOrder[0].f1_03[0]',
+              lambda data: sum(item.get('ordinary', 0) for item in _income(data).get('dividend_income', []))),
+    # Line 4b: IRA distributions (taxable amount)
+    FieldSpec('topmostSubform[0].Page1[0].Line4b_ReadOrder[0].f1_04[0]', 'income.ira_distributions'),
+    # Line 5b: Pensions and annuities (taxable amount)
+    FieldSpec('topmostSubform[0].Page1[0].Line5b_ReadOrder[0].f1_05[0]', 'income.pensions_annuities'),
+    # Line 8b: Rental real estate, royalties, partnerships, S corporations, etc.
+    FieldSpec('topmostSubform[0].Page1[0].Line8b_ReadOrder[0].f1_08[0]', _schedule_1_other_business_income),
+    # Part II: Adjustments to Income
+    FieldSpec('topmostSubform[0].Page1[0].Line12_ReadOrder[0].f1_12[0]', 'adjustments.educator_expenses'),
+    FieldSpec('topmostSubform[0].Page1[0].Line13_ReadOrder[0].f1_13[0]', 'adjustments.business_income_deduction'),
+    FieldSpec('topmostSubform[0].Page1[0].Line14_ReadOrder[0].f1_14[0]', 'adjustments.hsa_deduction'),
+    FieldSpec('topmostSubform[0].Page1[0].Line15_ReadOrder[0].f1_15[0]', 'adjustments.moving_expenses'),
+    FieldSpec('topmostSubform[0].Page1[0].Line16_ReadOrder[0].f1_16[0]', 'adjustments.sep_simple_deduction'),
+    FieldSpec('topmostSubform[0].Page1[0].Line17_ReadOrder[0].f1_17[0]', 'adjustments.health_insurance_deduction'),
+    FieldSpec('topmostSubform[0].Page1[0].Line18_ReadOrder[0].f1_18[0]', 'adjustments.early_withdrawal_penalty'),
+])
+
+SCHEDULE_A_SPEC = FormSpec(fields=[
+    # Part I: Medical and Dental Expenses
+    FieldSpec('topmostSubform[0].Page1[0].Line1_ReadOrder[0].f1_01[0]', 'deductions.medical_expenses'),
+    # Part II: Taxes You Paid
+    FieldSpec('topmostSubform[0].Page1[0].Line5_ReadOrder[0].f1_05[0]', 'deductions.state_local_taxes'),
+    FieldSpec('topmostSubform[0].Page1[0].Line6_ReadOrder[0].f1_06[0]', 'deductions.real_estate_taxes'),
+    FieldSpec('topmostSubform[0].Page1[0].Line7_ReadOrder[0].f1_07[0]', 'deductions.personal_property_taxes'),
+    FieldSpec('topmostSubform[0].Page1[0].Line8_ReadOrder[0].f1_08[0]', 'deductions.other_taxes'),
+    # Part III: Interest You Paid
+    FieldSpec('topmostSubform[0].Page1[0].Line10_ReadOrder[0].f1_10[0]', 'deductions.mortgage_interest'),
+    FieldSpec('topmostSubform[0].Page1[0].Line11_ReadOrder[0].f1_11[0]', 'deductions.unreported_mortgage_interest'),
+    FieldSpec('topmostSubform[0].Page1[0].Line12_ReadOrder[0].f1_12[0]', 'deductions.points_not_reported'),
+    FieldSpec('topmostSubform[0].Page1[0].Line13_ReadOrder[0].f1_13[0]', 'deductions.mortgage_insurance'),
+    FieldSpec('topmostSubform[0].Page1[0].Line14_ReadOrder[0].f1_14[0]', 'deductions.investment_interest'),
+    # Part IV: Gifts to Charity
+    FieldSpec('topmostSubform[0].Page1[0].Line15_ReadOrder[0].f1_15[0]', 'deductions.cash_contributions'),
+    FieldSpec('topmostSubform[0].Page1[0].Line16_ReadOrder[0].f1_16[0]', 'deductions.non_cash_contributions'),
+    FieldSpec('topmostSubform[0].Page1[0].Line17_ReadOrder[0].f1_17[0]', 'deductions.carryover_contributions'),
+    # Part V: Casualty and Theft Losses
+    FieldSpec('topmostSubform[0].Page1[0].Line18_ReadOrder[0].f1_18[0]', 'deductions.casualty_losses'),
+    # Part VI: Other Itemized Deductions
+    FieldSpec('topmostSubform[0].Page1[0].Line19_ReadOrder[0].f1_19[0]', 'deductions.other_misc_deductions'),
+])
+
+
+def _capital_gain_rows(line: str, fields: Tuple[str, ...]) -> Tuple[FieldSpec, ...]:
+    """Columns (a)-(e) and (g) of a Schedule D transaction line"""
+    columns = ('a', 'b', 'c', 'd', 'e', 'g')
+    sources = ('description', 'date_acquired', 'date_sold', 'sales_price', 'cost_basis', 'gain_loss')
+    return tuple(
+        FieldSpec(f'topmostSubform[0].Page1[0].Line{line}{column}_ReadOrder[{{row}}].{field}[0]', source,
+                  *((as_is, '') if index < 3 else ()))
+        for index, (column, source, field) in enumerate(zip(columns, sources, fields))
+    )
+
+
+def _schedule_d_totals(data: Dict[str, Any]) -> Dict[str, str]:
+    # Totals: the grand totals of all Form 8949 copies
+    fields = {}
+    totals = Form8949Mapper.calculate_totals(data)
+    if 'short' in totals:
+        fields['topmostSubform[0].Page1[0].Line2_ReadOrder[0].f1_15[0]'] = money(totals['short']['proceeds'])
+        fields['topmostSubform[0].Page1[0].Line3_ReadOrder[0].f1_16[0]'] = money(totals['short']['basis'])
+        fields['topmostSubform[0].Page1[0].Line5_ReadOrder[0].f1_18[0]'] = money(totals['short']['gain_loss'])
+    if 'long' in totals:
+        fields['topmostSubform[0].Page1[0].Line9_ReadOrder[0].f1_19[0]'] = money(totals['long']['proceeds'])
+        fields['topmostSubform[0].Page1[0].Line10_ReadOrder[0].f1_20[0]'] = money(totals['long']['basis'])
+        fields['topmostSubform[0].Page1[0].Line12_ReadOrder[0].f1_22[0]'] = money(totals['long']['gain_loss'])
+    return fields
+
+
+SCHEDULE_D_SPEC = FormSpec(
+    rows=[
+        # Part I: Short-Term Capital Gains and Losses (room for 14 transactions)
+        RowSpec(lambda data: Form8949Mapper._split_terms(data)[0],
+                _capital_gain_rows('1', ('f1_01', 'f1_02', 'f1_03', 'f1_04', 'f1_05', 'f1_07')), 14),
+        # Part II: Long-Term Capital Gains and Losses
+        RowSpec(lambda data: Form8949Mapper._split_terms(data)[1],
+                _capital_gain_rows('8', ('f1_08', 'f1_09', 'f1_10', 'f1_11', 'f1_12', 'f1_14')), 14),
+    ],
+    computed=[_schedule_d_totals]
+)
+
+# Schedule E expense lines 5A-5M: (line, field number, data key)
+SCHEDULE_E_EXPENSES = (
+    ('5A', 4, 'advertising'), ('5B', 5, 'auto_travel'), ('5C', 6, 'cleaning_maintenance'),
+    ('5D', 7, 'commissions'), ('5E', 8, 'insurance'), ('5F', 9, 'legal_fees'),
+    ('5G', 10, 'management_fees'), ('5H', 11, 'mortgage_interest'), ('5I', 12, 'other_interest'),
+    ('5J', 13, 'repairs'), ('5K', 14, 'supplies'), ('5L', 15, 'taxes_licenses'), ('5M', 16, 'utilities'),
+)
+SCHEDULE_E_PROPERTIES = 3
+
+
+def _rental_location(rental: Dict[str, Any]) -> Any:
+    city, state = rental.get('city', ''), rental.get('state', '')
+    return f"{city}, {state}" if city and state else None
+
+
+def _schedule_e_totals(data: Dict[str, Any]) -> Dict[str, str]:
+    fields = {}
+    properties = (_income(data).get('rental_income') or [])[:SCHEDULE_E_PROPERTIES]
+
+    def total(keys) -> Decimal:
+        return sum((Decimal(str(rental.get(key) or 0)) for rental in properties for key in keys), Decimal('0'))
+
+    total_rental_income = total(['gross_rental_income'])
+    total_rental_expenses = total([key for _, _, key in SCHEDULE_E_EXPENSES])
+    total_depreciation = total(['depreciation'])
+
+    # Total rental real estate income (Line 23)
+    if total_rental_income > 0:
+        fields['topmostSubform[0].Page1[0].Line23_ReadOrder[0].f1_23[0]'] = money(total_rental_income)
+    # Total rental real estate expenses (Line 20)
+    if total_rental_expenses > 0:
+        fields['topmostSubform[0].Page1[0].Line20_ReadOrder[0].f1_20[0]'] = money(total_rental_expenses)
+    # Depreciation (Line 22)
+    if total_depreciation > 0:
+        fields['topmostSubform[0].Page1[0].Line22_ReadOrder[0].f1_22[0]'] = money(total_depreciation)
+    # Net rental income/loss (Line 26)
+    net_rental = total_rental_income - total_rental_expenses - total_depreciation
+    if net_rental != 0:
+        fields['topmostSubform[0].Page1[0].Line26_ReadOrder[0].f1_26[0]'] = money(net_rental)
+    return fields
+
+
+SCHEDULE_E_SPEC = FormSpec(
+    rows=[
+        # Part I: Income or Loss From Rental Real Estate and Royalties (3 properties)
+        RowSpec('income.rental_income', (
+            # Property address (Line 1A) and location (Line 1B)
+            FieldSpec('topmostSubform[0].Page1[0].Line1_ReadOrder[{row}].f1_01[{row}]', 'address', truncate(35), ''),
+            FieldSpec('topmostSubform[0].Page1[0].Line1_ReadOrder[{row}].f1_02[{row}]', _rental_location, truncate(25), ''),
+            # Gross rents (Line 3)
+            FieldSpec('topmostSubform[0].Page1[0].Line3_ReadOrder[{row}].f1_03[{row}]', 'gross_rental_income'),
+            *(FieldSpec(f'topmostSubform[0].Page1[0].Line{line}_ReadOrder[{{row}}].f1_{number:02d}[{{row}}]', key)
+              for line, number, key in SCHEDULE_E_EXPENSES),
+            # Depreciation expense or depletion (Line 12)
+            FieldSpec('topmostSubform[0].Page1[0].Line12_ReadOrder[{row}].f1_17[{row}]', 'depreciation'),
+        ), SCHEDULE_E_PROPERTIES),
+    ],
+    computed=[_schedule_e_totals]
+)
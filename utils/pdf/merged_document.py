@@ -0,0 +1,243 @@
+"""
+Merged Document - Build a whole return as one PDF
+
+Forms are appended to a single writer as they are filled, with a bookmark
+per form, and the document is written once. The IRS templates each carry
+their own copies of the same fonts and appearance streams; before writing,
+byte-identical resource objects are collapsed into one shared object.
+
+Every form's top-level fields are renamed with a per-form suffix, so forms
+built from templates with the same field names (all IRS forms use
+``topmostSubform[0]``) keep independent values.
+"""
+
+import hashlib
+import io
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    StreamObject,
+    TextStringObject,
+)
+
+from utils.pdf.flatten import drop_unreachable_objects, flatten_document
+from utils.pdf.template_cache import FormTemplate
+
+logger = logging.getLogger(__name__)
+
+# Dictionary types that can be shared between pages and forms
+SHAREABLE_TYPES = frozenset({'/Font', '/FontDescriptor', '/Encoding', '/ExtGState', '/XObject'})
+
+
+def _object_key(obj: Any) -> bytes:
+    """Digest of an object's serialized form"""
+    buffer = io.BytesIO()
+    obj.write_to_stream(buffer)
+    return hashlib.sha256(buffer.getvalue()).digest()
+
+
+def _is_shareable(obj: Any) -> bool:
+    if isinstance(obj, StreamObject):
+        return True
+    return isinstance(obj, DictionaryObject) and obj.get('/Type') in SHAREABLE_TYPES
+
+
+def _references(writer: PdfWriter, obj: Any) -> List[Tuple[Any, Any, IndirectObject]]:
+    """(container, key, reference) for each reference an object holds, nested or not"""
+    references = []
+    stack = [obj]
+    while stack:
+        container = stack.pop()
+        # Raw access: indexing a pypdf container would resolve references
+        if isinstance(container, dict):
+            items = dict.items(container)
+        elif isinstance(container, list):
+            items = enumerate(list.__iter__(container))
+        else:
+            continue
+        for key, value in items:
+            if isinstance(value, IndirectObject):
+                if value.pdf is writer:
+                    references.append((container, key, value))
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return references
+
+
+def _redirect(references: List[Tuple[Any, Any, IndirectObject]], replacements: Dict[int, int]) -> None:
+    """Point references to replaced objects at their replacements"""
+    for container, key, reference in references:
+        target = replacements.get(reference.idnum)
+        if target is not None:
+            setter = dict.__setitem__ if isinstance(container, dict) else list.__setitem__
+            setter(container, key, IndirectObject(target, 0, reference.pdf))
+
+
+def deduplicate_objects(writer: PdfWriter) -> int:
+    """
+    Collapse byte-identical streams and shared resource dictionaries.
+
+    Objects are visited children first, so an object's references already
+    point at merged objects when it is hashed; objects that only differed in
+    references to duplicates are merged too, and each object is serialized
+    once. The duplicates are left unreferenced and written as ``null`` (see
+    drop_unreachable_objects), so object numbers stay valid.
+
+    Args:
+        writer: Document to compact in place
+
+    Returns:
+        Number of objects dropped
+    """
+    canonical: Dict[bytes, int] = {}
+    replacements: Dict[int, int] = {}
+    references: Dict[int, List[Tuple[Any, Any, IndirectObject]]] = {}
+    stack = [(writer._root_object.indirect_reference.idnum, False)]
+    while stack:
+        idnum, children_done = stack.pop()
+        obj = writer.get_object(idnum)
+        if not children_done:
+            if idnum in references:
+                continue
+            references[idnum] = _references(writer, obj)
+            stack.append((idnum, True))
+            stack.extend((ref.idnum, False) for _, _, ref in references[idnum] if ref.idnum not in references)
+            continue
+        _redirect(references[idnum], replacements)
+        if _is_shareable(obj):
+            idnum_kept = canonical.setdefault(_object_key(obj), idnum)
+            if idnum_kept != idnum:
+                replacements[idnum] = idnum_kept
+    if not replacements:
+        return 0
+    # A reference closing a cycle can be followed before its target is merged
+    for held in references.values():
+        _redirect(held, replacements)
+    drop_unreachable_objects(writer)
+    return len(replacements)
+
+
+class MergedDocument:
+    """One PDF assembled from filled forms and existing documents"""
+
+    def __init__(self):
+        self.writer = PdfWriter()
+        self._fields = ArrayObject()
+
+    @property
+    def page_count(self) -> int:
+        """Pages added so far"""
+        return len(self.writer.pages)
+
+    def _begin_append(self) -> None:
+        # PdfWriter.append() checks each new field against the whole /Fields
+        # array, so give it an empty one and collect the fields ourselves
+        acro_form = self.writer._root_object.get('/AcroForm')
+        if acro_form is not None:
+            acro_form.get_object()[NameObject('/Fields')] = ArrayObject()
+
+    def _end_append(self, field_suffix: str) -> None:
+        acro_form = self.writer._root_object.get('/AcroForm')
+        if acro_form is None:
+            return
+        added = acro_form.get_object().get('/Fields', ArrayObject())
+        for field_ref in added:
+            field = field_ref.get_object()
+            if field_suffix and '/T' in field:
+                field[NameObject('/T')] = TextStringObject(f"{field['/T']}{field_suffix}")
+        self._fields.extend(added)
+
+    def add_form(
+        self,
+        template: FormTemplate,
+        field_values: Dict[str, Any],
+        field_suffix: str = "",
+        on_page: Optional[Callable[[int], None]] = None,
+        appearances: bool = True
+    ) -> int:
+        """
+        Append a filled copy of a form.
+
+        Args:
+            template: Parsed form template
+            field_values: Field name to value
+            field_suffix: Appended to the copy's top-level field names
+            on_page: Called with each page's index once it is filled
+            appearances: Generate the fields' appearance streams (see
+                FormTemplate.fill)
+
+        Returns:
+            Index of the copy's first page
+        """
+        first_page = self.page_count
+        self._begin_append()
+        template.append_to(self.writer)
+        template.fill(self.writer, field_values, first_page, on_page, appearances)
+        self._end_append(field_suffix)
+        return first_page
+
+    def add_pdf(self, path: str, field_suffix: str = "") -> int:
+        """
+        Append an existing PDF, such as a state return.
+
+        Args:
+            path: PDF file
+            field_suffix: Appended to the document's top-level field names
+
+        Returns:
+            Index of the document's first page
+        """
+        first_page = self.page_count
+        self._begin_append()
+        self.writer.append(PdfReader(path))
+        self._end_append(field_suffix)
+        return first_page
+
+    def add_bookmark(self, title: str, page: int, parent: Optional[Any] = None) -> Any:
+        """
+        Add an outline entry.
+
+        Args:
+            title: Bookmark text
+            page: Target page index
+            parent: Enclosing bookmark, for nested entries
+
+        Returns:
+            The outline item, usable as a parent
+        """
+        return self.writer.add_outline_item(title, page, parent=parent)
+
+    def write(self, output_path: str, deduplicate: bool = True, flatten: bool = False) -> Path:
+        """
+        Save the document.
+
+        Args:
+            output_path: Destination file
+            deduplicate: Collapse identical resource objects first
+            flatten: Burn field values into the pages (see utils.pdf.flatten)
+
+        Returns:
+            Path written
+        """
+        acro_form = self.writer._root_object.get('/AcroForm')
+        if acro_form is not None:
+            acro_form.get_object()[NameObject('/Fields')] = self._fields
+        if flatten:
+            flatten_document(self.writer)
+        if deduplicate:
+            dropped = deduplicate_objects(self.writer)
+            logger.debug(f"Dropped {dropped} duplicate objects")
+
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, 'wb') as f:
+            self.writer.write(f)
+        logger.info(f"Created PDF: {output_file}")
+        return output_file
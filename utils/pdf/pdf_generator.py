@@ -6,21 +6,121 @@ This module coordinates the generation of complete tax returns by:
 - Filling multiple forms with appropriate data
 - Managing form dependencies and schedules
 - Providing batch export functionality
+
+Batch exports can run in a process pool: returns are mapped to field
+dictionaries in the calling process, and each worker parses the templates
+once (in its initializer) and only fills and writes PDFs.
+
+Re-exports are incremental: an export manifest in the output directory
+records a digest of each form's mapped field values, and forms whose digest
+hasn't changed are not filled again.
 """
 
 import os
 import logging
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
+from utils.pdf.export_manifest import ExportManifest, fingerprint
 from utils.pdf.form_filler import PDFFormFiller
-from utils.pdf.form_mappers import Form1040Mapper, Form8949Mapper
+from utils.pdf.merged_document import MergedDocument
+from utils.pdf.form_mappers import (
+    Form1040Mapper, Form8949Mapper, FORM_1040_SPEC,
+    SCHEDULE_1_SPEC, SCHEDULE_A_SPEC, SCHEDULE_D_SPEC, SCHEDULE_E_SPEC
+)
 from utils.plugins import PluginRegistry, PluginLoader
 from utils.pdf.field_mapper import DotDict
 
 logger = logging.getLogger(__name__)
 
+# Forms mapped entirely by a field spec; batch export maps each of them for
+# all the returns that need it in one map_many() call
+SPEC_MAPPED_FORMS = {
+    "Form 1040": FORM_1040_SPEC,
+    "Form 1040 (Schedule 1)": SCHEDULE_1_SPEC,
+    "Form 1040 (Schedule A)": SCHEDULE_A_SPEC,
+    "Form 1040 (Schedule D)": SCHEDULE_D_SPEC,
+    "Form 1040 (Schedule E)": SCHEDULE_E_SPEC,
+}
+
+# Signature date fields hold the day the return is generated; they are left
+# out of form digests so an unchanged return isn't refilled every new day
+SIGNATURE_DATE_FIELDS = (
+    'topmostSubform[0].Page2[0].YourSignature_ReadOrder[0].f2_02[0]',
+    'topmostSubform[0].Page2[0].SpouseSignature_ReadOrder[0].f2_05[0]',
+)
+
+
+@dataclass
+class FormFillJob:
+    """One form of one return, already mapped to PDF field values"""
+    form_name: str
+    field_values: Dict[str, str]
+    output_path: str
+    # Lots of Form 8949, whose copies are mapped one at a time as they are
+    # filled; field_values then holds the fields every copy shares
+    lots: Optional[List[Dict[str, Any]]] = None
+
+    def iter_copies(self) -> Iterator[Dict[str, str]]:
+        """Field values of each copy of a form filled from lots"""
+        for lot_fields in Form8949Mapper.iter_lot_pages(self.lots or []):
+            fields = dict(self.field_values)
+            fields.update(lot_fields)
+            yield fields
+
+
+@dataclass
+class BatchExportResult:
+    """Outcome of exporting one return in a batch"""
+    index: int
+    files: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    duration: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        """Whether every form of the return was written"""
+        return self.error is None
+
+
+# Per-process form filler for batch export workers
+_worker_filler: Optional[PDFFormFiller] = None
+
+
+def _init_export_worker(forms_directory: str, form_names: Sequence[str]) -> None:
+    """Process pool initializer: create a filler and parse the batch's templates once"""
+    global _worker_filler
+    _worker_filler = PDFFormFiller(forms_directory)
+    for form_name in form_names:
+        try:
+            _worker_filler.get_template(form_name)
+        except FileNotFoundError:
+            logger.warning(f"Template not found for batch export: {form_name}")
+
+
+def _fill_jobs(filler: PDFFormFiller, index: int, jobs: List[FormFillJob], flatten: bool) -> BatchExportResult:
+    """Fill every form of one return, stopping at the first failure"""
+    start = time.perf_counter()
+    files = {}
+    try:
+        for job in jobs:
+            if job.lots:
+                filler.fill_form_copies(job.form_name, job.iter_copies(), job.output_path, flatten)
+            else:
+                filler.fill_form(job.form_name, job.field_values, job.output_path, flatten)
+            files[job.form_name] = job.output_path
+    except Exception as e:
+        return BatchExportResult(index, files, f"{type(e).__name__}: {e}", time.perf_counter() - start)
+    return BatchExportResult(index, files, None, time.perf_counter() - start)
+
+
+def _export_chunk(chunk: List[Tuple[int, List[FormFillJob]]], flatten: bool) -> List[BatchExportResult]:
+    """Process pool task: fill a chunk of returns with the worker's filler"""
+    return [_fill_jobs(_worker_filler, index, jobs, flatten) for index, jobs in chunk]
+
 
 class TaxReturnPDFGenerator:
     """
@@ -52,10 +152,13 @@ class TaxReturnPDFGenerator:
 
         self.output_directory.mkdir(parents=True, exist_ok=True)
 
+        self.export_manifest = ExportManifest.for_directory(self.output_directory)
+
         # Initialize plugin registry
         self.plugin_registry = PluginRegistry()
         self._load_plugins()
 
+
     def _load_plugins(self):
         """Load plugins from the plugins directory"""
         plugins_dir = Path(__file__).parent.parent / "plugins"
@@ -129,7 +232,9 @@ class TaxReturnPDFGenerator:
         self,
         tax_data: Dict[str, Any],
         flatten: bool = False,
-        include_signature: bool = True
+        include_signature: bool = True,
+        single_file: bool = False,
+        incremental: bool = True
     ) -> Dict[str, str]:
         """
         Generate a complete tax return with all required forms.
@@ -138,40 +243,191 @@ class TaxReturnPDFGenerator:
             tax_data: Complete tax return data
             flatten: Whether to flatten forms (make non-editable)
             include_signature: Whether to include signature fields
+            single_file: Write all forms into one PDF (see generate_merged_return)
+            incremental: Leave forms whose field values haven't changed since
+                they were last written (see export_manifest)
 
         Returns:
-            Dictionary mapping form names to output file paths
+            Dictionary mapping form names to output file paths; with
+            single_file, every required form maps to the one merged PDF
         """
         # Wrap data in DotDict for consistent access
         if not isinstance(tax_data, DotDict):
             tax_data = DotDict(tax_data)
 
+        if single_file:
+            output_path = str(self.generate_merged_return(tax_data, flatten=flatten,
+                                                          include_signature=include_signature,
+                                                          incremental=incremental))
+            return {form_name: output_path for form_name in self.determine_required_forms(tax_data)}
+
+        return self._generate_forms(tax_data, flatten, include_signature, incremental, save_manifest=True)
+
+    def _generate_forms(
+        self,
+        tax_data: DotDict,
+        flatten: bool,
+        include_signature: bool,
+        incremental: bool,
+        save_manifest: bool
+    ) -> Dict[str, str]:
+        """
+        Generate each required form of a return as its own PDF.
+
+        Args:
+            tax_data: Tax data
+            flatten: Whether to flatten forms
+            include_signature: Whether to include signature fields
+            incremental: Leave forms whose field values haven't changed
+            save_manifest: Write the export manifest afterwards; batches
+                save it once when every return is done instead
+
+        Returns:
+            Dictionary mapping form names to output file paths
+        """
         # Determine required forms
         required_forms = self.determine_required_forms(tax_data)
         logger.info(f"Required forms: {required_forms}")
 
         generated_files = {}
+        manifest = self.export_manifest if incremental else None
+        unchanged = []
 
         # Generate each form
-        for form_name in required_forms:
-            try:
-                output_path = self._generate_single_form(
-                    form_name, tax_data, flatten, include_signature
-                )
-                generated_files[form_name] = str(output_path)
-                logger.info(f"Generated {form_name}: {output_path}")
-            except Exception as e:
-                logger.error(f"Failed to generate {form_name}: {e}")
-                raise
-
+        try:
+            for form_name in required_forms:
+                try:
+                    # Form 8949 copies are mapped as they are filled, so they are never all held at once
+                    job = None if form_name == "Form 8949" else \
+                        self._build_fill_job(form_name, tax_data, include_signature)
+                    if manifest is not None:
+                        output_path = self._get_output_path(form_name, tax_data)
+                        digest = self._form_digest(form_name, tax_data, flatten, include_signature,
+                                                   job.field_values if job else None)
+                        if manifest.is_current(str(output_path), digest):
+                            generated_files[form_name] = str(output_path)
+                            unchanged.append(form_name)
+                            continue
+                        manifest.forget(str(output_path))
+
+                    output_path = self._generate_single_form(
+                        form_name, tax_data, flatten, include_signature, job
+                    )
+                    generated_files[form_name] = str(output_path)
+                    if manifest is not None:
+                        manifest.record(str(output_path), digest)
+                    logger.info(f"Generated {form_name}: {output_path}")
+                except Exception as e:
+                    logger.error(f"Failed to generate {form_name}: {e}")
+                    raise
+        finally:
+            # Keep what was written even if a later form failed
+            if manifest is not None and save_manifest:
+                manifest.save()
+
+        if unchanged:
+            logger.info(f"Unchanged since last export: {unchanged}")
         return generated_files
 
+    def generate_merged_return(
+        self,
+        tax_data: Dict[str, Any],
+        output_path: Optional[str] = None,
+        flatten: bool = False,
+        include_signature: bool = True,
+        additional_documents: Optional[Dict[str, str]] = None,
+        deduplicate: bool = True,
+        incremental: bool = True
+    ) -> Path:
+        """
+        Generate the whole return as one PDF with a bookmark per form.
+
+        Forms are filled straight into one document, which is written once.
+        Identical fonts and streams repeated by the templates are stored once.
+        Each form's fields are renamed with a suffix from its form name (the
+        first form keeps its names) so forms sharing field names stay
+        independent.
+
+        Args:
+            tax_data: Complete tax return data
+            output_path: Destination (default: "<name>_Complete_Return.pdf"
+                in the output directory)
+            flatten: Whether to flatten forms (make non-editable)
+            include_signature: Whether to include signature fields
+            additional_documents: Bookmark title to path of PDFs to append
+                after the federal forms, such as state returns
+            deduplicate: Collapse identical resource objects before writing
+            incremental: Keep the existing file if no form's field values
+                (or appended document) changed since it was written
+
+        Returns:
+            Path to the merged PDF
+        """
+        if not isinstance(tax_data, DotDict):
+            tax_data = DotDict(tax_data)
+
+        required_forms = self.determine_required_forms(tax_data)
+        logger.info(f"Required forms: {required_forms}")
+
+        if output_path is None:
+            output_path = self._get_output_path("Complete Return", tax_data)
+        # Form 8949 copies are mapped as they are filled, so they are never all held at once
+        field_values = {
+            form_name: self._build_fill_job(form_name, tax_data, include_signature).field_values
+            for form_name in required_forms if form_name != "Form 8949"
+        }
+        manifest = self.export_manifest if incremental else None
+        if manifest is not None:
+            # One digest over every form, in order, plus the appended files
+            parts = [{form_name: self._form_digest(form_name, tax_data, flatten, include_signature,
+                                                   field_values.get(form_name))}
+                     for form_name in required_forms]
+            parts += [{title: [str(path), os.stat(path).st_size, os.stat(path).st_mtime_ns]}
+                      for title, path in (additional_documents or {}).items()]
+            digest = fingerprint("Complete Return", parts, {'flatten': flatten, 'deduplicate': deduplicate})
+            if manifest.is_current(str(output_path), digest):
+                logger.info(f"Merged return unchanged since last export: {output_path}")
+                return Path(output_path)
+            manifest.forget(str(output_path))
+
+        document = MergedDocument()
+        for position, form_name in enumerate(required_forms):
+            if form_name == "Form 8949":
+                copies = self._iter_form_8949_copies(tax_data, include_signature)
+            else:
+                copies = [field_values[form_name]]
+            field_suffix = "" if position == 0 else f"_{self._clean_form_name(form_name)}"
+
+            first_page = document.page_count
+            count = self.form_filler.add_form_copies(document, form_name, copies, field_suffix,
+                                                     continuation_appearances=flatten)
+            if count == 0:
+                logger.warning(f"No pages generated for {form_name}")
+                continue
+            bookmark = document.add_bookmark(form_name, first_page)
+            if count > 1:
+                pages_per_copy = (document.page_count - first_page) // count
+                for copy in range(2, count + 1):
+                    document.add_bookmark(f"Continuation {copy}",
+                                          first_page + (copy - 1) * pages_per_copy, bookmark)
+
+        for position, (title, path) in enumerate((additional_documents or {}).items(), 1):
+            first_page = document.add_pdf(path, f"_document{position}")
+            document.add_bookmark(title, first_page)
+
+        written = document.write(str(output_path), deduplicate, flatten)
+        if manifest is not None:
+            manifest.record(str(written), digest)
+            manifest.save()
+        return written
+
     def _generate_single_form(
         self,
         form_name: str,
         tax_data: DotDict,
         flatten: bool,
-        include_signature: bool
+        include_signature: bool,
+        job: Optional[FormFillJob] = None
     ) -> Path:
         """
         Generate a single form.
@@ -181,29 +437,165 @@ class TaxReturnPDFGenerator:
             tax_data: Tax data
             flatten: Whether to flatten the form
             include_signature: Whether to include signature
+            job: The form already mapped by _build_fill_job (mapped here if None)
 
         Returns:
             Path to the generated PDF
         """
+        if form_name == "Form 8949":
+            # Continuation copies are mapped one at a time as they are filled
+            output_path = self._get_output_path(form_name, tax_data)
+            self.form_filler.fill_form_copies(
+                form_name=form_name,
+                copies=self._iter_form_8949_copies(tax_data, include_signature),
+                output_path=str(output_path),
+                flatten=flatten
+            )
+            return output_path
+
+        if job is None:
+            job = self._build_fill_job(form_name, tax_data, include_signature)
+
+        # Fill the form
+        self.form_filler.fill_form(
+            form_name=job.form_name,
+            field_values=job.field_values,
+            output_path=job.output_path,
+            flatten=flatten
+        )
+
+        return Path(job.output_path)
+
+    def _form_digest(
+        self,
+        form_name: str,
+        tax_data: DotDict,
+        flatten: bool,
+        include_signature: bool,
+        field_values: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Fingerprint of a form's field values, fill options and template.
+
+        The signature date is not part of the digest, so a form is not
+        refilled just because it is exported on a later day.
+
+        Args:
+            form_name: Form being generated
+            tax_data: Tax data
+            flatten: Whether the form is flattened
+            include_signature: Whether signature fields are included
+            field_values: The form's field values, if already mapped for the
+                fill (mapped here otherwise; unused for Form 8949)
+        """
+        if form_name == "Form 8949":
+            # Mapped again when filled, so the copies are never all held at once
+            copies = self._iter_form_8949_copies(tax_data, include_signature)
+        elif field_values is not None:
+            copies = [field_values]
+        else:
+            copies = [self._build_fill_job(form_name, tax_data, include_signature).field_values]
+        copies = ({name: value for name, value in copy.items() if name not in SIGNATURE_DATE_FIELDS}
+                  for copy in copies)
+        return fingerprint(form_name, copies, {'flatten': flatten},
+                           self.form_filler.get_form_path(form_name))
+
+    def _iter_form_8949_copies(self, tax_data: DotDict, include_signature: bool) -> Iterator[Dict[str, str]]:
+        """Field values for each copy of Form 8949"""
+        signature_fields = self._get_signature_fields(tax_data) if include_signature else {}
+        for fields in Form8949Mapper.iter_pages(tax_data):
+            fields.update(signature_fields)
+            yield fields
+
+    def _build_fill_job(
+        self,
+        form_name: str,
+        tax_data: DotDict,
+        include_signature: bool,
+        field_mappings: Optional[Dict[str, str]] = None
+    ) -> FormFillJob:
+        """Map one form of a return to its field values (unless already mapped) and output path"""
+        if form_name == "Form 8949":
+            # Only the lots are passed on; copies are mapped by whoever fills them
+            shared_fields = Form1040Mapper.map_personal_info(tax_data)
+            if include_signature:
+                shared_fields.update(self._get_signature_fields(tax_data))
+            return FormFillJob(form_name, shared_fields, str(self._get_output_path(form_name, tax_data)),
+                               lots=list(Form8949Mapper.capital_gains(tax_data)))
+
         # Get field mappings for this form
-        field_mappings = self._get_field_mappings(form_name, tax_data)
+        if field_mappings is None:
+            field_mappings = self._get_field_mappings(form_name, tax_data)
 
         # Add signature if requested
         if include_signature:
             field_mappings.update(self._get_signature_fields(tax_data))
 
-        # Generate output path
-        output_path = self._get_output_path(form_name, tax_data)
+        return FormFillJob(form_name, field_mappings, str(self._get_output_path(form_name, tax_data)))
 
-        # Fill the form
-        self.form_filler.fill_form(
-            form_name=form_name,
-            field_values=field_mappings,
-            output_path=str(output_path),
-            flatten=flatten
-        )
+    def build_fill_jobs(
+        self,
+        tax_data: Dict[str, Any],
+        include_signature: bool = True,
+        premapped: Optional[Dict[str, Dict[str, str]]] = None,
+        required_forms: Optional[List[str]] = None
+    ) -> List[FormFillJob]:
+        """
+        Map a return to fill jobs for all of its required forms.
+
+        Args:
+            tax_data: Complete tax return data
+            include_signature: Whether to include signature fields
+            premapped: Field values already mapped for some forms, by form
+                name (signature fields are still added)
+            required_forms: Forms the return needs, if already determined
+
+        Returns:
+            One FormFillJob per required form
+        """
+        if not isinstance(tax_data, DotDict):
+            tax_data = DotDict(tax_data)
+        premapped = premapped or {}
+        if required_forms is None:
+            required_forms = self.determine_required_forms(tax_data)
+        return [
+            self._build_fill_job(form_name, tax_data, include_signature, premapped.get(form_name))
+            for form_name in required_forms
+        ]
+
+    def _premap_batch(self, tax_returns: Sequence[Dict[str, Any]]) -> Tuple[List[Optional[List[str]]], List[Dict[str, Dict[str, str]]]]:
+        """
+        Map the spec-mapped forms of a batch, one form at a time across returns.
+
+        Args:
+            tax_returns: Tax return data dictionaries
 
-        return output_path
+        Returns:
+            Required forms and pre-mapped field values per return; a return
+            whose forms couldn't be determined gets None and is mapped on
+            its own so its error is reported
+        """
+        required: List[Optional[List[str]]] = []
+        for tax_return in tax_returns:
+            try:
+                required.append(self.determine_required_forms(DotDict(tax_return)))
+            except Exception:
+                required.append(None)
+
+        premapped: List[Dict[str, Dict[str, str]]] = [{} for _ in tax_returns]
+        for form_name, spec in SPEC_MAPPED_FORMS.items():
+            indexes = [index for index, forms in enumerate(required) if forms and form_name in forms]
+            if not indexes:
+                continue
+            try:
+                mapped = spec.map_many([tax_returns[index] for index in indexes])
+            except Exception as e:
+                # Leave the form to per-return mapping, which reports the failing return
+                logger.debug(f"Batch mapping of {form_name} failed, mapping returns one by one: {e}")
+                continue
+            for index, fields in zip(indexes, mapped):
+                premapped[index][form_name] = fields
+        return required, premapped
 
     def _get_field_mappings(self, form_name: str, tax_data: DotDict) -> Dict[str, str]:
         """
@@ -260,415 +652,19 @@ class TaxReturnPDFGenerator:
 
     def _map_schedule_1(self, tax_data: DotDict) -> Dict[str, str]:
         """Map Schedule 1 (Additional Income and Adjustments)"""
-        fields = {}
-        income = tax_data.get('income', {})
-        adjustments = tax_data.get('adjustments', {})
-
-        # Part I: Additional Income
-        # Line 1: Taxable refunds, credits, or offsets of state and local income taxes
-        state_refunds = income.get('state_tax_refunds', 0)
-        if state_refunds:
-            fields['topmostSubform[0].Page1[0].Line1_ReadOrder[0].f1_01[0]'] = f"{state_refunds:,.2f}"
-
-        # Line 2b: Taxable interest
-        taxable_interest = sum(item.get('amount', 0) for item in income.get('interest_income', [])
-                              if not item.get('tax_exempt', False))
-        if taxable_interest:
-            fields['topmostSubform[0].Page1[0].Line2b_ReadOrder[0].f1_02[0]'] = f"{taxable_interest:,.2f}"
-
-        # Line 3b: Ordinary dividends
-        ordinary_dividends = sum(item.get('ordinary', 0) for item in income.get('dividend_income', []))
-        if ordinary_dividends:
-            fields['topmostSubform[0].Page1[0].Line3b_ReadOrder[0].f1_03[0]'] = f"{ordinary_dividends:,.2f}"
-
-        # Line 4b: IRA distributions (taxable amount)
-        ira_distributions = income.get('ira_distributions', 0)
-        if ira_distributions:
-            fields['topmostSubform[0].Page1[0].Line4b_ReadOrder[0].f1_04[0]'] = f"{ira_distributions:,.2f}"
-
-        # Line 5b: Pensions and annuities (taxable amount)
-        pensions_annuities = income.get('pensions_annuities', 0)
-        if pensions_annuities:
-            fields['topmostSubform[0].Page1[0].Line5b_ReadOrder[0].f1_05[0]'] = f"{pensions_annuities:,.2f}"
-
-        # Line 8b: Rental real estate, royalties, partnerships, S corporations, etc.
-        rental_income = income.get('rental_income', 0)
-        partnership_income = income.get('partnership_income', 0)
-        s_corp_income = income.get('s_corp_income', 0)
-        other_business_income = rental_income + partnership_income + s_corp_income
-        if other_business_income:
-            fields['topmostSubform[0].Page1[0].Line8b_ReadOrder[0].f1_08[0]'] = f"{other_business_income:,.2f}"
-
-        # Part II: Adjustments to Income
-        # Line 12: Educator expenses
-        educator_expenses = adjustments.get('educator_expenses', 0)
-        if educator_expenses:
-            fields['topmostSubform[0].Page1[0].Line12_ReadOrder[0].f1_12[0]'] = f"{educator_expenses:,.2f}"
-
-        # Line 13: Certain business income deduction
-        business_deduction = adjustments.get('business_income_deduction', 0)
-        if business_deduction:
-            fields['topmostSubform[0].Page1[0].Line13_ReadOrder[0].f1_13[0]'] = f"{business_deduction:,.2f}"
-
-        # Line 14: Health savings account deduction
-        hsa_deduction = adjustments.get('hsa_deduction', 0)
-        if hsa_deduction:
-            fields['topmostSubform[0].Page1[0].Line14_ReadOrder[0].f1_14[0]'] = f"{hsa_deduction:,.2f}"
-
-        # Line 15: Moving expenses for members of the Armed Forces
-        moving_expenses = adjustments.get('moving_expenses', 0)
-        if moving_expenses:
-            fields['topmostSubform[0].Page1[0].Line15_ReadOrder[0].f1_15[0]'] = f"{moving_expenses:,.2f}"
-
-        # Line 16: Self-employed SEP, SIMPLE, and qualified plans
-        sep_simple_deduction = adjustments.get('sep_simple_deduction', 0)
-        if sep_simple_deduction:
-            fields['topmostSubform[0].Page1[0].Line16_ReadOrder[0].f1_16[0]'] = f"{sep_simple_deduction:,.2f}"
-
-        # Line 17: Self-employed health insurance deduction
-        health_insurance_deduction = adjustments.get('health_insurance_deduction', 0)
-        if health_insurance_deduction:
-            fields['topmostSubform[0].Page1[0].Line17_ReadOrder[0].f1_17[0]'] = f"{health_insurance_deduction:,.2f}"
-
-        # Line 18: Penalty on early withdrawal of savings
-        early_withdrawal_penalty = adjustments.get('early_withdrawal_penalty', 0)
-        if early_withdrawal_penalty:
-            fields['topmostSubform[0].Page1[0].Line18_ReadOrder[0].f1_18[0]'] = f"{early_withdrawal_penalty:,.2f}"
-
-        return fields
+        return SCHEDULE_1_SPEC.map(tax_data)
 
     def _map_schedule_a(self, tax_data: DotDict) -> Dict[str, str]:
         """Map Schedule A (Itemized Deductions)"""
-        fields = {}
-        deductions = tax_data.get('deductions', {})
-
-        # Part I: Medical and Dental Expenses
-        # Line 1: Medical and dental expenses
-        medical_expenses = deductions.get('medical_expenses', 0)
-        if medical_expenses:
-            fields['topmostSubform[0].Page1[0].Line1_ReadOrder[0].f1_01[0]'] = f"{medical_expenses:,.2f}"
-
-        # Line 2: Enter amount from Form 1040, line 11
-        # This would be AGI, but we'll leave it for now
-
-        # Line 3: Multiply line 2 by 7.5% (0.075)
-        # Line 4: Subtract line 3 from line 1
-
-        # Part II: Taxes You Paid
-        # Line 5: State and local income taxes
-        state_local_taxes = deductions.get('state_local_taxes', 0)
-        if state_local_taxes:
-            fields['topmostSubform[0].Page1[0].Line5_ReadOrder[0].f1_05[0]'] = f"{state_local_taxes:,.2f}"
-
-        # Line 6: State and local real estate taxes
-        real_estate_taxes = deductions.get('real_estate_taxes', 0)
-        if real_estate_taxes:
-            fields['topmostSubform[0].Page1[0].Line6_ReadOrder[0].f1_06[0]'] = f"{real_estate_taxes:,.2f}"
-
-        # Line 7: State and local personal property taxes
-        personal_property_taxes = deductions.get('personal_property_taxes', 0)
-        if personal_property_taxes:
-            fields['topmostSubform[0].Page1[0].Line7_ReadOrder[0].f1_07[0]'] = f"{personal_property_taxes:,.2f}"
-
-        # Line 8: Other taxes
-        other_taxes = deductions.get('other_taxes', 0)
-        if other_taxes:
-            fields['topmostSubform[0].Page1[0].Line8_ReadOrder[0].f1_08[0]'] = f"{other_taxes:,.2f}"
-
-        # Part III: Interest You Paid
-        # Line 10: Home mortgage interest and points
-        mortgage_interest = deductions.get('mortgage_interest', 0)
-        if mortgage_interest:
-            fields['topmostSubform[0].Page1[0].Line10_ReadOrder[0].f1_10[0]'] = f"{mortgage_interest:,.2f}"
-
-        # Line 11: Home mortgage interest not reported to you on Form 1098
-        unreported_mortgage_interest = deductions.get('unreported_mortgage_interest', 0)
-        if unreported_mortgage_interest:
-            fields['topmostSubform[0].Page1[0].Line11_ReadOrder[0].f1_11[0]'] = f"{unreported_mortgage_interest:,.2f}"
-
-        # Line 12: Points not reported to you on Form 1098
-        points_not_reported = deductions.get('points_not_reported', 0)
-        if points_not_reported:
-            fields['topmostSubform[0].Page1[0].Line12_ReadOrder[0].f1_12[0]'] = f"{points_not_reported:,.2f}"
-
-        # Line 13: Mortgage insurance premiums
-        mortgage_insurance = deductions.get('mortgage_insurance', 0)
-        if mortgage_insurance:
-            fields['topmostSubform[0].Page1[0].Line13_ReadOrder[0].f1_13[0]'] = f"{mortgage_insurance:,.2f}"
-
-        # Line 14: Investment interest
-        investment_interest = deductions.get('investment_interest', 0)
-        if investment_interest:
-            fields['topmostSubform[0].Page1[0].Line14_ReadOrder[0].f1_14[0]'] = f"{investment_interest:,.2f}"
-
-        # Part IV: Gifts to Charity
-        # Line 15: Cash contributions
-        cash_contributions = deductions.get('cash_contributions', 0)
-        if cash_contributions:
-            fields['topmostSubform[0].Page1[0].Line15_ReadOrder[0].f1_15[0]'] = f"{cash_contributions:,.2f}"
-
-        # Line 16: Non-cash contributions
-        non_cash_contributions = deductions.get('non_cash_contributions', 0)
-        if non_cash_contributions:
-            fields['topmostSubform[0].Page1[0].Line16_ReadOrder[0].f1_16[0]'] = f"{non_cash_contributions:,.2f}"
-
-        # Line 17: Carryover from prior year
-        carryover_contributions = deductions.get('carryover_contributions', 0)
-        if carryover_contributions:
-            fields['topmostSubform[0].Page1[0].Line17_ReadOrder[0].f1_17[0]'] = f"{carryover_contributions:,.2f}"
-
-        # Part V: Casualty and Theft Losses
-        # Line 18: Casualty and theft losses
-        casualty_losses = deductions.get('casualty_losses', 0)
-        if casualty_losses:
-            fields['topmostSubform[0].Page1[0].Line18_ReadOrder[0].f1_18[0]'] = f"{casualty_losses:,.2f}"
-
-        # Part VI: Other Itemized Deductions
-        # Line 19: Other miscellaneous deductions
-        other_misc_deductions = deductions.get('other_misc_deductions', 0)
-        if other_misc_deductions:
-            fields['topmostSubform[0].Page1[0].Line19_ReadOrder[0].f1_19[0]'] = f"{other_misc_deductions:,.2f}"
-
-        return fields
+        return SCHEDULE_A_SPEC.map(tax_data)
 
     def _map_schedule_d(self, tax_data: DotDict) -> Dict[str, str]:
         """Map Schedule D (Capital Gains and Losses)"""
-        fields = {}
-        capital_gains = tax_data.get('income', {}).get('capital_gains', [])
-
-        if not capital_gains:
-            return fields
-
-        # Separate short-term and long-term transactions
-        short_term = [cg for cg in capital_gains if cg.get('holding_period') == 'Short-term']
-        long_term = [cg for cg in capital_gains if cg.get('holding_period') == 'Long-term']
-
-        # Part I: Short-Term Capital Gains and Losses
-        for i, transaction in enumerate(short_term[:14]):  # Schedule D has space for 14 transactions
-            base_idx = i + 1
-
-            # Column (a) - Description
-            desc = transaction.get('description', '')
-            if desc:
-                fields[f'topmostSubform[0].Page1[0].Line1a_ReadOrder[{i}].f1_01[0]'] = desc
-
-            # Column (b) - Date acquired
-            date_acq = transaction.get('date_acquired', '')
-            if date_acq:
-                fields[f'topmostSubform[0].Page1[0].Line1b_ReadOrder[{i}].f1_02[0]'] = date_acq
-
-            # Column (c) - Date sold
-            date_sold = transaction.get('date_sold', '')
-            if date_sold:
-                fields[f'topmostSubform[0].Page1[0].Line1c_ReadOrder[{i}].f1_03[0]'] = date_sold
-
-            # Column (d) - Sales price
-            sales_price = transaction.get('sales_price', 0)
-            if sales_price:
-                fields[f'topmostSubform[0].Page1[0].Line1d_ReadOrder[{i}].f1_04[0]'] = f"{sales_price:,.2f}"
-
-            # Column (e) - Cost or other basis
-            cost_basis = transaction.get('cost_basis', 0)
-            if cost_basis:
-                fields[f'topmostSubform[0].Page1[0].Line1e_ReadOrder[{i}].f1_05[0]'] = f"{cost_basis:,.2f}"
-
-            # Column (g) - Gain or loss
-            gain_loss = transaction.get('gain_loss', 0)
-            if gain_loss:
-                fields[f'topmostSubform[0].Page1[0].Line1g_ReadOrder[{i}].f1_07[0]'] = f"{gain_loss:,.2f}"
-
-        # Part II: Long-Term Capital Gains and Losses
-        for i, transaction in enumerate(long_term[:14]):  # Schedule D has space for 14 transactions
-            base_idx = i + 1
-
-            # Column (a) - Description
-            desc = transaction.get('description', '')
-            if desc:
-                fields[f'topmostSubform[0].Page1[0].Line8a_ReadOrder[{i}].f1_08[0]'] = desc
-
-            # Column (b) - Date acquired
-            date_acq = transaction.get('date_acquired', '')
-            if date_acq:
-                fields[f'topmostSubform[0].Page1[0].Line8b_ReadOrder[{i}].f1_09[0]'] = date_acq
-
-            # Column (c) - Date sold
-            date_sold = transaction.get('date_sold', '')
-            if date_sold:
-                fields[f'topmostSubform[0].Page1[0].Line8c_ReadOrder[{i}].f1_10[0]'] = date_sold
-
-            # Column (d) - Sales price
-            sales_price = transaction.get('sales_price', 0)
-            if sales_price:
-                fields[f'topmostSubform[0].Page1[0].Line8d_ReadOrder[{i}].f1_11[0]'] = f"{sales_price:,.2f}"
-
-            # Column (e) - Cost or other basis
-            cost_basis = transaction.get('cost_basis', 0)
-            if cost_basis:
-                fields[f'topmostSubform[0].Page1[0].Line8e_ReadOrder[{i}].f1_12[0]'] = f"{cost_basis:,.2f}"
-
-            # Column (g) - Gain or loss
-            gain_loss = transaction.get('gain_loss', 0)
-            if gain_loss:
-                fields[f'topmostSubform[0].Page1[0].Line8g_ReadOrder[{i}].f1_14[0]'] = f"{gain_loss:,.2f}"
-
-        # Calculate totals
-        if short_term:
-            short_term_proceeds = sum(t.get('sales_price', 0) for t in short_term)
-            short_term_basis = sum(t.get('cost_basis', 0) for t in short_term)
-            short_term_gain_loss = sum(t.get('gain_loss', 0) for t in short_term)
-
-            fields['topmostSubform[0].Page1[0].Line2_ReadOrder[0].f1_15[0]'] = f"{short_term_proceeds:,.2f}"
-            fields['topmostSubform[0].Page1[0].Line3_ReadOrder[0].f1_16[0]'] = f"{short_term_basis:,.2f}"
-            fields['topmostSubform[0].Page1[0].Line5_ReadOrder[0].f1_18[0]'] = f"{short_term_gain_loss:,.2f}"
-
-        if long_term:
-            long_term_proceeds = sum(t.get('sales_price', 0) for t in long_term)
-            long_term_basis = sum(t.get('cost_basis', 0) for t in long_term)
-            long_term_gain_loss = sum(t.get('gain_loss', 0) for t in long_term)
-
-            fields['topmostSubform[0].Page1[0].Line9_ReadOrder[0].f1_19[0]'] = f"{long_term_proceeds:,.2f}"
-            fields['topmostSubform[0].Page1[0].Line10_ReadOrder[0].f1_20[0]'] = f"{long_term_basis:,.2f}"
-            fields['topmostSubform[0].Page1[0].Line12_ReadOrder[0].f1_22[0]'] = f"{long_term_gain_loss:,.2f}"
-
-        return fields
+        return SCHEDULE_D_SPEC.map(tax_data)
 
     def _map_schedule_e(self, tax_data: DotDict) -> Dict[str, str]:
         """Map Schedule E (Supplemental Income and Loss)"""
-        fields = {}
-        rental_income = tax_data.get('income', {}).get('rental_income', [])
-
-        if not rental_income:
-            return fields
-
-        # Schedule E - Part I: Income or Loss From Rental Real Estate and Royalties
-        total_rental_income = Decimal('0')
-        total_rental_expenses = Decimal('0')
-        total_depreciation = Decimal('0')
-
-        for i, rental in enumerate(rental_income):
-            if i >= 3:  # Schedule E supports up to 3 properties on main form
-                break
-
-            # Property address (Line 1A)
-            address = rental.get('address', '')
-            if address:
-                fields[f'topmostSubform[0].Page1[0].Line1_ReadOrder[{i}].f1_01[{i}]'] = address[:35]  # Limit to 35 chars
-
-            # Location (Line 1B) - City and State
-            city = rental.get('city', '')
-            state = rental.get('state', '')
-            if city and state:
-                location = f"{city}, {state}"
-                fields[f'topmostSubform[0].Page1[0].Line1_ReadOrder[{i}].f1_02[{i}]'] = location[:25]  # Limit to 25 chars
-
-            # Gross rents (Line 3)
-            gross_rents = rental.get('gross_rental_income', 0)
-            if gross_rents:
-                fields[f'topmostSubform[0].Page1[0].Line3_ReadOrder[{i}].f1_03[{i}]'] = f"{gross_rents:,.2f}"
-                total_rental_income += Decimal(str(gross_rents))
-
-            # Advertising (Line 5A)
-            advertising = rental.get('advertising', 0)
-            if advertising:
-                fields[f'topmostSubform[0].Page1[0].Line5A_ReadOrder[{i}].f1_04[{i}]'] = f"{advertising:,.2f}"
-                total_rental_expenses += Decimal(str(advertising))
-
-            # Auto and travel (Line 5B)
-            auto_travel = rental.get('auto_travel', 0)
-            if auto_travel:
-                fields[f'topmostSubform[0].Page1[0].Line5B_ReadOrder[{i}].f1_05[{i}]'] = f"{auto_travel:,.2f}"
-                total_rental_expenses += Decimal(str(auto_travel))
-
-            # Cleaning and maintenance (Line 5C)
-            cleaning = rental.get('cleaning_maintenance', 0)
-            if cleaning:
-                fields[f'topmostSubform[0].Page1[0].Line5C_ReadOrder[{i}].f1_06[{i}]'] = f"{cleaning:,.2f}"
-                total_rental_expenses += Decimal(str(cleaning))
-
-            # Commissions (Line 5D)
-            commissions = rental.get('commissions', 0)
-            if commissions:
-                fields[f'topmostSubform[0].Page1[0].Line5D_ReadOrder[{i}].f1_07[{i}]'] = f"{commissions:,.2f}"
-                total_rental_expenses += Decimal(str(commissions))
-
-            # Insurance (Line 5E)
-            insurance = rental.get('insurance', 0)
-            if insurance:
-                fields[f'topmostSubform[0].Page1[0].Line5E_ReadOrder[{i}].f1_08[{i}]'] = f"{insurance:,.2f}"
-                total_rental_expenses += Decimal(str(insurance))
-
-            # Legal and other professional fees (Line 5F)
-            legal_fees = rental.get('legal_fees', 0)
-            if legal_fees:
-                fields[f'topmostSubform[0].Page1[0].Line5F_ReadOrder[{i}].f1_09[{i}]'] = f"{legal_fees:,.2f}"
-                total_rental_expenses += Decimal(str(legal_fees))
-
-            # Management fees (Line 5G)
-            management_fees = rental.get('management_fees', 0)
-            if management_fees:
-                fields[f'topmostSubform[0].Page1[0].Line5G_ReadOrder[{i}].f1_10[{i}]'] = f"{management_fees:,.2f}"
-                total_rental_expenses += Decimal(str(management_fees))
-
-            # Mortgage interest paid to banks (Line 5H)
-            mortgage_interest = rental.get('mortgage_interest', 0)
-            if mortgage_interest:
-                fields[f'topmostSubform[0].Page1[0].Line5H_ReadOrder[{i}].f1_11[{i}]'] = f"{mortgage_interest:,.2f}"
-                total_rental_expenses += Decimal(str(mortgage_interest))
-
-            # Other interest (Line 5I)
-            other_interest = rental.get('other_interest', 0)
-            if other_interest:
-                fields[f'topmostSubform[0].Page1[0].Line5I_ReadOrder[{i}].f1_12[{i}]'] = f"{other_interest:,.2f}"
-                total_rental_expenses += Decimal(str(other_interest))
-
-            # Repairs (Line 5J)
-            repairs = rental.get('repairs', 0)
-            if repairs:
-                fields[f'topmostSubform[0].Page1[0].Line5J_ReadOrder[{i}].f1_13[{i}]'] = f"{repairs:,.2f}"
-                total_rental_expenses += Decimal(str(repairs))
-
-            # Supplies (Line 5K)
-            supplies = rental.get('supplies', 0)
-            if supplies:
-                fields[f'topmostSubform[0].Page1[0].Line5K_ReadOrder[{i}].f1_14[{i}]'] = f"{supplies:,.2f}"
-                total_rental_expenses += Decimal(str(supplies))
-
-            # Taxes and licenses (Line 5L)
-            taxes_licenses = rental.get('taxes_licenses', 0)
-            if taxes_licenses:
-                fields[f'topmostSubform[0].Page1[0].Line5L_ReadOrder[{i}].f1_15[{i}]'] = f"{taxes_licenses:,.2f}"
-                total_rental_expenses += Decimal(str(taxes_licenses))
-
-            # Utilities (Line 5M)
-            utilities = rental.get('utilities', 0)
-            if utilities:
-                fields[f'topmostSubform[0].Page1[0].Line5M_ReadOrder[{i}].f1_16[{i}]'] = f"{utilities:,.2f}"
-                total_rental_expenses += Decimal(str(utilities))
-
-            # Depreciation expense or depletion (Line 12)
-            depreciation = rental.get('depreciation', 0)
-            if depreciation:
-                fields[f'topmostSubform[0].Page1[0].Line12_ReadOrder[{i}].f1_17[{i}]'] = f"{depreciation:,.2f}"
-                total_depreciation += Decimal(str(depreciation))
-
-        # Total rental real estate income (Line 23)
-        if total_rental_income > 0:
-            fields['topmostSubform[0].Page1[0].Line23_ReadOrder[0].f1_23[0]'] = f"{total_rental_income:,.2f}"
-
-        # Total rental real estate expenses (Line 20)
-        if total_rental_expenses > 0:
-            fields['topmostSubform[0].Page1[0].Line20_ReadOrder[0].f1_20[0]'] = f"{total_rental_expenses:,.2f}"
-
-        # Depreciation (Line 22)
-        if total_depreciation > 0:
-            fields['topmostSubform[0].Page1[0].Line22_ReadOrder[0].f1_22[0]'] = f"{total_depreciation:,.2f}"
-
-        # Net rental income/loss (Line 26) - calculated as income minus expenses minus depreciation
-        net_rental = total_rental_income - total_rental_expenses - total_depreciation
-        if net_rental != 0:
-            fields['topmostSubform[0].Page1[0].Line26_ReadOrder[0].f1_26[0]'] = f"{net_rental:,.2f}"
-
-        return fields
+        return SCHEDULE_E_SPEC.map(tax_data)
 
     def _map_schedule_se(self, tax_data: DotDict) -> Dict[str, str]:
         """Map Schedule SE (Self-Employment Tax)"""
@@ -793,18 +789,23 @@ class TaxReturnPDFGenerator:
         last_name = personal_info.get('last_name', 'Unknown')
         ssn_last4 = personal_info.get('ssn', 'XXXX')[-4:]
 
-        # Clean form name for filename
-        clean_form_name = form_name.replace(" ", "_").replace("(", "").replace(")", "")
-
-        filename = f"{last_name}_{first_name}_{ssn_last4}_{clean_form_name}.pdf"
+        filename = f"{last_name}_{first_name}_{ssn_last4}_{self._clean_form_name(form_name)}.pdf"
         return self.output_directory / filename
 
+    @staticmethod
+    def _clean_form_name(form_name: str) -> str:
+        """Form name usable in file and field names"""
+        return form_name.replace(" ", "_").replace("(", "").replace(")", "")
+
     def generate_batch_export(
         self,
         tax_returns: List[Dict[str, Any]],
         flatten: bool = True,
         include_signature: bool = True,
-        max_workers: int = 4
+        max_workers: int = 4,
+        use_processes: bool = False,
+        chunk_size: int = 1,
+        incremental: bool = True
     ) -> List[Dict[str, str]]:
         """
         Generate PDFs for multiple tax returns in parallel.
@@ -814,33 +815,131 @@ class TaxReturnPDFGenerator:
             flatten: Whether to flatten forms
             include_signature: Whether to include signatures
             max_workers: Maximum number of parallel workers
+            use_processes: Fill in a process pool (see iter_batch_export)
+                instead of threads
+            chunk_size: Returns per process pool task
+            incremental: In the thread pool, leave forms whose field values
+                haven't changed (process pool workers always write every form)
 
         Returns:
             List of dictionaries mapping form names to file paths for each return
         """
+        if use_processes:
+            return [
+                result.files if result.success else {}
+                for result in self.iter_batch_export(
+                    tax_returns, flatten, include_signature, max_workers, chunk_size
+                )
+            ]
+
         results = []
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all generation tasks
-            future_to_return = {
-                executor.submit(
-                    self.generate_complete_return,
-                    tax_return,
-                    flatten,
-                    include_signature
-                ): tax_return for tax_return in tax_returns
-            }
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Submit all generation tasks; the manifest is saved once for the batch
+                future_to_return = {
+                    executor.submit(
+                        self._generate_forms,
+                        tax_return if isinstance(tax_return, DotDict) else DotDict(tax_return),
+                        flatten,
+                        include_signature,
+                        incremental,
+                        False
+                    ): tax_return for tax_return in tax_returns
+                }
+
+                # Collect results as they complete
+                for future in as_completed(future_to_return):
+                    try:
+                        result = future.result()
+                        results.append(result)
+                    except Exception as e:
+                        logger.error(f"Failed to generate tax return: {e}")
+                        results.append({})  # Empty dict for failed generation
+        finally:
+            if incremental:
+                self.export_manifest.save()
 
-            # Collect results as they complete
-            for future in as_completed(future_to_return):
+        return results
+
+    def iter_batch_export(
+        self,
+        tax_returns: Sequence[Dict[str, Any]],
+        flatten: bool = True,
+        include_signature: bool = True,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 1
+    ) -> Iterator[BatchExportResult]:
+        """
+        Export returns in a process pool, yielding results as they finish.
+
+        Returns are mapped to field values here, each spec-mapped form
+        across the whole batch at once; workers receive only the fill jobs.
+        Each worker parses the batch's templates once when it starts. A
+        failing return is reported in its result and doesn't stop the rest
+        of the batch.
+
+        Args:
+            tax_returns: Tax return data dictionaries
+            flatten: Whether to flatten forms
+            include_signature: Whether to include signatures
+            max_workers: Worker processes (default: CPU count)
+            chunk_size: Returns per task; larger chunks cut scheduling
+                overhead, smaller ones balance uneven returns better
+
+        Yields:
+            BatchExportResult per return, in completion order (``index`` is
+            the return's position in tax_returns)
+
+        Raises:
+            ValueError: If chunk_size or max_workers is below 1
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+
+        mapped: List[Tuple[int, List[FormFillJob]]] = []
+        form_names: Dict[str, None] = {}
+        required, premapped = self._premap_batch(tax_returns)
+        for index, tax_return in enumerate(tax_returns):
+            try:
+                jobs = self.build_fill_jobs(tax_return, include_signature, premapped[index], required[index])
+            except Exception as e:
+                logger.error(f"Failed to map tax return {index}: {e}")
+                yield BatchExportResult(index, error=f"{type(e).__name__}: {e}")
+                continue
+            mapped.append((index, jobs))
+            form_names.update(dict.fromkeys(job.form_name for job in jobs))
+
+        if not mapped:
+            return
+
+        chunks = [mapped[start:start + chunk_size] for start in range(0, len(mapped), chunk_size)]
+        workers = min(max_workers or os.cpu_count() or 1, len(chunks))
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_export_worker,
+            initargs=(str(self.form_filler.forms_directory), list(form_names))
+        ) as executor:
+            future_to_indexes = {
+                executor.submit(_export_chunk, chunk, flatten): [index for index, _ in chunk]
+                for chunk in chunks
+            }
+            for future in as_completed(future_to_indexes):
                 try:
-                    result = future.result()
-                    results.append(result)
+                    results = future.result()
                 except Exception as e:
-                    logger.error(f"Failed to generate tax return: {e}")
-                    results.append({})  # Empty dict for failed generation
-
-        return results
+                    logger.error(f"Batch export worker failed: {e}")
+                    results = [
+                        BatchExportResult(index, error=f"{type(e).__name__}: {e}")
+                        for index in future_to_indexes[future]
+                    ]
+                for result in results:
+                    if not result.success:
+                        logger.error(f"Failed to generate tax return {result.index}: {result.error}")
+                    yield result
 
     def validate_pdf_generation(self, tax_data: Dict[str, Any]) -> tuple[bool, Optional[str]]:
         """
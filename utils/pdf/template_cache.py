@@ -0,0 +1,330 @@
+"""
+PDF Template Cache - Parsed IRS form templates shared across fills
+
+Parsing an IRS template is the most expensive part of filling it. The cache
+keeps one parsed copy of each template per process together with its field
+table and an index from field name to the (page, annotation) positions of the
+field's widgets. A fill clones the cached document and updates only the
+widgets that receive values.
+
+Entries are invalidated when the template file's modification time or size
+changes, so replacing a form on disk takes effect on the next fill.
+"""
+
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ArrayObject, DictionaryObject, NameObject, TextStringObject
+
+from utils.pdf_exceptions import FormFieldError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_TEMPLATES = 32
+
+# (page index, position in the page's /Annots array)
+WidgetLocation = Tuple[int, int]
+
+
+def _qualified_name(node: DictionaryObject) -> str:
+    """Full field name: partial /T names joined from the root down"""
+    parts = []
+    while node is not None:
+        if '/T' in node:
+            parts.append(str(node['/T']))
+        parent = node.get('/Parent')
+        node = parent.get_object() if parent is not None else None
+    return '.'.join(reversed(parts))
+
+
+@dataclass
+class FormTemplate:
+    """A parsed template with its field table and widget index"""
+
+    path: Path
+    mtime_ns: int
+    size: int
+    reader: PdfReader
+    fields: Dict[str, Dict[str, Any]]
+    field_index: Dict[str, Tuple[WidgetLocation, ...]]
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def load(cls, path: Path) -> 'FormTemplate':
+        """
+        Parse a template file and index its widgets.
+
+        Args:
+            path: Template PDF
+
+        Returns:
+            FormTemplate for the file
+        """
+        stat = os.stat(path)
+        reader = PdfReader(io.BytesIO(Path(path).read_bytes()))
+
+        fields = {}
+        for field_name, field_info in (reader.get_fields() or {}).items():
+            fields[field_name] = {
+                'type': field_info.get('/FT', 'unknown'),
+                'value': field_info.get('/V', ''),
+                'flags': field_info.get('/Ff', 0)
+            }
+
+        index: Dict[str, List[WidgetLocation]] = {}
+        for page_number, page in enumerate(reader.pages):
+            annots = page.get('/Annots')
+            if annots is None:
+                continue
+            for position, annot in enumerate(annots.get_object()):
+                annot = annot.get_object()
+                if annot.get('/Subtype') != '/Widget':
+                    continue
+                # Same rule as PdfWriter.update_page_form_field_values: a widget
+                # without its own /FT and /T belongs to its parent field
+                if '/FT' in annot and '/T' in annot:
+                    owner = annot
+                else:
+                    parent = annot.get('/Parent')
+                    if parent is None:
+                        continue
+                    owner = parent.get_object()
+                location = (page_number, position)
+                names = {_qualified_name(owner)}
+                if '/T' in owner:
+                    names.add(str(owner['/T']))
+                for name in names:
+                    index.setdefault(name, []).append(location)
+
+        return cls(
+            path=Path(path),
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            reader=reader,
+            fields=fields,
+            field_index={name: tuple(locations) for name, locations in index.items()},
+        )
+
+    @property
+    def page_count(self) -> int:
+        """Pages in one copy of the form"""
+        return len(self.reader.pages)
+
+    def is_current(self, stat: os.stat_result) -> bool:
+        """Whether the file on disk is still the one that was parsed"""
+        return stat.st_mtime_ns == self.mtime_ns and stat.st_size == self.size
+
+    def clone(self) -> PdfWriter:
+        """
+        Copy the parsed document into a new writer.
+
+        Returns:
+            PdfWriter holding an independent copy of the template
+        """
+        # The reader resolves objects lazily from its stream, which isn't thread safe
+        with self._lock:
+            return PdfWriter(clone_from=self.reader)
+
+    def append_to(self, writer: PdfWriter) -> None:
+        """
+        Append a fresh copy of the template's pages and fields to a writer.
+
+        Args:
+            writer: Document to extend
+        """
+        with self._lock:
+            # Forget earlier copies so every object is cloned again
+            writer._id_translated.pop(id(self.reader), None)
+            writer.append(self.reader)
+            self._merge_default_fonts(writer)
+
+    def _merge_default_fonts(self, writer: PdfWriter) -> None:
+        """Add the template's form fonts to the writer's, which append() keeps from the first document only"""
+        source = self.reader.root_object.get('/AcroForm')
+        target = writer._root_object.get('/AcroForm')
+        if source is None or target is None:
+            return
+        source_fonts = source.get_object().get('/DR', {}).get('/Font')
+        if source_fonts is None:
+            return
+        target = target.get_object()
+        resources = target.setdefault(NameObject('/DR'), DictionaryObject()).get_object()
+        fonts = resources.setdefault(NameObject('/Font'), DictionaryObject()).get_object()
+        for name, font in source_fonts.items():
+            if name not in fonts:
+                fonts[NameObject(name)] = font.clone(writer)
+
+    def fill(
+        self,
+        writer: PdfWriter,
+        field_values: Dict[str, Any],
+        first_page: int = 0,
+        on_page: Optional[Callable[[int], None]] = None,
+        appearances: bool = True
+    ) -> None:
+        """
+        Set field values on a copy of this template inside a writer.
+
+        Only the widgets of fields that receive values are updated, each with
+        just its own values.
+
+        Args:
+            writer: Document holding the copy
+            field_values: Field name to value
+            first_page: Index of the copy's first page in the writer
+            on_page: Called with each page's index in the writer once the
+                page is done; exceptions it raises stop the fill
+            appearances: Generate each text field's appearance stream. Without
+                them only the values are set and the document asks viewers to
+                draw the fields (NeedAppearances), which is much faster but
+                leaves nothing for flattening to draw
+
+        Raises:
+            FormFieldError: If the fields on a page can't be set
+        """
+        located = self.locate(field_values) if field_values and self.fields else {}
+        if located and not appearances:
+            writer.set_need_appearances_writer(True)
+        for page_number in range(self.page_count):
+            if page_number in located:
+                annots = writer.pages[first_page + page_number]['/Annots'].get_object()
+                try:
+                    for position, widget_values in located[page_number].items():
+                        if appearances:
+                            # A stand-in page holding just this widget
+                            widget = DictionaryObject({NameObject('/Annots'): ArrayObject([annots[position]])})
+                            writer.update_page_form_field_values(widget, widget_values)
+                        else:
+                            _set_widget_values(annots[position].get_object(), widget_values)
+                except Exception as e:
+                    page_values = {name for values in located[page_number].values() for name in values}
+                    logger.error(f"Failed to fill fields on page {page_number + 1} of {self.path.name}: {e}")
+                    raise FormFieldError(
+                        f"Could not fill {sorted(page_values)} on page {page_number + 1} "
+                        f"of {self.path.name}: {e}"
+                    ) from e
+            if on_page is not None:
+                on_page(first_page + page_number)
+
+    def locate(self, field_values: Dict[str, Any]) -> Dict[int, Dict[int, Dict[str, Any]]]:
+        """
+        Group field values by the widget they go into.
+
+        Args:
+            field_values: Field name (qualified or partial) to value
+
+        Returns:
+            Page index -> annotation position -> values for that widget;
+            names the template doesn't have are left out
+        """
+        pages: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        for name, value in field_values.items():
+            for page_number, position in self.field_index.get(name, ()):
+                pages.setdefault(page_number, {}).setdefault(position, {})[name] = value
+        return pages
+
+
+def _set_widget_values(widget: DictionaryObject, values: Dict[str, Any]) -> None:
+    """Set a widget's field value (and checkbox state) without drawing its appearance"""
+    # Same owner rule as FormTemplate.load
+    owner = widget if '/FT' in widget and '/T' in widget else widget['/Parent'].get_object()
+    for value in values.values():
+        if owner.get('/FT') == '/Btn':
+            state = NameObject(value)
+            normal = widget.get('/AP', DictionaryObject()).get_object().get('/N', DictionaryObject()).get_object()
+            if state not in normal:
+                state = NameObject('/Off')
+            widget[NameObject('/AS')] = state
+            widget[NameObject('/V')] = state
+        else:
+            owner[NameObject('/V')] = TextStringObject(value)
+
+
+class TemplateCache:
+    """Bounded process-wide cache of parsed templates keyed by file path"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_TEMPLATES):
+        """
+        Create a cache.
+
+        Args:
+            max_entries: Number of templates kept before the least recently
+                used one is dropped
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, FormTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path) -> FormTemplate:
+        """
+        Get the parsed template for a file, loading or reloading it as needed.
+
+        Args:
+            path: Template PDF
+
+        Returns:
+            FormTemplate matching the file currently on disk
+        """
+        key = str(Path(path).resolve())
+        stat = os.stat(key)
+        with self._lock:
+            template = self._entries.get(key)
+            if template is not None and template.is_current(stat):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return template
+            self.misses += 1
+
+        if template is not None:
+            logger.info(f"Template changed on disk, reloading: {key}")
+        template = FormTemplate.load(Path(key))
+        with self._lock:
+            self._entries[key] = template
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return template
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """
+        Drop one template, or all of them.
+
+        Args:
+            path: Template to drop (None clears the cache)
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(Path(path).resolve()), None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache size and hit/miss counts"""
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+# Global template cache instance
+_template_cache: Optional[TemplateCache] = None
+
+
+def get_template_cache() -> TemplateCache:
+    """
+    Get the process-wide template cache (singleton).
+
+    Returns:
+        Shared TemplateCache instance
+    """
+    global _template_cache
+
+    if _template_cache is None:
+        _template_cache = TemplateCache()
+    return _template_cache
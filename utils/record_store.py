@@ -0,0 +1,499 @@
+"""
+Record Store - Columnar storage for high-volume transaction rows
+
+Imported transactions, capital gain lots and audit entries can number in the
+hundreds of thousands. Holding each one as a dataclass instance (or a dict of
+strings) costs several hundred bytes per row. A RecordStore keeps one column
+per field instead:
+
+- ``category``: repeated values (currencies, accounts, enum members) stored
+  once, with an int32 code per row
+- ``float``: float64 array
+- ``decimal``: int64 coefficient and int8 exponent per row
+- ``date`` / ``datetime``: int32 ordinals / int64 microseconds
+- ``bool``: one byte per row
+- ``object``: plain list, for free text and nested values
+
+A typed column that meets a value it can't represent exactly (datetimes with
+different time zones, a Decimal beyond int64) converts itself to an object column, so
+storage is always lossless.
+
+Rows come back as the original record type on indexing or iteration, as
+slotted RecordView objects reading straight from the columns, or as dicts
+through the lazy ``dicts()`` view used by GUI tables.
+"""
+
+import dataclasses
+from array import array
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
+
+import numpy as np
+
+T = TypeVar('T')
+
+_EPOCH = datetime(1, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NULL_INT = -(2 ** 63)
+
+_INT64_LIMIT = 2 ** 63 - 1
+_MAX_COEFFICIENT_DIGITS = 19
+
+# Datetime column that hasn't seen a value yet
+_NO_TZINFO = object()
+
+
+class _Unrepresentable(Exception):
+    """Raised by a typed column for a value it can't store exactly"""
+
+
+class _ObjectColumn:
+    """Plain list of values"""
+
+    kind = 'object'
+
+    def __init__(self, values: Iterable[Any] = ()):
+        self._values = list(values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index: int) -> Any:
+        return self._values[index]
+
+    def append(self, value: Any) -> None:
+        self._values.append(value)
+
+    def clear(self) -> None:
+        self._values.clear()
+
+    def nbytes(self) -> int:
+        return self._values.__sizeof__()
+
+
+class _CategoryColumn:
+    """Dictionary-encoded column for values that repeat across rows"""
+
+    kind = 'category'
+
+    def __init__(self):
+        self._codes = array('i')
+        self._categories: List[Any] = []
+        self._index: Dict[Tuple[type, Any], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, index: int) -> Any:
+        code = self._codes[index]
+        return None if code < 0 else self._categories[code]
+
+    def append(self, value: Any) -> None:
+        if value is None:
+            self._codes.append(-1)
+            return
+        # Keyed by type too, so 1, 1.0 and True stay distinct
+        key = (type(value), value)
+        try:
+            code = self._index.get(key)
+        except TypeError:
+            raise _Unrepresentable(value)
+        if code is None:
+            code = len(self._categories)
+            self._categories.append(value)
+            self._index[key] = code
+        self._codes.append(code)
+
+    def clear(self) -> None:
+        self._codes = array('i')
+        self._categories.clear()
+        self._index.clear()
+
+    def nbytes(self) -> int:
+        return self._codes.buffer_info()[1] * self._codes.itemsize
+
+    @property
+    def categories(self) -> List[Any]:
+        """Distinct values in first-seen order"""
+        return list(self._categories)
+
+
+class _ArrayColumn:
+    """Base for columns backed by a typed array with a null sentinel"""
+
+    kind = ''
+    typecode = 'q'
+    null: Any = _NULL_INT
+
+    def __init__(self):
+        self._data = array(self.typecode)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, index: int) -> Any:
+        raw = self._data[index]
+        return None if raw == self.null else self.decode(raw)
+
+    def append(self, value: Any) -> None:
+        self._data.append(self.null if value is None else self.encode(value))
+
+    def clear(self) -> None:
+        self._data = array(self.typecode)
+
+    def nbytes(self) -> int:
+        return len(self._data) * self._data.itemsize
+
+    def encode(self, value: Any) -> Any:
+        raise NotImplementedError
+
+    def decode(self, raw: Any) -> Any:
+        raise NotImplementedError
+
+    def to_numpy(self) -> np.ndarray:
+        """Zero-copy view of the raw column"""
+        return np.frombuffer(self._data, dtype=self._data.typecode)
+
+
+class _FloatColumn(_ArrayColumn):
+    kind = 'float'
+    typecode = 'd'
+    null = None
+
+    def __init__(self):
+        super().__init__()
+        self._nulls: set = set()
+
+    def __getitem__(self, index: int) -> Any:
+        if self._nulls and index % len(self._data) in self._nulls:
+            return None
+        return self._data[index]
+
+    def append(self, value: Any) -> None:
+        if value is None:
+            self._nulls.add(len(self._data))
+            self._data.append(0.0)
+        elif type(value) is float:
+            self._data.append(value)
+        else:
+            raise _Unrepresentable(value)
+
+    def clear(self) -> None:
+        super().clear()
+        self._nulls.clear()
+
+
+class _DateColumn(_ArrayColumn):
+    kind = 'date'
+    typecode = 'i'
+    null = 0
+
+    def encode(self, value: Any) -> int:
+        if type(value) is not date:
+            raise _Unrepresentable(value)
+        return value.toordinal()
+
+    def decode(self, raw: int) -> date:
+        return date.fromordinal(raw)
+
+
+class _DateTimeColumn(_ArrayColumn):
+    """Wall-clock microseconds; aware datetimes must share one tzinfo per column"""
+
+    kind = 'datetime'
+
+    def __init__(self):
+        super().__init__()
+        self._tzinfo: Any = _NO_TZINFO
+
+    def encode(self, value: Any) -> int:
+        if type(value) is not datetime or value.fold:
+            raise _Unrepresentable(value)
+        if self._tzinfo is _NO_TZINFO:
+            self._tzinfo = value.tzinfo
+        elif value.tzinfo is not self._tzinfo:
+            raise _Unrepresentable(value)
+        return (value.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+
+    def decode(self, raw: int) -> datetime:
+        value = _EPOCH + timedelta(microseconds=raw)
+        return value if self._tzinfo is None else value.replace(tzinfo=self._tzinfo)
+
+    def clear(self) -> None:
+        super().clear()
+        self._tzinfo = _NO_TZINFO
+
+
+class _BoolColumn(_ArrayColumn):
+    kind = 'bool'
+    typecode = 'b'
+    null = -1
+
+    def encode(self, value: Any) -> int:
+        if type(value) is not bool:
+            raise _Unrepresentable(value)
+        return int(value)
+
+    def decode(self, raw: int) -> bool:
+        return bool(raw)
+
+
+class _DecimalColumn(_ArrayColumn):
+    """Decimals as int64 coefficients with an int8 exponent per row"""
+
+    kind = 'decimal'
+
+    def __init__(self):
+        super().__init__()
+        self._exponents = array('b')
+
+    def __getitem__(self, index: int) -> Any:
+        raw = self._data[index]
+        return None if raw == _NULL_INT else Decimal(raw).scaleb(self._exponents[index])
+
+    def append(self, value: Any) -> None:
+        if value is None:
+            self._data.append(_NULL_INT)
+            self._exponents.append(0)
+            return
+        if type(value) is not Decimal or not value.is_finite():
+            raise _Unrepresentable(value)
+        sign, digits, exponent = value.as_tuple()
+        if len(digits) > _MAX_COEFFICIENT_DIGITS or not -128 <= exponent <= 127:
+            raise _Unrepresentable(value)
+        coefficient = int(value.scaleb(-exponent))
+        if abs(coefficient) > _INT64_LIMIT or (sign and not coefficient):
+            raise _Unrepresentable(value)
+        self._data.append(coefficient)
+        self._exponents.append(exponent)
+
+    def clear(self) -> None:
+        super().clear()
+        self._exponents = array('b')
+
+    def nbytes(self) -> int:
+        return super().nbytes() + len(self._exponents)
+
+
+COLUMN_KINDS: Dict[str, Callable[[], Any]] = {
+    'object': _ObjectColumn,
+    'category': _CategoryColumn,
+    'float': _FloatColumn,
+    'decimal': _DecimalColumn,
+    'date': _DateColumn,
+    'datetime': _DateTimeColumn,
+    'bool': _BoolColumn,
+}
+
+
+class RecordView:
+    """
+    Lightweight row of a RecordStore.
+
+    Attribute reads go straight to the store's columns, so a view costs two
+    slots regardless of how many fields the record has.
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'RecordStore', index: int):
+        self._store = store
+        self._index = index
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            column = self._store._columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return column[self._index]
+
+    def materialize(self) -> Any:
+        """Build the full record object for this row"""
+        return self._store[self._index]
+
+    def __repr__(self) -> str:
+        return f"RecordView({self._store.record_type.__name__}, {self._index})"
+
+
+class _DictView(Sequence):
+    """Sequence of row dicts built only when a row is accessed"""
+
+    def __init__(self, store: 'RecordStore'):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._store.row_dict(i) for i in range(*index.indices(len(self._store)))]
+        return self._store.row_dict(index)
+
+
+class RecordStore(Sequence, Generic[T]):
+    """
+    Append-only columnar collection of dataclass records.
+
+    Behaves like a read-only list of records (indexing, slicing, iteration,
+    ``len`` and equality with lists), plus ``append``, ``extend`` and
+    ``clear``. Records are rebuilt from the columns when accessed.
+    """
+
+    def __init__(self, record_type: Type[T], columns: Dict[str, str],
+                 records: Iterable[T] = ()):
+        """
+        Create a store.
+
+        Args:
+            record_type: Dataclass of the records
+            columns: Column kind per field (see COLUMN_KINDS); fields not
+                listed are stored as objects
+            records: Initial records
+        """
+        self.record_type = record_type
+        self._fields = tuple(f.name for f in dataclasses.fields(record_type))
+        unknown = set(columns) - set(self._fields)
+        if unknown:
+            raise ValueError(f"Unknown fields for {record_type.__name__}: {sorted(unknown)}")
+        self._kinds = {name: columns.get(name, 'object') for name in self._fields}
+        self._columns: Dict[str, Any] = {
+            name: COLUMN_KINDS[kind]() for name, kind in self._kinds.items()
+        }
+        self._length = 0
+        self.extend(records)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("record index out of range")
+        return self._materialize(index)
+
+    def __iter__(self) -> Iterator[T]:
+        for index in range(self._length):
+            yield self._materialize(index)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, RecordStore):
+            return self.record_type is other.record_type and list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"RecordStore({self.record_type.__name__}, {self._length} records)"
+
+    def _materialize(self, index: int) -> T:
+        return self.record_type(**{name: self._columns[name][index] for name in self._fields})
+
+    def append(self, record: T) -> None:
+        """
+        Add a record.
+
+        Args:
+            record: Instance of the store's record type
+        """
+        values = [getattr(record, name) for name in self._fields]
+        for name, value in zip(self._fields, values):
+            column = self._columns[name]
+            try:
+                column.append(value)
+            except _Unrepresentable:
+                self._columns[name] = column = _ObjectColumn(column[i] for i in range(self._length))
+                column.append(value)
+        self._length += 1
+
+    def extend(self, records: Iterable[T]) -> None:
+        """Add records in order"""
+        for record in records:
+            self.append(record)
+
+    def clear(self) -> None:
+        """Remove all records"""
+        for column in self._columns.values():
+            column.clear()
+        self._length = 0
+
+    def view(self, index: int) -> RecordView:
+        """Get a slotted view of a row without building the record"""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("record index out of range")
+        return RecordView(self, index)
+
+    def column(self, name: str) -> List[Any]:
+        """
+        Get every value of one field.
+
+        Args:
+            name: Field name
+
+        Returns:
+            Values in row order
+        """
+        column = self._columns[name]
+        return [column[i] for i in range(self._length)]
+
+    def to_numpy(self, name: str) -> np.ndarray:
+        """
+        Zero-copy array of a float, date, datetime or bool column's raw values.
+
+        Dates are ordinals and datetimes microseconds since 0001-01-01.
+
+        Raises:
+            TypeError: If the column is not stored as a typed array
+        """
+        column = self._columns[name]
+        if not isinstance(column, _ArrayColumn) or isinstance(column, _DecimalColumn):
+            raise TypeError(f"Column '{name}' is stored as {column.kind}, not a numeric array")
+        return column.to_numpy()
+
+    def row_dict(self, index: int) -> Dict[str, Any]:
+        """
+        Materialize one row as a dict, the way the record serializes itself.
+
+        Uses the record type's ``to_dict`` when it has one.
+        """
+        record = self[index]
+        to_dict = getattr(record, 'to_dict', None)
+        return to_dict() if to_dict is not None else dataclasses.asdict(record)
+
+    def dicts(self) -> Sequence:
+        """Lazy sequence of row dicts for display code"""
+        return _DictView(self)
+
+    def storage_kinds(self) -> Dict[str, str]:
+        """How each field is currently stored (typed columns may have fallen back to object)"""
+        return {name: column.kind for name, column in self._columns.items()}
+
+    def nbytes(self) -> int:
+        """Size of the column buffers (object columns count list slots only)"""
+        return sum(column.nbytes() for column in self._columns.values())
+
+    @classmethod
+    def from_dicts(cls, record_type: Type[T], columns: Dict[str, str], rows: Iterable[Dict[str, Any]],
+                   parse: Optional[Callable[[Dict[str, Any]], T]] = None) -> 'RecordStore[T]':
+        """
+        Build a store from serialized rows.
+
+        Args:
+            record_type: Dataclass of the records
+            columns: Column kind per field
+            rows: Row dicts
+            parse: Converts a row to a record (default: record_type.from_dict)
+
+        Returns:
+            Populated store
+        """
+        parse = parse or record_type.from_dict
+        return cls(record_type, columns, (parse(row) for row in rows))
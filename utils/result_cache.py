@@ -0,0 +1,195 @@
+"""
+Content-addressed result cache shared by the calculation services
+
+Results are keyed by a stable structural hash of the inputs they were
+computed from rather than by object identity or modification time. Reloading
+an unchanged return, or undoing an edit, produces the same key and finds the
+earlier result.
+
+The cache is bounded and evicts the least recently used entry. A single
+process-wide instance is shared by TaxData, TaxCalculationService and
+TaxAnalyticsService (see get_result_cache()).
+"""
+
+import copy
+import dataclasses
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Optional
+
+DEFAULT_MAX_ENTRIES = 512
+
+_MISSING = object()
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values json can't, tagged so they don't collide with plain strings"""
+    if isinstance(value, Decimal):
+        return f"D:{value}"
+    if isinstance(value, (datetime, date)):
+        return f"T:{value.isoformat()}"
+    if isinstance(value, (set, frozenset)):
+        return sorted(_canonical(item) for item in value)
+    if isinstance(value, Enum):
+        return _canonical(value.value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _canonical(dataclasses.asdict(value))
+    return f"R:{value!r}"
+
+
+def _canonical(value: Any) -> Any:
+    """Convert to json-encodable values with string keys in a stable order"""
+    if isinstance(value, dict):
+        return [[repr(key), _canonical(item)] for key, item in sorted(value.items(), key=lambda kv: repr(kv[0]))]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return _json_default(value)
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    Stable structural hash of one or more values.
+
+    Equal nested structures (dicts compared by content regardless of key
+    order) hash the same across runs and processes.
+
+    Args:
+        *parts: Values to hash (dicts, lists, scalars, Decimal, dates, ...)
+
+    Returns:
+        Hex digest
+    """
+    try:
+        encoded = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=_json_default)
+    except TypeError:
+        # Mixed key types can't be sorted by json; fall back to repr-ordered keys
+        encoded = json.dumps(_canonical(parts), separators=(',', ':'))
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of calculation results.
+
+    Values are copied on the way in and out, so callers can modify what
+    they get back without corrupting the cache.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Create a cache.
+
+        Args:
+            max_entries: Number of results kept before the least recently
+                used one is evicted
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a result, marking it most recently used.
+
+        Args:
+            key: Cache key
+            default: Returned when the key is not cached
+
+        Returns:
+            Copy of the cached result, or default
+        """
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a result, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Result to cache (a copy is stored)
+        """
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for key, computing and storing it on a miss.
+
+        Args:
+            key: Cache key
+            compute: Called with no arguments on a miss
+
+        Returns:
+            Cached or newly computed result
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit, miss and eviction counts"""
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+# Global result cache instance
+_global_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    """
+    Get the process-wide result cache (singleton).
+
+    Returns:
+        Shared ResultCache instance
+    """
+    global _global_cache
+
+    if _global_cache is None:
+        _global_cache = ResultCache()
+    return _global_cache
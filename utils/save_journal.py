@@ -0,0 +1,270 @@
+"""
+Save Journal - Append-only encrypted change log next to a saved return
+
+Rewriting a whole return on every autosave is expensive, and a process that
+dies mid-write can leave nothing usable behind. The journal records changes
+instead, in a file next to the base return ("<name>.journal"):
+
+    header   magic "FTXJ", version, 16-byte salt, SHA-256 of the base's index
+    records  4-byte length + AES-256-GCM ciphertext and tag, repeated
+
+Each record is one JSON-encoded change. Appends are a single write followed
+by fsync, so an autosave costs the size of the changes, not of the return.
+
+Records are encrypted with a key derived by HKDF from the master key and the
+header's salt. A record's nonce is its position and the header is
+authenticated with every record, so records can't be reordered or moved to
+another journal. The base digest ties the journal to one version of the base
+file: after a compaction writes a new base, a journal left behind by a crash
+no longer matches and is discarded rather than replayed twice.
+
+A crash during an append leaves a partial record at the end. Replay stops at
+the first record that is incomplete or fails authentication, and the next
+append overwrites it.
+"""
+
+import json
+import logging
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_MAGIC = b"FTXJ"
+JOURNAL_VERSION = 1
+JOURNAL_SUFFIX = ".journal"
+
+# magic, version, reserved, reserved, salt, base digest
+_HEADER = struct.Struct(">4sBBH16s32s")
+_LENGTH = struct.Struct(">I")
+_TAG_SIZE = 16
+_MAX_RECORD_SIZE = 256 * 1024 * 1024
+_KEY_INFO = b"FreedomUSTaxReturn save journal v1"
+
+
+def journal_path(base_path: Path) -> Path:
+    """Path of the journal kept next to a base file"""
+    base_path = Path(base_path)
+    return base_path.with_name(base_path.name + JOURNAL_SUFFIX)
+
+
+def encode_record(change: Dict[str, Any]) -> bytes:
+    """Serialize a change for append(); encoding early snapshots mutable values"""
+    return json.dumps(change, separators=(',', ':')).encode('utf-8')
+
+
+def apply_change(data: Dict[str, Any], change: Dict[str, Any]) -> None:
+    """
+    Apply one journaled change to a return's data, without validation.
+
+    Args:
+        data: Return data with "years" and "metadata"
+        change: A change as recorded by TaxData
+    """
+    op = change["op"]
+    if op == "metadata":
+        data["metadata"][change["key"]] = change["value"]
+        return
+    years = data["years"]
+    year = change["year"]
+    if op == "year":
+        if change["value"] is None:
+            years.pop(year, None)
+        else:
+            years[year] = change["value"]
+        return
+    if op == "section":
+        years[year][change["section"]] = change["value"]
+        return
+
+    keys = change["path"].split('.')
+    target = years[year]
+    for key in keys[:-1]:
+        target = target.setdefault(key, {})
+    if op == "set":
+        target[keys[-1]] = change["value"]
+    elif change["action"] == "append":
+        target[keys[-1]].append(change["item"])
+    elif change["action"] == "remove":
+        target[keys[-1]].pop(change["index"])
+    else:
+        target[keys[-1]][change["index"]] = change["item"]
+
+
+def _journal_key(master_key: bytes, salt: bytes) -> AESGCM:
+    key = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=_KEY_INFO).derive(master_key)
+    return AESGCM(key)
+
+
+def fsync_directory(path: Path) -> None:
+    """Persist a rename or unlink in a directory (not possible on Windows)"""
+    if os.name == 'nt':
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def file_state(path: Path) -> Optional[Tuple[int, int, int]]:
+    """Identity of a file's current version (None if missing); replacing or writing it changes it"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class SaveJournal:
+    """
+    Append-only journal of changes made since a base file was saved.
+
+    Create one per base file; open() replays what an earlier session wrote
+    and positions the journal for further appends.
+    """
+
+    def __init__(self, base_path: Path, master_key: bytes):
+        """
+        Prepare a journal for a base file; nothing is read or written yet.
+
+        Args:
+            base_path: The saved return the journal belongs to
+            master_key: Secret the journal key is derived from
+        """
+        self.path = journal_path(base_path)
+        self._master_key = master_key
+        self._header = b""
+        self._cipher = None
+        self._next_index = 0
+        self._end = 0
+
+    @property
+    def size(self) -> int:
+        """Bytes of valid journal on disk (0 if none)"""
+        return self._end
+
+    def open(self, base_digest: bytes) -> List[Dict[str, Any]]:
+        """
+        Read the changes recorded against a base file.
+
+        A journal for a different base, with an unreadable header or
+        another key is removed, since its changes can't be applied.
+
+        Args:
+            base_digest: SHA-256 of the base file's index
+
+        Returns:
+            Recorded changes, oldest first
+        """
+        self._reset()
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return []
+
+        header = raw[:_HEADER.size]
+        if len(header) < _HEADER.size:
+            logger.warning(f"Discarding incomplete journal: {self.path.name}")
+            self.discard()
+            return []
+        magic, version, _, _, salt, digest = _HEADER.unpack(header)
+        if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION or digest != base_digest:
+            logger.warning(f"Discarding journal that does not match its base file: {self.path.name}")
+            self.discard()
+            return []
+
+        cipher = _journal_key(self._master_key, salt)
+        changes = []
+        index = 0
+        position = _HEADER.size
+        while position < len(raw):
+            length_bytes = raw[position:position + _LENGTH.size]
+            if len(length_bytes) < _LENGTH.size:
+                break
+            (length,) = _LENGTH.unpack(length_bytes)
+            start = position + _LENGTH.size
+            ciphertext = raw[start:start + length]
+            if not _TAG_SIZE <= length <= _MAX_RECORD_SIZE or len(ciphertext) < length:
+                break
+            try:
+                plaintext = cipher.decrypt(index.to_bytes(12, 'big'), ciphertext, header)
+            except InvalidTag:
+                break
+            changes.append(json.loads(plaintext))
+            index += 1
+            position = start + length
+
+        if position < len(raw):
+            logger.warning(f"Ignoring {len(raw) - position} unreadable bytes at the end of {self.path.name}")
+        self._header = header
+        self._cipher = cipher
+        self._next_index = index
+        self._end = position
+        return changes
+
+    def append(self, base_digest: bytes, records: Sequence[bytes]) -> None:
+        """
+        Durably add encoded changes, starting the journal if needed.
+
+        Args:
+            base_digest: SHA-256 of the base file's index
+            records: Changes from encode_record(), oldest first
+        """
+        if not records:
+            return
+        created = not self._header
+        if created:
+            self._header = _HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, 0, 0, os.urandom(16), base_digest)
+            self._cipher = _journal_key(self._master_key, self._header[8:24])
+
+        buffer = bytearray(self._header if created else b"")
+        index = self._next_index
+        for record in records:
+            ciphertext = self._cipher.encrypt(index.to_bytes(12, 'big'), record, self._header)
+            buffer += _LENGTH.pack(len(ciphertext))
+            buffer += ciphertext
+            index += 1
+
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        if created:
+            flags |= os.O_TRUNC
+        fd = os.open(self.path, flags, 0o600)
+        try:
+            # Overwrite any torn record a crash left after the valid ones
+            os.lseek(fd, self._end, os.SEEK_SET)
+            os.ftruncate(fd, self._end)
+            view = memoryview(buffer)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        except BaseException:
+            if created:
+                self._reset()
+            raise
+        finally:
+            os.close(fd)
+        if created:
+            fsync_directory(self.path.parent)
+
+        self._next_index = index
+        self._end += len(buffer)
+
+    def discard(self) -> None:
+        """Remove the journal, once its changes are part of a new base file"""
+        self.path.unlink(missing_ok=True)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._header = b""
+        self._cipher = None
+        self._next_index = 0
+        self._end = 0
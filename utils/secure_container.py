@@ -0,0 +1,260 @@
+"""
+Secure Container - Versioned, compressed, chunk-encrypted file format
+
+Saved returns used to be a Fernet token of a JSON package: base64 text about
+a third larger than the data, built and encrypted in memory as a whole. A
+container is binary and streamed instead:
+
+    header   magic "FTXC", version, codec, chunk size, 16-byte salt
+    chunks   4-byte length + AES-256-GCM ciphertext and tag, repeated
+
+The payload is compressed (zlib) and cut into fixed-size chunks that are
+encrypted and written one at a time, so neither the compressed nor the
+encrypted form of the whole payload is ever held in memory.
+
+Each file gets its own key, derived with HKDF from the caller's master key
+and the random salt in the header. A chunk's nonce is its index plus a flag
+marking the final chunk, and the header is authenticated with every chunk,
+so chunks can't be altered, reordered, dropped or appended without the read
+failing.
+"""
+
+import os
+import struct
+import zlib
+from typing import BinaryIO, Iterable, Iterator
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+MAGIC = b"FTXC"
+CONTAINER_VERSION = 1
+DEFAULT_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+
+# magic, version, codec, reserved, chunk size, salt
+_HEADER = struct.Struct(">4sBBHI16s")
+_LENGTH = struct.Struct(">I")
+_TAG_SIZE = 16
+_KEY_INFO = b"FreedomUSTaxReturn secure container v1"
+
+
+class ContainerError(ValueError):
+    """A container is malformed, truncated or fails authentication"""
+
+
+def is_container(prefix: bytes) -> bool:
+    """Whether data starting with these bytes is a container"""
+    return prefix[:len(MAGIC)] == MAGIC
+
+
+def _file_key(master_key: bytes, salt: bytes) -> AESGCM:
+    key = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=_KEY_INFO).derive(master_key)
+    return AESGCM(key)
+
+
+def _nonce(index: int, final: bool) -> bytes:
+    return index.to_bytes(11, 'big') + (b"\x01" if final else b"\x00")
+
+
+class ContainerWriter:
+    """
+    Streams a payload into a container.
+
+    Data passed to write() is compressed and encrypted in chunks as it
+    arrives; close() writes the final chunk. Use as a context manager.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        master_key: bytes,
+        compress: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        level: int = 6
+    ):
+        """
+        Write the header and prepare for data.
+
+        Args:
+            fileobj: Binary file opened for writing
+            master_key: Secret the file key is derived from
+            compress: Whether to zlib-compress the payload
+            chunk_size: Plaintext bytes per encrypted chunk
+            level: zlib compression level
+
+        Raises:
+            ValueError: If chunk_size is out of range
+        """
+        if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            raise ValueError(f"chunk_size must be between 1 and {MAX_CHUNK_SIZE}, got {chunk_size}")
+        self._file = fileobj
+        self._chunk_size = chunk_size
+        self._compressor = zlib.compressobj(level) if compress else None
+        salt = os.urandom(16)
+        self._header = _HEADER.pack(MAGIC, CONTAINER_VERSION, CODEC_ZLIB if compress else CODEC_NONE,
+                                    0, chunk_size, salt)
+        self._cipher = _file_key(master_key, salt)
+        self._pending = bytearray()
+        self._index = 0
+        self._closed = False
+        self.bytes_written = len(self._header)
+        self._file.write(self._header)
+
+    def write(self, data: bytes) -> None:
+        """Add payload bytes"""
+        if self._closed:
+            raise ValueError("Container is closed")
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self._pending += data
+        while len(self._pending) > self._chunk_size:
+            self._write_chunk(bytes(self._pending[:self._chunk_size]), final=False)
+            del self._pending[:self._chunk_size]
+
+    def close(self) -> None:
+        """Flush the compressor and write the final chunk"""
+        if self._closed:
+            return
+        if self._compressor is not None:
+            self._pending += self._compressor.flush()
+        while len(self._pending) > self._chunk_size:
+            self._write_chunk(bytes(self._pending[:self._chunk_size]), final=False)
+            del self._pending[:self._chunk_size]
+        self._write_chunk(bytes(self._pending), final=True)
+        self._pending = bytearray()
+        self._closed = True
+
+    def _write_chunk(self, plaintext: bytes, final: bool) -> None:
+        ciphertext = self._cipher.encrypt(_nonce(self._index, final), plaintext, self._header)
+        self._file.write(_LENGTH.pack(len(ciphertext)))
+        self._file.write(ciphertext)
+        self.bytes_written += _LENGTH.size + len(ciphertext)
+        self._index += 1
+
+    def __enter__(self) -> 'ContainerWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        # Leave a failed write without a final chunk, so it can't be read as complete
+        if exc_type is None:
+            self.close()
+
+
+def write_container(
+    fileobj: BinaryIO,
+    master_key: bytes,
+    pieces: Iterable[bytes],
+    compress: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """
+    Write a payload given as a sequence of byte strings.
+
+    Args:
+        fileobj: Binary file opened for writing
+        master_key: Secret the file key is derived from
+        pieces: Payload, in order
+        compress: Whether to zlib-compress the payload
+        chunk_size: Plaintext bytes per encrypted chunk
+
+    Returns:
+        Bytes written
+    """
+    with ContainerWriter(fileobj, master_key, compress, chunk_size) as writer:
+        for piece in pieces:
+            writer.write(piece)
+    return writer.bytes_written
+
+
+def iter_container(fileobj: BinaryIO, master_key: bytes) -> Iterator[bytes]:
+    """
+    Decrypt and decompress a container chunk by chunk.
+
+    Args:
+        fileobj: Binary file positioned at the container's start
+        master_key: Secret the file key was derived from
+
+    Yields:
+        Payload bytes, in order
+
+    Raises:
+        ContainerError: If the container is malformed, truncated, has
+            trailing data or was written with another key
+    """
+    header = fileobj.read(_HEADER.size)
+    if len(header) < _HEADER.size or not is_container(header):
+        raise ContainerError("Not a secure container")
+    _, version, codec, _, chunk_size, salt = _HEADER.unpack(header)
+    if version != CONTAINER_VERSION:
+        raise ContainerError(f"Unsupported container version {version}")
+    if codec not in (CODEC_NONE, CODEC_ZLIB):
+        raise ContainerError(f"Unsupported container codec {codec}")
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise ContainerError(f"Invalid container chunk size {chunk_size}")
+
+    cipher = _file_key(master_key, salt)
+    decompressor = zlib.decompressobj() if codec == CODEC_ZLIB else None
+    index = 0
+    length_bytes = fileobj.read(_LENGTH.size)
+    while True:
+        if len(length_bytes) < _LENGTH.size:
+            raise ContainerError("Container is truncated")
+        (length,) = _LENGTH.unpack(length_bytes)
+        if not _TAG_SIZE <= length <= chunk_size + _TAG_SIZE:
+            raise ContainerError(f"Invalid chunk length {length}")
+        ciphertext = fileobj.read(length)
+        if len(ciphertext) < length:
+            raise ContainerError("Container is truncated")
+
+        # Only the last chunk in the file may carry the final flag in its nonce
+        length_bytes = fileobj.read(_LENGTH.size)
+        final = not length_bytes
+        try:
+            plaintext = cipher.decrypt(_nonce(index, final), ciphertext, header)
+        except InvalidTag:
+            raise ContainerError("Container failed authentication (corrupted, tampered or another key)") from None
+        index += 1
+
+        if decompressor is not None:
+            try:
+                plaintext = decompressor.decompress(plaintext)
+            except zlib.error as e:
+                raise ContainerError(f"Container payload is corrupted: {e}") from e
+        if plaintext:
+            yield plaintext
+        if final:
+            break
+
+    if decompressor is not None:
+        try:
+            tail = decompressor.flush()
+        except zlib.error as e:
+            raise ContainerError(f"Container payload is corrupted: {e}") from e
+        if tail:
+            yield tail
+
+
+def read_container(fileobj: BinaryIO, master_key: bytes) -> bytearray:
+    """
+    Read a whole container's payload.
+
+    Args:
+        fileobj: Binary file positioned at the container's start
+        master_key: Secret the file key was derived from
+
+    Returns:
+        The payload
+
+    Raises:
+        ContainerError: See iter_container()
+    """
+    payload = bytearray()
+    for piece in iter_container(fileobj, master_key):
+        payload += piece
+    return payload
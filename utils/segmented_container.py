@@ -0,0 +1,438 @@
+"""
+Segmented Container - Index plus separately encrypted segments
+
+A multi-year return is mostly years nobody is looking at, yet a single
+container (see utils/secure_container.py) has to be decrypted and parsed as
+a whole. A segmented file stores each year in its own container instead:
+
+    header    magic "FTXS", version, index length
+    index     secure container of JSON: the shared data and, per segment,
+              its key, offset, length and SHA-256 digests
+    segments  one secure container of JSON per segment, back to back
+
+Opening a file reads only the header and the index. Segment values live in
+a LazySegments mapping and are decrypted on first access. The index is
+authenticated and records each segment's ciphertext digest, so a segment
+swapped in from another file or an older save is rejected when it's read.
+
+Saving copies segments that were never loaded, or whose JSON is unchanged,
+byte for byte from the previous file; only changed segments are serialized,
+compressed and encrypted again. Only segments that were never loaded need
+the previous file to still be there.
+"""
+
+import hashlib
+import io
+import json
+import struct
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from utils.secure_container import ContainerError, read_container, write_container
+
+SEGMENTED_MAGIC = b"FTXS"
+SEGMENTED_VERSION = 1
+
+# magic, version, reserved, reserved, index length
+_FILE_HEADER = struct.Struct(">4sBBHI")
+_COPY_SIZE = 1024 * 1024
+
+
+class _Unloaded:
+    """Placeholder stored for a segment that hasn't been decrypted yet"""
+
+    def __repr__(self) -> str:
+        return "<not loaded>"
+
+
+_UNLOADED = _Unloaded()
+
+
+def is_segmented(prefix: bytes) -> bool:
+    """Whether data starting with these bytes is a segmented container"""
+    return prefix[:len(SEGMENTED_MAGIC)] == SEGMENTED_MAGIC
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+@dataclass
+class SegmentRef:
+    """Where a segment is stored, relative to the end of the index"""
+    key: Union[int, str]
+    offset: int
+    length: int
+    sha256: str
+    payload_sha256: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SegmentRef':
+        """Create from dictionary"""
+        return cls(**data)
+
+
+class LazySegments(dict):
+    """
+    Dict of segment values that decrypts each one on first access.
+
+    Keys, len() and membership tests never load anything. Lookups load the
+    requested segment; items(), values(), comparisons and copies load them
+    all. Copies and pickles are plain dicts detached from the file.
+
+    Set ``reopen`` to a callable that re-attaches the mapping to the
+    current version of its file (see follow()); a lookup that fails because
+    the file was rewritten since it was opened calls it once and retries.
+
+    Raises:
+        ContainerError: From a lookup, if the segment no longer matches the
+            index (the file was changed since it was opened)
+    """
+
+    def __init__(self, values: Optional[Dict[Hashable, Any]] = None):
+        """
+        Create a mapping of loaded values, not yet backed by a file.
+
+        Args:
+            values: Initial values
+        """
+        super().__init__(values or {})
+        self._source: Optional[Path] = None
+        self._master_key: Optional[bytes] = None
+        self._base = 0
+        self._refs: Dict[Hashable, SegmentRef] = {}
+        self._lock = threading.RLock()
+        self.reopen: Optional[Callable[[], None]] = None
+
+    def attach(self, source: Path, master_key: bytes, base: int, refs: Dict[Hashable, SegmentRef]) -> None:
+        """
+        Back the mapping with a saved file.
+
+        Keys without a value are loaded from it on access, and segments that
+        are unchanged can be copied from it on the next save.
+
+        Args:
+            source: File the segments are stored in
+            master_key: Secret the segment keys are derived from
+            base: Offset of the first segment in the file
+            refs: Stored segments by key
+        """
+        with self._lock:
+            self._source = Path(source)
+            self._master_key = master_key
+            self._base = base
+            self._refs = dict(refs)
+            for key in refs:
+                if not dict.__contains__(self, key):
+                    dict.__setitem__(self, key, _UNLOADED)
+
+    def follow(self, newer: 'LazySegments') -> None:
+        """
+        Back the mapping with a newer save of its file.
+
+        Loaded values are kept; segments that weren't loaded are read from
+        the newer file, under the key it was written with.
+
+        Args:
+            newer: Segments of the newer file, from read_segmented()
+        """
+        with self._lock:
+            refs = {key: ref for key, ref in newer._refs.items() if dict.__contains__(self, key)}
+            self.attach(newer._source, newer._master_key, newer._base, refs)
+
+    def is_loaded(self, key: Hashable) -> bool:
+        """Whether a segment's value is in memory"""
+        return dict.get(self, key, _UNLOADED) is not _UNLOADED
+
+    def _read_segment(self, f: BinaryIO, ref: SegmentRef) -> bytes:
+        f.seek(self._base + ref.offset)
+        raw = f.read(ref.length)
+        if len(raw) != ref.length or hashlib.sha256(raw).hexdigest() != ref.sha256:
+            raise ContainerError(f"Segment {ref.key!r} does not match the index of {self._source.name}")
+        return raw
+
+    def _load(self, keys) -> None:
+        with self._lock:
+            keys = [key for key in keys if dict.get(self, key) is _UNLOADED]
+            if not keys:
+                return
+            try:
+                self._load_from_source(keys)
+            except (OSError, ContainerError):
+                if self.reopen is None:
+                    raise
+                self.reopen()
+                self._load_from_source(keys)
+
+    def _load_from_source(self, keys) -> None:
+        with open(self._source, 'rb') as f:
+            for key in sorted(keys, key=lambda k: self._refs[k].offset):
+                raw = self._read_segment(f, self._refs[key])
+                value = json.loads(read_container(io.BytesIO(raw), self._master_key))
+                dict.__setitem__(self, key, value)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = dict.__getitem__(self, key)
+        if value is _UNLOADED:
+            self._load([key])
+            value = dict.__getitem__(self, key)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def setdefault(self, key: Hashable, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def pop(self, key: Hashable, *default: Any) -> Any:
+        if key in self:
+            self._load([key])
+        self._refs.pop(key, None)
+        return dict.pop(self, key, *default)
+
+    def popitem(self) -> Tuple[Hashable, Any]:
+        self._load(list(dict.keys(self))[-1:])
+        key, value = dict.popitem(self)
+        self._refs.pop(key, None)
+        return key, value
+
+    def __delitem__(self, key: Hashable) -> None:
+        dict.__delitem__(self, key)
+        self._refs.pop(key, None)
+
+    def __iter__(self):
+        # Defined so dict() and update() go through keys() and __getitem__
+        # instead of copying the placeholders
+        return dict.__iter__(self)
+
+    def _load_all(self) -> None:
+        self._load(list(dict.keys(self)))
+
+    def items(self):
+        self._load_all()
+        return dict.items(self)
+
+    def values(self):
+        self._load_all()
+        return dict.values(self)
+
+    def copy(self) -> Dict[Hashable, Any]:
+        return dict(self.items())
+
+    def __eq__(self, other: Any) -> bool:
+        self._load_all()
+        if isinstance(other, LazySegments):
+            other._load_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: Any) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __or__(self, other: Any) -> Dict[Hashable, Any]:
+        return self.copy() | other
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
+
+
+def write_segmented(
+    fileobj: BinaryIO,
+    master_key: bytes,
+    shared: Dict[str, Any],
+    segments: Dict[Hashable, Any],
+    compress: bool = True
+) -> Tuple[int, Dict[Hashable, SegmentRef]]:
+    """
+    Write shared data and segments as a segmented container.
+
+    When segments is a LazySegments backed by a file written with the same
+    master key, segments that weren't loaded are copied from that file (and checked against its index while
+    copying). Loaded segments whose JSON is unchanged reuse the file's
+    bytes too, but only if they can still be read and match; if the file
+    was moved or rewritten they are encrypted again from memory.
+
+    Args:
+        fileobj: Binary file opened for writing; it must not be the file
+            backing segments
+        master_key: Secret the container keys are derived from
+        shared: JSON-serializable data stored in the index
+        segments: JSON-serializable values by int or str key
+        compress: Whether to zlib-compress new segments
+
+    Returns:
+        Offset of the first segment and the written segments by key, to
+        pass to LazySegments.attach() once the file is in place
+
+    Raises:
+        ContainerError: If a segment that wasn't loaded can't be copied
+            because its file is missing or no longer matches the index
+    """
+    lazy = segments if isinstance(segments, LazySegments) and segments._source is not None else None
+    if lazy is not None and lazy._master_key != master_key:
+        # Segments stored under another key (before a key rotation) can't be copied
+        lazy._load(list(dict.keys(lazy)))
+        lazy = None
+    refs: Dict[Hashable, SegmentRef] = {}
+    parts = []
+    offset = 0
+    source = _SourceFile(lazy)
+    try:
+        for key in dict.keys(segments):
+            value = dict.__getitem__(segments, key)
+            old = lazy._refs.get(key) if lazy is not None else None
+            if value is _UNLOADED:
+                part = old
+                payload_sha256 = old.payload_sha256
+            else:
+                payload = _dumps(value)
+                payload_sha256 = hashlib.sha256(payload).hexdigest()
+                part = None
+                if old is not None and old.payload_sha256 == payload_sha256:
+                    part = source.read(old)
+                if part is None:
+                    buffer = io.BytesIO()
+                    write_container(buffer, master_key, [payload], compress=compress)
+                    part = buffer.getvalue()
+            if isinstance(part, SegmentRef):
+                refs[key] = SegmentRef(key, offset, part.length, part.sha256, payload_sha256)
+            else:
+                refs[key] = SegmentRef(key, offset, len(part), hashlib.sha256(part).hexdigest(), payload_sha256)
+            parts.append(part)
+            offset += refs[key].length
+
+        index = io.BytesIO()
+        write_container(index, master_key, [_dumps({
+            'shared': shared,
+            'segments': [ref.to_dict() for ref in refs.values()],
+        })])
+        index_bytes = index.getvalue()
+        fileobj.write(_FILE_HEADER.pack(SEGMENTED_MAGIC, SEGMENTED_VERSION, 0, 0, len(index_bytes)))
+        fileobj.write(index_bytes)
+
+        for part in parts:
+            if isinstance(part, SegmentRef):
+                source.copy(part, fileobj)
+            else:
+                fileobj.write(part)
+    finally:
+        source.close()
+    return _FILE_HEADER.size + len(index_bytes), refs
+
+
+class _SourceFile:
+    """The file backing a LazySegments, opened when a save first needs it"""
+
+    def __init__(self, lazy: Optional[LazySegments]):
+        self._lazy = lazy
+        self._file: Optional[BinaryIO] = None
+        self._error: Optional[Exception] = None
+
+    def _open(self) -> BinaryIO:
+        if self._file is None:
+            if self._error is not None:
+                raise self._error
+            try:
+                self._file = open(self._lazy._source, 'rb')
+            except OSError as e:
+                self._error = ContainerError(f"Cannot copy segments from {self._lazy._source.name}: {e}")
+                raise self._error from e
+        return self._file
+
+    def read(self, ref: SegmentRef) -> Optional[bytes]:
+        """A loaded segment's stored bytes, or None if they're gone or changed"""
+        try:
+            return self._lazy._read_segment(self._open(), ref)
+        except (OSError, ContainerError):
+            return None
+
+    def copy(self, ref: SegmentRef, target: BinaryIO) -> None:
+        """Copy a segment that was never loaded"""
+        _copy_segment(self._open(), self._lazy._base + ref.offset, ref, target)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+def _copy_segment(source: BinaryIO, position: int, ref: SegmentRef, target: BinaryIO) -> None:
+    """Copy a stored segment, verifying it against its digest"""
+    source.seek(position)
+    digest = hashlib.sha256()
+    remaining = ref.length
+    while remaining:
+        block = source.read(min(remaining, _COPY_SIZE))
+        if not block:
+            break
+        digest.update(block)
+        target.write(block)
+        remaining -= len(block)
+    if remaining or digest.hexdigest() != ref.sha256:
+        raise ContainerError(f"Segment {ref.key!r} does not match the index of {source.name}")
+
+
+def index_digest(path: Path) -> bytes:
+    """
+    SHA-256 of a segmented file's header and index.
+
+    Every save writes a freshly encrypted index, so the digest identifies
+    one save of a file without reading its segments.
+
+    Raises:
+        ContainerError: If the file is not a segmented container
+    """
+    with open(path, 'rb') as f:
+        header = f.read(_FILE_HEADER.size)
+        if len(header) < _FILE_HEADER.size or not is_segmented(header):
+            raise ContainerError("Not a segmented container")
+        index_length = _FILE_HEADER.unpack(header)[4]
+        index = f.read(index_length)
+    if len(index) < index_length:
+        raise ContainerError("Segmented container is truncated")
+    return hashlib.sha256(header + index).digest()
+
+
+def read_segmented(
+    fileobj: BinaryIO,
+    master_key: bytes,
+    source: Path
+) -> Tuple[Dict[str, Any], LazySegments]:
+    """
+    Read a segmented container's index.
+
+    Args:
+        fileobj: Binary file positioned at the container's start
+        master_key: Secret the container keys were derived from
+        source: Path of the file, which segments are loaded from later
+
+    Returns:
+        The shared data and a LazySegments of the segments, none loaded
+
+    Raises:
+        ContainerError: If the header or index is malformed, truncated or
+            fails authentication
+    """
+    header = fileobj.read(_FILE_HEADER.size)
+    if len(header) < _FILE_HEADER.size or not is_segmented(header):
+        raise ContainerError("Not a segmented container")
+    _, version, _, _, index_length = _FILE_HEADER.unpack(header)
+    if version != SEGMENTED_VERSION:
+        raise ContainerError(f"Unsupported segmented container version {version}")
+
+    index = json.loads(read_container(io.BytesIO(fileobj.read(index_length)), master_key))
+    refs = {}
+    for entry in index['segments']:
+        ref = SegmentRef.from_dict(entry)
+        refs[ref.key] = ref
+    segments = LazySegments()
+    segments.attach(source, master_key, _FILE_HEADER.size + index_length, refs)
+    return index['shared'], segments
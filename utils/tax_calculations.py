@@ -4,11 +4,16 @@ TAX YEAR 2025:
 This module is configured for the 2025 tax year (returns filed in 2026).
 All tax brackets, standard deductions, and amounts are based on IRS
 published 2025 tax year figures.
+
+Amounts are computed in integer cents (utils.money): every rate is applied
+exactly and rounded half up to the cent, and results are returned as floats.
+The *_cents functions give the integer amounts for callers that keep cents.
 """
 
 from functools import lru_cache
 from typing import Optional
 from config.tax_year_config import get_tax_year_config
+from utils.money import divide_cents, multiply_cents, to_cents, to_dollars
 
 @lru_cache(maxsize=32)
 def calculate_standard_deduction(filing_status: str, tax_year: int = 2025) -> float:
@@ -29,7 +34,6 @@ def calculate_standard_deduction(filing_status: str, tax_year: int = 2025) -> fl
     config = get_tax_year_config(tax_year)
     return config.standard_deductions.get(filing_status, config.standard_deductions["Single"])
 
-@lru_cache(maxsize=128)
 def calculate_income_tax(taxable_income: float, filing_status: str, tax_year: int = 2025) -> float:
     """
     Calculate federal income tax based on taxable income and filing status.
@@ -47,21 +51,23 @@ def calculate_income_tax(taxable_income: float, filing_status: str, tax_year: in
         6328.0
     """
     
-    config = get_tax_year_config(tax_year)
-    brackets = config.tax_brackets.get(filing_status, config.tax_brackets["Single"])
-    
-    tax = 0.0
-    prev_threshold = 0.0
-    
-    for threshold, rate in brackets:
-        if taxable_income <= threshold:
-            tax += (taxable_income - prev_threshold) * rate
-            break
-        else:
-            tax += (threshold - prev_threshold) * rate
-            prev_threshold = threshold
+    return to_dollars(income_tax_cents(to_cents(taxable_income), filing_status, tax_year))
+
+def income_tax_cents(taxable_cents: int, filing_status: str, tax_year: int = 2025) -> int:
+    """
+    Federal income tax in cents on taxable income in cents.
     
-    return round(tax, 2)
+    Args:
+        taxable_cents: Taxable income in cents
+        filing_status: Filing status code (Single, MFJ, MFS, HOH, QW)
+        tax_year: Tax year for calculation (default: 2025)
+        
+    Returns:
+        Income tax in cents
+    """
+    config = get_tax_year_config(tax_year)
+    # Precompiled per configuration: one bisect plus one multiply-add
+    return config.get_cents_bracket_table(filing_status).tax(taxable_cents)
 
 def calculate_self_employment_tax(net_earnings: float) -> float:
     """
@@ -77,29 +83,40 @@ def calculate_self_employment_tax(net_earnings: float) -> float:
         Includes Social Security (12.4%), Medicare (2.9%), and
         additional Medicare tax (0.9% over threshold)
     """
-    if net_earnings <= 0:
-        return 0.0
+    return to_dollars(self_employment_tax_cents(to_cents(net_earnings)))
+
+def self_employment_tax_cents(net_cents: int) -> int:
+    """
+    Self-employment tax in cents, each line rounded to the cent as on Schedule SE.
+    
+    Args:
+        net_cents: Net earnings from self-employment in cents
+        
+    Returns:
+        Total self-employment tax in cents
+    """
+    if net_cents <= 0:
+        return 0
     
     config = get_tax_year_config()
     
     # 92.35% of net earnings subject to SE tax
-    se_income = net_earnings * config.se_tax_rate
+    se_income = multiply_cents(net_cents, config.se_tax_rate)
     
     # Social Security tax (12.4% up to wage base)
-    ss_tax = min(se_income, config.ss_wage_base) * config.ss_tax_rate
+    ss_tax = multiply_cents(min(se_income, to_cents(config.ss_wage_base)), config.ss_tax_rate)
     
     # Medicare tax (2.9% on all earnings)
-    medicare_tax = se_income * config.medicare_tax_rate
+    medicare_tax = multiply_cents(se_income, config.medicare_tax_rate)
     
     # Additional Medicare tax (0.9% over threshold)
-    if se_income > config.medicare_threshold:
-        additional_medicare = (se_income - config.medicare_threshold) * config.additional_medicare_rate
+    medicare_threshold = to_cents(config.medicare_threshold)
+    if se_income > medicare_threshold:
+        additional_medicare = multiply_cents(se_income - medicare_threshold, config.additional_medicare_rate)
     else:
-        additional_medicare = 0.0
-    
-    total_se_tax = ss_tax + medicare_tax + additional_medicare
+        additional_medicare = 0
     
-    return round(total_se_tax, 2)
+    return ss_tax + medicare_tax + additional_medicare
 
 def calculate_child_tax_credit(num_qualifying_children: int, num_other_dependents: int, 
                                agi: float, filing_status: str) -> float:
@@ -128,8 +145,8 @@ def calculate_child_tax_credit(num_qualifying_children: int, num_other_dependent
     credit_per_child = config.child_tax_credit_amount
     credit_per_other = config.other_dependent_credit
     
-    total_credit = (num_qualifying_children * credit_per_child + 
-                   num_other_dependents * credit_per_other)
+    total_credit = (num_qualifying_children * to_cents(credit_per_child) + 
+                   num_other_dependents * to_cents(credit_per_other))
     
     # Phase-out thresholds
     thresholds = {
@@ -140,15 +157,16 @@ def calculate_child_tax_credit(num_qualifying_children: int, num_other_dependent
         "QW": 400000
     }
     
-    threshold = thresholds.get(filing_status, 200000)
+    threshold = to_cents(thresholds.get(filing_status, 200000))
+    agi_cents = to_cents(agi)
     
-    # Phase out $50 for every $1,000 over threshold
-    if agi > threshold:
-        excess = agi - threshold
-        reduction = (excess // 1000) * 50
+    # Phase out $50 for every full $1,000 over threshold
+    if agi_cents > threshold:
+        excess = agi_cents - threshold
+        reduction = (excess // to_cents(1000)) * to_cents(50)
         total_credit = max(0, total_credit - reduction)
     
-    return round(total_credit, 2)
+    return to_dollars(total_credit)
 
 def calculate_earned_income_credit(earned_income, agi, num_children, filing_status):
     """
@@ -157,7 +175,7 @@ def calculate_earned_income_credit(earned_income, agi, num_children, filing_stat
     """
     # 2025 EIC limits
     if filing_status == "MFS":
-        return 0  # Not eligible if MFS
+        return 0.0  # Not eligible if MFS
     
     # Maximum AGI limits for 2025
     agi_limits = {
@@ -182,24 +200,28 @@ def calculate_earned_income_credit(earned_income, agi, num_children, filing_stat
     else:
         limit = agi_limits[num_children_key]["Single"]
     
+    limit = to_cents(limit)
+    agi = to_cents(agi)
     if agi > limit:
-        return 0
+        return 0.0
     
     # Simplified calculation - actual is more complex
-    max_credit = max_credits[num_children_key]
+    max_credit = to_cents(max_credits[num_children_key])
     
     # Phase in and phase out (simplified)
-    if earned_income < 10000:
-        credit = (earned_income / 10000) * max_credit
+    earned_income = to_cents(earned_income)
+    phase_in_end = to_cents(10000)
+    if earned_income < phase_in_end:
+        credit = divide_cents(earned_income * max_credit, phase_in_end)
     else:
         credit = max_credit
     
-    # Phase out based on AGI
-    if agi > limit * 0.7:
-        phase_out_rate = (agi - limit * 0.7) / (limit * 0.3)
-        credit = credit * (1 - phase_out_rate)
+    # Phase out over the top 30% of the AGI limit:
+    # credit * (1 - (agi - 0.7 * limit) / (0.3 * limit)) = credit * 10 * (limit - agi) / (3 * limit)
+    if agi * 10 > limit * 7:
+        credit = divide_cents(credit * 10 * (limit - agi), 3 * limit)
     
-    return round(max(0, credit), 2)
+    return to_dollars(max(0, credit))
 
 def calculate_education_credit_aotc(qualified_expenses: float, num_years_claimed: int) -> float:
     """
@@ -222,12 +244,14 @@ def calculate_education_credit_aotc(qualified_expenses: float, num_years_claimed
     if qualified_expenses <= 0:
         return 0.0
     
-    if qualified_expenses <= 2000:
-        credit = qualified_expenses
+    expenses = to_cents(qualified_expenses)
+    first_tier = to_cents(2000)
+    if expenses <= first_tier:
+        credit = expenses
     else:
-        credit = 2000 + (min(qualified_expenses - 2000, 2000) * 0.25)
+        credit = first_tier + multiply_cents(min(expenses - first_tier, first_tier), 0.25)
     
-    return round(min(credit, 2500), 2)
+    return to_dollars(min(credit, to_cents(2500)))
 
 def calculate_education_credit_llc(qualified_expenses: float) -> float:
     """
@@ -243,8 +267,8 @@ def calculate_education_credit_llc(qualified_expenses: float) -> float:
         20% of first $10,000 in qualified expenses
         No limit on number of years claimed
     """
-    credit = min(qualified_expenses, 10000) * 0.20
-    return round(min(credit, 2000), 2)
+    credit = multiply_cents(min(to_cents(qualified_expenses), to_cents(10000)), 0.20)
+    return to_dollars(min(credit, to_cents(2000)))
 
 
 def calculate_retirement_savings_credit(contributions: float, agi: float, filing_status: str, tax_year: int = 2025) -> float:
@@ -266,10 +290,10 @@ def calculate_retirement_savings_credit(contributions: float, agi: float, filing
         Credit phases out based on income thresholds
     """
     # Maximum credit contribution amount
-    max_contribution = 2000
+    max_contribution = to_cents(2000)
     
     # Limit contributions to maximum
-    eligible_contributions = min(contributions, max_contribution)
+    eligible_contributions = min(to_cents(contributions), max_contribution)
     
     # Get income limits for the credit percentage
     config = get_tax_year_config(tax_year)
@@ -277,61 +301,18 @@ def calculate_retirement_savings_credit(contributions: float, agi: float, filing
                                                                config.retirement_savings_credit_limits["Single"])
     
     # Determine credit percentage based on AGI
-    if agi <= income_limits["50_percent"]:
+    agi = to_cents(agi)
+    if agi <= to_cents(income_limits["50_percent"]):
         credit_rate = 0.50
-    elif agi <= income_limits["20_percent"]:
+    elif agi <= to_cents(income_limits["20_percent"]):
         credit_rate = 0.20
-    elif agi <= income_limits["10_percent"]:
+    elif agi <= to_cents(income_limits["10_percent"]):
         credit_rate = 0.10
     else:
         # No credit if AGI exceeds the 10% limit
         return 0.0
     
-    credit = eligible_contributions * credit_rate
-    return round(credit, 2)
-
-
-def calculate_child_dependent_care_credit(expenses: float, agi: float, filing_status: str, tax_year: int = 2025) -> float:
-    """
-    Calculate Child and Dependent Care Credit.
-    
-    Args:
-        expenses: Qualified child/dependent care expenses paid
-        agi: Adjusted Gross Income
-        filing_status: Filing status code
-        tax_year: Tax year for calculation
-        
-    Returns:
-        Child and dependent care credit amount
-        
-    Note:
-        Credit is 35% of first $3,000 in expenses for one child/dependent
-        Credit is 35% of first $6,000 in expenses for two or more children/dependents
-        Credit phases out for high-income taxpayers
-    """
-    # Expense limits based on number of children/dependents
-    # For simplicity, assume at least 2 children (most common case)
-    # In a real implementation, this would be passed as a parameter
-    expense_limit = 6000  # For 2+ children
-    credit_rate = 0.35
-    
-    # Limit expenses to maximum eligible amount
-    eligible_expenses = min(expenses, expense_limit)
-    
-    # Calculate base credit
-    base_credit = eligible_expenses * credit_rate
-    
-    # Phase out for high income
-    config = get_tax_year_config(tax_year)
-    phase_out_limits = config.child_dependent_care_limits.get(filing_status,
-                                                             config.child_dependent_care_limits["Single"])
-    
-    if agi > phase_out_limits["threshold"]:
-        # Phase out $1 for every $2 of AGI over threshold
-        phase_out_amount = (agi - phase_out_limits["threshold"]) / 2
-        base_credit = max(0, base_credit - phase_out_amount)
-    
-    return round(base_credit, 2)
+    return to_dollars(multiply_cents(eligible_contributions, credit_rate))
 
 
 def calculate_residential_energy_credit(credit_amount: float) -> float:
@@ -350,7 +331,7 @@ def calculate_residential_energy_credit(credit_amount: float) -> float:
     """
     # The credit amount is calculated on IRS Form 5695
     # We just return the amount as entered by the user
-    return round(credit_amount, 2)
+    return to_dollars(to_cents(credit_amount))
 
 
 def calculate_premium_tax_credit(credit_amount: float) -> float:
@@ -370,7 +351,7 @@ def calculate_premium_tax_credit(credit_amount: float) -> float:
     """
     # The credit amount is calculated by the IRS based on income and premium costs
     # We just return the amount as entered by the user
-    return round(credit_amount, 2)
+    return to_dollars(to_cents(credit_amount))
 
 
 def calculate_alternative_minimum_tax(agi: float, filing_status: str, tax_year: int = 2025) -> float:
@@ -391,17 +372,19 @@ def calculate_alternative_minimum_tax(agi: float, filing_status: str, tax_year:
     """
     config = get_tax_year_config(tax_year)
     
+    agi = to_cents(agi)
+    
     # Get AMT exemption amount
-    exemption = config.amt_exemptions.get(filing_status, config.amt_exemptions["Single"])
+    exemption = to_cents(config.amt_exemptions.get(filing_status, config.amt_exemptions["Single"]))
     
     # Phase out exemption for high income
-    phase_out_threshold = config.amt_phase_out_thresholds.get(filing_status, 
-                                                             config.amt_phase_out_thresholds["Single"])
+    phase_out_threshold = to_cents(config.amt_phase_out_thresholds.get(filing_status, 
+                                                                      config.amt_phase_out_thresholds["Single"]))
     
     if agi > phase_out_threshold:
         # Exemption phases out at 25 cents per dollar over threshold
         excess = agi - phase_out_threshold
-        exemption_reduction = excess * 0.25
+        exemption_reduction = multiply_cents(excess, 0.25)
         exemption = max(0, exemption - exemption_reduction)
     
     # AMT taxable income = AGI - exemption
@@ -409,21 +392,21 @@ def calculate_alternative_minimum_tax(agi: float, filing_status: str, tax_year:
     
     # Calculate tentative AMT using AMT tax brackets
     # AMT brackets are: 26% on first $220,700, 28% on excess
-    amt_bracket_1_threshold = 220700.0
+    amt_bracket_1_threshold = to_cents(220700)
     
     if amt_taxable_income <= amt_bracket_1_threshold:
-        tentative_amt = amt_taxable_income * 0.26
+        tentative_amt = multiply_cents(amt_taxable_income, 0.26)
     else:
-        tentative_amt = (amt_bracket_1_threshold * 0.26) + \
-                       ((amt_taxable_income - amt_bracket_1_threshold) * 0.28)
+        tentative_amt = multiply_cents(amt_bracket_1_threshold, 0.26) + \
+                       multiply_cents(amt_taxable_income - amt_bracket_1_threshold, 0.28)
     
     # Calculate regular tax for comparison
-    regular_tax = calculate_income_tax(amt_taxable_income, filing_status, tax_year)
+    regular_tax = income_tax_cents(amt_taxable_income, filing_status, tax_year)
     
     # AMT is the excess of tentative AMT over regular tax
     amt = max(0, tentative_amt - regular_tax)
     
-    return round(amt, 2)
+    return to_dollars(amt)
 
 
 def calculate_net_investment_income_tax(investment_income: float, agi: float, 
@@ -448,7 +431,8 @@ def calculate_net_investment_income_tax(investment_income: float, agi: float,
     config = get_tax_year_config(tax_year)
     
     # Get NIIT threshold
-    threshold = config.niit_thresholds.get(filing_status, config.niit_thresholds["Single"])
+    threshold = to_cents(config.niit_thresholds.get(filing_status, config.niit_thresholds["Single"]))
+    agi = to_cents(agi)
     
     if agi <= threshold:
         return 0.0
@@ -456,12 +440,12 @@ def calculate_net_investment_income_tax(investment_income: float, agi: float,
     # NIIT applies to the lesser of:
     # 1. Net investment income
     # 2. AGI minus threshold
-    niit_base = min(investment_income, agi - threshold)
+    niit_base = min(to_cents(investment_income), agi - threshold)
     
     # Tax rate is 3.8%
-    niit = niit_base * 0.038
+    niit = multiply_cents(niit_base, 0.038)
     
-    return round(niit, 2)
+    return to_dollars(niit)
 
 
 def calculate_additional_medicare_tax(wages: float, investment_income: float, 
@@ -486,19 +470,19 @@ def calculate_additional_medicare_tax(wages: float, investment_income: float,
     config = get_tax_year_config(tax_year)
     
     # Threshold for additional Medicare tax
-    threshold = config.niit_thresholds.get(filing_status, config.niit_thresholds["Single"])
+    threshold = to_cents(config.niit_thresholds.get(filing_status, config.niit_thresholds["Single"]))
     
     # Combined income subject to additional Medicare tax
-    combined_income = wages + investment_income
+    combined_income = to_cents(wages) + to_cents(investment_income)
     
     if combined_income <= threshold:
         return 0.0
     
     # Additional Medicare tax applies to the excess over threshold
     excess = combined_income - threshold
-    additional_medicare_tax = excess * config.additional_medicare_rate
+    additional_medicare_tax = multiply_cents(excess, config.additional_medicare_rate)
     
-    return round(additional_medicare_tax, 2)
+    return to_dollars(additional_medicare_tax)
 
 
 @lru_cache(maxsize=128)
@@ -524,23 +508,21 @@ def calculate_child_dependent_care_credit(expenses: float, agi: float,
     
     # Maximum qualifying expenses based on number of children
     # For simplicity, assume 2+ children (most common case) - max $6,000
-    max_expenses = 6000.0
+    max_expenses = to_cents(6000)
     
     # Limit expenses to maximum qualifying amount
-    qualifying_expenses = min(expenses, max_expenses)
-    
-    # Base credit rate is 35%
-    credit_rate = 0.35
+    qualifying_expenses = min(to_cents(expenses), max_expenses)
     
     # Check for phase-out
-    phase_out_threshold = config.child_dependent_care_limits.get(filing_status, 
-                                                                config.child_dependent_care_limits["Single"])["threshold"]
-    
-    if agi > phase_out_threshold:
-        # Phase out $1 of credit for every $2 of AGI over threshold
-        phase_out_amount = (agi - phase_out_threshold) / 2
-        credit_rate = max(0, credit_rate - (phase_out_amount / qualifying_expenses))
-    
-    credit = qualifying_expenses * credit_rate
-    
-    return round(credit, 2)
+    phase_out_threshold = to_cents(config.child_dependent_care_limits.get(
+        filing_status, config.child_dependent_care_limits["Single"])["threshold"])
+    agi = to_cents(agi)
+    
+    if agi <= phase_out_threshold:
+        # Base credit rate is 35%
+        return to_dollars(multiply_cents(qualifying_expenses, 0.35))
+    
+    # Phase out $1 of credit for every $2 of AGI over threshold:
+    # 35% of expenses minus half the excess, rounded once
+    credit = divide_cents(7 * qualifying_expenses - 10 * (agi - phase_out_threshold), 20)
+    return to_dollars(max(0, credit))
@@ -0,0 +1,170 @@
+"""
+Wash Sale Detection - Indexed detector for large capital gain lot lists
+
+A wash sale occurs when a security is sold at a loss and the same or a
+substantially identical security is bought within 30 days before or after
+the sale.
+
+Each lot's description is normalized once into a security key and each
+date is parsed once. Lots are bucketed by key and every bucket is sorted by
+acquisition date, so the 30-day window for a loss sale is found with two
+bisections instead of a scan of every other lot.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+WASH_SALE_WINDOW_DAYS = 30
+
+# Security types, checked in order; descriptions without one are common stock
+SECURITY_TYPES = ('common stock', 'preferred stock', 'bond', 'note', 'debenture')
+
+CLASS_DESIGNATION_RE = re.compile(r'\bclass\s+[a-zA-Z0-9]+\b', re.IGNORECASE)
+SERIES_DESIGNATION_RE = re.compile(r'\bseries\s+[a-zA-Z0-9]+\b', re.IGNORECASE)
+
+# Corporate suffixes that don't distinguish one issuer from another
+_CORPORATE_SUFFIXES = frozenset({
+    'inc', 'incorporated', 'corp', 'corporation', 'ltd', 'limited', 'co', 'company'
+})
+
+_DATE_FORMATS = ('%m/%d/%Y', '%Y-%m-%d')
+
+
+@lru_cache(maxsize=4096)
+def parse_date(date_str: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a MM/DD/YYYY or YYYY-MM-DD date string.
+
+    Lots in an import share few distinct dates, so results are cached.
+
+    Args:
+        date_str: Date string
+
+    Returns:
+        Parsed datetime, or None if empty or unparseable
+    """
+    if not date_str:
+        return None
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def split_security_description(description: str) -> Tuple[str, str]:
+    """
+    Extract (company_name, security_type) from a security description.
+
+    Class and series designations are removed because they don't affect
+    wash sale similarity.
+
+    Args:
+        description: Security description as entered on the lot
+
+    Returns:
+        Tuple of normalized company name and security type
+    """
+    desc_lower = description.lower()
+
+    security_type = 'common stock'
+    company_part = desc_lower
+    for candidate in SECURITY_TYPES:
+        if candidate in desc_lower:
+            security_type = candidate
+            company_part = desc_lower.replace(candidate, '').strip()
+            break
+
+    company_part = ' '.join(company_part.split())
+    company_part = company_part.replace(',', '').replace('.', '').strip()
+    company_part = CLASS_DESIGNATION_RE.sub('', company_part)
+    company_part = SERIES_DESIGNATION_RE.sub('', company_part)
+    company_part = ' '.join(company_part.split())
+
+    return company_part, security_type
+
+
+def security_key(description: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    Normalize a description into a key shared by substantially identical securities.
+
+    Args:
+        description: Security description
+
+    Returns:
+        (security_type, issuer) key, or None for an empty description
+    """
+    if not description or not description.strip():
+        return None
+    company, security_type = split_security_description(description.strip())
+    issuer = ' '.join(word for word in company.split() if word not in _CORPORATE_SUFFIXES)
+    return security_type, issuer
+
+
+def iter_wash_sales(transactions: Sequence[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Detect potential wash sales, yielding them as they are found.
+
+    Results are produced in loss-sale order, and for each sale in purchase
+    order, matching TaxData.detect_wash_sales.
+
+    Args:
+        transactions: Capital gain lots with description, date_acquired,
+            date_sold and gain_loss
+
+    Yields:
+        Dictionaries describing each sale/purchase pair
+    """
+    # Index purchases: key -> acquisition ordinals (sorted) and lot indexes
+    buckets: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+    keys: List[Optional[Tuple[str, str]]] = []
+    acquired: List[Optional[datetime]] = []
+
+    for index, lot in enumerate(transactions):
+        key = security_key(lot.get('description', ''))
+        acquired_date = parse_date(lot.get('date_acquired', ''))
+        keys.append(key)
+        acquired.append(acquired_date)
+        if key is not None and acquired_date is not None:
+            buckets.setdefault(key, []).append((acquired_date.toordinal(), index))
+
+    sorted_buckets: Dict[Tuple[str, str], Tuple[List[int], List[int]]] = {}
+    for key, entries in buckets.items():
+        entries.sort()
+        sorted_buckets[key] = ([ordinal for ordinal, _ in entries], [index for _, index in entries])
+
+    for sale_index, sale in enumerate(transactions):
+        if sale.get('gain_loss', 0) >= 0:  # Only check losses
+            continue
+
+        bucket = sorted_buckets.get(keys[sale_index])
+        if bucket is None:
+            continue
+
+        sale_date = parse_date(sale.get('date_sold', ''))
+        if not sale_date:
+            continue
+
+        ordinals, indexes = bucket
+        sale_ordinal = sale_date.toordinal()
+        start = bisect_left(ordinals, sale_ordinal - WASH_SALE_WINDOW_DAYS)
+        end = bisect_right(ordinals, sale_ordinal + WASH_SALE_WINDOW_DAYS)
+
+        for purchase_index in sorted(indexes[start:end]):
+            if purchase_index == sale_index:
+                continue
+            purchase = transactions[purchase_index]
+            yield {
+                'sale_index': sale_index,
+                'purchase_index': purchase_index,
+                'sale_description': sale.get('description'),
+                'purchase_description': purchase.get('description'),
+                'sale_date': sale.get('date_sold'),
+                'purchase_date': purchase.get('date_acquired'),
+                'loss_amount': abs(sale.get('gain_loss', 0)),
+                'days_between': abs((acquired[purchase_index] - sale_date).days)
+            }